@@ -23,13 +23,16 @@ from .const import (
     SIGNAL_BOOTSTRAP_INTEGRATONS,
 )
 from .exceptions import HomeAssistantError
-from .helpers import area_registry, device_registry, entity_registry
+from .helpers import area_registry, device_registry, entity_registry, startup_trace
 from .helpers.dispatcher import async_dispatcher_send
 from .helpers.typing import ConfigType
 from .setup import (
+    DATA_IMPORT_STARTED,
+    DATA_IMPORT_TIME,
     DATA_SETUP,
     DATA_SETUP_STARTED,
     DATA_SETUP_TIME,
+    async_import_integrations,
     async_set_domains_to_be_loaded,
     async_setup_component,
 )
@@ -96,6 +99,7 @@ async def async_setup_hass(
     """Set up Home Assistant."""
     hass = core.HomeAssistant()
     hass.config.config_dir = runtime_config.config_dir
+    startup_trace.async_start_startup_trace(hass)
 
     async_enable_logging(
         hass,
@@ -124,7 +128,8 @@ async def async_setup_hass(
         await hass.async_add_executor_job(conf_util.process_ha_config_upgrade, hass)
 
         try:
-            config_dict = await conf_util.async_hass_config_yaml(hass)
+            with _async_trace_span(hass, "load configuration"):
+                config_dict = await conf_util.async_hass_config_yaml(hass)
         except HomeAssistantError as err:
             _LOGGER.error(
                 "Failed to parse configuration.yaml: %s. Activating safe mode",
@@ -161,6 +166,7 @@ async def async_setup_hass(
         old_logging = hass.data.get(DATA_LOGGING)
 
         hass = core.HomeAssistant()
+        startup_trace.async_start_startup_trace(hass)
         if old_logging:
             hass.data[DATA_LOGGING] = old_logging
         hass.config.skip_pip = old_config.skip_pip
@@ -179,6 +185,8 @@ async def async_setup_hass(
             hass,
         )
 
+    startup_trace.async_finish_startup_trace(hass)
+
     if runtime_config.open_ui:
         hass.add_job(open_hass_ui, hass)
 
@@ -221,14 +229,14 @@ async def async_from_config_dict(
     # Set up core.
     _LOGGER.debug("Setting up %s", CORE_INTEGRATIONS)
 
-    if not all(
-        await asyncio.gather(
+    with _async_trace_span(hass, "core integrations"):
+        core_setup = await asyncio.gather(
             *(
                 async_setup_component(hass, domain, config)
                 for domain in CORE_INTEGRATIONS
             )
         )
-    ):
+    if not all(core_setup):
         _LOGGER.error("Home Assistant core failed to initialize. ")
         return None
 
@@ -408,12 +416,13 @@ async def _async_watch_pending_setups(hass: core.HomeAssistant) -> None:
     """Periodic log of setups that are pending for longer than LOG_SLOW_STARTUP_INTERVAL."""
     loop_count = 0
     setup_started: dict[str, datetime] = hass.data[DATA_SETUP_STARTED]
+    import_started: dict[str, datetime] = hass.data.setdefault(DATA_IMPORT_STARTED, {})
     previous_was_empty = True
     while True:
         now = dt_util.utcnow()
         remaining_with_setup_started = {
-            domain: (now - setup_started[domain]).total_seconds()
-            for domain in setup_started
+            domain: (now - started).total_seconds()
+            for domain, started in (*import_started.items(), *setup_started.items())
         }
         _LOGGER.debug("Integration remaining: %s", remaining_with_setup_started)
         if remaining_with_setup_started or not previous_was_empty:
@@ -455,6 +464,37 @@ async def async_setup_multi_components(
         )
 
 
+@core.callback
+def _async_trace_span(
+    hass: core.HomeAssistant, name: str
+) -> contextlib.AbstractContextManager[None]:
+    """Trace a step of bootstrap in the startup trace."""
+    return startup_trace.async_trace_span(
+        hass, startup_trace.TRACK_BOOTSTRAP, name, startup_trace.CATEGORY_BOOTSTRAP
+    )
+
+
+@core.callback
+def _async_log_manifest_stats(
+    hass: core.HomeAssistant, resolved: int, resolve_time: float
+) -> None:
+    """Log how long resolving the integrations took and where the manifests came from."""
+    stats = loader.async_get_manifest_stats(hass)
+    _LOGGER.debug(
+        "Resolved %s integrations in %.3fs. Manifests: %s from the index (loaded in "
+        "%.3fs), %s from the custom integration cache, %s read in %.3fs",
+        resolved,
+        resolve_time,
+        stats.from_index,
+        stats.index_load_time,
+        stats.from_cache,
+        stats.read,
+        stats.read_time,
+    )
+    if (time_saved := stats.time_saved) is not None:
+        _LOGGER.debug("Not reading manifests saved about %.3fs", time_saved)
+
+
 async def _async_set_up_integrations(
     hass: core.HomeAssistant, config: dict[str, Any]
 ) -> None:
@@ -468,54 +508,59 @@ async def _async_set_up_integrations(
 
     # Resolve all dependencies so we know all integrations
     # that will have to be loaded and start rightaway
+    resolve_start = monotonic()
     integration_cache: dict[str, loader.Integration] = {}
-    to_resolve: set[str] = domains_to_setup
-    while to_resolve:
-        old_to_resolve: set[str] = to_resolve
-        to_resolve = set()
-
-        integrations_to_process = [
-            int_or_exc
-            for int_or_exc in await gather_with_concurrency(
-                loader.MAX_LOAD_CONCURRENTLY,
-                *(
-                    loader.async_get_integration(hass, domain)
-                    for domain in old_to_resolve
-                ),
-                return_exceptions=True,
-            )
-            if isinstance(int_or_exc, loader.Integration)
-        ]
-        resolve_dependencies_tasks = [
-            itg.resolve_dependencies()
-            for itg in integrations_to_process
-            if not itg.all_dependencies_resolved
-        ]
+    with _async_trace_span(hass, "resolve integrations"):
+        to_resolve: set[str] = domains_to_setup
+        while to_resolve:
+            old_to_resolve: set[str] = to_resolve
+            to_resolve = set()
+
+            integrations_to_process = [
+                int_or_exc
+                for int_or_exc in await gather_with_concurrency(
+                    loader.MAX_LOAD_CONCURRENTLY,
+                    *(
+                        loader.async_get_integration(hass, domain)
+                        for domain in old_to_resolve
+                    ),
+                    return_exceptions=True,
+                )
+                if isinstance(int_or_exc, loader.Integration)
+            ]
+            resolve_dependencies_tasks = [
+                itg.resolve_dependencies()
+                for itg in integrations_to_process
+                if not itg.all_dependencies_resolved
+            ]
 
-        if resolve_dependencies_tasks:
-            await asyncio.gather(*resolve_dependencies_tasks)
+            if resolve_dependencies_tasks:
+                await asyncio.gather(*resolve_dependencies_tasks)
 
-        for itg in integrations_to_process:
-            integration_cache[itg.domain] = itg
+            for itg in integrations_to_process:
+                integration_cache[itg.domain] = itg
 
-            for dep in itg.all_dependencies:
-                if dep in domains_to_setup:
-                    continue
+                for dep in itg.all_dependencies:
+                    if dep in domains_to_setup:
+                        continue
 
-                domains_to_setup.add(dep)
-                to_resolve.add(dep)
+                    domains_to_setup.add(dep)
+                    to_resolve.add(dep)
 
     _LOGGER.info("Domains to be set up: %s", domains_to_setup)
+    _async_log_manifest_stats(hass, len(integration_cache), monotonic() - resolve_start)
 
     # Load logging as soon as possible
     if logging_domains := domains_to_setup & LOGGING_INTEGRATIONS:
         _LOGGER.info("Setting up logging: %s", logging_domains)
-        await async_setup_multi_components(hass, logging_domains, config)
+        with _async_trace_span(hass, "logging"):
+            await async_setup_multi_components(hass, logging_domains, config)
 
     # Start up debuggers. Start these first in case they want to wait.
     if debuggers := domains_to_setup & DEBUGGER_INTEGRATIONS:
         _LOGGER.debug("Setting up debuggers: %s", debuggers)
-        await async_setup_multi_components(hass, debuggers, config)
+        with _async_trace_span(hass, "debuggers"):
+            await async_setup_multi_components(hass, debuggers, config)
 
     # calculate what components to setup in what stage
     stage_1_domains: set[str] = set()
@@ -540,12 +585,26 @@ async def _async_set_up_integrations(
 
     stage_2_domains = domains_to_setup - logging_domains - debuggers - stage_1_domains
 
-    # Load the registries
-    await asyncio.gather(
-        device_registry.async_load(hass),
-        entity_registry.async_load(hass),
-        area_registry.async_load(hass),
-    )
+    # Load the registries while the stage 1 integrations are imported in the
+    # executor. The integrations of a stage are imported before the stage is
+    # set up because importing the same modules in a worker thread and the
+    # event loop at once can deadlock.
+    with _async_trace_span(hass, "registries and imports"):
+        registries = asyncio.gather(
+            device_registry.async_load(hass),
+            entity_registry.async_load(hass),
+            area_registry.async_load(hass),
+        )
+        try:
+            async with hass.timeout.async_timeout(
+                STAGE_1_TIMEOUT, cool_down=COOLDOWN_TIME
+            ):
+                await async_import_integrations(
+                    hass, stage_1_domains, integration_cache
+                )
+        except asyncio.TimeoutError:
+            _LOGGER.warning("Import timed out for stage 1 - moving forward")
+        await registries
 
     # Start setup
     if stage_1_domains:
@@ -554,7 +613,8 @@ async def _async_set_up_integrations(
             async with hass.timeout.async_timeout(
                 STAGE_1_TIMEOUT, cool_down=COOLDOWN_TIME
             ):
-                await async_setup_multi_components(hass, stage_1_domains, config)
+                with _async_trace_span(hass, "stage 1"):
+                    await async_setup_multi_components(hass, stage_1_domains, config)
         except asyncio.TimeoutError:
             _LOGGER.warning("Setup timed out for stage 1 - moving forward")
 
@@ -567,7 +627,12 @@ async def _async_set_up_integrations(
             async with hass.timeout.async_timeout(
                 STAGE_2_TIMEOUT, cool_down=COOLDOWN_TIME
             ):
-                await async_setup_multi_components(hass, stage_2_domains, config)
+                with _async_trace_span(hass, "stage 2 imports"):
+                    await async_import_integrations(
+                        hass, stage_2_domains, integration_cache
+                    )
+                with _async_trace_span(hass, "stage 2"):
+                    await async_setup_multi_components(hass, stage_2_domains, config)
         except asyncio.TimeoutError:
             _LOGGER.warning("Setup timed out for stage 2 - moving forward")
 
@@ -575,13 +640,24 @@ async def _async_set_up_integrations(
     _LOGGER.debug("Waiting for startup to wrap up")
     try:
         async with hass.timeout.async_timeout(WRAP_UP_TIMEOUT, cool_down=COOLDOWN_TIME):
-            await hass.async_block_till_done()
+            with _async_trace_span(hass, "wrap up"):
+                await hass.async_block_till_done()
     except asyncio.TimeoutError:
         _LOGGER.warning("Setup timed out for bootstrap - moving forward")
 
     watch_task.cancel()
     async_dispatcher_send(hass, SIGNAL_BOOTSTRAP_INTEGRATONS, {})
 
+    _LOGGER.debug(
+        "Integration import times: %s",
+        {
+            integration: timedelta.total_seconds()
+            for integration, timedelta in sorted(
+                hass.data.get(DATA_IMPORT_TIME, {}).items(),
+                key=lambda item: item[1].total_seconds(),
+            )
+        },
+    )
     _LOGGER.debug(
         "Integration setup times: %s",
         {
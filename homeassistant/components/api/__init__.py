@@ -1,11 +1,12 @@
 """Rest API for Home Assistant."""
 import asyncio
+from collections.abc import Callable
 from http import HTTPStatus
 import json
 import logging
 
 from aiohttp import web
-from aiohttp.web_exceptions import HTTPBadRequest
+from aiohttp.web_exceptions import HTTPBadRequest, HTTPInternalServerError
 import async_timeout
 import voluptuous as vol
 
@@ -13,6 +14,7 @@ from homeassistant.auth.permissions.const import POLICY_READ
 from homeassistant.bootstrap import DATA_LOGGING
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.const import (
+    CONTENT_TYPE_JSON,
     EVENT_HOMEASSISTANT_STOP,
     MATCH_ALL,
     URL_API,
@@ -171,12 +173,15 @@ class APIStatesView(HomeAssistantView):
         """Get current states."""
         user = request["hass_user"]
         entity_perm = user.permissions.check_entity
-        states = [
+        states = (
             state
             for state in request.app["hass"].states.async_all()
             if entity_perm(state.entity_id, "read")
-        ]
-        return self.json(states)
+        )
+        # The JSON of the states is cached on the states
+        return _json_response(
+            lambda: b"[" + b",".join(state.as_dict_json() for state in states) + b"]"
+        )
 
 
 class APIEntityStateView(HomeAssistantView):
@@ -193,7 +198,7 @@ class APIEntityStateView(HomeAssistantView):
             raise Unauthorized(entity_id=entity_id)
 
         if state := request.app["hass"].states.get(entity_id):
-            return self.json(state)
+            return _json_response(state.as_dict_json)
         return self.json_message("Entity not found.", HTTPStatus.NOT_FOUND)
 
     async def post(self, request, entity_id):
@@ -396,3 +401,15 @@ def async_events_json(hass):
         {"event": key, "listener_count": value}
         for key, value in hass.bus.async_listeners().items()
     ]
+
+
+def _json_response(serialize: Callable[[], bytes]) -> web.Response:
+    """Return a JSON response of already serialized JSON."""
+    try:
+        body = serialize()
+    except (ValueError, TypeError) as err:
+        _LOGGER.error("Unable to serialize to JSON: %s", err)
+        raise HTTPInternalServerError from err
+    response = web.Response(body=body, content_type=CONTENT_TYPE_JSON)
+    response.enable_compression()
+    return response
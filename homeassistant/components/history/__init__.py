@@ -1,12 +1,13 @@
 """Provide pre-made queries on top of the recorder component."""
 from __future__ import annotations
 
-from collections.abc import Iterable
+import asyncio
+from collections.abc import Iterable, MutableMapping
 from datetime import datetime as dt, timedelta
 from http import HTTPStatus
 import logging
 import time
-from typing import Literal, cast
+from typing import Any, Literal, cast
 
 from aiohttp import web
 import voluptuous as vol
@@ -24,8 +25,15 @@ from homeassistant.components.recorder.statistics import (
 )
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.components.websocket_api import messages
-from homeassistant.components.websocket_api.const import JSON_DUMP
-from homeassistant.core import HomeAssistant
+from homeassistant.components.websocket_api.const import (
+    COMPRESSED_STATE_ATTRIBUTES,
+    COMPRESSED_STATE_LAST_CHANGED,
+    COMPRESSED_STATE_LAST_UPDATED,
+    COMPRESSED_STATE_STATE,
+    JSON_DUMP,
+)
+from homeassistant.const import ATTR_ENTITY_ID, EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, State, callback
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA
 from homeassistant.helpers.typing import ConfigType
@@ -39,6 +47,17 @@ HISTORY_USE_INCLUDE_ORDER = "history_use_include_order"
 
 CONF_ORDER = "use_include_order"
 
+# The historical window of a history stream is
+# sent in chunks of this size before the live events
+STREAM_CHUNK_SIZE = timedelta(days=1)
+# How long the history stream waits for the recorder to commit
+# the queued states before giving up
+STREAM_RECORDER_SYNC_TIMEOUT = 10
+# The history stream ends when more live events than this
+# queue up while the history is sent, like the websocket
+# connection does when too many messages are pending
+MAX_PENDING_STREAM_EVENTS = 2048
+
 
 CONFIG_SCHEMA = vol.Schema(
     {
@@ -64,6 +83,8 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     websocket_api.async_register_command(hass, ws_get_statistics_during_period)
     websocket_api.async_register_command(hass, ws_get_list_statistic_ids)
     websocket_api.async_register_command(hass, ws_get_history_during_period)
+    websocket_api.async_register_command(hass, ws_get_columnar_history_during_period)
+    websocket_api.async_register_command(hass, ws_stream)
 
     return True
 
@@ -74,7 +95,7 @@ def _ws_get_statistics_during_period(
     start_time: dt,
     end_time: dt | None = None,
     statistic_ids: list[str] | None = None,
-    period: Literal["5minute", "day", "hour", "month"] = "hour",
+    period: Literal["5minute", "day", "hour", "week", "month", "year"] = "hour",
 ) -> str:
     """Fetch statistics and convert them to json in the executor."""
     return JSON_DUMP(
@@ -91,7 +112,9 @@ def _ws_get_statistics_during_period(
         vol.Required("start_time"): str,
         vol.Optional("end_time"): str,
         vol.Optional("statistic_ids"): [str],
-        vol.Required("period"): vol.Any("5minute", "hour", "day", "month"),
+        vol.Required("period"): vol.Any(
+            "5minute", "hour", "day", "week", "month", "year"
+        ),
     }
 )
 @websocket_api.async_response
@@ -189,22 +212,29 @@ def _ws_get_significant_states(
         True,
     )
 
-    if not use_include_order or not filters:
-        return JSON_DUMP(messages.result_message(msg_id, states))
-
     return JSON_DUMP(
         messages.result_message(
-            msg_id,
-            {
-                order_entity: states.pop(order_entity)
-                for order_entity in filters.included_entities
-                if order_entity in states
-            }
-            | states,
+            msg_id, _order_by_included_entities(states, filters, use_include_order)
         )
     )
 
 
+def _order_by_included_entities(
+    states: MutableMapping[str, Any],
+    filters: Filters | None,
+    use_include_order: bool | None,
+) -> MutableMapping[str, Any]:
+    """Optionally order the states by the entities included in the configuration."""
+    if not use_include_order or not filters:
+        return states
+
+    return {
+        order_entity: states.pop(order_entity)
+        for order_entity in filters.included_entities
+        if order_entity in states
+    } | states
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "history/history_during_period",
@@ -277,6 +307,342 @@ async def ws_get_history_during_period(
     )
 
 
+def _ws_get_significant_states_columnar(
+    hass: HomeAssistant,
+    msg_id: int,
+    start_time: dt,
+    end_time: dt | None,
+    entity_ids: list[str] | None,
+    filters: Filters | None,
+    use_include_order: bool | None,
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    no_attributes: bool,
+) -> str:
+    """Fetch history significant_states as columns and convert them to json."""
+    states = history.get_significant_states_columnar(
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        significant_changes_only,
+        no_attributes,
+    )
+    return JSON_DUMP(
+        messages.result_message(
+            msg_id, _order_by_included_entities(states, filters, use_include_order)
+        )
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "history/columnar_history_during_period",
+        vol.Required("start_time"): str,
+        vol.Optional("end_time"): str,
+        vol.Optional("entity_ids"): [str],
+        vol.Optional("include_start_time_state", default=True): bool,
+        vol.Optional("significant_changes_only", default=True): bool,
+        vol.Optional("no_attributes", default=False): bool,
+    }
+)
+@websocket_api.async_response
+async def ws_get_columnar_history_during_period(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Handle columnar history during period websocket command.
+
+    The states of each entity are returned as columns of epoch
+    timestamps and state values, and the attributes are only
+    included when they change.
+    """
+    start_time_str = msg["start_time"]
+    end_time_str = msg.get("end_time")
+
+    if start_time := dt_util.parse_datetime(start_time_str):
+        start_time = dt_util.as_utc(start_time)
+    else:
+        connection.send_error(msg["id"], "invalid_start_time", "Invalid start_time")
+        return
+
+    if end_time_str:
+        if end_time := dt_util.parse_datetime(end_time_str):
+            end_time = dt_util.as_utc(end_time)
+        else:
+            connection.send_error(msg["id"], "invalid_end_time", "Invalid end_time")
+            return
+    else:
+        end_time = None
+
+    if start_time > dt_util.utcnow():
+        connection.send_result(msg["id"], {})
+        return
+
+    entity_ids = msg.get("entity_ids")
+    include_start_time_state = msg["include_start_time_state"]
+
+    if (
+        not include_start_time_state
+        and entity_ids
+        and not _entities_may_have_state_changes_after(hass, entity_ids, start_time)
+    ):
+        connection.send_result(msg["id"], {})
+        return
+
+    connection.send_message(
+        await get_instance(hass).async_add_executor_job(
+            _ws_get_significant_states_columnar,
+            hass,
+            msg["id"],
+            start_time,
+            end_time,
+            entity_ids,
+            hass.data[HISTORY_FILTERS],
+            hass.data[HISTORY_USE_INCLUDE_ORDER],
+            include_start_time_state,
+            msg["significant_changes_only"],
+            msg["no_attributes"],
+        )
+    )
+
+
+def _ws_stream_history_chunk(
+    hass: HomeAssistant,
+    msg_id: int,
+    start_time: dt,
+    end_time: dt | None,
+    entity_ids: list[str],
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+) -> tuple[str, dict[str, tuple[float, str]]]:
+    """Fetch a chunk of the history stream and convert it to json.
+
+    Also returns the last_updated timestamp and the state of the
+    newest state of each entity that is in the chunk.
+    """
+    states = history.get_significant_states(
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        None,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
+        True,
+    )
+    last_sent = {
+        entity_id: (
+            cast(float, entity_states[-1][COMPRESSED_STATE_LAST_UPDATED]),
+            cast(str, entity_states[-1][COMPRESSED_STATE_STATE]),
+        )
+        for entity_id, entity_states in states.items()
+    }
+    return (
+        JSON_DUMP(
+            messages.event_message(
+                msg_id,
+                {
+                    "start_time": start_time.timestamp(),
+                    "end_time": end_time.timestamp() if end_time else None,
+                    "states": states,
+                },
+            )
+        ),
+        last_sent,
+    )
+
+
+def _state_to_compressed_state(
+    state: State, minimal_response: bool, no_attributes: bool
+) -> dict[str, Any]:
+    """Convert a live state to the compressed format of the history."""
+    compressed_state: dict[str, Any] = {
+        COMPRESSED_STATE_STATE: state.state,
+        COMPRESSED_STATE_LAST_UPDATED: state.last_updated.timestamp(),
+    }
+    if minimal_response and state.domain not in history.NEED_ATTRIBUTE_DOMAINS:
+        return compressed_state
+    compressed_state[COMPRESSED_STATE_ATTRIBUTES] = (
+        {} if no_attributes else state.attributes
+    )
+    if state.last_changed != state.last_updated:
+        compressed_state[COMPRESSED_STATE_LAST_CHANGED] = state.last_changed.timestamp()
+    return compressed_state
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "history/stream",
+        vol.Required("start_time"): str,
+        vol.Required("entity_ids"): [str],
+        vol.Optional("include_start_time_state", default=True): bool,
+        vol.Optional("significant_changes_only", default=True): bool,
+        vol.Optional("minimal_response", default=False): bool,
+        vol.Optional("no_attributes", default=False): bool,
+    }
+)
+@websocket_api.async_response
+async def ws_stream(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Handle history stream websocket command.
+
+    The history since start_time is sent in chunks from the database
+    followed by the live state changes of the requested entities.
+    """
+    msg_id: int = msg["id"]
+    if start_time := dt_util.parse_datetime(msg["start_time"]):
+        start_time = dt_util.as_utc(start_time)
+    else:
+        connection.send_error(msg_id, "invalid_start_time", "Invalid start_time")
+        return
+
+    entity_ids: list[str] = msg["entity_ids"]
+    include_start_time_state = msg["include_start_time_state"]
+    significant_changes_only = msg["significant_changes_only"]
+    minimal_response = msg["minimal_response"]
+    no_attributes = msg["no_attributes"]
+    stream_entity_ids = set(entity_ids)
+    # The last_updated and the state of the newest state sent for each
+    # entity, the live events that are older were already sent with the history
+    last_sent: dict[str, tuple[float, str]] = {}
+    pending_events: list[Event] = []
+    live = False
+    unsubscribed = False
+
+    @callback
+    def _forward_state_event(event: Event) -> None:
+        """Forward a state changed event once the history was sent."""
+        if not live:
+            if len(pending_events) >= MAX_PENDING_STREAM_EVENTS:
+                _LOGGER.warning(
+                    "History stream exceeded max pending events: %s",
+                    MAX_PENDING_STREAM_EVENTS,
+                )
+                if connection.subscriptions.pop(msg_id, None) is not None:
+                    _unsubscribe()
+                pending_events.clear()
+                connection.send_error(
+                    msg_id,
+                    "too_many_pending_events",
+                    "Too many state changes while the history was sent",
+                )
+                return
+            pending_events.append(event)
+            return
+        if (new_state := event.data.get("new_state")) is None:
+            return
+        if (
+            significant_changes_only
+            and new_state.domain not in history.SIGNIFICANT_DOMAINS
+            and new_state.last_changed != new_state.last_updated
+        ):
+            return
+        last_updated = new_state.last_updated.timestamp()
+        entity_id = new_state.entity_id
+        if sent := last_sent.get(entity_id):
+            if last_updated <= sent[0]:
+                return
+            # With minimal response the history only has the
+            # state changes, the attribute changes are filtered out
+            if (
+                minimal_response
+                and new_state.domain not in history.NEED_ATTRIBUTE_DOMAINS
+                and new_state.state == sent[1]
+            ):
+                return
+        last_sent[entity_id] = (last_updated, new_state.state)
+        connection.send_message(
+            messages.event_message(
+                msg_id,
+                {
+                    "states": {
+                        entity_id: [
+                            _state_to_compressed_state(
+                                new_state, minimal_response, no_attributes
+                            )
+                        ]
+                    }
+                },
+            )
+        )
+
+    unsub = hass.bus.async_listen_keyed(
+        EVENT_STATE_CHANGED, ATTR_ENTITY_ID, stream_entity_ids, _forward_state_event
+    )
+
+    @callback
+    def _unsubscribe() -> None:
+        """Stop the stream."""
+        nonlocal unsubscribed
+        unsubscribed = True
+        unsub()
+
+    connection.subscriptions[msg_id] = _unsubscribe
+
+    # The state changes that happened before the listener was
+    # added are queued in the recorder, make sure they are
+    # in the database before the history is fetched
+    instance = get_instance(hass)
+    if instance.recording:
+        try:
+            await asyncio.wait_for(
+                instance.async_block_till_done(), STREAM_RECORDER_SYNC_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            if connection.subscriptions.pop(msg_id, None) is not None:
+                _unsubscribe()
+            connection.send_error(
+                msg_id,
+                "recorder_timeout",
+                "The recorder did not commit the queued states in time",
+            )
+            return
+    if unsubscribed:
+        return
+    connection.send_result(msg_id)
+
+    chunk_start = start_time
+    while not unsubscribed:
+        chunk_end: dt | None = chunk_start + STREAM_CHUNK_SIZE
+        if chunk_end >= dt_util.utcnow():
+            # The last chunk includes everything that was committed
+            chunk_end = None
+        response, chunk_last_sent = await instance.async_add_executor_job(
+            _ws_stream_history_chunk,
+            hass,
+            msg_id,
+            chunk_start,
+            chunk_end,
+            entity_ids,
+            include_start_time_state and chunk_start == start_time,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+        )
+        if unsubscribed:
+            return
+        last_sent.update(chunk_last_sent)
+        connection.send_message(response)
+        if chunk_end is None:
+            break
+        chunk_start = chunk_end
+
+    # The pending events may already be in the history so they are sent
+    # only if they are newer than the last state sent for the entity.
+    # There is no await from here on so no event can be missed.
+    live = True
+    for event in pending_events:
+        _forward_state_event(event)
+    pending_events.clear()
+
+
 class HistoryPeriodView(HomeAssistantView):
     """Handle history period requests."""
 
@@ -1,7 +1,8 @@
 """Event parser and human readable log generator."""
 from __future__ import annotations
 
-from collections.abc import Callable, Generator
+import asyncio
+from collections.abc import Callable, Generator, Iterable, MutableMapping
 from contextlib import suppress
 from datetime import datetime as dt, timedelta
 from http import HTTPStatus
@@ -11,6 +12,7 @@ import re
 from typing import Any, cast
 
 from aiohttp import web
+from lru import LRU  # pylint: disable=no-name-in-module
 from sqlalchemy.engine.row import Row
 from sqlalchemy.orm.query import Query
 import voluptuous as vol
@@ -24,6 +26,8 @@ from homeassistant.components.recorder.filters import (
     sqlalchemy_filter_from_include_exclude_conf,
 )
 from homeassistant.components.recorder.models import (
+    bytes_to_ulid_or_none,
+    bytes_to_uuid_hex_or_none,
     process_datetime_to_timestamp,
     process_timestamp_to_utc_isoformat,
 )
@@ -36,16 +40,20 @@ from homeassistant.const import (
     ATTR_DOMAIN,
     ATTR_ENTITY_ID,
     ATTR_FRIENDLY_NAME,
+    ATTR_ICON,
     ATTR_NAME,
     ATTR_SERVICE,
+    ATTR_UNIT_OF_MEASUREMENT,
     EVENT_CALL_SERVICE,
     EVENT_LOGBOOK_ENTRY,
+    EVENT_STATE_CHANGED,
 )
 from homeassistant.core import (
     Context,
     Event,
     HomeAssistant,
     ServiceCall,
+    State,
     callback,
     split_entity_id,
 )
@@ -60,11 +68,16 @@ from homeassistant.helpers.entityfilter import (
 from homeassistant.helpers.integration_platform import (
     async_process_integration_platforms,
 )
+from homeassistant.helpers.json import json_dumps_compatible
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.loader import bind_hass
 import homeassistant.util.dt as dt_util
 
-from .queries import PSUEDO_EVENT_STATE_CHANGED, statement_for_request
+from .queries import (
+    CONTINUOUS_DOMAINS,
+    PSUEDO_EVENT_STATE_CHANGED,
+    statement_for_request,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -112,6 +125,19 @@ LOG_MESSAGE_SCHEMA = vol.Schema(
 LOGBOOK_FILTERS = "logbook_filters"
 LOGBOOK_ENTITIES_FILTER = "entities_filter"
 
+# The event stream only backfills this far into the past
+# and sends the backfill in batches of this size so the
+# frontend can render the most recent entries while the
+# older ones are still being fetched.
+STREAM_MAX_BACKFILL = timedelta(days=1)
+STREAM_BACKFILL_BATCH_SIZE = timedelta(hours=1)
+# Contexts are kept around to augment live events
+# with the event or state change that caused them
+STREAM_CONTEXT_LOOKUP_SIZE = 1024
+# How long the event stream waits for the recorder to commit
+# the queued events before giving up
+STREAM_RECORDER_SYNC_TIMEOUT = 10
+
 
 @bind_hass
 def log_entry(
@@ -184,6 +210,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
 
     hass.http.register_view(LogbookView(conf, filters, entities_filter))
     websocket_api.async_register_command(hass, ws_get_events)
+    websocket_api.async_register_command(hass, ws_event_stream)
 
     hass.services.async_register(DOMAIN, "log", log_message, schema=LOG_MESSAGE_SCHEMA)
 
@@ -292,6 +319,205 @@ async def ws_get_events(
     )
 
 
+def _ws_stream_backfill_batch(
+    hass: HomeAssistant,
+    msg_id: int,
+    start_time: dt,
+    end_time: dt | None,
+    entity_ids: list[str] | None,
+    filters: Filters | None,
+    entities_filter: EntityFilter | Callable[[str], bool] | None,
+) -> tuple[str, set[tuple[Any, ...]]]:
+    """Fetch a batch of the event stream backfill and convert it to json.
+
+    An end_time of None is the final batch that ends at the current time.
+
+    Returns the json and the identities of the rows in the batch.
+    """
+    row_identities: set[tuple[Any, ...]] = set()
+    events = _get_events(
+        hass,
+        start_time,
+        end_time or dt_util.utcnow(),
+        entity_ids,
+        filters,
+        entities_filter,
+        None,
+        True,
+        False,
+        row_identities,
+    )
+    return (
+        JSON_DUMP(
+            messages.event_message(
+                msg_id,
+                {
+                    "events": events,
+                    "start_time": process_datetime_to_timestamp(start_time),
+                    "end_time": end_time and process_datetime_to_timestamp(end_time),
+                },
+            )
+        ),
+        row_identities,
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "logbook/event_stream",
+        vol.Required("start_time"): str,
+        vol.Optional("entity_ids"): [str],
+    }
+)
+@websocket_api.async_response
+async def ws_event_stream(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Handle logbook event stream websocket command.
+
+    The entries since start_time are sent first in batches, bounded
+    by STREAM_MAX_BACKFILL, and new entries are sent as they happen.
+    """
+    msg_id: int = msg["id"]
+    utc_now = dt_util.utcnow()
+
+    if start_time := dt_util.parse_datetime(msg["start_time"]):
+        start_time = max(dt_util.as_utc(start_time), utc_now - STREAM_MAX_BACKFILL)
+    else:
+        connection.send_error(msg_id, "invalid_start_time", "Invalid start_time")
+        return
+
+    entity_ids: list[str] | None = msg.get("entity_ids")
+    filters: Filters | None = hass.data[LOGBOOK_FILTERS]
+    entities_filter: EntityFilter | Callable[[str], bool] | None = hass.data[
+        LOGBOOK_ENTITIES_FILTER
+    ]
+    if entity_ids:
+        live_entities_filter = generate_filter([], entity_ids, [], [])
+    else:
+        live_entities_filter = entities_filter
+    external_events: dict[
+        str, tuple[str, Callable[[LazyEventPartialState], dict[str, Any]]]
+    ] = hass.data[DOMAIN]
+    entity_name_cache = EntityNameCache(hass)
+    ent_reg = er.async_get(hass)
+    context_lookup: LRU = LRU(STREAM_CONTEXT_LOOKUP_SIZE)
+    continuous_sensors: dict[str, bool] = {}
+    pending: list[EventAsRow] | None = []
+    subscribed = True
+
+    @callback
+    def _async_send_rows(rows: list[EventAsRow]) -> None:
+        """Humanify rows and send the entries."""
+        if events := list(
+            _humanify(
+                rows,
+                live_entities_filter,
+                ent_reg,
+                external_events,
+                entity_name_cache,
+                _row_time_fired_timestamp,
+                False,
+                context_lookup,
+                continuous_sensors,
+            )
+        ):
+            connection.send_message(messages.event_message(msg_id, {"events": events}))
+
+    @callback
+    def _async_forward_event(event: Event) -> None:
+        """Forward a live event, or hold it until the backfill is sent."""
+        if (row := _async_event_to_row(event, live_entities_filter)) is None:
+            return
+        if pending is not None:
+            pending.append(row)
+            return
+        _async_send_rows([row])
+
+    # The listeners are added before the backfill is fetched
+    # so no entries are missed between the backfill and the
+    # live events
+    unsubs = [
+        hass.bus.async_listen(event_type, _async_forward_event)
+        for event_type in (
+            EVENT_STATE_CHANGED,
+            *ALL_EVENT_TYPES_EXCEPT_STATE_CHANGED,
+            *external_events,
+        )
+    ]
+
+    @callback
+    def _async_unsubscribe() -> None:
+        """Remove the listeners."""
+        nonlocal subscribed
+        subscribed = False
+        for unsub in unsubs:
+            unsub()
+
+    connection.subscriptions[msg_id] = _async_unsubscribe
+
+    instance = get_instance(hass)
+    # Make sure everything that has already happened
+    # has been written to the database
+    if instance.recording:
+        try:
+            await asyncio.wait_for(
+                instance.async_block_till_done(), STREAM_RECORDER_SYNC_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            if connection.subscriptions.pop(msg_id, None) is not None:
+                _async_unsubscribe()
+            connection.send_error(
+                msg_id,
+                "recorder_timeout",
+                "The recorder did not commit the queued events in time",
+            )
+            return
+    if not subscribed:
+        return
+    connection.send_result(msg_id)
+
+    backfilled: set[tuple[Any, ...]] = set()
+    batch_start = start_time
+    while subscribed:
+        batch_end: dt | None = batch_start + STREAM_BACKFILL_BATCH_SIZE
+        if batch_end >= utc_now:
+            batch_end = None
+        response, row_identities = await instance.async_add_executor_job(
+            _ws_stream_backfill_batch,
+            hass,
+            msg_id,
+            batch_start,
+            batch_end,
+            entity_ids,
+            filters,
+            entities_filter,
+        )
+        if not subscribed:
+            return
+        connection.send_message(response)
+        if batch_end is None:
+            # The events fired while the backfill was fetched
+            # can only be in the final batch
+            backfilled = row_identities
+            break
+        batch_start = batch_end
+
+    if not subscribed:
+        return
+
+    # Events that were fired while the backfill was being
+    # fetched are only sent if they were not in the backfill
+    assert pending is not None
+    held_rows = pending
+    pending = None
+    for row in held_rows:
+        if _row_identity(row) in backfilled:
+            # Still needed to link the context of later events
+            row.context_only = True
+    _async_send_rows(held_rows)
+
+
 class LogbookView(HomeAssistantView):
     """Handle logbook view requests."""
 
@@ -376,7 +602,7 @@ class LogbookView(HomeAssistantView):
 
 
 def _humanify(
-    rows: Generator[Row, None, None],
+    rows: Iterable[Row],
     entities_filter: EntityFilter | Callable[[str], bool] | None,
     ent_reg: er.EntityRegistry,
     external_events: dict[
@@ -385,12 +611,20 @@ def _humanify(
     entity_name_cache: EntityNameCache,
     format_time: Callable[[Row], Any],
     include_entity_name: bool = True,
+    context_lookup: MutableMapping[str | bytes | None, Row | None] | None = None,
+    continuous_sensors: dict[str, bool] | None = None,
 ) -> Generator[dict[str, Any], None, None]:
-    """Generate a converted list of events into entries."""
+    """Generate a converted list of events into entries.
+
+    The context_lookup and continuous_sensors can be passed
+    in to keep them between calls when streaming events.
+    """
     # Continuous sensors, will be excluded from the logbook
-    continuous_sensors: dict[str, bool] = {}
+    if continuous_sensors is None:
+        continuous_sensors = {}
+    if context_lookup is None:
+        context_lookup = {None: None}
     event_data_cache: dict[str, dict[str, Any]] = {}
-    context_lookup: dict[str | None, Row | None] = {None: None}
     event_cache = EventCache(event_data_cache)
     context_augmenter = ContextAugmenter(
         context_lookup, entity_name_cache, external_events, event_cache
@@ -413,7 +647,7 @@ def _humanify(
 
     # Process rows
     for row in rows:
-        context_id = row.context_id
+        context_id = row.context_id_bin or row.context_id
         context_lookup.setdefault(context_id, row)
         if row.context_only:
             continue
@@ -489,8 +723,13 @@ def _get_events(
     context_id: str | None = None,
     timestamp: bool = False,
     include_entity_name: bool = True,
+    row_identities: set[tuple[Any, ...]] | None = None,
 ) -> list[dict[str, Any]]:
-    """Get events for a period of time."""
+    """Get events for a period of time.
+
+    The identities of the rows that are not context only are
+    added to row_identities when it is passed.
+    """
     assert not (
         entity_ids and context_id
     ), "can't pass in both entity_ids and context_id"
@@ -525,18 +764,36 @@ def _get_events(
         return query.yield_per(1024)  # type: ignore[no-any-return]
 
     stmt = statement_for_request(
-        start_day, end_day, event_types, entity_ids, filters, context_id
+        get_instance(hass).schema_version,
+        start_day,
+        end_day,
+        event_types,
+        entity_ids,
+        filters,
+        context_id,
     )
     if _LOGGER.isEnabledFor(logging.DEBUG):
-        _LOGGER.debug(
-            "Literal statement: %s",
-            stmt.compile(compile_kwargs={"literal_binds": True}),
-        )
+        # Binary context ids cannot be rendered as literals
+        # so the parameters are logged next to the statement
+        compiled = stmt.compile()
+        _LOGGER.debug("Statement: %s, params: %s", compiled, compiled.params)
+
+    def collect_row_identities(
+        rows: Iterable[Row], identities: set[tuple[Any, ...]]
+    ) -> Generator[Row, None, None]:
+        """Add the identities of the rows as they are processed."""
+        for row in rows:
+            if not row.context_only:
+                identities.add(_row_identity(row))
+            yield row
 
     with session_scope(hass=hass) as session:
+        rows: Iterable[Row] = yield_rows(session.execute(stmt))
+        if row_identities is not None:
+            rows = collect_row_identities(rows, row_identities)
         return list(
             _humanify(
-                yield_rows(session.execute(stmt)),
+                rows,
                 entities_filter,
                 ent_reg,
                 external_events,
@@ -552,7 +809,7 @@ class ContextAugmenter:
 
     def __init__(
         self,
-        context_lookup: dict[str | None, Row | None],
+        context_lookup: MutableMapping[str | bytes | None, Row | None],
         entity_name_cache: EntityNameCache,
         external_events: dict[
             str, tuple[str, Callable[[LazyEventPartialState], dict[str, Any]]]
@@ -566,10 +823,16 @@ class ContextAugmenter:
         self.event_cache = event_cache
 
     def augment(
-        self, data: dict[str, Any], row: Row, context_id: str, include_entity_name: bool
+        self,
+        data: dict[str, Any],
+        row: Row,
+        context_id: str | bytes,
+        include_entity_name: bool,
     ) -> None:
         """Augment data from the row and cache."""
-        if context_user_id := row.context_user_id:
+        if context_user_id := (
+            bytes_to_uuid_hex_or_none(row.context_user_id_bin) or row.context_user_id
+        ):
             data[CONTEXT_USER_ID] = context_user_id
 
         if not (context_row := self.context_lookup.get(context_id)):
@@ -579,9 +842,11 @@ class ContextAugmenter:
             # This is the first event with the given ID. Was it directly caused by
             # a parent event?
             if (
-                not row.context_parent_id
-                or (context_row := self.context_lookup.get(row.context_parent_id))
-                is None
+                not (
+                    context_parent_id := row.context_parent_id_bin
+                    or row.context_parent_id
+                )
+                or (context_row := self.context_lookup.get(context_parent_id)) is None
             ):
                 return
             # Ensure the (parent) context_event exists and is not the root cause of
@@ -635,7 +900,7 @@ def _is_sensor_continuous(ent_reg: er.EntityRegistry, entity_id: str) -> bool:
     """Determine if a sensor is continuous by checking its state class.
 
     Sensors with a unit_of_measurement are also considered continuous, but are filtered
-    already by the SQL query generated by _get_events
+    already by the SQL query generated by _get_events or by _async_event_to_row
     """
     if not (entry := ent_reg.async_get(entity_id)):
         # Entity not registered, so can't have a state class
@@ -646,10 +911,11 @@ def _is_sensor_continuous(ent_reg: er.EntityRegistry, entity_id: str) -> bool:
     )
 
 
-def _rows_match(row: Row, other_row: Row) -> bool:
+def _rows_match(row: Row | EventAsRow, other_row: Row | EventAsRow) -> bool:
     """Check of rows match by using the same method as Events __hash__."""
     if (
-        (state_id := row.state_id) is not None
+        row is other_row
+        or (state_id := row.state_id) is not None
         and state_id == other_row.state_id
         or (event_id := row.event_id) is not None
         and event_id == other_row.event_id
@@ -658,6 +924,21 @@ def _rows_match(row: Row, other_row: Row) -> bool:
     return False
 
 
+def _row_identity(row: Row | EventAsRow) -> tuple[Any, ...]:
+    """Return the identity of a row.
+
+    Unlike _rows_match this does not need the database ids
+    so a live row has the same identity as the recorded row.
+    """
+    return (
+        row.event_type,
+        row.entity_id,
+        row.state,
+        bytes_to_ulid_or_none(row.context_id_bin) or row.context_id,
+        _row_time_fired_timestamp(row),
+    )
+
+
 def _row_event_data_extract(row: Row, extractor: re.Pattern) -> str | None:
     """Extract from event_data row."""
     result = extractor.search(row.shared_data or row.event_data or "")
@@ -708,9 +989,17 @@ class LazyEventPartialState:
         self.event_type: str = self.row.event_type
         self.entity_id: str | None = self.row.entity_id
         self.state = self.row.state
-        self.context_id: str | None = self.row.context_id
-        self.context_user_id: str | None = self.row.context_user_id
-        self.context_parent_id: str | None = self.row.context_parent_id
+        self.context_id: str | None = (
+            bytes_to_ulid_or_none(self.row.context_id_bin) or self.row.context_id
+        )
+        self.context_user_id: str | None = (
+            bytes_to_uuid_hex_or_none(self.row.context_user_id_bin)
+            or self.row.context_user_id
+        )
+        self.context_parent_id: str | None = (
+            bytes_to_ulid_or_none(self.row.context_parent_id_bin)
+            or self.row.context_parent_id
+        )
         source: str = self.row.shared_data or self.row.event_data
         if not source:
             self.data = {}
@@ -722,6 +1011,105 @@ class LazyEventPartialState:
             )
 
 
+class EventAsRow:
+    """Convert a live event to the row format used by _humanify."""
+
+    __slots__ = [
+        "event_type",
+        "event_data",
+        "shared_data",
+        "time_fired",
+        "context_id",
+        "context_user_id",
+        "context_parent_id",
+        "context_id_bin",
+        "context_user_id_bin",
+        "context_parent_id_bin",
+        "event_id",
+        "state_id",
+        "state",
+        "entity_id",
+        "icon",
+        "old_format_icon",
+        "context_only",
+    ]
+
+    def __init__(
+        self,
+        event: Event,
+        event_type: str | None,
+        shared_data: str | None,
+        time_fired: dt,
+        new_state: State | None = None,
+        context_only: bool = False,
+    ) -> None:
+        """Init the row from the event."""
+        context = event.context
+        self.event_type = event_type
+        self.event_data: str | None = None
+        self.shared_data = shared_data
+        self.time_fired = time_fired
+        self.context_id = context.id
+        self.context_user_id = context.user_id
+        self.context_parent_id = context.parent_id
+        self.context_id_bin: bytes | None = None
+        self.context_user_id_bin: bytes | None = None
+        self.context_parent_id_bin: bytes | None = None
+        # Live rows are matched by identity in _rows_match
+        self.event_id: int | None = None
+        self.state_id: int | None = None
+        self.state = new_state.state if new_state else None
+        self.entity_id = new_state.entity_id if new_state else None
+        self.icon = new_state.attributes.get(ATTR_ICON) if new_state else None
+        self.old_format_icon: str | None = None
+        self.context_only = context_only
+
+
+@callback
+def _async_event_to_row(
+    event: Event, entities_filter: EntityFilter | Callable[[str], bool] | None
+) -> EventAsRow | None:
+    """Convert a live event to a row.
+
+    State changes are filtered in memory the same way the
+    logbook queries filter them in sql, the continuous sensors
+    without a unit_of_measurement are filtered in _humanify.
+    """
+    if event.event_type != EVENT_STATE_CHANGED:
+        return EventAsRow(
+            event,
+            event.event_type,
+            json_dumps_compatible(event.data),
+            event.time_fired,
+        )
+
+    old_state: State | None = event.data.get("old_state")
+    new_state: State | None = event.data.get("new_state")
+    if (
+        old_state is None
+        or new_state is None
+        or new_state.state == old_state.state
+        or new_state.last_changed != new_state.last_updated
+    ):
+        return None
+    entity_id = new_state.entity_id
+    if (
+        new_state.domain in CONTINUOUS_DOMAINS
+        and ATTR_UNIT_OF_MEASUREMENT in new_state.attributes
+    ):
+        return None
+    # State changes of entities that are filtered away are
+    # still needed to link the context of the events they caused
+    return EventAsRow(
+        event,
+        PSUEDO_EVENT_STATE_CHANGED,
+        None,
+        new_state.last_updated,
+        new_state,
+        entities_filter is not None and not entities_filter(entity_id),
+    )
+
+
 class EntityNameCache:
     """A cache to lookup the name for an entity.
 
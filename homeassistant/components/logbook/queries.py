@@ -5,12 +5,12 @@ from collections.abc import Iterable
 from datetime import datetime as dt
 
 import sqlalchemy
-from sqlalchemy import JSON, lambda_stmt, select, type_coerce, union_all
+from sqlalchemy import JSON, Column, lambda_stmt, select, type_coerce, union_all
 from sqlalchemy.orm import Query, aliased
 from sqlalchemy.sql.elements import ClauseList
 from sqlalchemy.sql.expression import literal
 from sqlalchemy.sql.lambdas import StatementLambdaElement
-from sqlalchemy.sql.selectable import Select
+from sqlalchemy.sql.selectable import CTE, Select
 
 from homeassistant.components.proximity import DOMAIN as PROXIMITY_DOMAIN
 from homeassistant.components.recorder.filters import Filters
@@ -18,10 +18,14 @@ from homeassistant.components.recorder.models import (
     ENTITY_ID_LAST_UPDATED_INDEX,
     JSON_VARIENT_CAST,
     LAST_UPDATED_INDEX,
+    METADATA_ID_LAST_UPDATED_INDEX,
     EventData,
     Events,
     StateAttributes,
     States,
+    StatesMeta,
+    states_entity_id_column,
+    ulid_to_bytes_or_none,
 )
 from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
 
@@ -60,15 +64,21 @@ EVENT_COLUMNS = (
     Events.context_id.label("context_id"),
     Events.context_user_id.label("context_user_id"),
     Events.context_parent_id.label("context_parent_id"),
+    Events.context_id_bin.label("context_id_bin"),
+    Events.context_user_id_bin.label("context_user_id_bin"),
+    Events.context_parent_id_bin.label("context_parent_id_bin"),
 )
 
-STATE_COLUMNS = (
-    States.state_id.label("state_id"),
-    States.state.label("state"),
-    States.entity_id.label("entity_id"),
-    SHARED_ATTRS_JSON["icon"].as_string().label("icon"),
-    OLD_FORMAT_ATTRS_JSON["icon"].as_string().label("old_format_icon"),
-)
+
+def _state_columns(entity_id_column: Column) -> tuple[Column, ...]:
+    """Return the state columns with the entity_id from the entity_id column."""
+    return (
+        States.state_id.label("state_id"),
+        States.state.label("state"),
+        entity_id_column.label("entity_id"),
+        SHARED_ATTRS_JSON["icon"].as_string().label("icon"),
+        OLD_FORMAT_ATTRS_JSON["icon"].as_string().label("old_format_icon"),
+    )
 
 
 EMPTY_STATE_COLUMNS = (
@@ -93,6 +103,7 @@ NOT_CONTEXT_ONLY = literal(None).label("context_only")
 
 
 def statement_for_request(
+    schema_version: int,
     start_day: dt,
     end_day: dt,
     event_types: tuple[str, ...],
@@ -101,12 +112,15 @@ def statement_for_request(
     context_id: str | None = None,
 ) -> StatementLambdaElement:
     """Generate the logbook statement for a logbook request."""
+    entity_id_column = states_entity_id_column(schema_version)
 
     # No entities: logbook sends everything for the timeframe
     # limited by the context_id and the yaml configured filter
     if not entity_ids:
-        entity_filter = filters.entity_filter() if filters else None
-        return _all_stmt(start_day, end_day, event_types, entity_filter, context_id)
+        entity_filter = filters.entity_filter(entity_id_column) if filters else None
+        return _all_stmt(
+            start_day, end_day, event_types, entity_id_column, entity_filter, context_id
+        )
 
     # Multiple entities: logbook sends everything for the timeframe for the entities
     #
@@ -114,12 +128,16 @@ def statement_for_request(
     # like matching which means part of the query has to be built each
     # time when the entity_ids are not in the cache
     if len(entity_ids) > 1:
-        return _entities_stmt(start_day, end_day, event_types, entity_ids)
+        return _entities_stmt(
+            start_day, end_day, event_types, entity_id_column, entity_ids
+        )
 
     # Single entity: logbook sends everything for the timeframe for the entity
     entity_id = entity_ids[0]
     entity_like = ENTITY_ID_JSON_TEMPLATE.format(entity_id)
-    return _single_entity_stmt(start_day, end_day, event_types, entity_id, entity_like)
+    return _single_entity_stmt(
+        start_day, end_day, event_types, entity_id_column, entity_id, entity_like
+    )
 
 
 def _select_events_context_id_subquery(
@@ -129,7 +147,7 @@ def _select_events_context_id_subquery(
 ) -> Select:
     """Generate the select for a context_id subquery."""
     return (
-        select(Events.context_id)
+        select(Events.context_id_bin, Events.context_id)
         .where((Events.time_fired > start_day) & (Events.time_fired < end_day))
         .where(Events.event_type.in_(event_types))
         .outerjoin(EventData, (Events.data_id == EventData.data_id))
@@ -140,19 +158,34 @@ def _select_entities_context_ids_sub_query(
     start_day: dt,
     end_day: dt,
     event_types: tuple[str, ...],
+    entity_id_column: Column,
     entity_ids: list[str],
-) -> Select:
+) -> CTE:
     """Generate a subquery to find context ids for multiple entities."""
-    return select(
-        union_all(
-            _select_events_context_id_subquery(start_day, end_day, event_types).where(
-                _apply_event_entity_id_matchers(entity_ids)
+    return union_all(
+        _select_events_context_id_subquery(start_day, end_day, event_types).where(
+            _apply_event_entity_id_matchers(entity_ids)
+        ),
+        _apply_entities_hints(
+            _select_states_meta(
+                entity_id_column, States.context_id_bin, States.context_id
             ),
-            _apply_entities_hints(select(States.context_id))
-            .filter((States.last_updated > start_day) & (States.last_updated < end_day))
-            .where(States.entity_id.in_(entity_ids)),
-        ).c.context_id
-    )
+            entity_id_column,
+        )
+        .filter((States.last_updated > start_day) & (States.last_updated < end_day))
+        .where(entity_id_column.in_(entity_ids)),
+    ).cte("context_ids")
+
+
+def _context_ids_matcher(context_ids: CTE) -> ClauseList:
+    """Match the events by the binary or the string context ids.
+
+    Context ids that cannot be stored in the binary
+    columns are only found in the string columns.
+    """
+    return Events.context_id_bin.in_(
+        select(context_ids.c.context_id_bin)
+    ) | Events.context_id.in_(select(context_ids.c.context_id))
 
 
 def _select_events_context_only() -> Select:
@@ -170,6 +203,7 @@ def _entities_stmt(
     start_day: dt,
     end_day: dt,
     event_types: tuple[str, ...],
+    entity_id_column: Column,
     entity_ids: list[str],
 ) -> StatementLambdaElement:
     """Generate a logbook query for multiple entities."""
@@ -178,13 +212,16 @@ def _entities_stmt(
     )
     stmt = stmt.add_criteria(
         lambda s: s.where(_apply_event_entity_id_matchers(entity_ids)).union_all(
-            _states_query_for_entity_ids(start_day, end_day, entity_ids),
+            _states_query_for_entity_ids(
+                start_day, end_day, entity_id_column, entity_ids
+            ),
             _select_events_context_only().where(
-                Events.context_id.in_(
+                _context_ids_matcher(
                     _select_entities_context_ids_sub_query(
                         start_day,
                         end_day,
                         event_types,
+                        entity_id_column,
                         entity_ids,
                     )
                 )
@@ -194,7 +231,7 @@ def _entities_stmt(
         # like statements we need to use the entity_ids in the
         # the cache key since the sql can change based on the
         # likes.
-        track_on=(str(entity_ids),),
+        track_on=(str(entity_ids), entity_id_column),
     )
     stmt += lambda s: s.order_by(Events.time_fired)
     return stmt
@@ -204,27 +241,32 @@ def _select_entity_context_ids_sub_query(
     start_day: dt,
     end_day: dt,
     event_types: tuple[str, ...],
+    entity_id_column: Column,
     entity_id: str,
     entity_id_like: str,
-) -> Select:
+) -> CTE:
     """Generate a subquery to find context ids for a single entity."""
-    return select(
-        union_all(
-            _select_events_context_id_subquery(start_day, end_day, event_types).where(
-                Events.event_data.like(entity_id_like)
-                | EventData.shared_data.like(entity_id_like)
+    return union_all(
+        _select_events_context_id_subquery(start_day, end_day, event_types).where(
+            Events.event_data.like(entity_id_like)
+            | EventData.shared_data.like(entity_id_like)
+        ),
+        _apply_entities_hints(
+            _select_states_meta(
+                entity_id_column, States.context_id_bin, States.context_id
             ),
-            _apply_entities_hints(select(States.context_id))
-            .filter((States.last_updated > start_day) & (States.last_updated < end_day))
-            .where(States.entity_id == entity_id),
-        ).c.context_id
-    )
+            entity_id_column,
+        )
+        .filter((States.last_updated > start_day) & (States.last_updated < end_day))
+        .where(entity_id_column == entity_id),
+    ).cte("context_ids")
 
 
 def _single_entity_stmt(
     start_day: dt,
     end_day: dt,
     event_types: tuple[str, ...],
+    entity_id_column: Column,
     entity_id: str,
     entity_id_like: str,
 ) -> StatementLambdaElement:
@@ -236,11 +278,18 @@ def _single_entity_stmt(
             | EventData.shared_data.like(entity_id_like)
         )
         .union_all(
-            _states_query_for_entity_id(start_day, end_day, entity_id),
+            _states_query_for_entity_id(
+                start_day, end_day, entity_id_column, entity_id
+            ),
             _select_events_context_only().where(
-                Events.context_id.in_(
+                _context_ids_matcher(
                     _select_entity_context_ids_sub_query(
-                        start_day, end_day, event_types, entity_id, entity_id_like
+                        start_day,
+                        end_day,
+                        event_types,
+                        entity_id_column,
+                        entity_id,
+                        entity_id_like,
                     )
                 )
             ),
@@ -254,6 +303,7 @@ def _all_stmt(
     start_day: dt,
     end_day: dt,
     event_types: tuple[str, ...],
+    entity_id_column: Column,
     entity_filter: ClauseList | None = None,
     context_id: str | None = None,
 ) -> StatementLambdaElement:
@@ -261,46 +311,67 @@ def _all_stmt(
     stmt = lambda_stmt(
         lambda: _select_events_without_states(start_day, end_day, event_types)
     )
-    if context_id is not None:
+    if context_id is not None and (context_id_bin := ulid_to_bytes_or_none(context_id)):
         # Once all the old `state_changed` events
         # are gone from the database remove the
-        # _legacy_select_events_context_id()
+        # _legacy_select_events_context()
+        stmt += lambda s: s.where(Events.context_id_bin == context_id_bin).union_all(
+            _states_query_for_context(start_day, end_day, entity_id_column).where(
+                States.context_id_bin == context_id_bin
+            ),
+            _legacy_select_events_context(start_day, end_day, entity_id_column).where(
+                Events.context_id_bin == context_id_bin
+            ),
+        )
+    elif context_id is not None:
+        # Context ids that are not ULIDs are stored
+        # in the string context_id columns
         stmt += lambda s: s.where(Events.context_id == context_id).union_all(
-            _states_query_for_context_id(start_day, end_day, context_id),
-            _legacy_select_events_context_id(start_day, end_day, context_id),
+            _states_query_for_context(start_day, end_day, entity_id_column).where(
+                States.context_id == context_id
+            ),
+            _legacy_select_events_context(start_day, end_day, entity_id_column).where(
+                Events.context_id == context_id
+            ),
         )
     elif entity_filter is not None:
         stmt += lambda s: s.union_all(
-            _states_query_for_all(start_day, end_day).where(entity_filter)
+            _states_query_for_all(start_day, end_day, entity_id_column).where(
+                entity_filter
+            )
         )
     else:
-        stmt += lambda s: s.union_all(_states_query_for_all(start_day, end_day))
+        stmt += lambda s: s.union_all(
+            _states_query_for_all(start_day, end_day, entity_id_column)
+        )
     stmt += lambda s: s.order_by(Events.time_fired)
     return stmt
 
 
-def _legacy_select_events_context_id(
-    start_day: dt, end_day: dt, context_id: str
+def _legacy_select_events_context(
+    start_day: dt, end_day: dt, entity_id_column: Column
 ) -> Select:
-    """Generate a legacy events context id select that also joins states."""
+    """Generate a legacy events select for a context that also joins states."""
     # This can be removed once we no longer have event_ids in the states table
-    return (
-        select(
-            *EVENT_COLUMNS,
-            literal(value=None, type_=sqlalchemy.String).label("shared_data"),
-            *STATE_COLUMNS,
-            NOT_CONTEXT_ONLY,
+    query = select(
+        *EVENT_COLUMNS,
+        literal(value=None, type_=sqlalchemy.String).label("shared_data"),
+        *_state_columns(entity_id_column),
+        NOT_CONTEXT_ONLY,
+    ).outerjoin(States, (Events.event_id == States.event_id))
+    if entity_id_column is StatesMeta.entity_id:
+        query = query.outerjoin(
+            StatesMeta, (States.metadata_id == StatesMeta.metadata_id)
         )
-        .outerjoin(States, (Events.event_id == States.event_id))
-        .where(
+    return (
+        query.where(
             (States.last_updated == States.last_changed) | States.last_changed.is_(None)
         )
-        .where(_not_continuous_entity_matcher())
+        .where(_not_continuous_entity_matcher(entity_id_column))
         .outerjoin(
             StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
         )
         .where((Events.time_fired > start_day) & (Events.time_fired < end_day))
-        .where(Events.context_id == context_id)
     )
 
 
@@ -316,33 +387,50 @@ def _select_events_without_states(
     )
 
 
-def _states_query_for_context_id(start_day: dt, end_day: dt, context_id: str) -> Query:
-    return _apply_states_filters(_select_states(), start_day, end_day).where(
-        States.context_id == context_id
+def _states_query_for_context(
+    start_day: dt, end_day: dt, entity_id_column: Column
+) -> Query:
+    return _apply_states_filters(
+        _select_states(entity_id_column), start_day, end_day, entity_id_column
     )
 
 
-def _states_query_for_entity_id(start_day: dt, end_day: dt, entity_id: str) -> Query:
+def _states_query_for_entity_id(
+    start_day: dt, end_day: dt, entity_id_column: Column, entity_id: str
+) -> Query:
     return _apply_states_filters(
-        _apply_entities_hints(_select_states()), start_day, end_day
-    ).where(States.entity_id == entity_id)
+        _apply_entities_hints(_select_states(entity_id_column), entity_id_column),
+        start_day,
+        end_day,
+        entity_id_column,
+    ).where(entity_id_column == entity_id)
 
 
 def _states_query_for_entity_ids(
-    start_day: dt, end_day: dt, entity_ids: list[str]
+    start_day: dt, end_day: dt, entity_id_column: Column, entity_ids: list[str]
 ) -> Query:
     return _apply_states_filters(
-        _apply_entities_hints(_select_states()), start_day, end_day
-    ).where(States.entity_id.in_(entity_ids))
+        _apply_entities_hints(_select_states(entity_id_column), entity_id_column),
+        start_day,
+        end_day,
+        entity_id_column,
+    ).where(entity_id_column.in_(entity_ids))
 
 
-def _states_query_for_all(start_day: dt, end_day: dt) -> Query:
-    return _apply_states_filters(_apply_all_hints(_select_states()), start_day, end_day)
+def _states_query_for_all(
+    start_day: dt, end_day: dt, entity_id_column: Column
+) -> Query:
+    return _apply_states_filters(
+        _apply_all_hints(_select_states(entity_id_column)),
+        start_day,
+        end_day,
+        entity_id_column,
+    )
 
 
-def _select_states() -> Select:
+def _select_states(entity_id_column: Column) -> Select:
     """Generate a states select that formats the states table as event rows."""
-    return select(
+    query = select(
         literal(value=None, type_=sqlalchemy.Text).label("event_id"),
         # We use PSUEDO_EVENT_STATE_CHANGED aka None for
         # state_changed events since it takes up less
@@ -356,10 +444,25 @@ def _select_states() -> Select:
         States.context_id.label("context_id"),
         States.context_user_id.label("context_user_id"),
         States.context_parent_id.label("context_parent_id"),
+        States.context_id_bin.label("context_id_bin"),
+        States.context_user_id_bin.label("context_user_id_bin"),
+        States.context_parent_id_bin.label("context_parent_id_bin"),
         literal(value=None, type_=sqlalchemy.Text).label("shared_data"),
-        *STATE_COLUMNS,
+        *_state_columns(entity_id_column),
         NOT_CONTEXT_ONLY,
     )
+    if entity_id_column is StatesMeta.entity_id:
+        return query.join(StatesMeta, (States.metadata_id == StatesMeta.metadata_id))
+    return query
+
+
+def _select_states_meta(entity_id_column: Column, *columns: Column) -> Select:
+    """Generate a states select joined to states_meta to match on entity_id."""
+    if entity_id_column is StatesMeta.entity_id:
+        return select(*columns).join(
+            StatesMeta, (States.metadata_id == StatesMeta.metadata_id)
+        )
+    return select(*columns)
 
 
 def _apply_all_hints(query: Query) -> Query:
@@ -369,21 +472,29 @@ def _apply_all_hints(query: Query) -> Query:
     )
 
 
-def _apply_entities_hints(query: Query) -> Query:
+def _apply_entities_hints(query: Query, entity_id_column: Column) -> Query:
     """Force mysql to use the right index on large selects."""
+    if entity_id_column is StatesMeta.entity_id:
+        return query.with_hint(
+            States,
+            f"FORCE INDEX ({METADATA_ID_LAST_UPDATED_INDEX})",
+            dialect_name="mysql",
+        )
     return query.with_hint(
         States, f"FORCE INDEX ({ENTITY_ID_LAST_UPDATED_INDEX})", dialect_name="mysql"
     )
 
 
-def _apply_states_filters(query: Query, start_day: dt, end_day: dt) -> Query:
+def _apply_states_filters(
+    query: Query, start_day: dt, end_day: dt, entity_id_column: Column
+) -> Query:
     return (
         query.filter(
             (States.last_updated > start_day) & (States.last_updated < end_day)
         )
         .outerjoin(OLD_STATE, (States.old_state_id == OLD_STATE.state_id))
         .where(_missing_state_matcher())
-        .where(_not_continuous_entity_matcher())
+        .where(_not_continuous_entity_matcher(entity_id_column))
         .where(
             (States.last_updated == States.last_changed) | States.last_changed.is_(None)
         )
@@ -404,31 +515,32 @@ def _missing_state_matcher() -> sqlalchemy.and_:
     )
 
 
-def _not_continuous_entity_matcher() -> sqlalchemy.or_:
+def _not_continuous_entity_matcher(entity_id_column: Column) -> sqlalchemy.or_:
     """Match non continuous entities."""
     return sqlalchemy.or_(
-        _not_continuous_domain_matcher(),
+        _not_continuous_domain_matcher(entity_id_column),
         sqlalchemy.and_(
-            _continuous_domain_matcher, _not_uom_attributes_matcher()
+            _continuous_domain_matcher(entity_id_column),
+            _not_uom_attributes_matcher(),
         ).self_group(),
     )
 
 
-def _not_continuous_domain_matcher() -> sqlalchemy.and_:
+def _not_continuous_domain_matcher(entity_id_column: Column) -> sqlalchemy.and_:
     """Match not continuous domains."""
     return sqlalchemy.and_(
         *[
-            ~States.entity_id.like(entity_domain)
+            ~entity_id_column.like(entity_domain)
             for entity_domain in CONTINUOUS_ENTITY_ID_LIKE
         ],
     ).self_group()
 
 
-def _continuous_domain_matcher() -> sqlalchemy.or_:
+def _continuous_domain_matcher(entity_id_column: Column) -> sqlalchemy.or_:
     """Match continuous domains."""
     return sqlalchemy.or_(
         *[
-            States.entity_id.like(entity_domain)
+            entity_id_column.like(entity_domain)
             for entity_domain in CONTINUOUS_ENTITY_ID_LIKE
         ],
     ).self_group()
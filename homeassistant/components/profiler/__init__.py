@@ -1,6 +1,7 @@
 """The profiler integration."""
 import asyncio
 from datetime import timedelta
+from http import HTTPStatus
 import logging
 import reprlib
 import sys
@@ -9,15 +10,20 @@ import time
 import traceback
 from typing import Any
 
+from aiohttp import web
 import voluptuous as vol
 
-from homeassistant.components import persistent_notification
+from homeassistant.components import http, persistent_notification
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
 from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import Unauthorized
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.entity import async_set_write_timing, async_write_timings
 from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.json import json_bytes
 from homeassistant.helpers.service import async_register_admin_service
+from homeassistant.helpers.startup_trace import async_get_startup_trace
 
 from .const import DOMAIN
 
@@ -28,6 +34,9 @@ SERVICE_STOP_LOG_OBJECTS = "stop_log_objects"
 SERVICE_DUMP_LOG_OBJECTS = "dump_log_objects"
 SERVICE_LOG_THREAD_FRAMES = "log_thread_frames"
 SERVICE_LOG_EVENT_LOOP_SCHEDULED = "log_event_loop_scheduled"
+SERVICE_LOG_EVENT_LISTENER_TIMINGS = "log_event_listener_timings"
+SERVICE_DUMP_STARTUP_TRACE = "dump_startup_trace"
+SERVICE_LOG_ENTITY_WRITE_TIMINGS = "log_entity_write_timings"
 
 
 SERVICES = (
@@ -38,6 +47,9 @@ SERVICES = (
     SERVICE_DUMP_LOG_OBJECTS,
     SERVICE_LOG_THREAD_FRAMES,
     SERVICE_LOG_EVENT_LOOP_SCHEDULED,
+    SERVICE_LOG_EVENT_LISTENER_TIMINGS,
+    SERVICE_DUMP_STARTUP_TRACE,
+    SERVICE_LOG_ENTITY_WRITE_TIMINGS,
 )
 
 DEFAULT_SCAN_INTERVAL = timedelta(seconds=30)
@@ -46,6 +58,11 @@ CONF_SECONDS = "seconds"
 
 LOG_INTERVAL_SUB = "log_interval_subscription"
 
+STARTUP_TRACE_VIEW_REGISTERED = "profiler_startup_trace_view"
+
+MAX_LISTENER_TIMINGS_LOGGED = 25
+MAX_ENTITY_WRITE_TIMINGS_LOGGED = 25
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -58,6 +75,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         async with lock:
             await _async_generate_profile(hass, call)
 
+    async def _async_run_dump_startup_trace(call: ServiceCall) -> None:
+        await _async_dump_startup_trace(hass, call)
+
     async def _async_run_memory_profile(call: ServiceCall) -> None:
         async with lock:
             await _async_generate_memory_profile(hass, call)
@@ -144,6 +164,25 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             arepr.max_string = original_maxstring
             arepr.max_other = original_maxother
 
+    async def _async_log_event_listener_timings(call: ServiceCall) -> None:
+        """Time the event listeners and log the slowest ones."""
+        async with lock:
+            hass.bus.async_set_listener_timing(True)
+            try:
+                await asyncio.sleep(float(call.data[CONF_SECONDS]))
+                timings = hass.bus.async_listener_timings()
+            finally:
+                hass.bus.async_set_listener_timing(False)
+        for timing in timings[:MAX_LISTENER_TIMINGS_LOGGED]:
+            _LOGGER.critical(
+                "Event listener %s for %s: %s calls, %.6fs total, %.6fs max",
+                timing["listener"],
+                timing["event_type"],
+                timing["calls"],
+                timing["total"],
+                timing["max"],
+            )
+
     async_register_admin_service(
         hass,
         DOMAIN,
@@ -207,6 +246,42 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         _async_dump_scheduled,
     )
 
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_LOG_EVENT_LISTENER_TIMINGS,
+        _async_log_event_listener_timings,
+        schema=vol.Schema(
+            {vol.Optional(CONF_SECONDS, default=60.0): vol.Coerce(float)}
+        ),
+    )
+
+    async def _async_run_entity_write_timings(call: ServiceCall) -> None:
+        async with lock:
+            await _async_log_entity_write_timings(hass, call)
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_LOG_ENTITY_WRITE_TIMINGS,
+        _async_run_entity_write_timings,
+        schema=vol.Schema(
+            {vol.Optional(CONF_SECONDS, default=60.0): vol.Coerce(float)}
+        ),
+    )
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_DUMP_STARTUP_TRACE,
+        _async_run_dump_startup_trace,
+    )
+
+    if not hass.data.get(STARTUP_TRACE_VIEW_REGISTERED):
+        # Views can't be removed, so only register once
+        hass.http.register_view(StartupTraceView)
+        hass.data[STARTUP_TRACE_VIEW_REGISTERED] = True
+
     return True
 
 
@@ -251,6 +326,48 @@ async def _async_generate_profile(hass: HomeAssistant, call: ServiceCall):
     )
 
 
+async def _async_log_entity_write_timings(hass: HomeAssistant, call: ServiceCall):
+    """Time the entity state writes and log the slowest entities."""
+    async_set_write_timing(hass, True)
+    try:
+        await asyncio.sleep(float(call.data[CONF_SECONDS]))
+        timings = async_write_timings(hass)
+    finally:
+        async_set_write_timing(hass, False)
+    for timing in timings[:MAX_ENTITY_WRITE_TIMINGS_LOGGED]:
+        _LOGGER.critical(
+            "Entity %s: %s state writes, %.6fs total, %.6fs max",
+            timing["entity_id"],
+            timing["calls"],
+            timing["total"],
+            timing["max"],
+        )
+
+
+async def _async_dump_startup_trace(hass: HomeAssistant, call: ServiceCall):
+    if (trace := async_get_startup_trace(hass)) is None:
+        persistent_notification.async_create(
+            hass,
+            "No startup trace was recorded.",
+            title="Startup trace",
+            notification_id="profiler_startup_trace",
+        )
+        return
+
+    start_time = int(time.time() * 1000000)
+    trace_path = hass.config.path(f"startup_trace.{start_time}.json")
+    await hass.async_add_executor_job(
+        _write_startup_trace, json_bytes(trace.as_dict()), trace_path
+    )
+    persistent_notification.async_create(
+        hass,
+        f"Wrote the startup trace to {trace_path}. Open it in chrome://tracing, "
+        "Perfetto or speedscope.",
+        title="Startup trace",
+        notification_id="profiler_startup_trace",
+    )
+
+
 async def _async_generate_memory_profile(hass: HomeAssistant, call: ServiceCall):
     # Imports deferred to avoid loading modules
     # in memory since usually only one part of this
@@ -290,6 +407,11 @@ def _write_profile(profiler, cprofile_path, callgrind_path):
     convert(profiler.getstats(), callgrind_path)
 
 
+def _write_startup_trace(data: bytes, trace_path: str) -> None:
+    with open(trace_path, "wb") as trace_file:
+        trace_file.write(data)
+
+
 def _write_memory_profile(heap, heap_path):
     heap.byrcs.dump(heap_path)
 
@@ -301,3 +423,25 @@ def _log_objects(*_):
     import objgraph  # pylint: disable=import-outside-toplevel
 
     _LOGGER.critical("Memory Growth: %s", objgraph.growth(limit=100))
+
+
+class StartupTraceView(http.HomeAssistantView):
+    """Download the startup trace."""
+
+    url = "/api/profiler/startup_trace"
+    name = "api:profiler:startup_trace"
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the startup trace in the Chrome trace event format."""
+        if not request["hass_user"].is_admin:
+            raise Unauthorized()
+        hass: HomeAssistant = request.app["hass"]
+        if (trace := async_get_startup_trace(hass)) is None:
+            return self.json_message("No startup trace recorded", HTTPStatus.NOT_FOUND)
+        return web.Response(
+            body=json_bytes(trace.as_dict()),
+            content_type="application/json",
+            headers={
+                "Content-Disposition": 'attachment; filename="startup_trace.json"'
+            },
+        )
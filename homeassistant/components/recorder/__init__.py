@@ -41,6 +41,13 @@ DEFAULT_DB_INTEGRITY_CHECK = True
 DEFAULT_DB_MAX_RETRIES = 10
 DEFAULT_DB_RETRY_WAIT = 3
 DEFAULT_COMMIT_INTERVAL = 1
+# The number of attributes and event data ids to cache in memory
+#
+# Based on:
+# - The number of overlapping attributes
+# - How frequently states with overlapping attributes will change
+# - How much memory our low end hardware has
+DEFAULT_ID_CACHE_SIZE = 2048
 
 CONF_AUTO_PURGE = "auto_purge"
 CONF_AUTO_REPACK = "auto_repack"
@@ -51,6 +58,7 @@ CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_ID_CACHE_SIZE = "id_cache_size"
 
 
 EXCLUDE_SCHEMA = INCLUDE_EXCLUDE_FILTER_SCHEMA_INNER.extend(
@@ -100,6 +108,9 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_DB_INTEGRITY_CHECK, default=DEFAULT_DB_INTEGRITY_CHECK
                     ): cv.boolean,
+                    vol.Optional(
+                        CONF_ID_CACHE_SIZE, default=DEFAULT_ID_CACHE_SIZE
+                    ): cv.positive_int,
                 }
             ),
         )
@@ -139,6 +150,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     commit_interval = conf[CONF_COMMIT_INTERVAL]
     db_max_retries = conf[CONF_DB_MAX_RETRIES]
     db_retry_wait = conf[CONF_DB_RETRY_WAIT]
+    id_cache_size = conf[CONF_ID_CACHE_SIZE]
     db_url = conf.get(CONF_DB_URL) or DEFAULT_URL.format(
         hass_config_path=hass.config.path(DEFAULT_DB_FILE)
     )
@@ -161,6 +173,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         entity_filter=entity_filter,
         exclude_t=exclude_t,
         exclude_attributes_by_domain=exclude_attributes_by_domain,
+        id_cache_size=id_cache_size,
     )
     instance.async_initialize()
     instance.async_register()
@@ -176,6 +189,19 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
 async def _process_recorder_platform(
     hass: HomeAssistant, domain: str, platform: Any
 ) -> None:
-    """Process a recorder platform."""
+    """Process a recorder platform.
+
+    A recorder platform can implement these optional functions:
+    - exclude_attributes(hass) returns the attributes which are not recorded
+    - compile_statistics(hass, start, end) compiles the 5-minute statistics
+    - list_statistic_ids(hass, statistic_ids, statistic_type) lists the
+      statistic ids the platform provides
+    - validate_statistics(hass) returns the issues with the statistics
+    - async_setup_statistics(hass) is called from the event loop when the
+      platform is added, to prepare compiling the statistics
+    The other functions are not run in the event loop.
+    """
     instance: Recorder = hass.data[DATA_INSTANCE]
     instance.queue_task(AddRecorderPlatformTask(domain, platform))
+    if hasattr(platform, "async_setup_statistics"):
+        platform.async_setup_statistics(hass)
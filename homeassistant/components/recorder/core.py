@@ -10,14 +10,25 @@ import queue
 import sqlite3
 import threading
 import time
-from typing import Any, TypeVar, cast
+from typing import Any, NamedTuple, TypeVar, cast
 
 from lru import LRU  # pylint: disable=no-name-in-module
-from sqlalchemy import create_engine, event as sqlalchemy_event, exc, func, select
+from sqlalchemy import (
+    bindparam,
+    create_engine,
+    event as sqlalchemy_event,
+    exc,
+    func,
+    insert,
+    select,
+    update,
+)
 from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.dml import Insert
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from homeassistant.components import persistent_notification
 from homeassistant.const import (
@@ -34,11 +45,13 @@ from homeassistant.helpers.event import (
     async_track_time_interval,
     async_track_utc_time_change,
 )
+from homeassistant.helpers.storage import Store
 import homeassistant.util.dt as dt_util
 
 from . import migration, statistics
 from .const import (
     DB_WORKER_PREFIX,
+    DOMAIN,
     KEEPALIVE_TIME,
     MAX_QUEUE_BACKLOG,
     MYSQLDB_URL_PREFIX,
@@ -53,13 +66,28 @@ from .models import (
     Events,
     StateAttributes,
     States,
+    StatesMeta,
     StatisticData,
     StatisticMetaData,
     StatisticsRuns,
     process_timestamp,
 )
 from .pool import POOL_SIZE, MutexPool, RecorderPool
-from .queries import find_shared_attributes_id, find_shared_data_id
+from .purge import PurgeProgress
+from .queries import (
+    find_event_data_after,
+    find_last_attributes_id,
+    find_last_data_id,
+    find_last_metadata_id,
+    find_last_state_id,
+    find_recent_shared_attributes,
+    find_shared_attributes_id,
+    find_shared_data_id,
+    find_state_attributes_after,
+    find_states_after,
+    find_states_meta_after,
+    find_states_metadata_id,
+)
 from .run_history import RunHistory
 from .tasks import (
     AdjustStatisticsTask,
@@ -74,6 +102,7 @@ from .tasks import (
     RecorderTask,
     StatisticsTask,
     StopTask,
+    SynchronizeTask,
     UpdateStatisticsMetadataTask,
     WaitTask,
 )
@@ -99,14 +128,14 @@ DEFAULT_URL = "sqlite:///{hass_config_path}"
 # States and Events objects
 EXPIRE_AFTER_COMMITS = 120
 
-# The number of attribute ids to cache in memory
+# The number of states metadata ids to cache in memory
 #
-# Based on:
-# - The number of overlapping attributes
-# - How frequently states with overlapping attributes will change
-# - How much memory our low end hardware has
-STATE_ATTRIBUTES_ID_CACHE_SIZE = 2048
-EVENT_DATA_ID_CACHE_SIZE = 2048
+# There is one id per entity_id so this should be large
+# enough to hold every entity on most systems
+STATES_META_ID_CACHE_SIZE = 8192
+
+PURGE_PROGRESS_STORAGE_KEY = f"{DOMAIN}.purge_progress"
+PURGE_PROGRESS_STORAGE_VERSION = 1
 
 SHUTDOWN_TASK = object()
 
@@ -125,6 +154,32 @@ CONNECTIVITY_ERR = "Error in database connectivity during commit"
 MAX_DB_EXECUTOR_WORKERS = POOL_SIZE - 1
 
 
+class _PendingEvent(NamedTuple):
+    """An event row waiting to be written by the next commit."""
+
+    columns: dict[str, Any]
+    # The data_id is None when the event has no data or
+    # when the event_data row is written by the same commit
+    data_id: int | None
+    shared_data: str | None
+
+
+class _PendingState(NamedTuple):
+    """A state row waiting to be written by the next commit."""
+
+    columns: dict[str, Any]
+    entity_id: str
+    # The metadata_id and attributes_id are None when the
+    # states_meta or state_attributes row is written by the same commit
+    metadata_id: int | None
+    attributes_id: int | None
+    shared_attrs: str
+    old_state_id: int | None
+    # The index in the pending states of the old state
+    # when it is written by the same commit
+    old_state_idx: int | None
+
+
 class Recorder(threading.Thread):
     """A threaded recorder class."""
 
@@ -143,6 +198,7 @@ class Recorder(threading.Thread):
         entity_filter: Callable[[str], bool],
         exclude_t: list[str],
         exclude_attributes_by_domain: dict[str, set[str]],
+        id_cache_size: int,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -168,12 +224,17 @@ class Recorder(threading.Thread):
 
         self.schema_version = 0
         self._commits_without_expire = 0
-        self._old_states: dict[str, States] = {}
-        self._state_attributes_ids: LRU = LRU(STATE_ATTRIBUTES_ID_CACHE_SIZE)
-        self._event_data_ids: LRU = LRU(EVENT_DATA_ID_CACHE_SIZE)
-        self._pending_state_attributes: dict[str, StateAttributes] = {}
-        self._pending_event_data: dict[str, EventData] = {}
-        self._pending_expunge: list[States] = []
+        self._old_states: dict[str, int] = {}
+        self.id_cache_size = id_cache_size
+        self._state_attributes_ids: LRU = LRU(id_cache_size)
+        self._event_data_ids: LRU = LRU(id_cache_size)
+        self._states_meta_ids: LRU = LRU(STATES_META_ID_CACHE_SIZE)
+        self._pending_state_attributes: dict[str, int] = {}
+        self._pending_event_data: dict[str, int] = {}
+        self._pending_states_meta: set[str] = set()
+        self._pending_events: list[_PendingEvent] = []
+        self._pending_states: list[_PendingState] = []
+        self._pending_old_states: dict[str, int] = {}
         self.event_session: Session | None = None
         self._get_session: Callable[[], Session] | None = None
         self._completed_first_database_setup: bool | None = None
@@ -183,6 +244,10 @@ class Recorder(threading.Thread):
         self._database_lock_task: DatabaseLockTask | None = None
         self._db_executor: DBInterruptibleThreadPoolExecutor | None = None
         self._exclude_attributes_by_domain = exclude_attributes_by_domain
+        self.purge_progress: PurgeProgress | None = None
+        self._purge_progress_store: Store = Store(
+            hass, PURGE_PROGRESS_STORAGE_VERSION, PURGE_PROGRESS_STORAGE_KEY
+        )
 
         self._event_listener: CALLBACK_TYPE | None = None
         self._queue_watcher: CALLBACK_TYPE | None = None
@@ -421,6 +486,27 @@ class Recorder(threading.Thread):
         """Finish start and mark recorder ready."""
         self._async_setup_periodic_tasks()
         self.async_recorder_ready.set()
+        self.hass.async_create_task(self._async_resume_purge())
+
+    async def _async_resume_purge(self) -> None:
+        """Resume a purge which was interrupted by a restart."""
+        if self.purge_progress is not None or not (
+            data := await self._purge_progress_store.async_load()
+        ):
+            return
+        progress = self.purge_progress = PurgeProgress.from_dict(data)
+        if progress.finished is None:
+            _LOGGER.debug("Resuming purge before %s", progress.purge_before.isoformat())
+            self.queue_task(
+                PurgeTask(progress.purge_before, progress.repack, progress.apply_filter)
+            )
+
+    def save_purge_progress(self) -> None:
+        """Persist the purge progress."""
+        if (progress := self.purge_progress) is not None:
+            self.hass.add_job(
+                self._purge_progress_store.async_delay_save, progress.as_dict
+            )
 
     @callback
     def async_nightly_tasks(self, now: datetime) -> None:
@@ -721,12 +807,21 @@ class Recorder(threading.Thread):
                 return cast(int, data_id[0])
         return None
 
+    def _find_states_meta_id_in_db(self, entity_id: str) -> int | None:
+        """Find the states metadata_id in the db for an entity_id."""
+        assert self.event_session is not None
+        with self.event_session.no_autoflush:
+            if metadata_id := self.event_session.execute(
+                find_states_metadata_id(entity_id)
+            ).first():
+                return cast(int, metadata_id[0])
+        return None
+
     def _process_non_state_changed_event_into_session(self, event: Event) -> None:
         """Process any event into the session except state changed."""
-        assert self.event_session is not None
-        dbevent = Events.from_event(event)
+        columns = Events.columns_from_event(event)
         if not event.data:
-            self.event_session.add(dbevent)
+            self._pending_events.append(_PendingEvent(columns, None, None))
             return
 
         try:
@@ -736,31 +831,24 @@ class Recorder(threading.Thread):
             return
 
         # Matching attributes found in the pending commit
-        if pending_event_data := self._pending_event_data.get(shared_data):
-            dbevent.event_data_rel = pending_event_data
-        # Matching attributes id found in the cache
-        elif data_id := self._event_data_ids.get(shared_data):
-            dbevent.data_id = data_id
-        else:
+        if shared_data in self._pending_event_data:
+            data_id = None
+        # Matching attributes id not found in the cache
+        elif (data_id := self._event_data_ids.get(shared_data)) is None:
             data_hash = EventData.hash_shared_data(shared_data)
             # Matching attributes found in the database
             if data_id := self._find_shared_data_in_db(data_hash, shared_data):
-                self._event_data_ids[shared_data] = dbevent.data_id = data_id
+                self._event_data_ids[shared_data] = data_id
             # No matching attributes found, save them in the DB
             else:
-                dbevent_data = EventData(shared_data=shared_data, hash=data_hash)
-                dbevent.event_data_rel = self._pending_event_data[
-                    shared_data
-                ] = dbevent_data
-                self.event_session.add(dbevent_data)
+                self._pending_event_data[shared_data] = data_hash
 
-        self.event_session.add(dbevent)
+        self._pending_events.append(_PendingEvent(columns, data_id, shared_data))
 
     def _process_state_changed_event_into_session(self, event: Event) -> None:
         """Process a state_changed event into the session."""
-        assert self.event_session is not None
         try:
-            dbstate = States.from_event(event)
+            columns = States.columns_from_event(event)
             shared_attrs = StateAttributes.shared_attrs_from_event(
                 event, self._exclude_attributes_by_domain
             )
@@ -772,39 +860,53 @@ class Recorder(threading.Thread):
             )
             return
 
-        dbstate.attributes = None
+        # The entity_id is stored in the states_meta table
+        # and linked by metadata_id
+        entity_id: str = columns.pop("entity_id")
+        # Matching states metadata found in the pending commit
+        if entity_id in self._pending_states_meta:
+            metadata_id = None
+        # Matching states metadata id not found in the cache
+        elif (metadata_id := self._states_meta_ids.get(entity_id)) is None:
+            # Matching states metadata found in the database
+            if metadata_id := self._find_states_meta_id_in_db(entity_id):
+                self._states_meta_ids[entity_id] = metadata_id
+            # No matching states metadata found, save it in the DB
+            else:
+                self._pending_states_meta.add(entity_id)
+
         # Matching attributes found in the pending commit
-        if pending_attributes := self._pending_state_attributes.get(shared_attrs):
-            dbstate.state_attributes = pending_attributes
-        # Matching attributes id found in the cache
-        elif attributes_id := self._state_attributes_ids.get(shared_attrs):
-            dbstate.attributes_id = attributes_id
-        else:
+        if shared_attrs in self._pending_state_attributes:
+            attributes_id = None
+        # Matching attributes id not found in the cache
+        elif (attributes_id := self._state_attributes_ids.get(shared_attrs)) is None:
             attr_hash = StateAttributes.hash_shared_attrs(shared_attrs)
             # Matching attributes found in the database
             if attributes_id := self._find_shared_attr_in_db(attr_hash, shared_attrs):
-                dbstate.attributes_id = attributes_id
                 self._state_attributes_ids[shared_attrs] = attributes_id
             # No matching attributes found, save them in the DB
             else:
-                dbstate_attributes = StateAttributes(
-                    shared_attrs=shared_attrs, hash=attr_hash
-                )
-                dbstate.state_attributes = dbstate_attributes
-                self._pending_state_attributes[shared_attrs] = dbstate_attributes
-                self.event_session.add(dbstate_attributes)
+                self._pending_state_attributes[shared_attrs] = attr_hash
 
-        if old_state := self._old_states.pop(dbstate.entity_id, None):
-            if old_state.state_id:
-                dbstate.old_state_id = old_state.state_id
-            else:
-                dbstate.old_state = old_state
+        # The old state is either already in the database
+        # or will be written by the same commit
+        old_state_id = self._old_states.pop(entity_id, None)
+        old_state_idx = self._pending_old_states.pop(entity_id, None)
         if event.data.get("new_state"):
-            self._old_states[dbstate.entity_id] = dbstate
-            self._pending_expunge.append(dbstate)
+            self._pending_old_states[entity_id] = len(self._pending_states)
         else:
-            dbstate.state = None
-        self.event_session.add(dbstate)
+            columns["state"] = None
+        self._pending_states.append(
+            _PendingState(
+                columns,
+                entity_id,
+                metadata_id,
+                attributes_id,
+                shared_attrs,
+                old_state_id,
+                old_state_idx,
+            )
+        )
 
     def _handle_database_error(self, err: Exception) -> bool:
         """Handle a database error that may result in moving away the corrupt db."""
@@ -818,7 +920,12 @@ class Recorder(threading.Thread):
 
     def _event_session_has_pending_writes(self) -> bool:
         return bool(
-            self.event_session and (self.event_session.new or self.event_session.dirty)
+            self._pending_events
+            or self._pending_states
+            or (
+                self.event_session
+                and (self.event_session.new or self.event_session.dirty)
+            )
         )
 
     def _commit_event_session_or_retry(self) -> None:
@@ -847,28 +954,39 @@ class Recorder(threading.Thread):
         assert self.event_session is not None
         self._commits_without_expire += 1
 
-        if self._pending_expunge:
-            self.event_session.flush()
-            for dbstate in self._pending_expunge:
-                # Expunge the state so its not expired
-                # until we use it later for dbstate.old_state
-                if dbstate in self.event_session:
-                    self.event_session.expunge(dbstate)
-            self._pending_expunge = []
-        self.event_session.commit()
-
-        # We just committed the state attributes to the database
-        # and we now know the attributes_ids.  We can save
-        # many selects for matching attributes by loading them
-        # into the LRU cache now.
-        for state_attr in self._pending_state_attributes.values():
-            self._state_attributes_ids[
-                state_attr.shared_attrs
-            ] = state_attr.attributes_id
+        session = self.event_session
+        try:
+            metadata_ids = self._write_pending_states_meta(session)
+            attributes_ids = self._write_pending_state_attributes(session)
+            data_ids = self._write_pending_event_data(session)
+            self._write_pending_events(session, data_ids)
+            state_ids = self._write_pending_states(
+                session, metadata_ids, attributes_ids
+            )
+            session.commit()
+        except Exception:
+            # The pending rows are kept so the commit can be retried
+            session.rollback()
+            raise
+
+        # We just committed the shared rows to the database
+        # and we now know their ids.  We can save
+        # many selects for matching rows by loading them
+        # into the LRU caches now.
+        for shared_attrs, attributes_id in attributes_ids.items():
+            self._state_attributes_ids[shared_attrs] = attributes_id
+        for shared_data, data_id in data_ids.items():
+            self._event_data_ids[shared_data] = data_id
+        for entity_id, metadata_id in metadata_ids.items():
+            self._states_meta_ids[entity_id] = metadata_id
+        for entity_id, idx in self._pending_old_states.items():
+            self._old_states[entity_id] = state_ids[idx]
         self._pending_state_attributes = {}
-        for event_data in self._pending_event_data.values():
-            self._event_data_ids[event_data.shared_data] = event_data.data_id
         self._pending_event_data = {}
+        self._pending_states_meta = set()
+        self._pending_events = []
+        self._pending_states = []
+        self._pending_old_states = {}
 
         # Expire is an expensive operation (frequently more expensive
         # than the flush and commit itself) so we only
@@ -877,6 +995,119 @@ class Recorder(threading.Thread):
             self._commits_without_expire = 0
             self.event_session.expire_all()
 
+    def _write_pending_states_meta(self, session: Session) -> dict[str, int]:
+        """Write the pending states_meta rows and return their ids."""
+        if not self._pending_states_meta:
+            return {}
+        return _insert_and_find_ids(
+            session,
+            insert(StatesMeta),
+            [{"entity_id": entity_id} for entity_id in self._pending_states_meta],
+            find_last_metadata_id(),
+            find_states_meta_after,
+        )
+
+    def _write_pending_state_attributes(self, session: Session) -> dict[str, int]:
+        """Write the pending state_attributes rows and return their ids."""
+        if not self._pending_state_attributes:
+            return {}
+        return _insert_and_find_ids(
+            session,
+            insert(StateAttributes),
+            [
+                {"shared_attrs": shared_attrs, "hash": attr_hash}
+                for shared_attrs, attr_hash in self._pending_state_attributes.items()
+            ],
+            find_last_attributes_id(),
+            find_state_attributes_after,
+        )
+
+    def _write_pending_event_data(self, session: Session) -> dict[str, int]:
+        """Write the pending event_data rows and return their ids."""
+        if not self._pending_event_data:
+            return {}
+        return _insert_and_find_ids(
+            session,
+            insert(EventData),
+            [
+                {"shared_data": shared_data, "hash": data_hash}
+                for shared_data, data_hash in self._pending_event_data.items()
+            ],
+            find_last_data_id(),
+            find_event_data_after,
+        )
+
+    def _write_pending_events(self, session: Session, data_ids: dict[str, int]) -> None:
+        """Write the pending events with a single executemany."""
+        if not self._pending_events:
+            return
+        session.execute(
+            insert(Events),
+            [
+                {
+                    **pending_event.columns,
+                    "data_id": data_ids[pending_event.shared_data]
+                    if pending_event.data_id is None
+                    and pending_event.shared_data is not None
+                    else pending_event.data_id,
+                }
+                for pending_event in self._pending_events
+            ],
+        )
+
+    def _write_pending_states(
+        self,
+        session: Session,
+        metadata_ids: dict[str, int],
+        attributes_ids: dict[str, int],
+    ) -> list[int]:
+        """Write the pending states and return their state_ids.
+
+        The states are inserted by a single executemany in event order
+        so the state_ids are assigned in the same order as the pending
+        states. The old_state_id of a state whose old state is written
+        by the same commit is only known after the insert.
+        """
+        pending_states = self._pending_states
+        if not pending_states:
+            return []
+
+        last_state_id: int = session.execute(find_last_state_id()).scalar() or 0
+        session.execute(
+            insert(States),
+            [
+                {
+                    **pending_state.columns,
+                    "metadata_id": metadata_ids[pending_state.entity_id]
+                    if pending_state.metadata_id is None
+                    else pending_state.metadata_id,
+                    "attributes_id": attributes_ids[pending_state.shared_attrs]
+                    if pending_state.attributes_id is None
+                    else pending_state.attributes_id,
+                    "old_state_id": pending_state.old_state_id,
+                }
+                for pending_state in pending_states
+            ],
+        )
+        state_ids: list[int] = list(
+            session.execute(find_states_after(last_state_id)).scalars()
+        )
+        assert len(state_ids) == len(pending_states)
+
+        if old_state_ids := [
+            {"b_state_id": state_id, "b_old_state_id": state_ids[old_state_idx]}
+            for state_id, pending_state in zip(state_ids, pending_states)
+            if (old_state_idx := pending_state.old_state_idx) is not None
+        ]:
+            session.execute(
+                update(States.__table__)
+                .where(States.state_id == bindparam("b_state_id"))
+                .values(old_state_id=bindparam("b_old_state_id")),
+                old_state_ids,
+            )
+
+        return state_ids
+
     def _handle_sqlite_corruption(self) -> None:
         """Handle the sqlite3 database being corrupt."""
         self._close_event_session()
@@ -889,10 +1120,15 @@ class Recorder(threading.Thread):
     def _close_event_session(self) -> None:
         """Close the event session."""
         self._old_states = {}
-        self._state_attributes_ids = {}
-        self._event_data_ids = {}
+        self._state_attributes_ids.clear()
+        self._event_data_ids.clear()
+        self._states_meta_ids.clear()
         self._pending_state_attributes = {}
         self._pending_event_data = {}
+        self._pending_states_meta = set()
+        self._pending_events = []
+        self._pending_states = []
+        self._pending_old_states = {}
 
         if not self.event_session:
             return
@@ -943,6 +1179,12 @@ class Recorder(threading.Thread):
         self.queue_task(WAIT_TASK)
         self._queue_watch.wait()
 
+    async def async_block_till_done(self) -> None:
+        """Wait until all the events queued so far are committed."""
+        event = asyncio.Event()
+        self.queue_task(SynchronizeTask(event))
+        await event.wait()
+
     async def lock_database(self) -> bool:
         """Lock database so it can be backed up safely."""
         if self.dialect_name != SupportedDialect.SQLITE:
@@ -1052,8 +1294,37 @@ class Recorder(threading.Thread):
             self.run_history.start(session)
             self._schedule_compile_missing_statistics(session)
 
+        self._pre_populate_state_attributes_ids()
         self._open_event_session()
 
+    def _pre_populate_state_attributes_ids(self) -> None:
+        """Load the attributes ids of the most recent states into the cache.
+
+        The attributes of the current states are the ones most likely
+        to be seen again shortly after a restart.
+        """
+        try:
+            with session_scope(session=self.get_session()) as session:
+                rows = session.execute(
+                    find_recent_shared_attributes(self.id_cache_size)
+                ).all()
+        except SQLAlchemyError as err:
+            _LOGGER.warning("Unable to pre-populate the attributes ids cache: %s", err)
+            return
+        for attributes_id, shared_attrs in rows:
+            self._state_attributes_ids[shared_attrs] = attributes_id
+        _LOGGER.debug(
+            "Loaded %s state attributes ids into the cache",
+            len(self._state_attributes_ids),
+        )
+
+    def get_id_cache_stats(self) -> dict[str, tuple[int, int]]:
+        """Return the hits and misses of the shared attributes and data id caches."""
+        return {
+            "state_attributes": self._state_attributes_ids.get_stats(),
+            "event_data": self._event_data_ids.get_stats(),
+        }
+
     def _schedule_compile_missing_statistics(self, session: Session) -> None:
         """Add tasks for missing statistics runs."""
         now = dt_util.utcnow()
@@ -1092,3 +1363,22 @@ class Recorder(threading.Thread):
         self._stop_executor()
         self._end_session()
         self._close_connection()
+
+
+def _insert_and_find_ids(
+    session: Session,
+    stmt: Insert,
+    rows: list[dict[str, Any]],
+    find_last_id: StatementLambdaElement,
+    find_rows_after: Callable[[int], StatementLambdaElement],
+) -> dict[str, int]:
+    """Insert rows with a single executemany and return the new ids by value.
+
+    The recorder thread is the only writer to these tables so
+    every row after the previous highest id is from this insert.
+    """
+    last_id: int = session.execute(find_last_id).scalar() or 0
+    session.execute(stmt, rows)
+    return {
+        value: row_id for row_id, value in session.execute(find_rows_after(last_id))
+    }
@@ -1,14 +1,14 @@
 """Provide pre-made queries on top of the recorder component."""
 from __future__ import annotations
 
-from sqlalchemy import not_, or_
+from sqlalchemy import Column, not_, or_
 from sqlalchemy.sql.elements import ClauseList
 
 from homeassistant.const import CONF_DOMAINS, CONF_ENTITIES, CONF_EXCLUDE, CONF_INCLUDE
 from homeassistant.helpers.entityfilter import CONF_ENTITY_GLOBS
 from homeassistant.helpers.typing import ConfigType
 
-from .models import States
+from .models import StatesMeta
 
 DOMAIN = "history"
 HISTORY_FILTERS = "history_filters"
@@ -59,37 +59,39 @@ class Filters:
             or self.included_entity_globs
         )
 
-    def entity_filter(self) -> ClauseList:
-        """Generate the entity filter query."""
+    def entity_filter(
+        self, entity_id_column: Column = StatesMeta.entity_id
+    ) -> ClauseList:
+        """Generate the entity filter query on the entity_id column."""
         includes = []
         if self.included_domains:
             includes.append(
                 or_(
                     *[
-                        States.entity_id.like(f"{domain}.%")
+                        entity_id_column.like(f"{domain}.%")
                         for domain in self.included_domains
                     ]
                 ).self_group()
             )
         if self.included_entities:
-            includes.append(States.entity_id.in_(self.included_entities))
+            includes.append(entity_id_column.in_(self.included_entities))
         for glob in self.included_entity_globs:
-            includes.append(_glob_to_like(glob))
+            includes.append(_glob_to_like(entity_id_column, glob))
 
         excludes = []
         if self.excluded_domains:
             excludes.append(
                 or_(
                     *[
-                        States.entity_id.like(f"{domain}.%")
+                        entity_id_column.like(f"{domain}.%")
                         for domain in self.excluded_domains
                     ]
                 ).self_group()
             )
         if self.excluded_entities:
-            excludes.append(States.entity_id.in_(self.excluded_entities))
+            excludes.append(entity_id_column.in_(self.excluded_entities))
         for glob in self.excluded_entity_globs:
-            excludes.append(_glob_to_like(glob))
+            excludes.append(_glob_to_like(entity_id_column, glob))
 
         if not includes and not excludes:
             return None
@@ -103,6 +105,6 @@ class Filters:
         return or_(*includes) & not_(or_(*excludes))
 
 
-def _glob_to_like(glob_str: str) -> ClauseList:
+def _glob_to_like(entity_id_column: Column, glob_str: str) -> ClauseList:
     """Translate glob to sql."""
-    return States.entity_id.like(glob_str.translate(GLOB_TO_SQL_CHARS))
+    return entity_id_column.like(glob_str.translate(GLOB_TO_SQL_CHARS))
@@ -15,9 +15,12 @@ from sqlalchemy.orm.query import Query
 from sqlalchemy.orm.session import Session
 from sqlalchemy.sql.expression import literal
 from sqlalchemy.sql.lambdas import StatementLambdaElement
+from sqlalchemy.sql.selectable import Select
 
 from homeassistant.components import recorder
 from homeassistant.components.websocket_api.const import (
+    COMPRESSED_STATE_ATTRIBUTES,
+    COMPRESSED_STATE_LAST_CHANGED,
     COMPRESSED_STATE_LAST_UPDATED,
     COMPRESSED_STATE_STATE,
 )
@@ -30,10 +33,13 @@ from .models import (
     RecorderRuns,
     StateAttributes,
     States,
+    StatesMeta,
+    decode_attributes_from_row,
     process_datetime_to_timestamp,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
     row_to_compressed_state,
+    states_entity_id_column,
 )
 from .util import execute_stmt_lambda_element, session_scope
 
@@ -62,14 +68,13 @@ NEED_ATTRIBUTE_DOMAINS = {
     "water_heater",
 }
 
+# The entity_id column is selected by _select_states
 BASE_STATES = [
-    States.entity_id,
     States.state,
     States.last_changed,
     States.last_updated,
 ]
 BASE_STATES_NO_LAST_CHANGED = [
-    States.entity_id,
     States.state,
     literal(value=None, type_=Text).label("last_changed"),
     States.last_updated,
@@ -115,6 +120,13 @@ def _schema_version(hass: HomeAssistant) -> int:
     return recorder.get_instance(hass).schema_version
 
 
+def _entity_group_column(schema_version: int) -> Column:
+    """Return the states column to group the states of an entity by."""
+    if schema_version < 29:
+        return States.entity_id
+    return States.metadata_id
+
+
 def lambda_stmt_and_join_attributes(
     schema_version: int, no_attributes: bool, include_last_changed: bool = True
 ) -> tuple[StatementLambdaElement, bool]:
@@ -123,14 +135,24 @@ def lambda_stmt_and_join_attributes(
     Because these are lambda_stmt the values inside the lambdas need
     to be explicitly written out to avoid caching the wrong values.
     """
+    entity_id_column = states_entity_id_column(schema_version)
     # If no_attributes was requested we do the query
     # without the attributes fields and do not join the
     # state_attributes table
     if no_attributes:
         if include_last_changed:
-            return lambda_stmt(lambda: select(*QUERY_STATE_NO_ATTR)), False
+            return (
+                lambda_stmt(
+                    lambda: _select_states(entity_id_column, QUERY_STATE_NO_ATTR)
+                ),
+                False,
+            )
         return (
-            lambda_stmt(lambda: select(*QUERY_STATE_NO_ATTR_NO_LAST_CHANGED)),
+            lambda_stmt(
+                lambda: _select_states(
+                    entity_id_column, QUERY_STATE_NO_ATTR_NO_LAST_CHANGED
+                )
+            ),
             False,
         )
     # If we in the process of migrating schema we do
@@ -139,19 +161,44 @@ def lambda_stmt_and_join_attributes(
     if schema_version < 25:
         if include_last_changed:
             return (
-                lambda_stmt(lambda: select(*QUERY_STATES_PRE_SCHEMA_25)),
+                lambda_stmt(
+                    lambda: _select_states(entity_id_column, QUERY_STATES_PRE_SCHEMA_25)
+                ),
                 False,
             )
         return (
-            lambda_stmt(lambda: select(*QUERY_STATES_PRE_SCHEMA_25_NO_LAST_CHANGED)),
+            lambda_stmt(
+                lambda: _select_states(
+                    entity_id_column, QUERY_STATES_PRE_SCHEMA_25_NO_LAST_CHANGED
+                )
+            ),
             False,
         )
     # Finally if no migration is in progress and no_attributes
     # was not requested, we query both attributes columns and
     # join state_attributes
     if include_last_changed:
-        return lambda_stmt(lambda: select(*QUERY_STATES)), True
-    return lambda_stmt(lambda: select(*QUERY_STATES_NO_LAST_CHANGED)), True
+        return lambda_stmt(lambda: _select_states(entity_id_column, QUERY_STATES)), True
+    return (
+        lambda_stmt(
+            lambda: _select_states(entity_id_column, QUERY_STATES_NO_LAST_CHANGED)
+        ),
+        True,
+    )
+
+
+def _select_states(entity_id_column: Column, columns: list[Any]) -> Select:
+    """Select the entity_id and columns from the states table.
+
+    Once the schema 29 migration is done the entity_id is stored in
+    the states_meta table and the states table only references it
+    by metadata_id.
+    """
+    if entity_id_column is StatesMeta.entity_id:
+        return select(entity_id_column, *columns).join(
+            StatesMeta, States.metadata_id == StatesMeta.metadata_id
+        )
+    return select(entity_id_column, *columns)
 
 
 def get_significant_states(
@@ -183,12 +230,12 @@ def get_significant_states(
         )
 
 
-def _ignore_domains_filter(query: Query) -> Query:
+def _ignore_domains_filter(query: Query, entity_id_column: Column) -> Query:
     """Add a filter to ignore domains we do not fetch history for."""
     return query.filter(
         and_(
             *[
-                ~States.entity_id.like(entity_domain)
+                ~entity_id_column.like(entity_domain)
                 for entity_domain in IGNORE_DOMAINS_ENTITY_ID_LIKE
             ]
         )
@@ -208,6 +255,8 @@ def _significant_states_stmt(
     stmt, join_attributes = lambda_stmt_and_join_attributes(
         schema_version, no_attributes, include_last_changed=not significant_changes_only
     )
+    entity_id_column = states_entity_id_column(schema_version)
+    group_column = _entity_group_column(schema_version)
     if (
         entity_ids
         and len(entity_ids) == 1
@@ -221,7 +270,7 @@ def _significant_states_stmt(
         stmt += lambda q: q.filter(
             or_(
                 *[
-                    States.entity_id.like(entity_domain)
+                    entity_id_column.like(entity_domain)
                     for entity_domain in SIGNIFICANT_DOMAINS_ENTITY_ID_LIKE
                 ],
                 (
@@ -232,11 +281,11 @@ def _significant_states_stmt(
         )
 
     if entity_ids:
-        stmt += lambda q: q.filter(States.entity_id.in_(entity_ids))
+        stmt += lambda q: q.filter(entity_id_column.in_(entity_ids))
     else:
-        stmt += _ignore_domains_filter
+        stmt += lambda q: _ignore_domains_filter(q, entity_id_column)
         if filters and filters.has_config:
-            entity_filter = filters.entity_filter()
+            entity_filter = filters.entity_filter(entity_id_column)
             stmt += lambda q: q.filter(entity_filter)
 
     stmt += lambda q: q.filter(States.last_updated > start_time)
@@ -247,7 +296,11 @@ def _significant_states_stmt(
         stmt += lambda q: q.outerjoin(
             StateAttributes, States.attributes_id == StateAttributes.attributes_id
         )
-    stmt += lambda q: q.order_by(States.entity_id, States.last_updated)
+    if entity_ids:
+        stmt += lambda q: q.order_by(group_column, States.last_updated)
+    else:
+        # Keep the results for all entities sorted by entity_id
+        stmt += lambda q: q.order_by(entity_id_column, States.last_updated)
     return stmt
 
 
@@ -343,21 +396,23 @@ def _state_changed_during_period_stmt(
     stmt, join_attributes = lambda_stmt_and_join_attributes(
         schema_version, no_attributes, include_last_changed=False
     )
+    entity_id_column = states_entity_id_column(schema_version)
+    group_column = _entity_group_column(schema_version)
     stmt += lambda q: q.filter(
         ((States.last_changed == States.last_updated) | States.last_changed.is_(None))
         & (States.last_updated > start_time)
     )
     if end_time:
         stmt += lambda q: q.filter(States.last_updated < end_time)
-    stmt += lambda q: q.filter(States.entity_id == entity_id)
+    stmt += lambda q: q.filter(entity_id_column == entity_id)
     if join_attributes:
         stmt += lambda q: q.outerjoin(
             StateAttributes, States.attributes_id == StateAttributes.attributes_id
         )
     if descending:
-        stmt += lambda q: q.order_by(States.entity_id, States.last_updated.desc())
+        stmt += lambda q: q.order_by(group_column, States.last_updated.desc())
     else:
-        stmt += lambda q: q.order_by(States.entity_id, States.last_updated)
+        stmt += lambda q: q.order_by(group_column, States.last_updated)
     if limit:
         stmt += lambda q: q.limit(limit)
     return stmt
@@ -410,14 +465,16 @@ def _get_last_state_changes_stmt(
     stmt, join_attributes = lambda_stmt_and_join_attributes(
         schema_version, False, include_last_changed=False
     )
+    entity_id_column = states_entity_id_column(schema_version)
+    group_column = _entity_group_column(schema_version)
     stmt += lambda q: q.filter(
         (States.last_changed == States.last_updated) | States.last_changed.is_(None)
-    ).filter(States.entity_id == entity_id)
+    ).filter(entity_id_column == entity_id)
     if join_attributes:
         stmt += lambda q: q.outerjoin(
             StateAttributes, States.attributes_id == StateAttributes.attributes_id
         )
-    stmt += lambda q: q.order_by(States.entity_id, States.last_updated.desc()).limit(
+    stmt += lambda q: q.order_by(group_column, States.last_updated.desc()).limit(
         number_of_states
     )
     return stmt
@@ -463,19 +520,40 @@ def _get_states_for_entites_stmt(
     )
     # We got an include-list of entities, accelerate the query by filtering already
     # in the inner query.
-    stmt += lambda q: q.where(
-        States.state_id
-        == (
-            select(func.max(States.state_id).label("max_state_id"))
-            .filter(
-                (States.last_updated >= run_start)
-                & (States.last_updated < utc_point_in_time)
-            )
-            .filter(States.entity_id.in_(entity_ids))
-            .group_by(States.entity_id)
-            .subquery()
-        ).c.max_state_id
-    )
+    if schema_version < 29:
+        stmt += lambda q: q.where(
+            States.state_id
+            == (
+                select(func.max(States.state_id).label("max_state_id"))
+                .filter(
+                    (States.last_updated >= run_start)
+                    & (States.last_updated < utc_point_in_time)
+                )
+                .filter(States.entity_id.in_(entity_ids))
+                .group_by(States.entity_id)
+                .subquery()
+            ).c.max_state_id
+        )
+    else:
+        stmt += lambda q: q.where(
+            States.state_id
+            == (
+                select(func.max(States.state_id).label("max_state_id"))
+                .filter(
+                    (States.last_updated >= run_start)
+                    & (States.last_updated < utc_point_in_time)
+                )
+                .filter(
+                    States.metadata_id.in_(
+                        select(StatesMeta.metadata_id).filter(
+                            StatesMeta.entity_id.in_(entity_ids)
+                        )
+                    )
+                )
+                .group_by(States.metadata_id)
+                .subquery()
+            ).c.max_state_id
+        )
     if join_attributes:
         stmt += lambda q: q.outerjoin(
             StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
@@ -494,20 +572,22 @@ def _get_states_for_all_stmt(
     stmt, join_attributes = lambda_stmt_and_join_attributes(
         schema_version, no_attributes, include_last_changed=True
     )
+    entity_id_column = states_entity_id_column(schema_version)
+    group_column = _entity_group_column(schema_version)
     # We did not get an include-list of entities, query all states in the inner
     # query, then filter out unwanted domains as well as applying the custom filter.
     # This filtering can't be done in the inner query because the domain column is
     # not indexed and we can't control what's in the custom filter.
     most_recent_states_by_date = (
         select(
-            States.entity_id.label("max_entity_id"),
+            group_column.label("max_group_id"),
             func.max(States.last_updated).label("max_last_updated"),
         )
         .filter(
             (States.last_updated >= run_start)
             & (States.last_updated < utc_point_in_time)
         )
-        .group_by(States.entity_id)
+        .group_by(group_column)
         .subquery()
     )
     stmt += lambda q: q.where(
@@ -517,23 +597,26 @@ def _get_states_for_all_stmt(
             .join(
                 most_recent_states_by_date,
                 and_(
-                    States.entity_id == most_recent_states_by_date.c.max_entity_id,
+                    group_column == most_recent_states_by_date.c.max_group_id,
                     States.last_updated
                     == most_recent_states_by_date.c.max_last_updated,
                 ),
             )
-            .group_by(States.entity_id)
+            .group_by(group_column)
             .subquery()
         ).c.max_state_id,
     )
-    stmt += _ignore_domains_filter
+    stmt += lambda q: _ignore_domains_filter(q, entity_id_column)
     if filters and filters.has_config:
-        entity_filter = filters.entity_filter()
+        entity_filter = filters.entity_filter(entity_id_column)
         stmt += lambda q: q.filter(entity_filter)
     if join_attributes:
         stmt += lambda q: q.outerjoin(
             StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
         )
+    # The states are grouped by metadata_id so we need
+    # to sort them by entity_id to get a stable result
+    stmt += lambda q: q.order_by(entity_id_column)
     return stmt
 
 
@@ -588,10 +671,11 @@ def _get_single_entity_states_stmt(
     stmt, join_attributes = lambda_stmt_and_join_attributes(
         schema_version, no_attributes, include_last_changed=True
     )
+    entity_id_column = states_entity_id_column(schema_version)
     stmt += (
         lambda q: q.filter(
             States.last_updated < utc_point_in_time,
-            States.entity_id == entity_id,
+            entity_id_column == entity_id,
         )
         .order_by(States.last_updated.desc())
         .limit(1)
@@ -603,6 +687,50 @@ def _get_single_entity_states_stmt(
     return stmt
 
 
+def _get_initial_states(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    entity_ids: list[str] | None,
+    filters: Filters | None,
+    include_start_time_state: bool,
+    no_attributes: bool,
+) -> dict[str, Row]:
+    """Get the states at the start time keyed by entity_id."""
+    if not include_start_time_state:
+        return {}
+
+    timer_start = time.perf_counter()
+    initial_states = {
+        row.entity_id: row
+        for row in _get_rows_with_session(
+            hass,
+            session,
+            start_time,
+            entity_ids,
+            filters=filters,
+            no_attributes=no_attributes,
+        )
+    }
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug(
+            "getting %d first datapoints took %fs", len(initial_states), elapsed
+        )
+
+    return initial_states
+
+
+def _group_states_by_entity_id(
+    states: Iterable[Row], entity_ids: list[str] | None
+) -> Iterable[tuple[str | Column, Iterator[Row]]]:
+    """Group the states sorted by entity_id and last_updated by entity_id."""
+    if entity_ids and len(entity_ids) == 1:
+        return ((entity_ids[0], iter(states)),)
+    return groupby(states, lambda state: state.entity_id)
+
+
 def _sorted_states_to_dict(
     hass: HomeAssistant,
     session: Session,
@@ -645,35 +773,18 @@ def _sorted_states_to_dict(
         for ent_id in entity_ids:
             result[ent_id] = []
 
-    # Get the states at the start time
-    timer_start = time.perf_counter()
-    initial_states: dict[str, Row] = {}
-    if include_start_time_state:
-        initial_states = {
-            row.entity_id: row
-            for row in _get_rows_with_session(
-                hass,
-                session,
-                start_time,
-                entity_ids,
-                filters=filters,
-                no_attributes=no_attributes,
-            )
-        }
-
-    if _LOGGER.isEnabledFor(logging.DEBUG):
-        elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("getting %d first datapoints took %fs", len(result), elapsed)
-
-    if entity_ids and len(entity_ids) == 1:
-        states_iter: Iterable[tuple[str | Column, Iterator[States]]] = (
-            (entity_ids[0], iter(states)),
-        )
-    else:
-        states_iter = groupby(states, lambda state: state.entity_id)
+    initial_states = _get_initial_states(
+        hass,
+        session,
+        start_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        no_attributes,
+    )
 
     # Append all changes to it
-    for ent_id, group in states_iter:
+    for ent_id, group in _group_states_by_entity_id(states, entity_ids):
         attr_cache: dict[str, dict[str, Any]] = {}
         prev_state: Column | str
         ent_results = result[ent_id]
@@ -729,3 +840,139 @@ def _sorted_states_to_dict(
 
     # Filter out the empty lists if some states had 0 results.
     return {key: val for key, val in result.items() if val}
+
+
+def get_significant_states_columnar(
+    hass: HomeAssistant,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    filters: Filters | None = None,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    no_attributes: bool = False,
+) -> dict[str, dict[str, list[Any]]]:
+    """Return significant states changes during UTC period as columns.
+
+    Each entity_id maps to a dict of columns instead of a list of states:
+
+    "s" and "lu" hold the state and the last_updated epoch timestamp of each row.
+    "lc" and "a" are sparse and hold [index, value] pairs for the rows where
+    last_changed differs from last_updated, and where the attributes differ
+    from the previous row.
+    """
+    with session_scope(hass=hass) as session:
+        stmt = _significant_states_stmt(
+            _schema_version(hass),
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            significant_changes_only,
+            no_attributes,
+        )
+        states = execute_stmt_lambda_element(
+            session, stmt, None if entity_ids else start_time, end_time
+        )
+        return _sorted_states_to_columnar(
+            hass,
+            session,
+            states,
+            start_time,
+            entity_ids,
+            filters,
+            include_start_time_state,
+            no_attributes,
+        )
+
+
+def _sorted_states_to_columnar(
+    hass: HomeAssistant,
+    session: Session,
+    states: Iterable[Row],
+    start_time: datetime,
+    entity_ids: list[str] | None,
+    filters: Filters | None = None,
+    include_start_time_state: bool = True,
+    no_attributes: bool = False,
+) -> dict[str, dict[str, list[Any]]]:
+    """Convert SQL results into columns per entity_id without creating states.
+
+    States must be sorted by entity_id and last_updated
+    """
+    result: dict[str, dict[str, list[Any]]] = {}
+    # Set all entity IDs to empty columns in result set to maintain the order
+    if entity_ids is not None:
+        for ent_id in entity_ids:
+            result[ent_id] = _empty_columns()
+
+    initial_states = _get_initial_states(
+        hass,
+        session,
+        start_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        no_attributes,
+    )
+    start_time_ts = start_time.timestamp()
+
+    for ent_id, group in _group_states_by_entity_id(states, entity_ids):
+        attr_cache: dict[str, dict[str, Any]] = {}
+        columns = result.get(ent_id) or result.setdefault(ent_id, _empty_columns())
+        state_column = columns[COMPRESSED_STATE_STATE]
+        last_updated_column = columns[COMPRESSED_STATE_LAST_UPDATED]
+        last_changed_column = columns[COMPRESSED_STATE_LAST_CHANGED]
+        attributes_column = columns[COMPRESSED_STATE_ATTRIBUTES]
+        # The attributes are None when no_attributes was requested
+        # so they never differ from the previous row
+        prev_attributes: str | None = None
+
+        if row := initial_states.pop(ent_id, None):
+            state_column.append(row.state)
+            last_updated_column.append(start_time_ts)
+            if prev_attributes := row.shared_attrs or row.attributes:
+                attributes_column.append(
+                    [0, decode_attributes_from_row(row, attr_cache)]
+                )
+
+        for row in group:
+            idx = len(state_column)
+            state_column.append(row.state)
+            row_last_updated: datetime = row.last_updated
+            last_updated_column.append(process_datetime_to_timestamp(row_last_updated))
+            if (
+                row_last_changed := row.last_changed
+            ) and row_last_changed != row_last_updated:
+                last_changed_column.append(
+                    [idx, process_datetime_to_timestamp(row_last_changed)]
+                )
+            if (attributes := row.shared_attrs or row.attributes) != prev_attributes:
+                attributes_column.append(
+                    [idx, decode_attributes_from_row(row, attr_cache)]
+                )
+                prev_attributes = attributes
+
+    # If there are no states beyond the initial state,
+    # the state was never popped from initial_states
+    for ent_id, row in initial_states.items():
+        columns = result.get(ent_id) or result.setdefault(ent_id, _empty_columns())
+        columns[COMPRESSED_STATE_STATE].append(row.state)
+        columns[COMPRESSED_STATE_LAST_UPDATED].append(start_time_ts)
+        if row.shared_attrs or row.attributes:
+            columns[COMPRESSED_STATE_ATTRIBUTES].append(
+                [0, decode_attributes_from_row(row, {})]
+            )
+
+    # Filter out the entities without any states
+    return {key: val for key, val in result.items() if val[COMPRESSED_STATE_STATE]}
+
+
+def _empty_columns() -> dict[str, list[Any]]:
+    """Return the empty columns of an entity."""
+    return {
+        COMPRESSED_STATE_STATE: [],
+        COMPRESSED_STATE_LAST_UPDATED: [],
+        COMPRESSED_STATE_LAST_CHANGED: [],
+        COMPRESSED_STATE_ATTRIBUTES: [],
+    }
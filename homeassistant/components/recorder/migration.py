@@ -19,20 +19,32 @@ from sqlalchemy.orm.session import Session
 from sqlalchemy.schema import AddConstraint, DropConstraint
 from sqlalchemy.sql.expression import true
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import Context, HomeAssistant
 
 from .const import SupportedDialect
 from .models import (
     SCHEMA_VERSION,
     TABLE_STATES,
     Base,
+    Events,
     SchemaChanges,
+    States,
+    StatesMeta,
     Statistics,
     StatisticsMeta,
     StatisticsRuns,
     StatisticsShortTerm,
+    context_to_columns,
     process_timestamp,
 )
+from .queries import (
+    find_entity_ids_to_migrate,
+    find_events_context_ids_to_migrate,
+    find_states_context_ids_to_migrate,
+    find_states_metadata_id,
+    find_states_to_migrate,
+    migrate_states_to_metadata_id,
+)
 from .statistics import delete_duplicates, get_start_time
 from .util import session_scope
 
@@ -400,6 +412,25 @@ def _drop_foreign_key_constraints(
                 )
 
 
+def _add_foreign_key_constraint(
+    session_maker: Callable[[], Session], table: str, columns: list[str]
+) -> None:
+    """Add the foreign key constraint of the model on specific columns of a table."""
+    for fkc in Base.metadata.tables[table].foreign_key_constraints:
+        if fkc.column_keys != columns:
+            continue
+        with session_scope(session=session_maker()) as session:
+            try:
+                connection = session.connection()
+                connection.execute(AddConstraint(fkc))
+            except (InternalError, OperationalError):
+                _LOGGER.exception(
+                    "Could not add foreign constraints in %s table on %s",
+                    table,
+                    columns,
+                )
+
+
 def _apply_update(  # noqa: C901
     hass: HomeAssistant,
     engine: Engine,
@@ -410,6 +441,12 @@ def _apply_update(  # noqa: C901
     """Perform operations to bring schema up to date."""
     dialect = engine.dialect.name
     big_int = "INTEGER(20)" if dialect == SupportedDialect.MYSQL else "INTEGER"
+    if dialect == SupportedDialect.MYSQL:
+        context_bin_type = "VARBINARY(16)"
+    elif dialect == SupportedDialect.POSTGRESQL:
+        context_bin_type = "BYTEA"
+    else:
+        context_bin_type = "BLOB"
 
     if new_version == 1:
         _create_index(session_maker, "events", "ix_events_time_fired")
@@ -705,10 +742,123 @@ def _apply_update(  # noqa: C901
         _create_index(session_maker, "states", "ix_states_context_id")
         # Once there are no longer any state_changed events
         # in the events table we can drop the index on states.event_id
+    elif new_version == 29:
+        # The states_meta table is created by create_all
+        if dialect == SupportedDialect.SQLITE:
+            # SQLite can only add a foreign key together with the column
+            _add_columns(
+                session_maker,
+                "states",
+                [f"metadata_id {big_int} REFERENCES states_meta(metadata_id)"],
+            )
+        else:
+            _add_columns(session_maker, "states", [f"metadata_id {big_int}"])
+            _add_foreign_key_constraint(session_maker, TABLE_STATES, ["metadata_id"])
+        _migrate_states_entity_ids(session_maker)
+        _create_index(session_maker, "states", "ix_states_metadata_id_last_updated")
+        _drop_index(session_maker, "states", "ix_states_entity_id_last_updated")
+    elif new_version == 30:
+        for table in ("events", "states"):
+            _add_columns(
+                session_maker,
+                table,
+                [
+                    f"context_id_bin {context_bin_type}",
+                    f"context_user_id_bin {context_bin_type}",
+                    f"context_parent_id_bin {context_bin_type}",
+                ],
+            )
+        _migrate_context_ids(session_maker)
+        _create_index(session_maker, "events", "ix_events_context_id_bin")
+        _create_index(session_maker, "states", "ix_states_context_id_bin")
+        # The ix_events_context_id and ix_states_context_id indexes
+        # are kept for the context ids left in the string columns
     else:
         raise ValueError(f"No schema migration defined for version {new_version}")
 
 
+def _migrate_states_entity_ids(session_maker: Callable[[], Session]) -> None:
+    """Move the entity_id of every states row to the states_meta table.
+
+    Each batch is committed on its own to avoid holding a long
+    running transaction on large databases.
+    """
+    _LOGGER.warning(
+        "Migrating entity_ids to the states_meta table. Note: this can take several "
+        "minutes on large databases and slow computers. Please be patient!"
+    )
+    with session_scope(session=session_maker()) as session:
+        entity_ids = [
+            entity_id for (entity_id,) in session.execute(find_entity_ids_to_migrate())
+        ]
+
+    for entity_id in entity_ids:
+        with session_scope(session=session_maker()) as session:
+            if (
+                metadata_id := session.execute(
+                    find_states_metadata_id(entity_id)
+                ).scalar()
+            ) is None:
+                states_meta = StatesMeta(entity_id=entity_id)
+                session.add(states_meta)
+                session.flush()
+                metadata_id = states_meta.metadata_id
+
+        while True:
+            with session_scope(session=session_maker()) as session:
+                state_ids = [
+                    state_id
+                    for (state_id,) in session.execute(
+                        find_states_to_migrate(entity_id)
+                    )
+                ]
+                if not state_ids:
+                    break
+                session.execute(migrate_states_to_metadata_id(state_ids, metadata_id))
+
+    _LOGGER.debug("Migrated %s entity_ids to the states_meta table", len(entity_ids))
+
+
+def _migrate_context_ids(session_maker: Callable[[], Session]) -> None:
+    """Move the context ids of events and states to the binary columns.
+
+    Ids that cannot be converted without loss stay in the string columns.
+    Each batch is committed on its own to avoid holding a long
+    running transaction on large databases.
+    """
+    _LOGGER.warning(
+        "Migrating context ids to binary columns. Note: this can take several "
+        "minutes on large databases and slow computers. Please be patient!"
+    )
+    for table, primary_key, find_context_ids_to_migrate in (
+        (Events, "event_id", find_events_context_ids_to_migrate),
+        (States, "state_id", find_states_context_ids_to_migrate),
+    ):
+        last_id = 0
+        while True:
+            with session_scope(session=session_maker()) as session:
+                rows = session.execute(find_context_ids_to_migrate(last_id)).all()
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                session.bulk_update_mappings(
+                    table,
+                    [
+                        {
+                            primary_key: row_id,
+                            **context_to_columns(
+                                Context(
+                                    id=context_id,
+                                    user_id=context_user_id,
+                                    parent_id=context_parent_id,
+                                )
+                            ),
+                        }
+                        for row_id, context_id, context_user_id, context_parent_id in rows
+                    ],
+                )
+
+
 def _inspect_schema_version(session: Session) -> int:
     """Determine the schema version by inspecting the db structure.
 
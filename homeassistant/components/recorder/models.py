@@ -18,6 +18,7 @@ from sqlalchemy import (
     Identity,
     Index,
     Integer,
+    LargeBinary,
     SmallInteger,
     String,
     Text,
@@ -44,6 +45,7 @@ from homeassistant.const import (
 )
 from homeassistant.core import Context, Event, EventOrigin, State, split_entity_id
 import homeassistant.util.dt as dt_util
+from homeassistant.util.ulid import bytes_to_ulid, ulid_to_bytes
 
 from .const import ALL_DOMAIN_EXCLUDE_ATTRS, JSON_DUMP
 
@@ -51,7 +53,7 @@ from .const import ALL_DOMAIN_EXCLUDE_ATTRS, JSON_DUMP
 # pylint: disable=invalid-name
 Base = declarative_base()
 
-SCHEMA_VERSION = 28
+SCHEMA_VERSION = 30
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -61,6 +63,7 @@ TABLE_EVENTS = "events"
 TABLE_EVENT_DATA = "event_data"
 TABLE_STATES = "states"
 TABLE_STATE_ATTRIBUTES = "state_attributes"
+TABLE_STATES_META = "states_meta"
 TABLE_RECORDER_RUNS = "recorder_runs"
 TABLE_SCHEMA_CHANGES = "schema_changes"
 TABLE_STATISTICS = "statistics"
@@ -71,6 +74,7 @@ TABLE_STATISTICS_SHORT_TERM = "statistics_short_term"
 ALL_TABLES = [
     TABLE_STATES,
     TABLE_STATE_ATTRIBUTES,
+    TABLE_STATES_META,
     TABLE_EVENTS,
     TABLE_EVENT_DATA,
     TABLE_RECORDER_RUNS,
@@ -90,6 +94,12 @@ TABLES_TO_CHECK = [
 
 LAST_UPDATED_INDEX = "ix_states_last_updated"
 ENTITY_ID_LAST_UPDATED_INDEX = "ix_states_entity_id_last_updated"
+METADATA_ID_LAST_UPDATED_INDEX = "ix_states_metadata_id_last_updated"
+EVENTS_CONTEXT_ID_BIN_INDEX = "ix_events_context_id_bin"
+STATES_CONTEXT_ID_BIN_INDEX = "ix_states_context_id_bin"
+
+# ULIDs and UUIDs are both 128 bits
+CONTEXT_ID_BIN_MAX_LENGTH = 16
 
 EMPTY_JSON_OBJECT = "{}"
 
@@ -116,6 +126,9 @@ DOUBLE_TYPE = (
     .with_variant(oracle.DOUBLE_PRECISION(), "oracle")
     .with_variant(postgresql.DOUBLE_PRECISION(), "postgresql")
 )
+CONTEXT_BINARY_TYPE = LargeBinary(CONTEXT_ID_BIN_MAX_LENGTH).with_variant(
+    mysql.VARBINARY(CONTEXT_ID_BIN_MAX_LENGTH), "mysql"
+)
 EVENT_ORIGIN_ORDER = [EventOrigin.local, EventOrigin.remote]
 EVENT_ORIGIN_TO_IDX = {origin: idx for idx, origin in enumerate(EVENT_ORIGIN_ORDER)}
 
@@ -127,6 +140,7 @@ class Events(Base):  # type: ignore[misc,valid-type]
         # Used for fetching events at a specific time
         # see logbook
         Index("ix_events_event_type_time_fired", "event_type", "time_fired"),
+        Index(EVENTS_CONTEXT_ID_BIN_INDEX, "context_id_bin"),
         {"mysql_default_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
     )
     __tablename__ = TABLE_EVENTS
@@ -136,10 +150,15 @@ class Events(Base):  # type: ignore[misc,valid-type]
     origin = Column(String(MAX_LENGTH_EVENT_ORIGIN))  # no longer used for new rows
     origin_idx = Column(SmallInteger)
     time_fired = Column(DATETIME_TYPE, index=True)
+    # The string context columns are only used for ids that
+    # cannot be stored losslessly in the binary columns
     context_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID), index=True)
     context_user_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID))
     context_parent_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID))
     data_id = Column(Integer, ForeignKey("event_data.data_id"), index=True)
+    context_id_bin = Column(CONTEXT_BINARY_TYPE)
+    context_user_id_bin = Column(CONTEXT_BINARY_TYPE)
+    context_parent_id_bin = Column(CONTEXT_BINARY_TYPE)
     event_data_rel = relationship("EventData")
 
     def __repr__(self) -> str:
@@ -154,23 +173,22 @@ class Events(Base):  # type: ignore[misc,valid-type]
     @staticmethod
     def from_event(event: Event) -> Events:
         """Create an event database object from a native event."""
-        return Events(
-            event_type=event.event_type,
-            event_data=None,
-            origin_idx=EVENT_ORIGIN_TO_IDX.get(event.origin),
-            time_fired=event.time_fired,
-            context_id=event.context.id,
-            context_user_id=event.context.user_id,
-            context_parent_id=event.context.parent_id,
-        )
+        return Events(**Events.columns_from_event(event))
+
+    @staticmethod
+    def columns_from_event(event: Event) -> dict[str, Any]:
+        """Create the column values for a native event."""
+        return {
+            "event_type": event.event_type,
+            "event_data": None,
+            "origin_idx": EVENT_ORIGIN_TO_IDX.get(event.origin),
+            "time_fired": event.time_fired,
+            **context_to_columns(event.context),
+        }
 
     def to_native(self, validate_entity_id: bool = True) -> Event | None:
         """Convert to a native HA Event."""
-        context = Context(
-            id=self.context_id,
-            user_id=self.context_user_id,
-            parent_id=self.context_parent_id,
-        )
+        context = context_from_columns(self)
         try:
             return Event(
                 self.event_type,
@@ -240,12 +258,15 @@ class States(Base):  # type: ignore[misc,valid-type]
     __table_args__ = (
         # Used for fetching the state of entities at a specific time
         # (get_states in history.py)
-        Index(ENTITY_ID_LAST_UPDATED_INDEX, "entity_id", "last_updated"),
+        Index(METADATA_ID_LAST_UPDATED_INDEX, "metadata_id", "last_updated"),
+        Index(STATES_CONTEXT_ID_BIN_INDEX, "context_id_bin"),
         {"mysql_default_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
     )
     __tablename__ = TABLE_STATES
     state_id = Column(Integer, Identity(), primary_key=True)
-    entity_id = Column(String(MAX_LENGTH_STATE_ENTITY_ID))
+    entity_id = Column(
+        String(MAX_LENGTH_STATE_ENTITY_ID)
+    )  # no longer used for new rows
     state = Column(String(MAX_LENGTH_STATE_STATE))
     attributes = Column(
         Text().with_variant(mysql.LONGTEXT, "mysql")
@@ -259,18 +280,25 @@ class States(Base):  # type: ignore[misc,valid-type]
     attributes_id = Column(
         Integer, ForeignKey("state_attributes.attributes_id"), index=True
     )
+    # The string context columns are only used for ids that
+    # cannot be stored losslessly in the binary columns
     context_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID), index=True)
     context_user_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID))
     context_parent_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID))
     origin_idx = Column(SmallInteger)  # 0 is local, 1 is remote
+    metadata_id = Column(Integer, ForeignKey("states_meta.metadata_id"))
+    context_id_bin = Column(CONTEXT_BINARY_TYPE)
+    context_user_id_bin = Column(CONTEXT_BINARY_TYPE)
+    context_parent_id_bin = Column(CONTEXT_BINARY_TYPE)
     old_state = relationship("States", remote_side=[state_id])
     state_attributes = relationship("StateAttributes")
+    states_meta_rel = relationship("StatesMeta")
 
     def __repr__(self) -> str:
         """Return string representation of instance for debugging."""
         return (
             f"<recorder.States("
-            f"id={self.state_id}, entity_id='{self.entity_id}', "
+            f"id={self.state_id}, metadata_id={self.metadata_id}, "
             f"state='{self.state}', event_id='{self.event_id}', "
             f"last_updated='{self.last_updated.isoformat(sep=' ', timespec='seconds')}', "
             f"old_state_id={self.old_state_id}, attributes_id={self.attributes_id}"
@@ -280,40 +308,37 @@ class States(Base):  # type: ignore[misc,valid-type]
     @staticmethod
     def from_event(event: Event) -> States:
         """Create object from a state_changed event."""
-        entity_id = event.data["entity_id"]
+        return States(attributes=None, **States.columns_from_event(event))
+
+    @staticmethod
+    def columns_from_event(event: Event) -> dict[str, Any]:
+        """Create the column values for a state_changed event."""
         state: State | None = event.data.get("new_state")
-        dbstate = States(
-            entity_id=entity_id,
-            attributes=None,
-            context_id=event.context.id,
-            context_user_id=event.context.user_id,
-            context_parent_id=event.context.parent_id,
-            origin_idx=EVENT_ORIGIN_TO_IDX.get(event.origin),
-        )
+        columns = {
+            "entity_id": event.data["entity_id"],
+            **context_to_columns(event.context),
+            "origin_idx": EVENT_ORIGIN_TO_IDX.get(event.origin),
+        }
 
         # None state means the state was removed from the state machine
         if state is None:
-            dbstate.state = ""
-            dbstate.last_updated = event.time_fired
-            dbstate.last_changed = None
-            return dbstate
+            columns["state"] = ""
+            columns["last_updated"] = event.time_fired
+            columns["last_changed"] = None
+            return columns
 
-        dbstate.state = state.state
-        dbstate.last_updated = state.last_updated
+        columns["state"] = state.state
+        columns["last_updated"] = state.last_updated
         if state.last_updated == state.last_changed:
-            dbstate.last_changed = None
+            columns["last_changed"] = None
         else:
-            dbstate.last_changed = state.last_changed
+            columns["last_changed"] = state.last_changed
 
-        return dbstate
+        return columns
 
     def to_native(self, validate_entity_id: bool = True) -> State | None:
         """Convert to an HA state object."""
-        context = Context(
-            id=self.context_id,
-            user_id=self.context_user_id,
-            parent_id=self.context_parent_id,
-        )
+        context = context_from_columns(self)
         try:
             attrs = json.loads(self.attributes) if self.attributes else {}
         except ValueError:
@@ -325,8 +350,11 @@ class States(Base):  # type: ignore[misc,valid-type]
         else:
             last_updated = process_timestamp(self.last_updated)
             last_changed = process_timestamp(self.last_changed)
+        entity_id = self.entity_id
+        if entity_id is None and self.states_meta_rel is not None:
+            entity_id = self.states_meta_rel.entity_id
         return State(
-            self.entity_id,
+            entity_id,
             self.state,
             # Join the state_attributes table on attributes_id to get the attributes
             # for newer states
@@ -401,6 +429,25 @@ class StateAttributes(Base):  # type: ignore[misc,valid-type]
             return {}
 
 
+class StatesMeta(Base):  # type: ignore[misc,valid-type]
+    """Metadata for states."""
+
+    __table_args__ = (
+        {"mysql_default_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
+    )
+    __tablename__ = TABLE_STATES_META
+    metadata_id = Column(Integer, Identity(), primary_key=True)
+    entity_id = Column(String(MAX_LENGTH_STATE_ENTITY_ID), index=True, unique=True)
+
+    def __repr__(self) -> str:
+        """Return string representation of instance for debugging."""
+        return (
+            f"<recorder.StatesMeta("
+            f"id={self.metadata_id}, entity_id='{self.entity_id}'"
+            f")>"
+        )
+
+
 class StatisticResult(TypedDict):
     """Statistic result data class.
 
@@ -555,8 +602,10 @@ class RecorderRuns(Base):  # type: ignore[misc,valid-type]
 
         assert session is not None, "RecorderRuns need to be persisted"
 
-        query = session.query(distinct(States.entity_id)).filter(
-            States.last_updated >= self.start
+        query = (
+            session.query(distinct(StatesMeta.entity_id))
+            .join(States, States.metadata_id == StatesMeta.metadata_id)
+            .filter(States.last_updated >= self.start)
         )
 
         if point_in_time is not None:
@@ -657,6 +706,82 @@ def process_datetime_to_timestamp(ts: datetime) -> float:
     return ts.timestamp()
 
 
+def ulid_to_bytes_or_none(ulid: str | None) -> bytes | None:
+    """Convert a ULID to bytes or None if it is not a canonical ULID."""
+    if ulid is None:
+        return None
+    try:
+        return ulid_to_bytes(ulid)
+    except ValueError:
+        return None
+
+
+def bytes_to_ulid_or_none(_bytes: bytes | None) -> str | None:
+    """Convert bytes to a ULID or None if the bytes are missing."""
+    if _bytes is None:
+        return None
+    return bytes_to_ulid(_bytes)
+
+
+def uuid_hex_to_bytes_or_none(uuid_hex: str | None) -> bytes | None:
+    """Convert a lowercase uuid hex string to bytes or None if it does not round trip."""
+    if uuid_hex is None or len(uuid_hex) != 32:
+        return None
+    try:
+        _bytes = bytes.fromhex(uuid_hex)
+    except ValueError:
+        return None
+    return _bytes if _bytes.hex() == uuid_hex else None
+
+
+def bytes_to_uuid_hex_or_none(_bytes: bytes | None) -> str | None:
+    """Convert bytes to a uuid hex string or None if the bytes are missing."""
+    if _bytes is None:
+        return None
+    return _bytes.hex()
+
+
+def context_to_columns(context: Context) -> dict[str, str | bytes | None]:
+    """Convert a context to the binary context columns.
+
+    Ids that cannot be converted without loss are
+    kept in the string context columns instead.
+    """
+    context_id_bin = ulid_to_bytes_or_none(context.id)
+    context_user_id_bin = uuid_hex_to_bytes_or_none(context.user_id)
+    context_parent_id_bin = ulid_to_bytes_or_none(context.parent_id)
+    return {
+        "context_id": None if context_id_bin else context.id,
+        "context_user_id": None if context_user_id_bin else context.user_id,
+        "context_parent_id": None if context_parent_id_bin else context.parent_id,
+        "context_id_bin": context_id_bin,
+        "context_user_id_bin": context_user_id_bin,
+        "context_parent_id_bin": context_parent_id_bin,
+    }
+
+
+def context_from_columns(row: Events | States) -> Context:
+    """Convert the context columns of a row back to a context."""
+    return Context(
+        id=bytes_to_ulid_or_none(row.context_id_bin) or row.context_id,
+        user_id=bytes_to_uuid_hex_or_none(row.context_user_id_bin)
+        or row.context_user_id,
+        parent_id=bytes_to_ulid_or_none(row.context_parent_id_bin)
+        or row.context_parent_id,
+    )
+
+
+def states_entity_id_column(schema_version: int) -> Column:
+    """Return the column that holds the entity_id of the states rows.
+
+    The schema 29 migration moves the entity_ids to the states_meta
+    table. Until it finishes the states rows still hold them.
+    """
+    if schema_version < 29:
+        return States.entity_id
+    return StatesMeta.entity_id
+
+
 class LazyState(State):
     """A lazy version of core State."""
 
@@ -2,19 +2,23 @@
 from __future__ import annotations
 
 from collections.abc import Callable, Iterable
+from dataclasses import dataclass
 from datetime import datetime
 from functools import partial
 from itertools import islice, zip_longest
 import logging
+import time
 from typing import TYPE_CHECKING, Any
 
 from sqlalchemy.orm.session import Session
 from sqlalchemy.sql.expression import distinct
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from homeassistant.const import EVENT_STATE_CHANGED
+import homeassistant.util.dt as dt_util
 
 from .const import MAX_ROWS_TO_PURGE, SupportedDialect
-from .models import Events, StateAttributes, States
+from .models import Events, StateAttributes, States, StatesMeta
 from .queries import (
     attributes_ids_exist_in_states,
     attributes_ids_exist_in_states_sqlite,
@@ -22,17 +26,23 @@ from .queries import (
     data_ids_exist_in_events_sqlite,
     delete_event_data_rows,
     delete_event_rows,
+    delete_event_rows_range,
     delete_recorder_runs_rows,
     delete_states_attributes_rows,
+    delete_states_meta_rows,
     delete_states_rows,
+    delete_states_rows_range,
     delete_statistics_runs_rows,
     delete_statistics_short_term_rows,
     disconnect_states_rows,
+    disconnect_states_rows_range,
+    find_events_id_range_to_purge,
     find_events_to_purge,
     find_latest_statistics_runs_run_id,
     find_legacy_event_state_and_attributes_and_data_ids_to_purge,
     find_legacy_row,
     find_short_term_statistics_to_purge,
+    find_states_id_range_to_purge,
     find_states_to_purge,
     find_statistics_runs_to_purge,
 )
@@ -48,6 +58,101 @@ _LOGGER = logging.getLogger(__name__)
 DEFAULT_STATES_BATCHES_PER_PURGE = 20  # We expect ~95% de-dupe rate
 DEFAULT_EVENTS_BATCHES_PER_PURGE = 15  # We expect ~92% de-dupe rate
 
+# Stop purging and requeue the purge task once this many tasks are waiting
+# in the recorder queue so the events are not held up by the purge
+PURGE_YIELD_BACKLOG = 100
+
+# Contiguous runs of ids at least this long are deleted by primary key range
+MIN_PURGE_ID_RANGE = 100
+
+
+@dataclass
+class PurgeProgress:
+    """Progress of a purge.
+
+    The progress is persisted so an interrupted purge can be resumed
+    after a restart.
+    """
+
+    purge_before: datetime
+    repack: bool
+    apply_filter: bool
+    started: datetime
+    states_to_purge: int
+    events_to_purge: int
+    states_purged: int = 0
+    events_purged: int = 0
+    state_attributes_purged: int = 0
+    event_data_purged: int = 0
+    purge_seconds: float = 0.0
+    finished: datetime | None = None
+
+    @property
+    def rows_per_second(self) -> float | None:
+        """Return the rate the states and events are purged at."""
+        if not self.purge_seconds:
+            return None
+        return (self.states_purged + self.events_purged) / self.purge_seconds
+
+    @property
+    def rows_remaining(self) -> int:
+        """Return an estimate of the states and events left to purge."""
+        if self.finished:
+            return 0
+        return max(0, self.states_to_purge - self.states_purged) + max(
+            0, self.events_to_purge - self.events_purged
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dict to persist the progress."""
+        return {
+            "purge_before": self.purge_before.isoformat(),
+            "repack": self.repack,
+            "apply_filter": self.apply_filter,
+            "started": self.started.isoformat(),
+            "states_to_purge": self.states_to_purge,
+            "events_to_purge": self.events_to_purge,
+            "states_purged": self.states_purged,
+            "events_purged": self.events_purged,
+            "state_attributes_purged": self.state_attributes_purged,
+            "event_data_purged": self.event_data_purged,
+            "purge_seconds": self.purge_seconds,
+            "finished": self.finished.isoformat() if self.finished else None,
+        }
+
+    def as_status_dict(self) -> dict[str, Any]:
+        """Return a dict with the progress and the rate and remaining estimates."""
+        rows_per_second = self.rows_per_second
+        rows_remaining = self.rows_remaining
+        return {
+            **self.as_dict(),
+            "rows_per_second": rows_per_second,
+            "rows_remaining": rows_remaining,
+            "seconds_remaining": rows_remaining / rows_per_second
+            if rows_per_second
+            else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> PurgeProgress:
+        """Restore the progress from a persisted dict."""
+        return cls(
+            purge_before=dt_util.parse_datetime(data["purge_before"]),  # type: ignore[arg-type]
+            repack=data["repack"],
+            apply_filter=data["apply_filter"],
+            started=dt_util.parse_datetime(data["started"]),  # type: ignore[arg-type]
+            states_to_purge=data["states_to_purge"],
+            events_to_purge=data["events_to_purge"],
+            states_purged=data["states_purged"],
+            events_purged=data["events_purged"],
+            state_attributes_purged=data["state_attributes_purged"],
+            event_data_purged=data["event_data_purged"],
+            purge_seconds=data["purge_seconds"],
+            finished=dt_util.parse_datetime(data["finished"])
+            if data["finished"]
+            else None,
+        )
+
 
 def take(take_num: int, iterable: Iterable) -> list[Any]:
     """Return first n items of the iterable as a list.
@@ -65,6 +170,27 @@ def chunked(iterable: Iterable, chunked_num: int) -> Iterable[Any]:
     return iter(partial(take, chunked_num, iter(iterable)), [])
 
 
+def split_id_ranges(ids: Iterable[int]) -> tuple[list[tuple[int, int]], list[int]]:
+    """Split ids into contiguous ranges of at least MIN_PURGE_ID_RANGE ids.
+
+    Returns the first and last id of each range and the ids which
+    are not part of a range.
+    """
+    ranges: list[tuple[int, int]] = []
+    single_ids: list[int] = []
+    sorted_ids = sorted(ids)
+    start = 0
+    for idx in range(1, len(sorted_ids) + 1):
+        if idx < len(sorted_ids) and sorted_ids[idx] == sorted_ids[idx - 1] + 1:
+            continue
+        if idx - start >= MIN_PURGE_ID_RANGE:
+            ranges.append((sorted_ids[start], sorted_ids[idx - 1]))
+        else:
+            single_ids.extend(sorted_ids[start:idx])
+        start = idx
+    return ranges, single_ids
+
+
 @retryable_database_job("purge")
 def purge_old_data(
     instance: Recorder,
@@ -82,9 +208,68 @@ def purge_old_data(
         "Purging states and events before target %s",
         purge_before.isoformat(sep=" ", timespec="seconds"),
     )
+    started = time.monotonic()
+    try:
+        finished = _purge_old_data(
+            instance,
+            purge_before,
+            repack,
+            apply_filter,
+            events_batch_size,
+            states_batch_size,
+        )
+    finally:
+        if (progress := instance.purge_progress) is not None:
+            progress.purge_seconds += time.monotonic() - started
+            instance.save_purge_progress()
+    if finished and repack:
+        repack_database(instance)
+    return finished
+
+
+def _estimate_rows_to_purge(session: Session, stmt: StatementLambdaElement) -> int:
+    """Estimate the rows to purge from the range of their ids.
+
+    Counting the rows scans the whole range on large databases. The rows to
+    purge are the oldest ones, so their ids are mostly consecutive.
+    """
+    first_id, last_id = session.execute(stmt).one()
+    if first_id is None or last_id is None:
+        return 0
+    return max(0, last_id - first_id + 1)
+
+
+def _purge_old_data(
+    instance: Recorder,
+    purge_before: datetime,
+    repack: bool,
+    apply_filter: bool,
+    events_batch_size: int,
+    states_batch_size: int,
+) -> bool:
+    """Purge a batch of events and states older than purge_before."""
     using_sqlite = instance.dialect_name == SupportedDialect.SQLITE
 
     with session_scope(session=instance.get_session()) as session:
+        progress = instance.purge_progress
+        if (
+            progress is None
+            or progress.finished is not None
+            or progress.purge_before != purge_before
+        ):
+            progress = instance.purge_progress = PurgeProgress(
+                purge_before=purge_before,
+                repack=repack,
+                apply_filter=apply_filter,
+                started=dt_util.utcnow(),
+                states_to_purge=_estimate_rows_to_purge(
+                    session, find_states_id_range_to_purge(purge_before)
+                ),
+                events_to_purge=_estimate_rows_to_purge(
+                    session, find_events_id_range_to_purge(purge_before)
+                ),
+            )
+
         # Purge a max of MAX_ROWS_TO_PURGE, based on the oldest states or events record
         has_more_to_purge = False
         if _purging_legacy_format(session):
@@ -126,8 +311,7 @@ def purge_old_data(
             return False
 
         _purge_old_recorder_runs(instance, session, purge_before)
-    if repack:
-        repack_database(instance)
+        progress.finished = dt_util.utcnow()
     return True
 
 
@@ -152,7 +336,7 @@ def _purge_legacy_format(
         _purge_state_ids(instance, session, state_ids)
     _purge_unused_attributes_ids(instance, session, attributes_ids, using_sqlite)
     if event_ids:
-        _purge_event_ids(session, event_ids)
+        _purge_event_ids(instance, session, event_ids)
     _purge_unused_data_ids(instance, session, data_ids, using_sqlite)
     return bool(event_ids or state_ids or attributes_ids or data_ids)
 
@@ -166,14 +350,12 @@ def _purge_states_and_attributes_ids(
 ) -> bool:
     """Purge states and linked attributes id in a batch.
 
+    Each batch of states is committed together with the attributes
+    it orphaned to keep the transactions short.
+
     Returns true if there are more states to purge.
     """
     has_remaining_state_ids_to_purge = True
-    # There are more states relative to attributes_ids so
-    # we purge enough state_ids to try to generate a full
-    # size batch of attributes_ids that will be around the size
-    # MAX_ROWS_TO_PURGE
-    attributes_ids_batch: set[int] = set()
     for _ in range(states_batch_size):
         state_ids, attributes_ids = _select_state_attributes_ids_to_purge(
             session, purge_before
@@ -182,9 +364,11 @@ def _purge_states_and_attributes_ids(
             has_remaining_state_ids_to_purge = False
             break
         _purge_state_ids(instance, session, state_ids)
-        attributes_ids_batch = attributes_ids_batch | attributes_ids
+        _purge_unused_attributes_ids(instance, session, attributes_ids, using_sqlite)
+        session.commit()
+        if _purge_should_yield(instance):
+            break
 
-    _purge_unused_attributes_ids(instance, session, attributes_ids_batch, using_sqlite)
     _LOGGER.debug(
         "After purging states and attributes_ids remaining=%s",
         has_remaining_state_ids_to_purge,
@@ -204,20 +388,17 @@ def _purge_events_and_data_ids(
     Returns true if there are more states to purge.
     """
     has_remaining_event_ids_to_purge = True
-    # There are more events relative to data_ids so
-    # we purge enough event_ids to try to generate a full
-    # size batch of data_ids that will be around the size
-    # MAX_ROWS_TO_PURGE
-    data_ids_batch: set[int] = set()
     for _ in range(events_batch_size):
         event_ids, data_ids = _select_event_data_ids_to_purge(session, purge_before)
         if not event_ids:
             has_remaining_event_ids_to_purge = False
             break
-        _purge_event_ids(session, event_ids)
-        data_ids_batch = data_ids_batch | data_ids
+        _purge_event_ids(instance, session, event_ids)
+        _purge_unused_data_ids(instance, session, data_ids, using_sqlite)
+        session.commit()
+        if _purge_should_yield(instance):
+            break
 
-    _purge_unused_data_ids(instance, session, data_ids_batch, using_sqlite)
     _LOGGER.debug(
         "After purging event and data_ids remaining=%s",
         has_remaining_event_ids_to_purge,
@@ -225,6 +406,23 @@ def _purge_events_and_data_ids(
     return has_remaining_event_ids_to_purge
 
 
+def _active_purge_progress(instance: Recorder) -> PurgeProgress | None:
+    """Return the progress of the purge which is running."""
+    if (progress := instance.purge_progress) is None or progress.finished:
+        return None
+    return progress
+
+
+def _purge_should_yield(instance: Recorder) -> bool:
+    """Return if the purge should yield to the tasks waiting in the queue."""
+    if instance.backlog < PURGE_YIELD_BACKLOG:
+        return False
+    _LOGGER.debug(
+        "Purge yielding to %s tasks waiting in the recorder queue", instance.backlog
+    )
+    return True
+
+
 def _select_state_attributes_ids_to_purge(
     session: Session, purge_before: datetime
 ) -> tuple[set[int], set[int]]:
@@ -443,11 +641,24 @@ def _purge_state_ids(instance: Recorder, session: Session, state_ids: set[int])
     # the delete does not fail due to a foreign key constraint
     # since some databases (MSSQL) cannot do the ON DELETE SET NULL
     # for us.
-    disconnected_rows = session.execute(disconnect_states_rows(state_ids))
+    ranges, single_ids = split_id_ranges(state_ids)
+    disconnected_rows = deleted_rows = 0
+    for first_state_id, last_state_id in ranges:
+        disconnected_rows += session.execute(
+            disconnect_states_rows_range(first_state_id, last_state_id)
+        ).rowcount
+        deleted_rows += session.execute(
+            delete_states_rows_range(first_state_id, last_state_id)
+        ).rowcount
+    if single_ids:
+        disconnected_rows += session.execute(
+            disconnect_states_rows(single_ids)
+        ).rowcount
+        deleted_rows += session.execute(delete_states_rows(single_ids)).rowcount
     _LOGGER.debug("Updated %s states to remove old_state_id", disconnected_rows)
-
-    deleted_rows = session.execute(delete_states_rows(state_ids))
     _LOGGER.debug("Deleted %s states", deleted_rows)
+    if progress := _active_purge_progress(instance):
+        progress.states_purged += deleted_rows
 
     # Evict eny entries in the old_states cache referring to a purged state
     _evict_purged_states_from_old_states_cache(instance, state_ids)
@@ -460,9 +671,7 @@ def _evict_purged_states_from_old_states_cache(
     # Make a map from old_state_id to entity_id
     old_states = instance._old_states  # pylint: disable=protected-access
     old_state_reversed = {
-        old_state.state_id: entity_id
-        for entity_id, old_state in old_states.items()
-        if old_state.state_id
+        old_state_id: entity_id for entity_id, old_state_id in old_states.items()
     }
 
     # Evict any purged state from the old states cache
@@ -507,6 +716,23 @@ def _evict_purged_attributes_from_attributes_cache(
         )
 
 
+def _evict_purged_states_meta_from_states_meta_cache(
+    instance: Recorder, purged_metadata_ids: set[int]
+) -> None:
+    """Evict purged metadata ids from the states meta ids cache."""
+    # Make a map from metadata_id to the entity_id
+    states_meta_ids = instance._states_meta_ids  # pylint: disable=protected-access
+    states_meta_ids_reversed = {
+        metadata_id: entity_id for entity_id, metadata_id in states_meta_ids.items()
+    }
+
+    # Evict any purged metadata from the states_meta_ids cache
+    for purged_metadata_id in purged_metadata_ids.intersection(
+        states_meta_ids_reversed
+    ):
+        states_meta_ids.pop(states_meta_ids_reversed[purged_metadata_id], None)
+
+
 def _purge_batch_attributes_ids(
     instance: Recorder, session: Session, attributes_ids: set[int]
 ) -> None:
@@ -514,8 +740,10 @@ def _purge_batch_attributes_ids(
     for attributes_ids_chunk in chunked(attributes_ids, MAX_ROWS_TO_PURGE):
         deleted_rows = session.execute(
             delete_states_attributes_rows(attributes_ids_chunk)
-        )
+        ).rowcount
         _LOGGER.debug("Deleted %s attribute states", deleted_rows)
+        if progress := _active_purge_progress(instance):
+            progress.state_attributes_purged += deleted_rows
 
     # Evict any entries in the state_attributes_ids cache referring to a purged state
     _evict_purged_attributes_from_attributes_cache(instance, attributes_ids)
@@ -526,13 +754,26 @@ def _purge_batch_data_ids(
 ) -> None:
     """Delete old event data ids in batches of MAX_ROWS_TO_PURGE."""
     for data_ids_chunk in chunked(data_ids, MAX_ROWS_TO_PURGE):
-        deleted_rows = session.execute(delete_event_data_rows(data_ids_chunk))
+        deleted_rows = session.execute(delete_event_data_rows(data_ids_chunk)).rowcount
         _LOGGER.debug("Deleted %s data events", deleted_rows)
+        if progress := _active_purge_progress(instance):
+            progress.event_data_purged += deleted_rows
 
     # Evict any entries in the event_data_ids cache referring to a purged state
     _evict_purged_data_from_data_cache(instance, data_ids)
 
 
+def _purge_states_meta_ids(
+    instance: Recorder, session: Session, metadata_ids: set[int]
+) -> None:
+    """Delete states meta ids that no longer have any states."""
+    deleted_rows = session.execute(delete_states_meta_rows(metadata_ids))
+    _LOGGER.debug("Deleted %s states meta", deleted_rows)
+
+    # Evict any entries in the states_meta_ids cache referring to a purged entity
+    _evict_purged_states_meta_from_states_meta_cache(instance, metadata_ids)
+
+
 def _purge_statistics_runs(session: Session, statistics_runs: list[int]) -> None:
     """Delete by run_id."""
     deleted_rows = session.execute(delete_statistics_runs_rows(statistics_runs))
@@ -549,10 +790,21 @@ def _purge_short_term_statistics(
     _LOGGER.debug("Deleted %s short term statistics", deleted_rows)
 
 
-def _purge_event_ids(session: Session, event_ids: Iterable[int]) -> None:
+def _purge_event_ids(
+    instance: Recorder, session: Session, event_ids: Iterable[int]
+) -> None:
     """Delete by event id."""
-    deleted_rows = session.execute(delete_event_rows(event_ids))
+    ranges, single_ids = split_id_ranges(event_ids)
+    deleted_rows = 0
+    for first_event_id, last_event_id in ranges:
+        deleted_rows += session.execute(
+            delete_event_rows_range(first_event_id, last_event_id)
+        ).rowcount
+    if single_ids:
+        deleted_rows += session.execute(delete_event_rows(single_ids)).rowcount
     _LOGGER.debug("Deleted %s events", deleted_rows)
+    if progress := _active_purge_progress(instance):
+        progress.events_purged += deleted_rows
 
 
 def _purge_old_recorder_runs(
@@ -572,13 +824,15 @@ def _purge_filtered_data(instance: Recorder, session: Session) -> bool:
     using_sqlite = instance.dialect_name == SupportedDialect.SQLITE
 
     # Check if excluded entity_ids are in database
-    excluded_entity_ids: list[str] = [
-        entity_id
-        for (entity_id,) in session.query(distinct(States.entity_id)).all()
+    excluded_metadata_ids: list[int] = [
+        metadata_id
+        for (metadata_id, entity_id) in session.query(
+            StatesMeta.metadata_id, StatesMeta.entity_id
+        ).all()
         if not instance.entity_filter(entity_id)
     ]
-    if len(excluded_entity_ids) > 0:
-        _purge_filtered_states(instance, session, excluded_entity_ids, using_sqlite)
+    if len(excluded_metadata_ids) > 0:
+        _purge_filtered_states(instance, session, excluded_metadata_ids, using_sqlite)
         return False
 
     # Check if excluded event_types are in database
@@ -597,27 +851,33 @@ def _purge_filtered_data(instance: Recorder, session: Session) -> bool:
 def _purge_filtered_states(
     instance: Recorder,
     session: Session,
-    excluded_entity_ids: list[str],
+    excluded_metadata_ids: list[int],
     using_sqlite: bool,
 ) -> None:
-    """Remove filtered states and linked events."""
+    """Remove filtered states and linked events.
+
+    Once all the states of the excluded entities are gone
+    their states meta are removed as well.
+    """
     state_ids: list[int]
     attributes_ids: list[int]
     event_ids: list[int]
-    state_ids, attributes_ids, event_ids = zip(
-        *(
-            session.query(States.state_id, States.attributes_id, States.event_id)
-            .filter(States.entity_id.in_(excluded_entity_ids))
-            .limit(MAX_ROWS_TO_PURGE)
-            .all()
-        )
+    states = (
+        session.query(States.state_id, States.attributes_id, States.event_id)
+        .filter(States.metadata_id.in_(excluded_metadata_ids))
+        .limit(MAX_ROWS_TO_PURGE)
+        .all()
     )
+    if not states:
+        _purge_states_meta_ids(instance, session, set(excluded_metadata_ids))
+        return
+    state_ids, attributes_ids, event_ids = zip(*states)
     event_ids = [id_ for id_ in event_ids if id_ is not None]
     _LOGGER.debug(
         "Selected %s state_ids to remove that should be filtered", len(state_ids)
     )
     _purge_state_ids(instance, session, set(state_ids))
-    _purge_event_ids(session, event_ids)
+    _purge_event_ids(instance, session, event_ids)
     unused_attribute_ids_set = _select_unused_attributes_ids(
         session, {id_ for id_ in attributes_ids if id_ is not None}, using_sqlite
     )
@@ -645,14 +905,14 @@ def _purge_filtered_events(
     )
     state_ids: set[int] = {state.state_id for state in states}
     _purge_state_ids(instance, session, state_ids)
-    _purge_event_ids(session, event_ids)
+    _purge_event_ids(instance, session, event_ids)
     if unused_data_ids_set := _select_unused_event_data_ids(
         session, set(data_ids), using_sqlite
     ):
         _purge_batch_data_ids(instance, session, unused_data_ids_set)
     if EVENT_STATE_CHANGED in excluded_event_types:
         session.query(StateAttributes).delete(synchronize_session=False)
-        instance._state_attributes_ids = {}  # pylint: disable=protected-access
+        instance._state_attributes_ids.clear()  # pylint: disable=protected-access
 
 
 @retryable_database_job("purge")
@@ -660,15 +920,20 @@ def purge_entity_data(instance: Recorder, entity_filter: Callable[[str], bool])
     """Purge states and events of specified entities."""
     using_sqlite = instance.dialect_name == SupportedDialect.SQLITE
     with session_scope(session=instance.get_session()) as session:
-        selected_entity_ids: list[str] = [
-            entity_id
-            for (entity_id,) in session.query(distinct(States.entity_id)).all()
-            if entity_filter(entity_id)
-        ]
+        selected_metadata_ids: list[int] = []
+        selected_entity_ids: list[str] = []
+        for (metadata_id, entity_id) in session.query(
+            StatesMeta.metadata_id, StatesMeta.entity_id
+        ).all():
+            if entity_filter(entity_id):
+                selected_metadata_ids.append(metadata_id)
+                selected_entity_ids.append(entity_id)
         _LOGGER.debug("Purging entity data for %s", selected_entity_ids)
-        if len(selected_entity_ids) > 0:
+        if len(selected_metadata_ids) > 0:
             # Purge a max of MAX_ROWS_TO_PURGE, based on the oldest states or events record
-            _purge_filtered_states(instance, session, selected_entity_ids, using_sqlite)
+            _purge_filtered_states(
+                instance, session, selected_metadata_ids, using_sqlite
+            )
             _LOGGER.debug("Purging entity data hasn't fully completed yet")
             return False
 
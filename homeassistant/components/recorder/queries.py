@@ -15,6 +15,7 @@ from .models import (
     RecorderRuns,
     StateAttributes,
     States,
+    StatesMeta,
     StatisticsRuns,
     StatisticsShortTerm,
 )
@@ -40,6 +41,13 @@ def find_shared_data_id(attr_hash: int, shared_data: str) -> StatementLambdaElem
     )
 
 
+def find_states_metadata_id(entity_id: str) -> StatementLambdaElement:
+    """Find a metadata_id by entity_id."""
+    return lambda_stmt(
+        lambda: select(StatesMeta.metadata_id).filter(StatesMeta.entity_id == entity_id)
+    )
+
+
 def _state_attrs_exist(attr: int | None) -> Select:
     """Check if a state attributes id exists in the states table."""
     return select(func.min(States.attributes_id)).where(States.attributes_id == attr)
@@ -513,6 +521,40 @@ def delete_states_rows(state_ids: Iterable[int]) -> StatementLambdaElement:
     )
 
 
+def disconnect_states_rows_range(
+    first_state_id: int, last_state_id: int
+) -> StatementLambdaElement:
+    """Disconnect states rows from a range of state ids."""
+    return lambda_stmt(
+        lambda: update(States)
+        .where(States.old_state_id >= first_state_id)
+        .where(States.old_state_id <= last_state_id)
+        .values(old_state_id=None)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def delete_states_rows_range(
+    first_state_id: int, last_state_id: int
+) -> StatementLambdaElement:
+    """Delete a range of states rows by primary key."""
+    return lambda_stmt(
+        lambda: delete(States)
+        .where(States.state_id >= first_state_id)
+        .where(States.state_id <= last_state_id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def delete_states_meta_rows(metadata_ids: Iterable[int]) -> StatementLambdaElement:
+    """Delete states_meta rows."""
+    return lambda_stmt(
+        lambda: delete(StatesMeta)
+        .where(StatesMeta.metadata_id.in_(metadata_ids))
+        .execution_options(synchronize_session=False)
+    )
+
+
 def delete_event_data_rows(data_ids: Iterable[int]) -> StatementLambdaElement:
     """Delete event_data rows."""
     return lambda_stmt(
@@ -566,6 +608,18 @@ def delete_event_rows(
     )
 
 
+def delete_event_rows_range(
+    first_event_id: int, last_event_id: int
+) -> StatementLambdaElement:
+    """Delete a range of events rows by primary key."""
+    return lambda_stmt(
+        lambda: delete(Events)
+        .where(Events.event_id >= first_event_id)
+        .where(Events.event_id <= last_event_id)
+        .execution_options(synchronize_session=False)
+    )
+
+
 def delete_recorder_runs_rows(
     purge_before: datetime, current_run_id: int
 ) -> StatementLambdaElement:
@@ -596,6 +650,34 @@ def find_states_to_purge(purge_before: datetime) -> StatementLambdaElement:
     )
 
 
+def find_events_id_range_to_purge(purge_before: datetime) -> StatementLambdaElement:
+    """Find the id of the oldest event and the newest event to purge."""
+    return lambda_stmt(
+        lambda: select(
+            select(func.min(Events.event_id)).scalar_subquery(),
+            select(Events.event_id)
+            .filter(Events.time_fired < purge_before)
+            .order_by(Events.time_fired.desc())
+            .limit(1)
+            .scalar_subquery(),
+        )
+    )
+
+
+def find_states_id_range_to_purge(purge_before: datetime) -> StatementLambdaElement:
+    """Find the id of the oldest state and the newest state to purge."""
+    return lambda_stmt(
+        lambda: select(
+            select(func.min(States.state_id)).scalar_subquery(),
+            select(States.state_id)
+            .filter(States.last_updated < purge_before)
+            .order_by(States.last_updated.desc())
+            .limit(1)
+            .scalar_subquery(),
+        )
+    )
+
+
 def find_short_term_statistics_to_purge(
     purge_before: datetime,
 ) -> StatementLambdaElement:
@@ -640,3 +722,138 @@ def find_legacy_event_state_and_attributes_and_data_ids_to_purge(
 def find_legacy_row() -> StatementLambdaElement:
     """Check if there are still states in the table with an event_id."""
     return lambda_stmt(lambda: select(func.max(States.event_id)))
+
+
+def find_entity_ids_to_migrate() -> StatementLambdaElement:
+    """Find entity_ids that are still stored in the states table."""
+    return lambda_stmt(
+        lambda: select(distinct(States.entity_id)).filter(States.entity_id.isnot(None))
+    )
+
+
+def find_states_to_migrate(entity_id: str) -> StatementLambdaElement:
+    """Find a batch of states that still store the entity_id."""
+    return lambda_stmt(
+        lambda: select(States.state_id)
+        .filter(States.entity_id == entity_id)
+        .limit(MAX_ROWS_TO_PURGE)
+    )
+
+
+def migrate_states_to_metadata_id(
+    state_ids: Iterable[int], metadata_id: int
+) -> StatementLambdaElement:
+    """Link states rows to their states_meta row and drop the entity_id."""
+    return lambda_stmt(
+        lambda: update(States)
+        .where(States.state_id.in_(state_ids))
+        .values(metadata_id=metadata_id, entity_id=None)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def find_events_context_ids_to_migrate(last_event_id: int) -> StatementLambdaElement:
+    """Find the next batch of events with string context ids."""
+    return lambda_stmt(
+        lambda: select(
+            Events.event_id,
+            Events.context_id,
+            Events.context_user_id,
+            Events.context_parent_id,
+        )
+        .filter(Events.event_id > last_event_id)
+        .order_by(Events.event_id)
+        .limit(MAX_ROWS_TO_PURGE)
+    )
+
+
+def find_states_context_ids_to_migrate(last_state_id: int) -> StatementLambdaElement:
+    """Find the next batch of states with string context ids."""
+    return lambda_stmt(
+        lambda: select(
+            States.state_id,
+            States.context_id,
+            States.context_user_id,
+            States.context_parent_id,
+        )
+        .filter(States.state_id > last_state_id)
+        .order_by(States.state_id)
+        .limit(MAX_ROWS_TO_PURGE)
+    )
+
+
+def find_last_state_id() -> StatementLambdaElement:
+    """Find the highest state_id."""
+    return lambda_stmt(lambda: select(func.max(States.state_id)))
+
+
+def find_states_after(state_id: int) -> StatementLambdaElement:
+    """Find the state_ids after a state_id in insert order."""
+    return lambda_stmt(
+        lambda: select(States.state_id)
+        .filter(States.state_id > state_id)
+        .order_by(States.state_id)
+    )
+
+
+def find_last_attributes_id() -> StatementLambdaElement:
+    """Find the highest attributes_id."""
+    return lambda_stmt(lambda: select(func.max(StateAttributes.attributes_id)))
+
+
+def find_state_attributes_after(attributes_id: int) -> StatementLambdaElement:
+    """Find the attributes_id and shared_attrs of the rows after an attributes_id."""
+    return lambda_stmt(
+        lambda: select(
+            StateAttributes.attributes_id, StateAttributes.shared_attrs
+        ).filter(StateAttributes.attributes_id > attributes_id)
+    )
+
+
+def find_last_data_id() -> StatementLambdaElement:
+    """Find the highest data_id."""
+    return lambda_stmt(lambda: select(func.max(EventData.data_id)))
+
+
+def find_event_data_after(data_id: int) -> StatementLambdaElement:
+    """Find the data_id and shared_data of the rows after a data_id."""
+    return lambda_stmt(
+        lambda: select(EventData.data_id, EventData.shared_data).filter(
+            EventData.data_id > data_id
+        )
+    )
+
+
+def find_last_metadata_id() -> StatementLambdaElement:
+    """Find the highest states metadata_id."""
+    return lambda_stmt(lambda: select(func.max(StatesMeta.metadata_id)))
+
+
+def find_states_meta_after(metadata_id: int) -> StatementLambdaElement:
+    """Find the metadata_id and entity_id of the rows after a metadata_id."""
+    return lambda_stmt(
+        lambda: select(StatesMeta.metadata_id, StatesMeta.entity_id).filter(
+            StatesMeta.metadata_id > metadata_id
+        )
+    )
+
+
+def find_recent_shared_attributes(limit: int) -> StatementLambdaElement:
+    """Find the attributes_id and shared_attrs of the most recent states."""
+    # MySQL and MariaDB don't support LIMIT in an IN subquery,
+    # so the most recent states are selected from a derived table
+    recent_states = (
+        select(States.attributes_id)
+        .order_by(States.state_id.desc())
+        .limit(limit)
+        .subquery()
+    )
+    recent_attributes_ids = select(recent_states.c.attributes_id).distinct().subquery()
+    return lambda_stmt(
+        lambda: select(StateAttributes.attributes_id, StateAttributes.shared_attrs)
+        .join(
+            recent_attributes_ids,
+            StateAttributes.attributes_id == recent_attributes_ids.c.attributes_id,
+        )
+        .order_by(StateAttributes.attributes_id)
+    )
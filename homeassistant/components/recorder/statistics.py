@@ -11,14 +11,15 @@ import json
 import logging
 import os
 import re
-from statistics import mean
 from typing import TYPE_CHECKING, Any, Literal, overload
 
-from sqlalchemy import bindparam, func
+from sqlalchemy import Integer, bindparam, func, literal, null, select, union_all
 from sqlalchemy.exc import SQLAlchemyError, StatementError
 from sqlalchemy.ext import baked
+from sqlalchemy.orm import aliased
 from sqlalchemy.orm.session import Session
 from sqlalchemy.sql.expression import literal_column, true
+from sqlalchemy.sql.selectable import CTE, Select
 import voluptuous as vol
 
 from homeassistant.const import (
@@ -122,6 +123,9 @@ QUERY_STATISTIC_META_ID = [
 
 STATISTICS_BAKERY = "recorder_statistics_bakery"
 
+# The maximum number of periods reduced by a single query
+MAX_PERIODS_PER_QUERY = 100
+
 
 # Convert pressure, temperature and volume statistics from the normalized unit used for
 # statistics to the unit configured by the user
@@ -877,54 +881,6 @@ def _statistics_during_period_query(
     return baked_query  # type: ignore[no-any-return]
 
 
-def _reduce_statistics(
-    stats: dict[str, list[dict[str, Any]]],
-    same_period: Callable[[datetime, datetime], bool],
-    period_start_end: Callable[[datetime], tuple[datetime, datetime]],
-    period: timedelta,
-) -> dict[str, list[dict[str, Any]]]:
-    """Reduce hourly statistics to daily or monthly statistics."""
-    result: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    for statistic_id, stat_list in stats.items():
-        max_values: list[float] = []
-        mean_values: list[float] = []
-        min_values: list[float] = []
-        prev_stat: dict[str, Any] = stat_list[0]
-
-        # Loop over the hourly statistics + a fake entry to end the period
-        for statistic in chain(
-            stat_list, ({"start": stat_list[-1]["start"] + period},)
-        ):
-            if not same_period(prev_stat["start"], statistic["start"]):
-                start, end = period_start_end(prev_stat["start"])
-                # The previous statistic was the last entry of the period
-                result[statistic_id].append(
-                    {
-                        "statistic_id": statistic_id,
-                        "start": start.isoformat(),
-                        "end": end.isoformat(),
-                        "mean": mean(mean_values) if mean_values else None,
-                        "min": min(min_values) if min_values else None,
-                        "max": max(max_values) if max_values else None,
-                        "last_reset": prev_stat.get("last_reset"),
-                        "state": prev_stat.get("state"),
-                        "sum": prev_stat["sum"],
-                    }
-                )
-                max_values = []
-                mean_values = []
-                min_values = []
-            if statistic.get("max") is not None:
-                max_values.append(statistic["max"])
-            if statistic.get("mean") is not None:
-                mean_values.append(statistic["mean"])
-            if statistic.get("min") is not None:
-                min_values.append(statistic["min"])
-            prev_stat = statistic
-
-    return result
-
-
 def same_day(time1: datetime, time2: datetime) -> bool:
     """Return True if time1 and time2 are in the same date."""
     date1 = dt_util.as_local(time1).date()
@@ -934,19 +890,22 @@ def same_day(time1: datetime, time2: datetime) -> bool:
 
 def day_start_end(time: datetime) -> tuple[datetime, datetime]:
     """Return the start and end of the period (day) time is within."""
-    start = dt_util.as_utc(
-        dt_util.as_local(time).replace(hour=0, minute=0, second=0, microsecond=0)
+    start_local = dt_util.as_local(time).replace(
+        hour=0, minute=0, second=0, microsecond=0
     )
-    end = start + timedelta(days=1)
-    return (start, end)
-
+    # The end is calculated in local time, a day is not 24 hours when DST changes
+    end_local = start_local + timedelta(days=1)
+    return (dt_util.as_utc(start_local), dt_util.as_utc(end_local))
 
-def _reduce_statistics_per_day(
-    stats: dict[str, list[dict[str, Any]]]
-) -> dict[str, list[dict[str, Any]]]:
-    """Reduce hourly statistics to daily statistics."""
 
-    return _reduce_statistics(stats, same_day, day_start_end, timedelta(days=1))
+def week_start_end(time: datetime) -> tuple[datetime, datetime]:
+    """Return the start and end of the period (week) time is within."""
+    time_local = dt_util.as_local(time)
+    start_local = time_local.replace(
+        hour=0, minute=0, second=0, microsecond=0
+    ) - timedelta(days=time_local.weekday())
+    end_local = start_local + timedelta(days=7)
+    return (dt_util.as_utc(start_local), dt_util.as_utc(end_local))
 
 
 def same_month(time1: datetime, time2: datetime) -> bool:
@@ -967,12 +926,299 @@ def month_start_end(time: datetime) -> tuple[datetime, datetime]:
     return (start, end)
 
 
-def _reduce_statistics_per_month(
-    stats: dict[str, list[dict[str, Any]]],
+def year_start_end(time: datetime) -> tuple[datetime, datetime]:
+    """Return the start and end of the period (year) time is within."""
+    start_local = dt_util.as_local(time).replace(
+        month=1, day=1, hour=0, minute=0, second=0, microsecond=0
+    )
+    end_local = start_local.replace(year=start_local.year + 1)
+    return (dt_util.as_utc(start_local), dt_util.as_utc(end_local))
+
+
+PERIOD_START_END: dict[str, Callable[[datetime], tuple[datetime, datetime]]] = {
+    "day": day_start_end,
+    "week": week_start_end,
+    "month": month_start_end,
+    "year": year_start_end,
+}
+
+
+def _periods_cte(periods: list[tuple[datetime, datetime]]) -> CTE:
+    """Generate a table of the periods with their index, start and end."""
+    return union_all(
+        *(
+            select(
+                literal(idx, Integer).label("idx"),
+                literal(period_start, Statistics.start.type).label("period_start"),
+                literal(period_end, Statistics.start.type).label("period_end"),
+            )
+            for idx, (period_start, period_end) in enumerate(periods)
+        )
+    ).cte("periods")
+
+
+def _reduced_statistics_query(
+    periods: list[tuple[datetime, datetime]],
+    metadata_ids: list[int],
+    has_mean: bool,
+) -> Select:
+    """Generate a query which reduces hourly statistics to the periods.
+
+    For statistics with a mean the hourly statistics are joined to the
+    periods and the mean, min and max are aggregated with GROUP BY. For
+    statistics without a mean only the first and last hourly statistics of
+    each period are looked up, which only needs index lookups. The last
+    hourly statistics of each period are joined to get the state and sum.
+    """
+    periods_cte = _periods_cte(periods)
+    if has_mean:
+        reduced = (
+            select(
+                Statistics.metadata_id.label("metadata_id"),
+                periods_cte.c.idx.label("period"),
+                func.avg(Statistics.mean).label("mean"),
+                func.count(Statistics.mean).label("mean_count"),
+                func.min(Statistics.min).label("min"),
+                func.max(Statistics.max).label("max"),
+                func.min(Statistics.start).label("first_start"),
+                func.max(Statistics.start).label("last_start"),
+            )
+            .select_from(periods_cte)
+            .join(
+                Statistics,
+                (Statistics.start >= periods_cte.c.period_start)
+                & (Statistics.start < periods_cte.c.period_end),
+            )
+            .where(Statistics.metadata_id.in_(metadata_ids))
+            .group_by(Statistics.metadata_id, periods_cte.c.idx)
+            .subquery()
+        )
+        aggregated_columns = (
+            reduced.c.mean,
+            reduced.c.mean_count,
+            reduced.c.min,
+            reduced.c.max,
+        )
+    else:
+        hourly = aliased(Statistics)
+        in_period = (
+            (hourly.metadata_id == StatisticsMeta.id)
+            & (hourly.start >= periods_cte.c.period_start)
+            & (hourly.start < periods_cte.c.period_end)
+        )
+        reduced = (
+            select(
+                StatisticsMeta.id.label("metadata_id"),
+                periods_cte.c.idx.label("period"),
+                select(func.min(hourly.start))
+                .where(in_period)
+                .scalar_subquery()
+                .label("first_start"),
+                select(func.max(hourly.start))
+                .where(in_period)
+                .scalar_subquery()
+                .label("last_start"),
+            )
+            .select_from(StatisticsMeta)
+            .join(periods_cte, true())
+            .where(StatisticsMeta.id.in_(metadata_ids))
+            .subquery()
+        )
+        aggregated_columns = (
+            null().label("mean"),
+            literal_column("0").label("mean_count"),
+            null().label("min"),
+            null().label("max"),
+        )
+    return (
+        select(
+            reduced.c.metadata_id,
+            reduced.c.period,
+            *aggregated_columns,
+            reduced.c.first_start,
+            Statistics.last_reset,
+            Statistics.state,
+            Statistics.sum,
+        )
+        .select_from(reduced)
+        .join(
+            Statistics,
+            (Statistics.metadata_id == reduced.c.metadata_id)
+            & (Statistics.start == reduced.c.last_start),
+        )
+    )
+
+
+def _reduced_statistics_during_period(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    metadata_ids: list[int] | None,
+    _metadata: dict[str, tuple[int, StatisticMetaData]],
+    period_start_end: Callable[[datetime], tuple[datetime, datetime]],
+    start_time_as_datetime: bool,
 ) -> dict[str, list[dict[str, Any]]]:
-    """Reduce hourly statistics to monthly statistics."""
+    """Reduce hourly statistics to daily, weekly, monthly or yearly statistics.
+
+    The periods are calculated in local time, and the hourly statistics are
+    reduced to the periods by the database.
+    """
+    range_query = session.query(
+        func.min(Statistics.start), func.max(Statistics.start)
+    ).filter(Statistics.start >= start_time)
+    if end_time is not None:
+        range_query = range_query.filter(Statistics.start < end_time)
+    if metadata_ids is not None:
+        range_query = range_query.filter(Statistics.metadata_id.in_(metadata_ids))
+    first_start, last_start = range_query.one()
+    if first_start is None:
+        return {}
+    first_start = process_timestamp(first_start)
+    last_start = process_timestamp(last_start)
+
+    # The first and last period are clipped to the requested time range
+    periods: list[tuple[datetime, datetime]] = []
+    period_start, period_end = period_start_end(first_start)
+    while period_start <= last_start:
+        periods.append((period_start, period_end))
+        period_start, period_end = period_start_end(period_end)
+    query_periods = [
+        (
+            max(period_start, start_time),
+            min(period_end, end_time) if end_time is not None else period_end,
+        )
+        for period_start, period_end in periods
+    ]
 
-    return _reduce_statistics(stats, same_month, month_start_end, timedelta(days=31))
+    if metadata_ids is None:
+        metadata_ids = [metadata_id for metadata_id, _ in _metadata.values()]
+    metadata_ids_set = set(metadata_ids)
+    metadata_ids_by_has_mean: dict[bool, list[int]] = defaultdict(list)
+    for metadata_id, meta in _metadata.values():
+        if metadata_id in metadata_ids_set:
+            metadata_ids_by_has_mean[meta["has_mean"]].append(metadata_id)
+
+    # Each period has three bound parameters and each metadata_id has one
+    ids_per_query = MAX_ROWS_TO_PURGE - 3 * MAX_PERIODS_PER_QUERY
+    # The rows are metadata_id, period, mean, mean_count, min, max,
+    # first_start, last_reset, state and sum
+    rows: list[list[Any]] = []
+    for has_mean, has_mean_ids in metadata_ids_by_has_mean.items():
+        for ids_idx in range(0, len(has_mean_ids), ids_per_query):
+            for idx in range(0, len(query_periods), MAX_PERIODS_PER_QUERY):
+                chunk_rows = [
+                    list(row)
+                    for row in execute(
+                        session.execute(
+                            _reduced_statistics_query(
+                                query_periods[idx : idx + MAX_PERIODS_PER_QUERY],
+                                has_mean_ids[ids_idx : ids_idx + ids_per_query],
+                                has_mean,
+                            )
+                        )
+                    )
+                ]
+                if idx:
+                    for row in chunk_rows:
+                        row[1] += idx
+                rows.extend(chunk_rows)
+    rows.sort(key=lambda row: row[:2])
+
+    # Fetch last known statistics for the statistics which start after start_time
+    stats_at_start_time = {}
+    need_stat_at_start_time = {
+        meta_id
+        for meta_id, group in groupby(rows, lambda row: row[0])
+        if process_timestamp(next(group)[6]) > start_time
+    }
+    if need_stat_at_start_time:
+        for stat in (
+            _statistics_at_time(
+                session, need_stat_at_start_time, Statistics, start_time
+            )
+            or ()
+        ):
+            stats_at_start_time[stat.metadata_id] = stat
+
+    def _format_period(
+        period_start: datetime, period_end: datetime
+    ) -> tuple[datetime | str, str]:
+        """Format the start and end of a period."""
+        return (
+            period_start if start_time_as_datetime else period_start.isoformat(),
+            period_end.isoformat(),
+        )
+
+    # The periods are the same for all statistics, format them once
+    formatted_periods = [_format_period(*period) for period in periods]
+    result: dict[str, list[dict[str, Any]]] = {}
+    units = hass.config.units
+    metadata = dict(_metadata.values())
+    for meta_id, group in groupby(rows, lambda row: row[0]):
+        unit = metadata[meta_id]["unit_of_measurement"]
+        statistic_id = metadata[meta_id]["statistic_id"]
+        convert: Callable[[Any, Any], float | None]
+        convert = STATISTIC_UNIT_TO_DISPLAY_UNIT_CONVERSIONS.get(unit, lambda x, units: x)  # type: ignore[arg-type,no-any-return]
+        ent_results = result[statistic_id] = []
+        reduced = [[*formatted_periods[row[1]], *row[2:6], *row[7:]] for row in group]
+        if (stat := stats_at_start_time.get(meta_id)) is not None:
+            stat_period = _format_period(
+                *period_start_end(process_timestamp(stat.start))
+            )
+            mean_count = int(stat.mean is not None)
+            if stat_period[0] != reduced[0][0]:
+                reduced.insert(
+                    0,
+                    [
+                        *stat_period,
+                        stat.mean,
+                        mean_count,
+                        stat.min,
+                        stat.max,
+                        stat.last_reset,
+                        stat.state,
+                        stat.sum,
+                    ],
+                )
+            else:
+                # The last known statistics are in the first period
+                first = reduced[0]
+                if mean_count:
+                    first[2] = ((first[2] or 0.0) * first[3] + stat.mean) / (
+                        first[3] + 1
+                    )
+                    first[3] += 1
+                if stat.min is not None:
+                    first[4] = stat.min if first[4] is None else min(first[4], stat.min)
+                if stat.max is not None:
+                    first[5] = stat.max if first[5] is None else max(first[5], stat.max)
+        for (
+            start,
+            end,
+            mean_,
+            _,
+            min_,
+            max_,
+            last_reset,
+            state,
+            sum_,
+        ) in reduced:
+            ent_results.append(
+                {
+                    "statistic_id": statistic_id,
+                    "start": start,
+                    "end": end,
+                    "mean": convert(mean_, units),
+                    "min": convert(min_, units),
+                    "max": convert(max_, units),
+                    "last_reset": process_timestamp_to_utc_isoformat(last_reset),
+                    "state": convert(state, units),
+                    "sum": convert(sum_, units),
+                }
+            )
+
+    return result
 
 
 def statistics_during_period(
@@ -980,13 +1226,15 @@ def statistics_during_period(
     start_time: datetime,
     end_time: datetime | None = None,
     statistic_ids: list[str] | None = None,
-    period: Literal["5minute", "day", "hour", "month"] = "hour",
+    period: Literal["5minute", "day", "hour", "week", "month", "year"] = "hour",
     start_time_as_datetime: bool = False,
 ) -> dict[str, list[dict[str, Any]]]:
     """Return statistics during UTC period start_time - end_time for the statistic_ids.
 
     If end_time is omitted, returns statistics newer than or equal to start_time.
     If statistic_ids is omitted, returns statistics for all statistics ids.
+    Daily, weekly, monthly and yearly statistics are reduced from the hourly
+    statistics by the database.
     """
     metadata = None
     with session_scope(hass=hass) as session:
@@ -999,6 +1247,18 @@ def statistics_during_period(
         if statistic_ids is not None:
             metadata_ids = [metadata_id for metadata_id, _ in metadata.values()]
 
+        if period in PERIOD_START_END:
+            return _reduced_statistics_during_period(
+                hass,
+                session,
+                start_time,
+                end_time,
+                metadata_ids,
+                metadata,
+                PERIOD_START_END[period],
+                start_time_as_datetime,
+            )
+
         bakery = hass.data[STATISTICS_BAKERY]
         if period == "5minute":
             baked_query = bakery(
@@ -1021,28 +1281,18 @@ def statistics_during_period(
         if not stats:
             return {}
         # Return statistics combined with metadata
-        if period not in ("day", "month"):
-            return _sorted_statistics_to_dict(
-                hass,
-                session,
-                stats,
-                statistic_ids,
-                metadata,
-                True,
-                table,
-                start_time,
-                start_time_as_datetime,
-            )
-
-        result = _sorted_statistics_to_dict(
-            hass, session, stats, statistic_ids, metadata, True, table, start_time, True
+        return _sorted_statistics_to_dict(
+            hass,
+            session,
+            stats,
+            statistic_ids,
+            metadata,
+            True,
+            table,
+            start_time,
+            start_time_as_datetime,
         )
 
-        if period == "day":
-            return _reduce_statistics_per_day(result)
-
-        return _reduce_statistics_per_month(result)
-
 
 def _get_last_statistics(
     hass: HomeAssistant,
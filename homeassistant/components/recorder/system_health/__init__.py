@@ -54,7 +54,15 @@ async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
         db_stats = await instance.async_add_executor_job(
             _get_db_stats, instance, database_name
         )
-    return {
-        "oldest_recorder_run": run_history.first.start,
-        "current_recorder_run": run_history.current.start,
-    } | db_stats
+    cache_stats = {
+        f"{cache}_id_cache": f"{hits} hits, {misses} misses"
+        for cache, (hits, misses) in instance.get_id_cache_stats().items()
+    }
+    return (
+        {
+            "oldest_recorder_run": run_history.first.start,
+            "current_recorder_run": run_history.current.start,
+        }
+        | db_stats
+        | cache_stats
+    )
@@ -169,6 +169,20 @@ class WaitTask(RecorderTask):
         instance._queue_watch.set()  # pylint: disable=[protected-access]
 
 
+@dataclass
+class SynchronizeTask(RecorderTask):
+    """Ensure all pending data has been committed."""
+
+    # commit_before is the default
+    event: asyncio.Event
+
+    def run(self, instance: Recorder) -> None:
+        """Handle the task."""
+        # The asyncio.Event is not thread safe
+        # so it must be set from the event loop
+        instance.hass.loop.call_soon_threadsafe(self.event.set)
+
+
 @dataclass
 class DatabaseLockTask(RecorderTask):
     """An object to insert into the recorder queue to prevent writes to the database."""
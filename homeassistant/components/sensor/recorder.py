@@ -3,6 +3,8 @@ from __future__ import annotations
 
 from collections import defaultdict
 from collections.abc import Callable, Iterable, MutableMapping
+from concurrent.futures import TimeoutError as FutTimeoutError
+import dataclasses
 import datetime
 import itertools
 import logging
@@ -29,6 +31,7 @@ from homeassistant.const import (
     ENERGY_KILO_WATT_HOUR,
     ENERGY_MEGA_WATT_HOUR,
     ENERGY_WATT_HOUR,
+    EVENT_STATE_CHANGED,
     POWER_KILO_WATT,
     POWER_WATT,
     PRESSURE_BAR,
@@ -44,9 +47,10 @@ from homeassistant.const import (
     VOLUME_CUBIC_FEET,
     VOLUME_CUBIC_METERS,
 )
-from homeassistant.core import HomeAssistant, State
+from homeassistant.core import Event, HomeAssistant, State, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity import entity_sources
+from homeassistant.util.async_ import run_callback_threadsafe
 import homeassistant.util.dt as dt_util
 import homeassistant.util.pressure as pressure_util
 import homeassistant.util.temperature as temperature_util
@@ -128,6 +132,16 @@ WARN_UNSTABLE_UNIT = "sensor_warn_unstable_unit"
 # Link to dev statistics where issues around LTS can be fixed
 LINK_DEV_STATISTICS = "https://my.home-assistant.io/redirect/developer_statistics"
 
+DATA_STATISTICS_ACCUMULATOR = "sensor_statistics_accumulator"
+# The length of a short term statistics period
+ACCUMULATOR_WINDOW = datetime.timedelta(minutes=5)
+# Accumulated windows are kept for an hour in case the
+# recorder is behind, older windows are compiled from the database
+ACCUMULATOR_MAX_WINDOWS = 12
+# How long compiling statistics waits for the event loop to hand over
+# the accumulated windows before compiling them from the database
+ACCUMULATOR_HANDOVER_TIMEOUT = 10
+
 
 def _get_sensor_states(hass: HomeAssistant) -> list[State]:
     """Get the current state of all sensors for which to compile statistics."""
@@ -385,6 +399,341 @@ def _last_reset_as_utc_isoformat(last_reset_s: Any, entity_id: str) -> str | Non
     return dt_util.as_utc(last_reset).isoformat()
 
 
+def _window_start(time: datetime.datetime) -> datetime.datetime:
+    """Return the start of the 5-minute statistics period time is in."""
+    return time.replace(minute=time.minute - time.minute % 5, second=0, microsecond=0)
+
+
+@dataclasses.dataclass(frozen=True)
+class AccumulatedWindow:
+    """The accumulated statistics of a sensor during a 5-minute period."""
+
+    has_sum: bool
+    device_class: str | None
+    # The states during the period, for sensors with a sum
+    states: tuple[State, ...] = ()
+    # The normalized unit, mean, min and max for sensors with a mean,
+    # the mean is None if the sensor had no numeric states
+    unit: str | None = None
+    mean: float | None = None
+    min: float | None = None
+    max: float | None = None
+
+
+class _EntityAccumulator:
+    """Accumulate the statistics of a sensor as its state changes.
+
+    The mean, min and max are kept as running values, sensors with a sum keep
+    the states of the period since compiling the sum needs the previous
+    statistics.
+    """
+
+    __slots__ = (
+        "has_sum",
+        "device_class",
+        "last_state",
+        "windows",
+        "window_start",
+        "window_end",
+        "partial",
+        "valid",
+        "states",
+        "units",
+        "fstate",
+        "fstate_time",
+        "mean_start",
+        "accumulated",
+        "min",
+        "max",
+    )
+
+    def __init__(
+        self,
+        has_sum: bool,
+        device_class: str | None,
+        window_start: datetime.datetime,
+        last_state: State | None,
+        partial: bool = False,
+    ) -> None:
+        """Initialize the accumulator."""
+        self.has_sum = has_sum
+        self.device_class = device_class
+        self.last_state = last_state
+        self.windows: dict[datetime.datetime, AccumulatedWindow] = {}
+        self._start_window(window_start)
+        # A partial window is missing the states before the accumulator was created
+        self.partial = partial
+
+    def _start_window(self, window_start: datetime.datetime) -> None:
+        """Start a new window, carrying over the last state."""
+        self.window_start = window_start
+        self.window_end = window_start + ACCUMULATOR_WINDOW
+        self.partial = False
+        self.valid = True
+        self.states: list[State] = []
+        self.units: set[str | None] = set()
+        self.fstate: float | None = None
+        self.fstate_time: datetime.datetime | None = None
+        self.mean_start: datetime.datetime | None = None
+        self.accumulated = 0.0
+        self.min: float | None = None
+        self.max: float | None = None
+        if (last_state := self.last_state) is None:
+            return
+        if self.has_sum:
+            self.states.append(last_state)
+        elif (normalized := self._normalize(last_state)) is not None:
+            self._add_value(*normalized, window_start)
+
+    def _normalize(self, state: State) -> tuple[float, str | None] | None:
+        """Normalize the value and unit of a state like _normalize_states."""
+        try:
+            fstate = _parse_float(state.state)
+        except (ValueError, TypeError):
+            return None
+        unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+        if (device_class := self.device_class) not in UNIT_CONVERSIONS:
+            return fstate, unit
+        if unit not in UNIT_CONVERSIONS[device_class]:
+            # Leave the warning to compiling the period from the database
+            self.valid = False
+            return None
+        return (
+            UNIT_CONVERSIONS[device_class][unit](fstate),
+            DEVICE_CLASS_UNITS[device_class],
+        )
+
+    def _add_value(
+        self, fstate: float, unit: str | None, time: datetime.datetime
+    ) -> None:
+        """Add a value to the running mean, min and max."""
+        self.units.add(unit)
+        if self.fstate is None:
+            # Adjust the start of the mean if there was no last known state
+            self.mean_start = time
+            self.min = self.max = fstate
+        else:
+            assert self.fstate_time is not None
+            self.accumulated += self.fstate * (time - self.fstate_time).total_seconds()
+            self.min = min(self.min, fstate)  # type: ignore[type-var]
+            self.max = max(self.max, fstate)  # type: ignore[type-var]
+        self.fstate = fstate
+        self.fstate_time = time
+
+    def _finish_window(self) -> AccumulatedWindow | None:
+        """Return the statistics of the current window.
+
+        Returns None if the window has to be compiled from the database.
+        """
+        if self.partial or not self.valid or self.last_state is None:
+            return None
+        if self.has_sum:
+            return AccumulatedWindow(True, self.device_class, states=tuple(self.states))
+        if self.fstate is None:
+            return AccumulatedWindow(False, self.device_class)
+        if len(self.units) > 1:
+            return None
+        assert self.fstate_time is not None and self.mean_start is not None
+        accumulated = (
+            self.accumulated
+            + self.fstate * (self.window_end - self.fstate_time).total_seconds()
+        )
+        return AccumulatedWindow(
+            False,
+            self.device_class,
+            unit=next(iter(self.units)),
+            mean=accumulated / (self.window_end - self.mean_start).total_seconds(),
+            min=self.min,
+            max=self.max,
+        )
+
+    def roll(self, time: datetime.datetime) -> None:
+        """Close the windows which ended at or before time."""
+        while self.window_end <= time:
+            if (window := self._finish_window()) is not None:
+                self.windows[self.window_start] = window
+            # Windows without state changes are all the same, skip
+            # the ones which would not be kept anyway
+            self._start_window(
+                max(
+                    self.window_end,
+                    _window_start(time) - ACCUMULATOR_WINDOW * ACCUMULATOR_MAX_WINDOWS,
+                )
+            )
+        while len(self.windows) > ACCUMULATOR_MAX_WINDOWS:
+            del self.windows[next(iter(self.windows))]
+
+    def add(self, state: State) -> None:
+        """Add a state change."""
+        if state is self.last_state:
+            return
+        self.roll(state.last_updated)
+        self.last_state = state
+        if self.has_sum:
+            self.states.append(state)
+            return
+        # Only significant changes are used for the mean, min and max
+        if state.last_changed != state.last_updated:
+            return
+        if (normalized := self._normalize(state)) is not None:
+            self._add_value(*normalized, state.last_updated)
+
+
+class SensorStatisticsAccumulator:
+    """Accumulate the 5-minute statistics of sensors as their states change.
+
+    The accumulator is only used from the event loop, the recorder thread
+    gets the finished windows with pop_windows which hands them over from
+    the event loop. A window which was not fully seen, for example after a
+    restart, is compiled from the database instead.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the accumulator."""
+        self._hass = hass
+        self._entities: dict[str, _EntityAccumulator] = {}
+
+    @callback
+    def async_add(self, new_state: State, old_state: State | None) -> None:
+        """Add a state change of a sensor."""
+        entity_id = new_state.entity_id
+        has_sum = "sum" in DEFAULT_STATISTICS[new_state.attributes[ATTR_STATE_CLASS]]
+        device_class = new_state.attributes.get(ATTR_DEVICE_CLASS)
+        last_updated = new_state.last_updated
+        if (entity := self._entities.get(entity_id)) is not None and (
+            entity.has_sum != has_sum
+            or entity.device_class != device_class
+            or last_updated < entity.window_start
+            or (
+                entity.last_state is not None
+                and last_updated < entity.last_state.last_updated
+            )
+        ):
+            entity = None
+        if entity is None:
+            window_start = _window_start(last_updated)
+            if old_state is not None and old_state.last_updated < window_start:
+                entity = _EntityAccumulator(
+                    has_sum, device_class, window_start, old_state
+                )
+            else:
+                entity = _EntityAccumulator(
+                    has_sum, device_class, window_start, None, partial=True
+                )
+            self._entities[entity_id] = entity
+        entity.add(new_state)
+
+    @callback
+    def async_remove(self, entity_id: str) -> None:
+        """Stop accumulating a sensor."""
+        self._entities.pop(entity_id, None)
+
+    def pop_windows(
+        self,
+        sensor_states: list[State],
+        wanted_statistics: dict[str, set[str]],
+        start: datetime.datetime,
+        end: datetime.datetime,
+    ) -> dict[str, AccumulatedWindow]:
+        """Return the accumulated statistics during start-end.
+
+        Must not be run in the event loop, nothing is returned if the
+        event loop does not hand over the windows in time.
+        """
+        future = run_callback_threadsafe(
+            self._hass.loop,
+            self._async_pop_windows,
+            sensor_states,
+            wanted_statistics,
+            start,
+            end,
+        )
+        try:
+            return future.result(ACCUMULATOR_HANDOVER_TIMEOUT)
+        except FutTimeoutError:
+            _LOGGER.debug("Timed out waiting for the accumulated statistics")
+            return {}
+
+    @callback
+    def _async_pop_windows(
+        self,
+        sensor_states: list[State],
+        wanted_statistics: dict[str, set[str]],
+        start: datetime.datetime,
+        end: datetime.datetime,
+    ) -> dict[str, AccumulatedWindow]:
+        """Return the accumulated statistics during start-end.
+
+        Sensors which are not accumulated yet, because they have not
+        changed, start accumulating with the next period.
+        """
+        windows: dict[str, AccumulatedWindow] = {}
+        for state in sensor_states:
+            entity_id = state.entity_id
+            has_sum = "sum" in wanted_statistics[entity_id]
+            device_class = state.attributes.get(ATTR_DEVICE_CLASS)
+            if (entity := self._entities.get(entity_id)) is None:
+                if state.last_updated < end:
+                    entity = _EntityAccumulator(has_sum, device_class, end, state)
+                else:
+                    entity = _EntityAccumulator(
+                        has_sum,
+                        device_class,
+                        _window_start(state.last_updated),
+                        state,
+                        partial=True,
+                    )
+                self._entities[entity_id] = entity
+                continue
+            entity.roll(end)
+            if (
+                (window := entity.windows.pop(start, None)) is not None
+                and window.has_sum == has_sum
+                and window.device_class == device_class
+            ):
+                windows[entity_id] = window
+        return windows
+
+
+@callback
+def async_setup_statistics(hass: HomeAssistant) -> None:
+    """Accumulate the statistics of sensors as their states change."""
+    accumulator = hass.data[DATA_STATISTICS_ACCUMULATOR] = SensorStatisticsAccumulator(
+        hass
+    )
+    # The recorder entity filter does not change at runtime
+    entities_recorded: dict[str, bool] = {}
+
+    @callback
+    def _async_sensor_filter(event: Event) -> bool:
+        """Filter state changes of sensors."""
+        return bool(event.data["entity_id"].startswith(f"{DOMAIN}."))
+
+    @callback
+    def _async_sensor_state_changed(event: Event) -> None:
+        """Add a state change of a sensor."""
+        entity_id: str = event.data["entity_id"]
+        new_state: State | None = event.data.get("new_state")
+        if (recorded := entities_recorded.get(entity_id)) is None:
+            recorded = entities_recorded[entity_id] = is_entity_recorded(
+                hass, entity_id
+            )
+        if (
+            not recorded
+            or new_state is None
+            or new_state.attributes.get(ATTR_STATE_CLASS) not in STATE_CLASSES
+        ):
+            accumulator.async_remove(entity_id)
+            return
+        accumulator.async_add(new_state, event.data.get("old_state"))
+
+    hass.bus.async_listen(
+        EVENT_STATE_CHANGED,
+        _async_sensor_state_changed,
+        event_filter=_async_sensor_filter,
+    )
+
+
 def compile_statistics(
     hass: HomeAssistant, start: datetime.datetime, end: datetime.datetime
 ) -> statistics.PlatformCompiledStatistics:
@@ -412,9 +761,18 @@ def _compile_statistics(  # noqa: C901
         hass, session, statistic_ids=[i.entity_id for i in sensor_states]
     )
 
+    # Use the statistics accumulated while the states changed when possible
+    accumulated: dict[str, AccumulatedWindow] = {}
+    if accumulator := hass.data.get(DATA_STATISTICS_ACCUMULATOR):
+        accumulated = accumulator.pop_windows(
+            sensor_states, wanted_statistics, start, end
+        )
+
     # Get history between start and end
     entities_full_history = [
-        i.entity_id for i in sensor_states if "sum" in wanted_statistics[i.entity_id]
+        i.entity_id
+        for i in sensor_states
+        if "sum" in wanted_statistics[i.entity_id] and i.entity_id not in accumulated
     ]
     history_list: MutableMapping[str, list[State]] = {}
     if entities_full_history:
@@ -430,6 +788,7 @@ def _compile_statistics(  # noqa: C901
         i.entity_id
         for i in sensor_states
         if "sum" not in wanted_statistics[i.entity_id]
+        and i.entity_id not in accumulated
     ]
     if entities_significant_history:
         _history_list = history.get_full_significant_states_with_session(
@@ -443,33 +802,42 @@ def _compile_statistics(  # noqa: C901
     # If there are no recent state changes, the sensor's state may already be pruned
     # from the recorder. Get the state from the state machine instead.
     for _state in sensor_states:
-        if _state.entity_id not in history_list:
+        if _state.entity_id not in history_list and _state.entity_id not in accumulated:
             history_list[_state.entity_id] = [_state]
 
     to_process = []
     to_query = []
     for _state in sensor_states:
         entity_id = _state.entity_id
-        if entity_id not in history_list:
-            continue
-
         device_class = _state.attributes.get(ATTR_DEVICE_CLASS)
-        entity_history = history_list[entity_id]
-        unit, fstates = _normalize_states(
-            hass,
-            session,
-            old_metadatas,
-            entity_history,
-            device_class,
-            entity_id,
-        )
+        window = accumulated.get(entity_id)
+        if window is not None and not window.has_sum:
+            if window.mean is None:
+                continue
+            unit, fstates = window.unit, []
+        else:
+            entity_history: Iterable[State]
+            if window is not None:
+                entity_history = window.states
+            elif entity_id in history_list:
+                entity_history = history_list[entity_id]
+            else:
+                continue
+            unit, fstates = _normalize_states(
+                hass,
+                session,
+                old_metadatas,
+                entity_history,
+                device_class,
+                entity_id,
+            )
 
-        if not fstates:
-            continue
+            if not fstates:
+                continue
 
         state_class = _state.attributes[ATTR_STATE_CLASS]
 
-        to_process.append((entity_id, unit, state_class, fstates))
+        to_process.append((entity_id, unit, state_class, fstates, window))
         if "sum" in wanted_statistics[entity_id]:
             to_query.append(entity_id)
 
@@ -481,6 +849,7 @@ def _compile_statistics(  # noqa: C901
         unit,
         state_class,
         fstates,
+        window,
     ) in to_process:
         # Check metadata
         if old_metadata := old_metadatas.get(entity_id):
@@ -515,13 +884,20 @@ def _compile_statistics(  # noqa: C901
 
         # Make calculations
         stat: StatisticData = {"start": start}
-        if "max" in wanted_statistics[entity_id]:
-            stat["max"] = max(*itertools.islice(zip(*fstates), 1))  # type: ignore[typeddict-item]
-        if "min" in wanted_statistics[entity_id]:
-            stat["min"] = min(*itertools.islice(zip(*fstates), 1))  # type: ignore[typeddict-item]
+        if window is not None and not window.has_sum:
+            assert window.mean is not None
+            assert window.min is not None and window.max is not None
+            stat["max"] = window.max
+            stat["min"] = window.min
+            stat["mean"] = window.mean
+        else:
+            if "max" in wanted_statistics[entity_id]:
+                stat["max"] = max(*itertools.islice(zip(*fstates), 1))  # type: ignore[typeddict-item]
+            if "min" in wanted_statistics[entity_id]:
+                stat["min"] = min(*itertools.islice(zip(*fstates), 1))  # type: ignore[typeddict-item]
 
-        if "mean" in wanted_statistics[entity_id]:
-            stat["mean"] = _time_weighted_average(fstates, start, end)
+            if "mean" in wanted_statistics[entity_id]:
+                stat["mean"] = _time_weighted_average(fstates, start, end)
 
         if "sum" in wanted_statistics[entity_id]:
             last_reset = old_last_reset = None
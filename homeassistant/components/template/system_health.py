@@ -0,0 +1,33 @@
+"""Provide info to system health."""
+from typing import Any
+
+from homeassistant.components import system_health
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.template import (
+    async_get_compile_stats,
+    async_get_render_cache,
+)
+
+
+@callback
+def async_register(
+    hass: HomeAssistant, register: system_health.SystemHealthRegistration
+) -> None:
+    """Register system health callbacks."""
+    register.async_register_info(system_health_info)
+
+
+async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
+    """Get info for the info page."""
+    render_cache = async_get_render_cache(hass).as_dict()
+    compile_stats = async_get_compile_stats(hass)
+    return {
+        "render_cache_size": render_cache["size"],
+        "render_cache_hits": render_cache["hits"],
+        "render_cache_misses": render_cache["misses"],
+        "render_cache_hit_rate": f"{render_cache['hit_rate']:.1%}",
+        "compiled_templates": compile_stats["compiled"],
+        "reused_templates": compile_stats["reused"],
+        "compile_time_saved": f"{compile_stats['time_saved']:.3f} s",
+        "compile_memory_saved": f"{compile_stats['memory_saved'] / 1024:.1f} KiB",
+    }
@@ -32,7 +32,11 @@ from homeassistant.helpers.event import (
 from homeassistant.helpers.json import ExtendedJSONEncoder
 from homeassistant.helpers.service import async_get_all_descriptions
 from homeassistant.loader import IntegrationNotFound, async_get_integration
-from homeassistant.setup import DATA_SETUP_TIME, async_get_loaded_integrations
+from homeassistant.setup import (
+    DATA_IMPORT_TIME,
+    DATA_SETUP_TIME,
+    async_get_loaded_integrations,
+)
 from homeassistant.util.json import (
     find_paths_unserializable_data,
     format_unserializable_data,
@@ -234,37 +238,41 @@ def handle_get_states(
     hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
 ) -> None:
     """Handle get states command."""
-    states = _async_get_allowed_states(hass, connection)
-
-    # JSON serialize here so we can recover if it blows up due to the
-    # state machine containing unserializable data. This command is required
-    # to succeed for the UI to show.
-    response = messages.result_message(msg["id"], states)
-    try:
-        connection.send_message(const.JSON_DUMP(response))
-        return
-    except (ValueError, TypeError):
-        connection.logger.error(
-            "Unable to serialize to JSON. Bad data found at %s",
-            format_unserializable_data(
-                find_paths_unserializable_data(response, dump=const.JSON_DUMP)
-            ),
+    # The JSON of the states is cached on the states, so only the states
+    # that changed since the last call are serialized.
+    serialized_states = _async_serialize_states(
+        connection, _async_get_allowed_states(hass, connection)
+    )
+    connection.send_message(
+        messages.construct_result_message(
+            msg["id"], f"[{b','.join(serialized_states).decode()}]"
         )
-    del response
+    )
+
 
-    # If we can't serialize, we'll filter out unserializable states
-    serialized = []
+@callback
+def _async_serialize_states(
+    connection: ActiveConnection,
+    states: list[State],
+    serialize: Callable[[State], bytes] = State.as_dict_json,
+) -> list[bytes]:
+    """Serialize states, leaving out the ones that can't be serialized.
+
+    This is required to succeed for the UI to show, so one state with
+    unserializable data must not break it.
+    """
+    serialized_states = []
     for state in states:
         try:
-            serialized.append(const.JSON_DUMP(state))
+            serialized_states.append(serialize(state))
         except (ValueError, TypeError):
-            # Error is already logged above
-            pass
-
-    # We now have partially serialized states. Craft some JSON.
-    response2 = const.JSON_DUMP(messages.result_message(msg["id"], ["TO_REPLACE"]))
-    response2 = response2.replace('"TO_REPLACE"', ", ".join(serialized))
-    connection.send_message(response2)
+            connection.logger.error(
+                "Unable to serialize to JSON. Bad data found at %s",
+                format_unserializable_data(
+                    find_paths_unserializable_data(state, dump=const.JSON_DUMP)
+                ),
+            )
+    return serialized_states
 
 
 @callback
@@ -302,42 +310,22 @@ def handle_subscribe_entities(
         EVENT_STATE_CHANGED, forward_entity_changes, run_immediately=True
     )
     connection.send_result(msg["id"])
-    data: dict[str, dict[str, dict]] = {
-        messages.ENTITY_EVENT_ADD: {
-            state.entity_id: messages.compressed_state_dict_add(state)
-            for state in states
-            if not entity_ids or state.entity_id in entity_ids
-        }
-    }
-
-    # JSON serialize here so we can recover if it blows up due to the
-    # state machine containing unserializable data. This command is required
-    # to succeed for the UI to show.
-    response = messages.event_message(msg["id"], data)
-    try:
-        connection.send_message(const.JSON_DUMP(response))
-        return
-    except (ValueError, TypeError):
-        connection.logger.error(
-            "Unable to serialize to JSON. Bad data found at %s",
-            format_unserializable_data(
-                find_paths_unserializable_data(response, dump=const.JSON_DUMP)
-            ),
+    if entity_ids:
+        states = [state for state in states if state.entity_id in entity_ids]
+    # Entity ids never need escaping in JSON
+    added = b",".join(
+        _async_serialize_states(
+            connection,
+            states,
+            lambda state: b'"%s":%s'
+            % (state.entity_id.encode(), state.as_compressed_state_json()),
         )
-    del response
-
-    add_entities = data[messages.ENTITY_EVENT_ADD]
-    cannot_serialize: list[str] = []
-    for entity_id, state_dict in add_entities.items():
-        try:
-            const.JSON_DUMP(state_dict)
-        except (ValueError, TypeError):
-            cannot_serialize.append(entity_id)
-
-    for entity_id in cannot_serialize:
-        del add_entities[entity_id]
-
-    connection.send_message(const.JSON_DUMP(messages.event_message(msg["id"], data)))
+    )
+    connection.send_message(
+        messages.construct_event_message(
+            msg["id"], f'{{"{messages.ENTITY_EVENT_ADD}":{{{added.decode()}}}}}'
+        )
+    )
 
 
 @decorators.websocket_command({vol.Required("type"): "get_services"})
@@ -395,10 +383,17 @@ async def handle_integration_setup_info(
     hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
 ) -> None:
     """Handle integrations command."""
+    import_time: dict[str, dt.timedelta] = hass.data.get(DATA_IMPORT_TIME, {})
     connection.send_result(
         msg["id"],
         [
-            {"domain": integration, "seconds": timedelta.total_seconds()}
+            {
+                "domain": integration,
+                "seconds": timedelta.total_seconds(),
+                "import_seconds": import_time[integration].total_seconds()
+                if integration in import_time
+                else None,
+            }
             for integration, timedelta in cast(
                 dict[str, dt.timedelta], hass.data[DATA_SETUP_TIME]
             ).items()
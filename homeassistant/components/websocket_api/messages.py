@@ -61,11 +61,21 @@ def error_message(iden: int | None, code: str, message: str) -> dict[str, Any]:
     }
 
 
+def construct_result_message(iden: int, payload: str) -> str:
+    """Construct a success result message JSON from the JSON of the result."""
+    return f'{{"id":{iden},"type":"result","success":true,"result":{payload}}}'
+
+
 def event_message(iden: JSON_TYPE, event: Any) -> dict[str, Any]:
     """Return an event message."""
     return {"id": iden, "type": "event", "event": event}
 
 
+def construct_event_message(iden: int, payload: str) -> str:
+    """Construct an event message JSON from the JSON of the event."""
+    return f'{{"id":{iden},"type":"event","event":{payload}}}'
+
+
 def cached_event_message(iden: int, event: Event) -> str:
     """Return an event message.
 
@@ -175,19 +185,7 @@ def compressed_state_dict_add(state: State) -> dict[str, Any]:
 
     Sends c (context) as a string if it only contains an id.
     """
-    if state.context.parent_id is None and state.context.user_id is None:
-        context: dict[str, Any] | str = state.context.id
-    else:
-        context = state.context.as_dict()
-    compressed_state: dict[str, Any] = {
-        COMPRESSED_STATE_STATE: state.state,
-        COMPRESSED_STATE_ATTRIBUTES: state.attributes,
-        COMPRESSED_STATE_CONTEXT: context,
-        COMPRESSED_STATE_LAST_CHANGED: state.last_changed.timestamp(),
-    }
-    if state.last_changed != state.last_updated:
-        compressed_state[COMPRESSED_STATE_LAST_UPDATED] = state.last_updated.timestamp()
-    return compressed_state
+    return state.as_compressed_state()
 
 
 def message_to_json(message: dict[str, Any]) -> str:
@@ -57,12 +57,13 @@ from .helpers import (
     extract_domain_configs,
 )
 from .helpers.entity_values import EntityValues
+from .helpers.storage import Store
 from .helpers.typing import ConfigType
 from .loader import Integration, IntegrationNotFound
 from .requirements import RequirementsNotFound, async_get_integration_with_requirements
 from .util.package import is_docker_env
 from .util.unit_system import IMPERIAL_SYSTEM, METRIC_SYSTEM
-from .util.yaml import SECRET_YAML, Secrets, load_yaml
+from .util.yaml import SECRET_YAML, Secrets, YamlCache, load_yaml
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -73,6 +74,11 @@ YAML_CONFIG_FILE = "configuration.yaml"
 VERSION_FILE = ".HA_VERSION"
 CONFIG_DIR_NAME = ".homeassistant"
 DATA_CUSTOMIZE = "hass_customize"
+DATA_YAML_CACHE = "yaml_cache"
+
+YAML_CACHE_STORAGE_KEY = "core.yaml_cache"
+YAML_CACHE_STORAGE_VERSION = 1
+YAML_CACHE_SAVE_DELAY = 10
 
 AUTOMATION_CONFIG_PATH = "automations.yaml"
 SCRIPT_CONFIG_PATH = "scripts.yaml"
@@ -343,28 +349,57 @@ async def async_hass_config_yaml(hass: HomeAssistant) -> dict:
     else:
         secrets = Secrets(Path(hass.config.config_dir))
 
+    store, cache = await _async_get_yaml_cache(hass)
     # Not using async_add_executor_job because this is an internal method.
     config = await hass.loop.run_in_executor(
         None,
         load_yaml_config_file,
         hass.config.path(YAML_CONFIG_FILE),
         secrets,
+        cache,
     )
+    if cache.dirty:
+        store.async_delay_save(cache.as_dict, YAML_CACHE_SAVE_DELAY)
     core_config = config.get(CONF_CORE, {})
     await merge_packages_config(hass, config, core_config.get(CONF_PACKAGES, {}))
     return config
 
 
+async def _async_get_yaml_cache(hass: HomeAssistant) -> tuple[Store, YamlCache]:
+    """Return the cache of loaded configuration files and its store.
+
+    The cache is read from storage the first time the configuration is loaded
+    and kept in memory for reloads.
+    """
+    if DATA_YAML_CACHE in hass.data:
+        return hass.data[DATA_YAML_CACHE]  # type: ignore[no-any-return]
+
+    # Private because the cached configuration contains the used secrets
+    store = Store(
+        hass, YAML_CACHE_STORAGE_VERSION, YAML_CACHE_STORAGE_KEY, private=True
+    )
+    data = await store.async_load()
+    result = hass.data[DATA_YAML_CACHE] = (
+        store,
+        YamlCache(data if isinstance(data, dict) else None),
+    )
+    return result
+
+
 def load_yaml_config_file(
-    config_path: str, secrets: Secrets | None = None
+    config_path: str,
+    secrets: Secrets | None = None,
+    cache: YamlCache | None = None,
 ) -> dict[Any, Any]:
     """Parse a YAML configuration file.
 
+    Unchanged files are taken from the cache if one is passed in.
+
     Raises FileNotFoundError or HomeAssistantError.
 
     This method needs to run in an executor.
     """
-    conf_dict = load_yaml(config_path, secrets)
+    conf_dict = load_yaml(config_path, secrets, cache)
 
     if not isinstance(conf_dict, dict):
         msg = (
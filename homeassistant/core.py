@@ -23,7 +23,7 @@ import os
 import pathlib
 import re
 import threading
-from time import monotonic
+from time import monotonic, time
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -37,7 +37,6 @@ from typing import (
 )
 from urllib.parse import urlparse
 
-import attr
 import voluptuous as vol
 import yarl
 
@@ -48,6 +47,11 @@ from .const import (
     ATTR_FRIENDLY_NAME,
     ATTR_SERVICE,
     ATTR_SERVICE_DATA,
+    COMPRESSED_STATE_ATTRIBUTES,
+    COMPRESSED_STATE_CONTEXT,
+    COMPRESSED_STATE_LAST_CHANGED,
+    COMPRESSED_STATE_LAST_UPDATED,
+    COMPRESSED_STATE_STATE,
     CONF_UNIT_SYSTEM_IMPERIAL,
     EVENT_CALL_SERVICE,
     EVENT_CORE_CONFIG_UPDATE,
@@ -73,6 +77,7 @@ from .exceptions import (
     ServiceNotFound,
     Unauthorized,
 )
+from .helpers.json import json_bytes_strict
 from .util import dt as dt_util, location, ulid as ulid_util
 from .util.async_ import (
     fire_coroutine_threadsafe,
@@ -101,6 +106,8 @@ _R = TypeVar("_R")
 _R_co = TypeVar("_R_co", covariant=True)
 # Internal; not helpers.typing.UNDEFINED due to circular dependency
 _UNDEF: dict[Any, Any] = {}
+# Generating the id of a context can race between the loop and the recorder
+_CONTEXT_ID_LOCK = threading.Lock()
 _CallableT = TypeVar("_CallableT", bound=Callable[..., Any])
 CALLBACK_TYPE = Callable[[], None]  # pylint: disable=invalid-name
 
@@ -692,17 +699,89 @@ class HomeAssistant:
             self._stopped.set()
 
 
-@attr.s(slots=True, frozen=True)
 class Context:
-    """The context that triggered something."""
+    """The context that triggered something.
 
-    user_id: str | None = attr.ib(default=None)
-    parent_id: str | None = attr.ib(default=None)
-    id: str = attr.ib(factory=ulid_util.ulid)
+    When no id is given, the ULID is only generated the first time the id
+    is used, as most contexts of state changes and events are never looked
+    at. The ULID still carries the time the context was created.
+    """
+
+    __slots__ = ("_user_id", "_parent_id", "_id", "_timestamp")
+
+    def __init__(
+        self,
+        user_id: str | None = None,
+        parent_id: str | None = None,
+        # pylint: disable-next=dangerous-default-value,redefined-builtin
+        id: str | None | dict[Any, Any] = _UNDEF,  # _UNDEF is not modified
+    ) -> None:
+        """Initialize the context."""
+        self._user_id = user_id
+        self._parent_id = parent_id
+        if id is _UNDEF:
+            self._id: str | None = None
+            self._timestamp: float | None = time()
+        else:
+            self._id = cast(Optional[str], id)
+            self._timestamp = None
+
+    @classmethod
+    def _at(cls, timestamp: float) -> Context:
+        """Create a context whose id will carry the given timestamp."""
+        context = cls.__new__(cls)
+        context._user_id = None
+        context._parent_id = None
+        context._id = None
+        context._timestamp = timestamp
+        return context
+
+    @property
+    def user_id(self) -> str | None:
+        """Return the user that triggered something."""
+        return self._user_id
+
+    @property
+    def parent_id(self) -> str | None:
+        """Return the id of the context this context originates from."""
+        return self._parent_id
+
+    @property
+    def id(self) -> str:
+        """Return the id of the context."""
+        if self._timestamp is not None:
+            with _CONTEXT_ID_LOCK:
+                if (timestamp := self._timestamp) is not None:
+                    # The id is set before the timestamp is cleared, so
+                    # readers without the lock never see a missing id
+                    self._id = ulid_util.ulid(timestamp)
+                    self._timestamp = None
+        return self._id  # type: ignore[return-value]
+
+    def __eq__(self, other: Any) -> bool:
+        """Return the comparison."""
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (  # type: ignore[no-any-return]
+            self._user_id == other._user_id
+            and self._parent_id == other._parent_id
+            and self.id == other.id
+        )
+
+    def __hash__(self) -> int:
+        """Make hashable."""
+        return hash((self._user_id, self._parent_id, self.id))
+
+    def __repr__(self) -> str:
+        """Return the representation."""
+        return (
+            f"Context(user_id={self._user_id!r}, "
+            f"parent_id={self._parent_id!r}, id={self.id!r})"
+        )
 
     def as_dict(self) -> dict[str, str | None]:
         """Return a dictionary representation of the context."""
-        return {"id": self.id, "parent_id": self.parent_id, "user_id": self.user_id}
+        return {"id": self.id, "parent_id": self._parent_id, "user_id": self._user_id}
 
 
 class EventOrigin(enum.Enum):
@@ -734,9 +813,10 @@ class Event:
         self.data = data or {}
         self.origin = origin
         self.time_fired = time_fired or dt_util.utcnow()
-        self.context: Context = context or Context(
-            id=ulid_util.ulid(dt_util.utc_to_timestamp(self.time_fired))
-        )
+        if context is None:
+            # pylint: disable-next=protected-access
+            context = Context._at(dt_util.utc_to_timestamp(self.time_fired))
+        self.context: Context = context
 
     def __hash__(self) -> int:
         """Make hashable."""
@@ -783,12 +863,34 @@ class _FilterableJob(NamedTuple):
     run_immediately: bool
 
 
+class _ListenerTiming:
+    """Time spent running an event listener."""
+
+    __slots__ = ("calls", "total", "max")
+
+    def __init__(self) -> None:
+        """Initialize the timing."""
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
 class EventBus:
     """Allow the firing of and listening for events."""
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
+        # The lists of listeners are replaced instead of modified
+        # so they can be iterated while listeners are added or removed
         self._listeners: dict[str, list[_FilterableJob]] = {}
+        # event_type -> data key -> value of the data key -> listeners
+        self._keyed_listeners: dict[
+            str, dict[str, dict[str, list[HassJob[None | Awaitable[None]]]]]
+        ] = {}
+        self._keyed_listener_count: dict[str, int] = {}
+        self._listener_timings: dict[
+            tuple[str, HassJob[None | Awaitable[None]]], _ListenerTiming
+        ] | None = None
         self._hass = hass
 
     @callback
@@ -797,7 +899,60 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        return {key: len(listeners) for key, listeners in self._listeners.items()}
+        listeners = {key: len(listeners) for key, listeners in self._listeners.items()}
+        for event_type, count in self._keyed_listener_count.items():
+            listeners[event_type] = listeners.get(event_type, 0) + count
+        return listeners
+
+    @callback
+    def async_keyed_listeners(self, event_type: str, data_key: str) -> dict[str, int]:
+        """Return dictionary with the keys and the number of keyed listeners.
+
+        This method must be run in the event loop.
+        """
+        return {
+            key: len(jobs)
+            for key, jobs in self._keyed_listeners.get(event_type, {})
+            .get(data_key, {})
+            .items()
+        }
+
+    @callback
+    def async_set_listener_timing(self, enable: bool) -> None:
+        """Enable or disable timing the event listeners.
+
+        Enabling the timing discards the timings recorded before.
+
+        This method must be run in the event loop.
+        """
+        self._listener_timings = {} if enable else None
+
+    @callback
+    def async_listener_timings(self) -> list[dict[str, Any]]:
+        """Return the timings of the event listeners, slowest first.
+
+        Only the time spent in the event loop is recorded for listeners
+        running in the executor. Coroutine listeners are timed until they
+        are done.
+
+        This method must be run in the event loop.
+        """
+        if self._listener_timings is None:
+            return []
+        return sorted(
+            (
+                {
+                    "event_type": event_type,
+                    "listener": _listener_name(job),
+                    "calls": timing.calls,
+                    "total": timing.total,
+                    "max": timing.max,
+                }
+                for (event_type, job), timing in self._listener_timings.items()
+            ),
+            key=lambda timing: timing["total"],  # type: ignore[no-any-return]
+            reverse=True,
+        )
 
     @property
     def listeners(self) -> dict[str, int]:
@@ -834,20 +989,52 @@ class EventBus:
                 event_type, "event_type", MAX_LENGTH_EVENT_EVENT_TYPE
             )
 
-        listeners = self._listeners.get(event_type, [])
+        listeners = self._listeners.get(event_type)
+        keyed_listeners = self._keyed_listeners.get(event_type)
 
         # EVENT_HOMEASSISTANT_CLOSE should go only to this listeners
-        match_all_listeners = self._listeners.get(MATCH_ALL)
-        if match_all_listeners is not None and event_type != EVENT_HOMEASSISTANT_CLOSE:
-            listeners = match_all_listeners + listeners
-
-        event = Event(event_type, event_data, origin, time_fired, context)
+        match_all_listeners = (
+            self._listeners.get(MATCH_ALL)
+            if event_type != EVENT_HOMEASSISTANT_CLOSE
+            else None
+        )
 
-        _LOGGER.debug("Bus:Handling %s", event)
+        # The event is only created when something is going to look at it
+        event: Event | None = None
 
-        if not listeners:
-            return
+        if (
+            match_all_listeners is not None
+            or listeners is not None
+            or _LOGGER.isEnabledFor(logging.DEBUG)
+        ):
+            event = Event(event_type, event_data, origin, time_fired, context)
+
+            _LOGGER.debug("Bus:Handling %s", event)
+
+            if match_all_listeners is not None:
+                self._async_run_listeners(match_all_listeners, event)
+            if listeners is not None:
+                self._async_run_listeners(listeners, event)
+
+        if keyed_listeners is not None and event_data:
+            for data_key, key_listeners in keyed_listeners.items():
+                if isinstance(key := event_data.get(data_key), str) and (
+                    key in key_listeners
+                ):
+                    if event is None:
+                        event = Event(
+                            event_type, event_data, origin, time_fired, context
+                        )
+                    self._hass.loop.call_soon(
+                        self._async_run_keyed_listeners, key_listeners, key, event
+                    )
 
+    @callback
+    def _async_run_listeners(
+        self, listeners: list[_FilterableJob], event: Event
+    ) -> None:
+        """Run the listeners of an event."""
+        timings = self._listener_timings
         for job, event_filter, run_immediately in listeners:
             if event_filter is not None:
                 try:
@@ -856,7 +1043,12 @@ class EventBus:
                 except Exception:  # pylint: disable=broad-except
                     _LOGGER.exception("Error in event filter")
                     continue
-            if run_immediately:
+            if timings is not None:
+                if run_immediately:
+                    self._async_run_timed_job(job, event)
+                else:
+                    self._hass.loop.call_soon(self._async_run_timed_job, job, event)
+            elif run_immediately:
                 try:
                     job.target(event)
                 except Exception:  # pylint: disable=broad-except
@@ -864,6 +1056,70 @@ class EventBus:
             else:
                 self._hass.async_add_hass_job(job, event)
 
+    @callback
+    def _async_run_keyed_listeners(
+        self,
+        key_listeners: dict[str, list[HassJob[None | Awaitable[None]]]],
+        key: str,
+        event: Event,
+    ) -> None:
+        """Run the listeners of the key of an event.
+
+        The listeners are looked up when they run so listeners
+        removed since the event was fired are not called.
+        """
+        if (jobs := key_listeners.get(key)) is None:
+            return
+        timings = self._listener_timings
+        for job in jobs:
+            if timings is not None:
+                self._async_run_timed_job(job, event)
+                continue
+            try:
+                self._hass.async_run_hass_job(job, event)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error running job: %s", job)
+
+    @callback
+    def _async_run_timed_job(
+        self, job: HassJob[None | Awaitable[None]], event: Event
+    ) -> None:
+        """Run an event listener and record the time it took."""
+        if job.job_type == HassJobType.Coroutinefunction:
+            self._hass.async_create_task(self._async_run_timed_coroutine(job, event))
+            return
+        start = monotonic()
+        try:
+            self._hass.async_run_hass_job(job, event)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error running job: %s", job)
+        finally:
+            self._async_record_timing(event.event_type, job, monotonic() - start)
+
+    async def _async_run_timed_coroutine(
+        self, job: HassJob[None | Awaitable[None]], event: Event
+    ) -> None:
+        """Run a coroutine event listener and record the time it took."""
+        start = monotonic()
+        try:
+            await cast(Callable[[Event], Awaitable[None]], job.target)(event)
+        finally:
+            self._async_record_timing(event.event_type, job, monotonic() - start)
+
+    @callback
+    def _async_record_timing(
+        self, event_type: str, job: HassJob[None | Awaitable[None]], elapsed: float
+    ) -> None:
+        """Record the time an event listener took."""
+        if (timings := self._listener_timings) is None:
+            return
+        if (timing := timings.get((event_type, job))) is None:
+            timing = timings[(event_type, job)] = _ListenerTiming()
+        timing.calls += 1
+        timing.total += elapsed
+        if elapsed > timing.max:
+            timing.max = elapsed
+
     def listen(
         self,
         event_type: str,
@@ -919,7 +1175,10 @@ class EventBus:
     def _async_listen_filterable_job(
         self, event_type: str, filterable_job: _FilterableJob
     ) -> CALLBACK_TYPE:
-        self._listeners.setdefault(event_type, []).append(filterable_job)
+        self._listeners[event_type] = [
+            *self._listeners.get(event_type, ()),
+            filterable_job,
+        ]
 
         def remove_listener() -> None:
             """Remove the listener."""
@@ -927,6 +1186,66 @@ class EventBus:
 
         return remove_listener
 
+    @callback
+    def async_listen_keyed(
+        self,
+        event_type: str,
+        data_key: str,
+        keys: Iterable[str],
+        listener: Callable[[Event], None | Awaitable[None]],
+    ) -> CALLBACK_TYPE:
+        """Listen for events of a specific type with one of the keys in the data.
+
+        The listener is called when the value of data_key in the event
+        data is one of the keys, e.g. the entity_id of a state_changed
+        event. The listeners are found with a dict lookup instead of
+        running an event filter for each of them.
+
+        Callback listeners are run when the event is dispatched, after
+        the listeners without a key.
+
+        This method must be run in the event loop.
+        """
+        job = HassJob(listener)
+        key_listeners = self._keyed_listeners.setdefault(event_type, {}).setdefault(
+            data_key, {}
+        )
+        keys = list(keys)
+        for key in keys:
+            key_listeners[key] = [*key_listeners.get(key, ()), job]
+        self._keyed_listener_count[event_type] = (
+            self._keyed_listener_count.get(event_type, 0) + 1
+        )
+        removed = False
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the listener."""
+            nonlocal removed
+            if removed:
+                return
+            removed = True
+            for key in keys:
+                jobs = [
+                    key_job
+                    for key_job in key_listeners.get(key, ())
+                    if key_job is not job
+                ]
+                if jobs:
+                    key_listeners[key] = jobs
+                else:
+                    key_listeners.pop(key, None)
+            event_listeners = self._keyed_listeners.get(event_type, {})
+            if not key_listeners and event_listeners.get(data_key) is key_listeners:
+                del event_listeners[data_key]
+                if not event_listeners:
+                    del self._keyed_listeners[event_type]
+            self._keyed_listener_count[event_type] -= 1
+            if not self._keyed_listener_count[event_type]:
+                del self._keyed_listener_count[event_type]
+
+        return remove_listener
+
     def listen_once(
         self, event_type: str, listener: Callable[[Event], None | Awaitable[None]]
     ) -> CALLBACK_TYPE:
@@ -995,10 +1314,13 @@ class EventBus:
         This method must be run in the event loop.
         """
         try:
-            self._listeners[event_type].remove(filterable_job)
+            listeners = list(self._listeners[event_type])
+            listeners.remove(filterable_job)
 
             # delete event_type list if empty
-            if not self._listeners[event_type]:
+            if listeners:
+                self._listeners[event_type] = listeners
+            else:
                 self._listeners.pop(event_type)
         except (KeyError, ValueError):
             # KeyError is key event_type listener did not exist
@@ -1008,6 +1330,16 @@ class EventBus:
             )
 
 
+def _listener_name(job: HassJob[Any]) -> str:
+    """Return a name for the target of a listener job."""
+    target = job.target
+    while isinstance(target, functools.partial):
+        target = target.func
+    if (name := getattr(target, "__qualname__", None)) is None:
+        return repr(target)
+    return f"{target.__module__}.{name}"
+
+
 _StateT = TypeVar("_StateT", bound="State")
 
 
@@ -1034,6 +1366,9 @@ class State:
         "domain",
         "object_id",
         "_as_dict",
+        "_as_dict_json",
+        "_as_compressed_state",
+        "_as_compressed_state_json",
     ]
 
     def __init__(
@@ -1063,12 +1398,20 @@ class State:
 
         self.entity_id = entity_id.lower()
         self.state = state
-        self.attributes = ReadOnlyDict(attributes or {})
+        # A read only dict can be shared as nothing can change it
+        self.attributes = (
+            attributes
+            if isinstance(attributes, ReadOnlyDict)
+            else ReadOnlyDict(attributes or {})
+        )
         self.last_updated = last_updated or dt_util.utcnow()
         self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
         self.domain, self.object_id = split_entity_id(self.entity_id)
         self._as_dict: ReadOnlyDict[str, Collection[Any]] | None = None
+        self._as_dict_json: bytes | None = None
+        self._as_compressed_state: ReadOnlyDict[str, Any] | None = None
+        self._as_compressed_state_json: bytes | None = None
 
     @property
     def name(self) -> str:
@@ -1103,6 +1446,53 @@ class State:
             )
         return self._as_dict
 
+    def as_dict_json(self) -> bytes:
+        """Return the JSON of the dict representation of the State.
+
+        The JSON is cached so it is only encoded once for all the clients
+        that fetch the state.
+        """
+        if self._as_dict_json is None:
+            self._as_dict_json = json_bytes_strict(self.as_dict())
+        return self._as_dict_json
+
+    def as_compressed_state(self) -> ReadOnlyDict[str, Any]:
+        """Build a compressed dict of the State.
+
+        Omits the lu (last_updated) if it matches (lc) last_changed.
+
+        Sends c (context) as a string if it only contains an id.
+        """
+        if self._as_compressed_state is None:
+            context = self.context
+            if context.parent_id is None and context.user_id is None:
+                compressed_context: dict[str, Any] | str = context.id
+            else:
+                compressed_context = ReadOnlyDict(context.as_dict())
+            compressed_state: dict[str, Any] = {
+                COMPRESSED_STATE_STATE: self.state,
+                COMPRESSED_STATE_ATTRIBUTES: self.attributes,
+                COMPRESSED_STATE_CONTEXT: compressed_context,
+                COMPRESSED_STATE_LAST_CHANGED: self.last_changed.timestamp(),
+            }
+            if self.last_changed != self.last_updated:
+                compressed_state[
+                    COMPRESSED_STATE_LAST_UPDATED
+                ] = self.last_updated.timestamp()
+            self._as_compressed_state = ReadOnlyDict(compressed_state)
+        return self._as_compressed_state
+
+    def as_compressed_state_json(self) -> bytes:
+        """Return the JSON of the compressed dict of the State.
+
+        The JSON is cached like the one of as_dict_json.
+        """
+        if self._as_compressed_state_json is None:
+            self._as_compressed_state_json = json_bytes_strict(
+                self.as_compressed_state()
+            )
+        return self._as_compressed_state_json
+
     @classmethod
     def from_dict(cls: type[_StateT], json_dict: dict[str, Any]) -> _StateT | None:
         """Initialize a state from a dict.
@@ -1162,6 +1552,7 @@ class StateMachine:
     def __init__(self, bus: EventBus, loop: asyncio.events.AbstractEventLoop) -> None:
         """Initialize state machine."""
         self._states: dict[str, State] = {}
+        self._domain_index: dict[str, dict[str, State]] = {}
         self._reservations: set[str] = set()
         self._bus = bus
         self._loop = loop
@@ -1184,13 +1575,10 @@ class StateMachine:
         if domain_filter is None:
             return list(self._states)
 
-        if isinstance(domain_filter, str):
-            domain_filter = (domain_filter.lower(),)
-
         return [
-            state.entity_id
-            for state in self._states.values()
-            if state.domain in domain_filter
+            entity_id
+            for states in self._async_domain_states(domain_filter)
+            for entity_id in states
         ]
 
     @callback
@@ -1204,12 +1592,7 @@ class StateMachine:
         if domain_filter is None:
             return len(self._states)
 
-        if isinstance(domain_filter, str):
-            domain_filter = (domain_filter.lower(),)
-
-        return len(
-            [None for state in self._states.values() if state.domain in domain_filter]
-        )
+        return sum(len(states) for states in self._async_domain_states(domain_filter))
 
     def all(self, domain_filter: str | Iterable[str] | None = None) -> list[State]:
         """Create a list of all states."""
@@ -1228,11 +1611,28 @@ class StateMachine:
         if domain_filter is None:
             return list(self._states.values())
 
+        return [
+            state
+            for states in self._async_domain_states(domain_filter)
+            for state in states.values()
+        ]
+
+    @callback
+    def _async_domain_states(
+        self, domain_filter: str | Iterable[str]
+    ) -> list[dict[str, State]]:
+        """Return the states of each domain in the filter from the domain index.
+
+        This method must be run in the event loop.
+        """
         if isinstance(domain_filter, str):
             domain_filter = (domain_filter.lower(),)
 
+        domain_index = self._domain_index
         return [
-            state for state in self._states.values() if state.domain in domain_filter
+            domain_index[domain]
+            for domain in dict.fromkeys(domain_filter)
+            if domain in domain_index
         ]
 
     def get(self, entity_id: str) -> State | None:
@@ -1276,6 +1676,8 @@ class StateMachine:
         if old_state is None:
             return False
 
+        del self._domain_index[old_state.domain][entity_id]
+
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": None},
@@ -1365,10 +1767,16 @@ class StateMachine:
         if same_state and same_attr:
             return
 
+        if same_attr:
+            # Share the attributes of the old state instead of copying them
+            assert old_state is not None
+            attributes = old_state.attributes
+
         now = dt_util.utcnow()
 
         if context is None:
-            context = Context(id=ulid_util.ulid(dt_util.utc_to_timestamp(now)))
+            # pylint: disable-next=protected-access
+            context = Context._at(dt_util.utc_to_timestamp(now))
 
         state = State(
             entity_id,
@@ -1380,6 +1788,9 @@ class StateMachine:
             old_state is None,
         )
         self._states[entity_id] = state
+        if (domain_states := self._domain_index.get(state.domain)) is None:
+            domain_states = self._domain_index[state.domain] = {}
+        domain_states[entity_id] = state
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": state},
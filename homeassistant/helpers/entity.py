@@ -58,6 +58,7 @@ SLOW_UPDATE_WARNING = 10
 DATA_ENTITY_SOURCE = "entity_info"
 SOURCE_CONFIG_ENTRY = "config_entry"
 SOURCE_PLATFORM_CONFIG = "platform_config"
+DATA_ENTITY_WRITE_TIMINGS = "entity_write_timings"
 
 # Used when converting float states to string: limit precision according to machine
 # epsilon to make the string representation readable
@@ -107,6 +108,47 @@ def async_generate_entity_id(
     return test_string
 
 
+class _WriteTiming:
+    """Time spent writing the state of an entity."""
+
+    __slots__ = ("calls", "total", "max")
+
+    def __init__(self) -> None:
+        """Initialize the timing."""
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+@callback
+def async_set_write_timing(hass: HomeAssistant, enable: bool) -> None:
+    """Enable or disable timing the state writes of entities.
+
+    Enabling the timing discards the timings recorded before.
+    """
+    hass.data[DATA_ENTITY_WRITE_TIMINGS] = {} if enable else None
+
+
+@callback
+def async_write_timings(hass: HomeAssistant) -> list[dict[str, Any]]:
+    """Return the timings of the entity state writes, slowest first."""
+    if (timings := hass.data.get(DATA_ENTITY_WRITE_TIMINGS)) is None:
+        return []
+    return sorted(
+        (
+            {
+                "entity_id": entity_id,
+                "calls": timing.calls,
+                "total": timing.total,
+                "max": timing.max,
+            }
+            for entity_id, timing in timings.items()
+        ),
+        key=lambda timing: timing["total"],  # type: ignore[no-any-return]
+        reverse=True,
+    )
+
+
 def get_capability(hass: HomeAssistant, entity_id: str, capability: str) -> Any | None:
     """Get a capability attribute of an entity.
 
@@ -281,6 +323,11 @@ class Entity(ABC):
     # If entity is added to an entity platform
     _platform_state = EntityPlatformState.NOT_ADDED
 
+    # State writes within this many seconds are merged, from the platform
+    _state_write_coalesce_window: float | None = None
+    # Coalesced state write waiting to run
+    _pending_write: asyncio.Handle | None = None
+
     # Entity Properties
     _attr_assumed_state: bool = False
     _attr_attribution: str | None = None
@@ -530,8 +577,52 @@ class Entity(ABC):
                 f"No entity id specified for entity {self.name}"
             )
 
+        if (window := self._state_write_coalesce_window) is not None:
+            self._async_coalesce_write_ha_state(window)
+            return
+
         self._async_write_ha_state()
 
+    @callback
+    def _async_coalesce_write_ha_state(self, window: float) -> None:
+        """Merge the state write with the other writes within the window."""
+        assert self.platform is not None
+        if self._pending_write is not None:
+            self.platform.coalesced_state_writes += 1
+            return
+
+        if window:
+            self._pending_write = self.hass.loop.call_later(
+                window, self._async_write_pending_ha_state
+            )
+        else:
+            self._pending_write = self.hass.loop.call_soon(
+                self._async_write_pending_ha_state
+            )
+
+    @callback
+    def _async_write_pending_ha_state(self) -> None:
+        """Write the state of a coalesced state write."""
+        self._pending_write = None
+        self._async_write_ha_state()
+
+    @callback
+    def _async_merge_pending_write(self) -> None:
+        """Merge the coalesced state write waiting to run into this write."""
+        if self._pending_write is None:
+            return
+        self._async_cancel_pending_write()
+        if self.platform is not None:
+            self.platform.coalesced_state_writes += 1
+
+    @callback
+    def _async_cancel_pending_write(self) -> None:
+        """Cancel the coalesced state write that is waiting to run."""
+        if self._pending_write is None:
+            return
+        self._pending_write.cancel()
+        self._pending_write = None
+
     def _stringify_state(self, available: bool) -> str:
         """Convert state to string."""
         if not available:
@@ -547,6 +638,8 @@ class Entity(ABC):
     @callback
     def _async_write_ha_state(self) -> None:
         """Write the state to the state machine."""
+        self._async_merge_pending_write()
+
         if self._platform_state == EntityPlatformState.REMOVED:
             # Polling returned after the entity has already been removed
             return
@@ -620,9 +713,6 @@ class Entity(ABC):
 
         def _convert_temperature(state: str, attr: dict[str, Any]) -> str:
             # Convert temperature if we detect one
-            # pylint: disable-next=import-outside-toplevel
-            from homeassistant.components.sensor import SensorEntity
-
             unit_of_measure = attr.get(ATTR_UNIT_OF_MEASUREMENT)
             units = self.hass.config.units
             if unit_of_measure == units.temperature_unit or unit_of_measure not in (
@@ -631,6 +721,9 @@ class Entity(ABC):
             ):
                 return state
 
+            # pylint: disable-next=import-outside-toplevel
+            from homeassistant.components.sensor import SensorEntity
+
             domain = split_entity_id(self.entity_id)[0]
             if domain != "sensor":
                 if not self._temperature_reported:
@@ -681,6 +774,21 @@ class Entity(ABC):
             self.entity_id, state, attr, self.force_update, self._context
         )
 
+        if (timings := self.hass.data.get(DATA_ENTITY_WRITE_TIMINGS)) is not None:
+            self._async_record_write_timing(timings, timer() - start)
+
+    @callback
+    def _async_record_write_timing(
+        self, timings: dict[str, _WriteTiming], elapsed: float
+    ) -> None:
+        """Record the time spent writing the state."""
+        if (timing := timings.get(self.entity_id)) is None:
+            timing = timings[self.entity_id] = _WriteTiming()
+        timing.calls += 1
+        timing.total += elapsed
+        if elapsed > timing.max:
+            timing.max = elapsed
+
     def schedule_update_ha_state(self, force_refresh: bool = False) -> None:
         """Schedule an update ha state change task.
 
@@ -797,6 +905,8 @@ class Entity(ABC):
         """Abort adding an entity to a platform."""
 
         self._platform_state = EntityPlatformState.NOT_ADDED
+        self._async_cancel_pending_write()
+        self._state_write_coalesce_window = None
         self._call_on_remove_callbacks()
 
         self.hass = None  # type: ignore[assignment]
@@ -808,6 +918,9 @@ class Entity(ABC):
         await self.async_internal_added_to_hass()
         await self.async_added_to_hass()
         self.async_write_ha_state()
+        # The first state is written right away, later ones can be coalesced
+        assert self.platform is not None
+        self._state_write_coalesce_window = self.platform.state_write_coalesce_window
 
     async def async_remove(self, *, force_remove: bool = False) -> None:
         """Remove entity from Home Assistant.
@@ -826,6 +939,8 @@ class Entity(ABC):
 
         self._platform_state = EntityPlatformState.REMOVED
 
+        self._async_cancel_pending_write()
+        self._state_write_coalesce_window = None
         self._call_on_remove_callbacks()
 
         await self.async_internal_will_remove_from_hass()
@@ -106,6 +106,16 @@ class EntityPlatform:
 
         self.parallel_updates: asyncio.Semaphore | None = None
 
+        # State writes of an entity within this many seconds of each other
+        # are merged into one state change, None writes every state
+        self.state_write_coalesce_window: float | None = None
+        if (
+            coalesce_window := getattr(platform, "STATE_WRITE_COALESCE_WINDOW", None)
+        ) is not None:
+            self.state_write_coalesce_window = coalesce_window / 1_000_000
+        # Number of state writes merged into another state write
+        self.coalesced_state_writes = 0
+
         # Platform is None for the EntityComponent "catch-all" EntityPlatform
         # which powers entity_component.add_entities
         self.parallel_updates_created = platform is None
@@ -1,7 +1,13 @@
 """Helpers to help with encoding Home Assistant objects in JSON."""
+from collections.abc import Iterable
 import datetime
 import json
-from typing import Any
+import math
+from typing import Any, Final
+
+import orjson
+
+_ORJSON_OPTIONS: Final = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS
 
 
 class JSONEncoder(json.JSONEncoder):
@@ -22,6 +28,90 @@ class JSONEncoder(json.JSONEncoder):
         return json.JSONEncoder.default(self, o)
 
 
+_COMPACT_ENCODER: Final = JSONEncoder(separators=(",", ":"))
+
+
+def json_encoder_default(obj: Any) -> Any:
+    """Convert Home Assistant objects for orjson.
+
+    orjson handles datetimes and enums itself.
+    """
+    if isinstance(obj, set):
+        return list(obj)
+    if isinstance(obj, datetime.datetime):
+        # Datetimes with a tzinfo orjson doesn't know
+        return obj.isoformat()
+    if hasattr(obj, "as_dict"):
+        return obj.as_dict()
+    if isinstance(obj, tuple):
+        # Named tuples, json writes them as lists
+        return tuple(obj)
+    raise TypeError
+
+
+_SCALAR_TYPES: Final = (str, int, bool, type(None))
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """Return if there is NaN or Infinity in what orjson encoded."""
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        values: Iterable[Any] = obj.values()
+    elif isinstance(obj, (list, tuple, set)):
+        values = obj
+    elif hasattr(obj, "as_dict"):
+        return _has_non_finite(obj.as_dict())
+    else:
+        return False
+    for value in values:
+        if type(value) in _SCALAR_TYPES:
+            continue
+        if _has_non_finite(value):
+            return True
+    return False
+
+
+def json_bytes(obj: Any) -> bytes:
+    """Dump json bytes.
+
+    NaN and Infinity are written as null.
+    """
+    return orjson.dumps(obj, option=_ORJSON_OPTIONS, default=json_encoder_default)
+
+
+def json_bytes_strict(obj: Any) -> bytes:
+    """Dump json bytes, rejecting NaN and Infinity.
+
+    Raises ValueError for NaN and Infinity, like json.dumps with
+    allow_nan=False. Scanning for them is slow, only use it where the
+    result is cached, like the JSON of a state.
+    """
+    data = json_bytes(obj)
+    # orjson writes NaN and Infinity as null
+    if b"null" in data and _has_non_finite(obj):
+        raise ValueError("Out of range float values are not JSON compliant")
+    return data
+
+
+def json_dumps(obj: Any) -> str:
+    """Dump json string.
+
+    NaN and Infinity are written as null.
+    """
+    return json_bytes(obj).decode("utf-8")
+
+
+def json_dumps_compatible(obj: Any) -> str:
+    """Dump json string identical to json.dumps with the JSONEncoder.
+
+    For data that is stored and compared as a string. orjson writes floats,
+    NaN, Infinity and non ASCII characters differently, so this keeps using
+    json but doesn't create a new encoder for every call like json.dumps.
+    """
+    return _COMPACT_ENCODER.encode(obj)
+
+
 class ExtendedJSONEncoder(JSONEncoder):
     """JSONEncoder that supports Home Assistant objects and falls back to repr(o)."""
 
@@ -12,7 +12,7 @@ from homeassistant.core import HomeAssistant, State, callback, valid_entity_id
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.util.dt as dt_util
 
-from . import start
+from . import start, startup_trace
 from .entity import Entity
 from .event import async_track_time_interval
 from .json import JSONEncoder
@@ -105,22 +105,25 @@ class RestoreStateData:
         """Get the singleton instance of this data helper."""
         data = RestoreStateData(hass)
 
-        try:
-            stored_states = await data.store.async_load()
-        except HomeAssistantError as exc:
-            _LOGGER.error("Error loading last states", exc_info=exc)
-            stored_states = None
-
-        if stored_states is None:
-            _LOGGER.debug("Not creating cache - no saved states found")
-            data.last_states = {}
-        else:
-            data.last_states = {
-                item["state"]["entity_id"]: StoredState.from_dict(item)
-                for item in stored_states
-                if valid_entity_id(item["state"]["entity_id"])
-            }
-            _LOGGER.debug("Created cache with %s", list(data.last_states))
+        with startup_trace.async_trace_span(
+            hass, "restore_state", "load", startup_trace.CATEGORY_RESTORE_STATE
+        ):
+            try:
+                stored_states = await data.store.async_load()
+            except HomeAssistantError as exc:
+                _LOGGER.error("Error loading last states", exc_info=exc)
+                stored_states = None
+
+            if stored_states is None:
+                _LOGGER.debug("Not creating cache - no saved states found")
+                data.last_states = {}
+            else:
+                data.last_states = {
+                    item["state"]["entity_id"]: StoredState.from_dict(item)
+                    for item in stored_states
+                    if valid_entity_id(item["state"]["entity_id"])
+                }
+                _LOGGER.debug("Created cache with %s", list(data.last_states))
 
         async def hass_start(hass: HomeAssistant) -> None:
             """Start the restore state task."""
@@ -0,0 +1,147 @@
+"""Record where the wall time of startup goes.
+
+The trace is written in the Chrome trace event format, which can be opened
+in chrome://tracing, Perfetto or speedscope.
+"""
+from __future__ import annotations
+
+from collections.abc import Generator
+import contextlib
+from time import perf_counter
+from typing import Any
+
+from homeassistant.const import __version__
+from homeassistant.core import HomeAssistant, callback
+
+DATA_STARTUP_TRACE = "startup_trace"
+
+TRACK_BOOTSTRAP = "bootstrap"
+
+CATEGORY_BOOTSTRAP = "bootstrap"
+CATEGORY_REQUIREMENTS = "requirements"
+CATEGORY_IMPORT = "import"
+CATEGORY_CONFIG = "config"
+CATEGORY_SETUP = "setup"
+CATEGORY_CONFIG_ENTRY = "config_entry"
+CATEGORY_RESTORE_STATE = "restore_state"
+
+
+class StartupTrace:
+    """Collect timed spans of the startup.
+
+    Every span is drawn on a track. Spans on the same track must be nested,
+    so things that run concurrently need their own track, like the setup of
+    each integration and platform.
+    """
+
+    __slots__ = ("_start", "_spans", "finished")
+
+    def __init__(self) -> None:
+        """Initialize the trace."""
+        self._start = perf_counter()
+        self._spans: list[tuple[str, str, str, float, float, dict[str, Any]]] = []
+        self.finished = False
+
+    def add(
+        self,
+        track: str,
+        name: str,
+        category: str,
+        start: float,
+        end: float,
+        args: dict[str, Any] | None = None,
+    ) -> None:
+        """Add a span with perf_counter start and end times.
+
+        Safe to call from any thread.
+        """
+        if not self.finished:
+            self._spans.append((track, name, category, start, end, args or {}))
+
+    @contextlib.contextmanager
+    def span(
+        self,
+        track: str,
+        name: str,
+        category: str,
+        args: dict[str, Any] | None = None,
+    ) -> Generator[None, None, None]:
+        """Time the body of the with statement as a span."""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(track, name, category, start, perf_counter(), args)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the trace in the Chrome trace event format."""
+        tracks: dict[str, int] = {}
+        events: list[dict[str, Any]] = []
+        for track, name, category, start, end, args in sorted(
+            self._spans, key=lambda span: (span[3], -span[4])
+        ):
+            if (tid := tracks.get(track)) is None:
+                tid = tracks[track] = len(tracks) + 1
+                events.append(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": 1,
+                        "tid": tid,
+                        "args": {"name": track},
+                    }
+                )
+            events.append(
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": round((start - self._start) * 1_000_000),
+                    "dur": round((end - start) * 1_000_000),
+                    "pid": 1,
+                    "tid": tid,
+                    "args": args,
+                }
+            )
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"version": __version__, "finished": self.finished},
+        }
+
+
+@callback
+def async_start_startup_trace(hass: HomeAssistant) -> StartupTrace:
+    """Start recording the startup trace."""
+    trace = hass.data[DATA_STARTUP_TRACE] = StartupTrace()
+    return trace
+
+
+@callback
+def async_finish_startup_trace(hass: HomeAssistant) -> None:
+    """Stop recording spans once startup is done."""
+    if (trace := hass.data.get(DATA_STARTUP_TRACE)) is not None:
+        trace.finished = True
+
+
+@callback
+def async_get_startup_trace(hass: HomeAssistant) -> StartupTrace | None:
+    """Return the startup trace if one was recorded."""
+    return hass.data.get(DATA_STARTUP_TRACE)
+
+
+@contextlib.contextmanager
+def async_trace_span(
+    hass: HomeAssistant,
+    track: str,
+    name: str,
+    category: str,
+    args: dict[str, Any] | None = None,
+) -> Generator[None, None, None]:
+    """Time the body of the with statement while startup is traced."""
+    trace: StartupTrace | None = hass.data.get(DATA_STARTUP_TRACE)
+    if trace is None or trace.finished:
+        yield
+        return
+    with trace.span(track, name, category, args):
+        yield
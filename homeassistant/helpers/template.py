@@ -19,12 +19,14 @@ import re
 import statistics
 from struct import error as StructError, pack, unpack_from
 import sys
+from timeit import default_timer as timer
+from types import CodeType
 from typing import Any, cast
 from urllib.parse import urlencode as urllib_urlencode
 import weakref
 
 import jinja2
-from jinja2 import pass_context, pass_environment
+from jinja2 import nodes, pass_context, pass_environment
 from jinja2.sandbox import ImmutableSandboxedEnvironment
 from jinja2.utils import Namespace
 import voluptuous as vol
@@ -66,6 +68,7 @@ _SENTINEL = object()
 DATE_STR_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 _RENDER_INFO = "template.render_info"
+_RENDER_CACHE = "template.render_cache"
 _ENVIRONMENT = "template.environment"
 _ENVIRONMENT_LIMITED = "template.environment_limited"
 _ENVIRONMENT_STRICT = "template.environment_strict"
@@ -93,6 +96,36 @@ _COLLECTABLE_STATE_ATTRIBUTES = {
 ALL_STATES_RATE_LIMIT = timedelta(minutes=1)
 DOMAIN_STATES_RATE_LIMIT = timedelta(seconds=1)
 
+RENDER_CACHE_SIZE = 1024
+
+# Template functions and filters with results that don't only depend on the
+# states of the entities they collect
+_NOT_CACHEABLE_NAMES = {
+    "area_devices",
+    "area_entities",
+    "area_id",
+    "area_name",
+    "as_local",
+    "closest",
+    "device_attr",
+    "device_entities",
+    "device_id",
+    "distance",
+    "integration_entities",
+    "is_device_attr",
+    "lipsum",
+    "now",
+    "random",
+    "relative_time",
+    "timestamp_custom",
+    "timestamp_local",
+    "today_at",
+    "utcnow",
+}
+
+# Results that can be shared by the renders of a template
+_CACHEABLE_RESULT_TYPES = {str, int, float, bool, type(None)}
+
 template_cv: ContextVar[tuple[str, str] | None] = ContextVar(
     "template_cv", default=None
 )
@@ -304,6 +337,243 @@ class RenderInfo:
             self.filter = _false
 
 
+class RenderCache:
+    """Hold the results of template renders that only depend on entity states.
+
+    A result is reused while the entities collected by its render are not
+    updated, so the same template tracked with the same variables, like by
+    several template entities, is rendered once per change.
+    """
+
+    __slots__ = ("_entries", "hits", "misses")
+
+    def __init__(self) -> None:
+        """Initialize the render cache."""
+        self._entries: dict[
+            tuple, tuple[tuple[tuple[str, datetime | None], ...], RenderInfo]
+        ] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached results."""
+        return len(self._entries)
+
+    @callback
+    def async_get(self, hass: HomeAssistant, key: tuple) -> RenderInfo | None:
+        """Return the cached render if its entities were not updated."""
+        if (entry := self._entries.get(key)) is not None:
+            versions, render_info = entry
+            states = hass.states
+            for entity_id, last_updated in versions:
+                state = states.get(entity_id)
+                if (state and state.last_updated) != last_updated:
+                    break
+            else:
+                self.hits += 1
+                return render_info
+        self.misses += 1
+        return None
+
+    @callback
+    def async_set(
+        self, hass: HomeAssistant, key: tuple, render_info: RenderInfo
+    ) -> None:
+        """Cache a render that only depends on the states of its entities."""
+        if (
+            render_info.exception is not None
+            or render_info.all_states
+            or render_info.all_states_lifecycle
+            or render_info.domains
+            or render_info.domains_lifecycle
+            or render_info.has_time
+            # A render that collected no entities can't tell when it is stale
+            or not render_info.entities
+            # pylint: disable-next=protected-access
+            or type(render_info._result) not in _CACHEABLE_RESULT_TYPES
+        ):
+            return
+
+        if key not in self._entries and len(self._entries) >= RENDER_CACHE_SIZE:
+            del self._entries[next(iter(self._entries))]
+
+        states = hass.states
+        self._entries[key] = (
+            tuple(
+                (entity_id, (state := states.get(entity_id)) and state.last_updated)
+                for entity_id in render_info.entities
+            ),
+            render_info,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the size and the hit rate of the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+@callback
+def async_get_render_cache(hass: HomeAssistant) -> RenderCache:
+    """Return the render cache shared by the tracked templates."""
+    if (cache := hass.data.get(_RENDER_CACHE)) is None:
+        cache = hass.data[_RENDER_CACHE] = RenderCache()
+    return cast(RenderCache, cache)
+
+
+def _render_cache_variables(variables: collections.abc.Mapping[str, Any]) -> Any:
+    """Return the variables as a hashable key.
+
+    Raises TypeError if a variable can't be part of the key.
+    """
+    items = []
+    for name, value in variables.items():
+        if isinstance(value, TemplateStateFromEntityId):
+            # Collects the state of its entity when the template reads it
+            value = (
+                value.entity_id,
+                value._collect,
+            )  # pylint: disable=protected-access
+        items.append((name, type(value), value))
+    key = frozenset(items)
+    hash(key)
+    return key
+
+
+_FAST_RENDER_FILTERS = ("abs", "float", "int", "round")
+_FAST_RENDER_BINOPS: dict[type[nodes.BinExpr], Callable[[Any, Any], Any]] = {
+    nodes.Add: lambda left, right: left + right,
+    nodes.Sub: lambda left, right: left - right,
+    nodes.Mul: lambda left, right: left * right,
+    nodes.Div: lambda left, right: left / right,
+    nodes.FloorDiv: lambda left, right: left // right,
+    nodes.Mod: lambda left, right: left % right,
+}
+_FAST_RENDER_RESULT_TYPES = (str, int, float, bool, type(None))
+
+FastRender = Callable[[Any, Any], Any]
+
+
+class _FastRenderMiss(Exception):
+    """Raised when the fast render can't match what jinja would render."""
+
+
+def _check_number(value: Any) -> Any:
+    """Return the value if arithmetic on it behaves the same in jinja."""
+    if type(value) not in (int, float):
+        raise _FastRenderMiss
+    return value
+
+
+def _compile_fast_expr(env: TemplateEnvironment, node: nodes.Node) -> FastRender:
+    """Return a function evaluating an expression of value and value_json.
+
+    Raises _FastRenderMiss if the expression uses anything else.
+    """
+    if isinstance(node, nodes.Name):
+        if node.name == "value":
+            return lambda value, value_json: value
+        if node.name == "value_json":
+            return lambda value, value_json: value_json
+        raise _FastRenderMiss
+
+    if isinstance(node, nodes.Const):
+        const = node.value
+        return lambda value, value_json: const
+
+    if isinstance(node, nodes.Getattr):
+        obj = _compile_fast_expr(env, node.node)
+        attr = node.attr
+        if hasattr(dict, attr):
+            raise _FastRenderMiss
+
+        def _getattr(value: Any, value_json: Any) -> Any:
+            if type(result := obj(value, value_json)) is not dict:
+                raise _FastRenderMiss
+            return result[attr]
+
+        return _getattr
+
+    if isinstance(node, nodes.Getitem) and isinstance(node.arg, nodes.Const):
+        obj = _compile_fast_expr(env, node.node)
+        key = node.arg.value
+
+        def _getitem(value: Any, value_json: Any) -> Any:
+            result = obj(value, value_json)
+            if type(result) is dict or (type(result) is list and type(key) is int):
+                return result[key]
+            raise _FastRenderMiss
+
+        return _getitem
+
+    if isinstance(node, nodes.Filter):
+        if (
+            node.name not in _FAST_RENDER_FILTERS
+            or node.dyn_args is not None
+            or node.dyn_kwargs is not None
+            or not all(isinstance(arg, nodes.Const) for arg in node.args)
+            or not all(isinstance(kwarg.value, nodes.Const) for kwarg in node.kwargs)
+        ):
+            raise _FastRenderMiss
+        obj = _compile_fast_expr(env, node.node)  # type: ignore[arg-type]
+        func = env.filters[node.name]
+        args = [arg.value for arg in node.args]  # type: ignore[attr-defined]
+        kwargs = {kwarg.key: kwarg.value.value for kwarg in node.kwargs}
+        return lambda value, value_json: func(obj(value, value_json), *args, **kwargs)
+
+    if isinstance(node, (nodes.Neg, nodes.Pos)):
+        obj = _compile_fast_expr(env, node.node)
+        if isinstance(node, nodes.Neg):
+            return lambda value, value_json: -_check_number(obj(value, value_json))
+        return lambda value, value_json: +_check_number(obj(value, value_json))
+
+    if (binop := _FAST_RENDER_BINOPS.get(type(node))) is not None:
+        left = _compile_fast_expr(env, node.left)  # type: ignore[attr-defined]
+        right = _compile_fast_expr(env, node.right)  # type: ignore[attr-defined]
+        return lambda value, value_json: binop(
+            _check_number(left(value, value_json)),
+            _check_number(right(value, value_json)),
+        )
+
+    raise _FastRenderMiss
+
+
+def _compile_fast_render(
+    env: TemplateEnvironment, source: str
+) -> tuple[FastRender, bool] | None:
+    """Compile a template printing a single expression of the value.
+
+    Value templates like {{ value_json.temperature | float * 10 }} are
+    rendered without going through jinja. Returns the render function and
+    if it needs value_json, or None if the template needs jinja.
+    """
+    try:
+        body = env.parse(source).body
+    except jinja2.TemplateError:
+        return None
+    if (
+        len(body) != 1
+        or not isinstance(output := body[0], nodes.Output)
+        or len(output.nodes) != 1
+    ):
+        return None
+    expr = output.nodes[0]
+    try:
+        render = _compile_fast_expr(env, expr)
+    except _FastRenderMiss:
+        return None
+    uses_value_json = any(
+        node.name == "value_json"
+        for node in (expr, *expr.find_all(nodes.Name))
+        if isinstance(node, nodes.Name)
+    )
+    return render, uses_value_json
+
+
 class Template:
     """Class to hold a template and manage caching and rendering."""
 
@@ -314,6 +584,8 @@ class Template:
         "is_static",
         "_compiled_code",
         "_compiled",
+        "_cacheable",
+        "_fast_render",
         "_exc_info",
         "_limited",
         "_strict",
@@ -327,6 +599,8 @@ class Template:
         self.template: str = template.strip()
         self._compiled_code = None
         self._compiled: jinja2.Template | None = None
+        self._cacheable: bool | None = None
+        self._fast_render: tuple[FastRender, bool] | bool | None = None
         self.hass = hass
         self.is_static = not is_template_string(template)
         self._exc_info = None
@@ -507,9 +781,17 @@ class Template:
 
     @callback
     def async_render_to_info(
-        self, variables: TemplateVarsType = None, strict: bool = False, **kwargs: Any
+        self,
+        variables: TemplateVarsType = None,
+        strict: bool = False,
+        use_cache: bool = False,
+        **kwargs: Any,
     ) -> RenderInfo:
-        """Render the template and collect an entity filter."""
+        """Render the template and collect an entity filter.
+
+        If use_cache is True, the render is shared through the render cache
+        with other renders of the same template and variables.
+        """
         assert self.hass and _RENDER_INFO not in self.hass.data
 
         render_info = RenderInfo(self)
@@ -520,6 +802,25 @@ class Template:
             render_info._freeze_static()
             return render_info
 
+        cache_key = None
+        if use_cache and self._is_cacheable():
+            try:
+                cache_key = (
+                    self.template,
+                    strict,
+                    _render_cache_variables({**(variables or {}), **kwargs}),
+                )
+            except TypeError:
+                pass
+            else:
+                cache = async_get_render_cache(self.hass)
+                if (cached := cache.async_get(self.hass, cache_key)) is not None:
+                    render_info._result = cached._result
+                    render_info.entities = cached.entities
+                    render_info.rate_limit = cached.rate_limit
+                    render_info._freeze()
+                    return render_info
+
         self.hass.data[_RENDER_INFO] = render_info
         try:
             render_info._result = self.async_render(variables, strict=strict, **kwargs)
@@ -529,8 +830,26 @@ class Template:
             del self.hass.data[_RENDER_INFO]
 
         render_info._freeze()
+        if cache_key is not None:
+            async_get_render_cache(self.hass).async_set(
+                self.hass, cache_key, render_info
+            )
         return render_info
 
+    def _is_cacheable(self) -> bool:
+        """Return if the renders only depend on the states and variables."""
+        if self._cacheable is None:
+            try:
+                ast = self._env.parse(self.template)
+            except jinja2.TemplateError:
+                self._cacheable = False
+            else:
+                self._cacheable = not any(
+                    node.name in _NOT_CACHEABLE_NAMES
+                    for node in ast.find_all((nodes.Name, nodes.Filter, nodes.Test))
+                )
+        return self._cacheable
+
     def render_with_possible_json_value(self, value, error_value=_SENTINEL):
         """Render template with value exposed.
 
@@ -562,6 +881,23 @@ class Template:
         if self._compiled is None:
             self._ensure_compiled()
 
+        if self._fast_render is None:
+            self._fast_render = _compile_fast_render(self._env, self.template) or False
+
+        if self._fast_render:
+            render, uses_value_json = self._fast_render  # type: ignore[misc]
+            value_json = None
+            try:
+                if uses_value_json:
+                    value_json = json.loads(value)
+                result = render(value, value_json)
+            except Exception:  # pylint: disable=broad-except
+                # Let jinja render it, including any error
+                pass
+            else:
+                if type(result) in _FAST_RENDER_RESULT_TYPES:
+                    return str(result).strip()
+
         variables = dict(variables or {})
         variables["value"] = value
 
@@ -601,9 +937,7 @@ class Template:
         self._strict = strict
         env = self._env
 
-        self._compiled = jinja2.Template.from_code(
-            env, self._compiled_code, env.globals, None
-        )
+        self._compiled = env.template_from_code(self.template, self._compiled_code)
 
         return self._compiled
 
@@ -1878,6 +2212,66 @@ class LoggingUndefined(jinja2.Undefined):
         return super().__bool__()
 
 
+class CompileStats:
+    """Compile work an environment saved by reusing compiled templates."""
+
+    __slots__ = ("compiled", "compile_time", "reused", "time_saved", "memory_saved")
+
+    def __init__(self) -> None:
+        """Initialize the stats."""
+        self.compiled = 0
+        self.compile_time = 0.0
+        self.reused = 0
+        self.time_saved = 0.0
+        self.memory_saved = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the stats."""
+        return {
+            "compiled": self.compiled,
+            "compile_time": self.compile_time,
+            "reused": self.reused,
+            "time_saved": self.time_saved,
+            "memory_saved": self.memory_saved,
+        }
+
+
+def _compiled_template_size(compiled: jinja2.Template) -> int:
+    """Estimate the memory held by a template created from compiled code.
+
+    The environment and its globals are shared and not counted.
+    """
+    return sum(
+        map(
+            sys.getsizeof,
+            (
+                compiled,
+                vars(compiled),
+                compiled.blocks,
+                compiled.root_render_func,
+                compiled.root_render_func.__globals__,
+                compiled._debug_info,  # pylint: disable=protected-access
+            ),
+        )
+    )
+
+
+@callback
+def async_get_compile_stats(hass: HomeAssistant) -> dict[str, Any]:
+    """Return the compile stats of the template environments of hass."""
+    stats = CompileStats()
+    for key in (_ENVIRONMENT, _ENVIRONMENT_LIMITED, _ENVIRONMENT_STRICT):
+        if (env := hass.data.get(key)) is None:
+            continue
+        env_stats: CompileStats = env.compile_stats
+        stats.compiled += env_stats.compiled
+        stats.compile_time += env_stats.compile_time
+        stats.reused += env_stats.reused
+        stats.time_saved += env_stats.time_saved
+        stats.memory_saved += env_stats.memory_saved
+    return stats.as_dict()
+
+
 class TemplateEnvironment(ImmutableSandboxedEnvironment):
     """The Home Assistant template environment."""
 
@@ -1889,7 +2283,23 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
             undefined = jinja2.StrictUndefined
         super().__init__(undefined=undefined)
         self.hass = hass
-        self.template_cache = weakref.WeakValueDictionary()
+        # Compiled code and templates by source, shared by all Template
+        # objects using this environment while any of them holds them
+        self.template_cache: weakref.WeakValueDictionary[
+            str, CodeType
+        ] = weakref.WeakValueDictionary()
+        self.compiled_cache: weakref.WeakValueDictionary[
+            str, jinja2.Template
+        ] = weakref.WeakValueDictionary()
+        # Time it took to compile the code and create the templates, and
+        # the estimated memory of the templates
+        self._compile_times: weakref.WeakKeyDictionary[
+            CodeType, float
+        ] = weakref.WeakKeyDictionary()
+        self._compiled_costs: weakref.WeakKeyDictionary[
+            jinja2.Template, tuple[float, int]
+        ] = weakref.WeakKeyDictionary()
+        self.compile_stats = CompileStats()
         self.filters["round"] = forgiving_round
         self.filters["multiply"] = multiply
         self.filters["log"] = logarithm
@@ -2081,10 +2491,40 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
             # any instance of this.
             return super().compile(source, name, filename, raw, defer_init)
 
-        if (cached := self.template_cache.get(source)) is None:
-            cached = self.template_cache[source] = super().compile(source)
+        stats = self.compile_stats
+        if (cached := self.template_cache.get(source)) is not None:
+            stats.time_saved += self._compile_times.get(cached, 0.0)
+            return cached
 
+        start = timer()
+        cached = self.template_cache[source] = super().compile(source)
+        compile_time = self._compile_times[cached] = timer() - start
+        stats.compiled += 1
+        stats.compile_time += compile_time
         return cached
 
+    def template_from_code(self, source: str, code: CodeType) -> jinja2.Template:
+        """Return the template for the compiled code of source.
+
+        Templates are not changed by rendering, so all Template objects with
+        the same source share one.
+        """
+        stats = self.compile_stats
+        if (compiled := self.compiled_cache.get(source)) is not None:
+            create_time, size = self._compiled_costs.get(compiled, (0.0, 0))
+            stats.reused += 1
+            stats.time_saved += create_time
+            stats.memory_saved += size
+            return compiled
+
+        start = timer()
+        compiled = jinja2.Template.from_code(self, code, self.globals, None)
+        self._compiled_costs[compiled] = (
+            timer() - start,
+            _compiled_template_size(compiled),
+        )
+        self.compiled_cache[source] = compiled
+        return compiled
+
 
 _NO_HASS_ENV = TemplateEnvironment(None)  # type: ignore[no-untyped-call]
@@ -15,6 +15,8 @@ import json
 import logging
 import pathlib
 import sys
+import threading
+from time import monotonic
 from types import ModuleType
 from typing import TYPE_CHECKING, Any, Literal, TypedDict, TypeVar, cast
 
@@ -43,6 +45,8 @@ _LOGGER = logging.getLogger(__name__)
 DATA_COMPONENTS = "components"
 DATA_INTEGRATIONS = "integrations"
 DATA_CUSTOM_COMPONENTS = "custom_components"
+DATA_MANIFEST_INDEX = "manifest_index"
+DATA_MANIFEST_STATS = "manifest_stats"
 PACKAGE_CUSTOM_COMPONENTS = "custom_components"
 PACKAGE_BUILTIN = "homeassistant.components"
 CUSTOM_WARNING = (
@@ -56,6 +60,11 @@ _UNDEF = object()  # Internal; not helpers.typing.UNDEFINED due to circular depe
 
 MAX_LOAD_CONCURRENTLY = 4
 
+MANIFEST_INDEX_PATH = pathlib.Path(__file__).parent / "generated/manifest_index.json"
+CUSTOM_MANIFESTS_STORAGE_KEY = "core.custom_manifests"
+CUSTOM_MANIFESTS_STORAGE_VERSION = 1
+CUSTOM_MANIFESTS_SAVE_DELAY = 10
+
 MOVED_ZEROCONF_PROPS = ("macaddress", "model", "manufacturer")
 
 
@@ -120,6 +129,130 @@ def manifest_from_legacy_module(domain: str, module: ModuleType) -> Manifest:
     }
 
 
+class ManifestStats:
+    """Where the manifests of the integrations were loaded from."""
+
+    __slots__ = ("index_load_time", "from_index", "from_cache", "read", "read_time")
+
+    def __init__(self) -> None:
+        """Initialize the stats."""
+        self.index_load_time = 0.0
+        self.from_index = 0
+        self.from_cache = 0
+        self.read = 0
+        self.read_time = 0.0
+
+    @property
+    def time_saved(self) -> float | None:
+        """Estimate the time saved by not reading manifests from disk.
+
+        Based on the average time of the manifests that were read, None if
+        no manifest was read.
+        """
+        if not self.read:
+            return None
+        return (self.from_index + self.from_cache) * (
+            self.read_time / self.read
+        ) - self.index_load_time
+
+
+def async_get_manifest_stats(hass: HomeAssistant) -> ManifestStats:
+    """Return where the manifests of the integrations were loaded from."""
+    if (stats := hass.data.get(DATA_MANIFEST_STATS)) is None:
+        stats = hass.data[DATA_MANIFEST_STATS] = ManifestStats()
+    return cast(ManifestStats, stats)
+
+
+def _load_manifest_index() -> tuple[dict[str, Manifest], float]:
+    """Load the manifests of the built-in integrations generated by hassfest.
+
+    Returns the manifests and the time it took to load them.
+    """
+    start = monotonic()
+    try:
+        index = json.loads(MANIFEST_INDEX_PATH.read_bytes())
+    except (OSError, ValueError) as err:
+        _LOGGER.warning(
+            "Unable to load the manifest index %s, manifests of built-in "
+            "integrations are read from their folder: %s",
+            MANIFEST_INDEX_PATH,
+            err,
+        )
+        index = {}
+    return index, monotonic() - start
+
+
+async def _async_get_manifest_index(hass: HomeAssistant) -> dict[str, Manifest]:
+    """Return the manifests of the built-in integrations."""
+    if (index_or_future := hass.data.get(DATA_MANIFEST_INDEX)) is None:
+        future = hass.data[DATA_MANIFEST_INDEX] = hass.async_add_executor_job(
+            _load_manifest_index
+        )
+        index, load_time = await future
+        async_get_manifest_stats(hass).index_load_time = load_time
+        hass.data[DATA_MANIFEST_INDEX] = index
+        return index
+
+    if isinstance(index_or_future, asyncio.Future):
+        index, _ = await index_or_future
+        return index
+
+    return cast(dict[str, Manifest], index_or_future)
+
+
+class _CustomManifestCache:
+    """Manifests of custom integrations, used while their file is unchanged."""
+
+    def __init__(self, data: dict[str, dict[str, Any]] | None) -> None:
+        """Initialize the cache with the data returned by as_dict."""
+        self._entries = data or {}
+        self._used: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.reads = 0
+        self.read_time = 0.0
+
+    def load(self, manifest_path: pathlib.Path) -> Manifest:
+        """Return a manifest, it is only read if its mtime or size changed.
+
+        Raises ValueError if the manifest is not valid JSON.
+        """
+        stat = manifest_path.stat()
+        key = str(manifest_path)
+        entry = self._entries.get(key)
+        if (
+            entry is not None
+            and entry["mtime"] == stat.st_mtime_ns
+            and entry["size"] == stat.st_size
+        ):
+            with self._lock:
+                self.hits += 1
+                self._used[key] = entry
+            return cast(Manifest, dict(entry["manifest"]))
+
+        start = monotonic()
+        # A file changed after the stat will no longer match its mtime
+        manifest = json.loads(manifest_path.read_text())
+        with self._lock:
+            self.reads += 1
+            self.read_time += monotonic() - start
+            self._used[key] = {
+                "mtime": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "manifest": manifest,
+            }
+        return cast(Manifest, dict(manifest))
+
+    @property
+    def changed(self) -> bool:
+        """Return if the cache needs to be saved."""
+        return bool(self.reads) or self._used.keys() != self._entries.keys()
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """Return the manifests that were loaded, for storage."""
+        return dict(self._used)
+
+
 async def _async_get_custom_components(
     hass: HomeAssistant,
 ) -> dict[str, Integration]:
@@ -145,16 +278,34 @@ async def _async_get_custom_components(
         get_sub_directories, custom_components.__path__
     )
 
+    # pylint: disable-next=import-outside-toplevel
+    from .helpers.storage import Store
+
+    store = Store(hass, CUSTOM_MANIFESTS_STORAGE_VERSION, CUSTOM_MANIFESTS_STORAGE_KEY)
+    data = await store.async_load()
+    manifest_cache = _CustomManifestCache(data if isinstance(data, dict) else None)
+
     integrations = await gather_with_concurrency(
         MAX_LOAD_CONCURRENTLY,
         *(
             hass.async_add_executor_job(
-                Integration.resolve_from_root, hass, custom_components, comp.name
+                Integration.resolve_from_root,
+                hass,
+                custom_components,
+                comp.name,
+                manifest_cache,
             )
             for comp in dirs
         ),
     )
 
+    stats = async_get_manifest_stats(hass)
+    stats.from_cache += manifest_cache.hits
+    stats.read += manifest_cache.reads
+    stats.read_time += manifest_cache.read_time
+    if manifest_cache.changed:
+        store.async_delay_save(manifest_cache.as_dict, CUSTOM_MANIFESTS_SAVE_DELAY)
+
     return {
         integration.domain: integration
         for integration in integrations
@@ -356,7 +507,11 @@ class Integration:
 
     @classmethod
     def resolve_from_root(
-        cls, hass: HomeAssistant, root_module: ModuleType, domain: str
+        cls,
+        hass: HomeAssistant,
+        root_module: ModuleType,
+        domain: str,
+        manifest_cache: _CustomManifestCache | None = None,
     ) -> Integration | None:
         """Resolve an integration from a root module."""
         for base in root_module.__path__:
@@ -366,7 +521,10 @@ class Integration:
                 continue
 
             try:
-                manifest = json.loads(manifest_path.read_text())
+                if manifest_cache is None:
+                    manifest = json.loads(manifest_path.read_text())
+                else:
+                    manifest = manifest_cache.load(manifest_path)
             except ValueError as err:
                 _LOGGER.error(
                     "Error parsing manifest.json file at %s: %s", manifest_path, err
@@ -686,9 +844,23 @@ async def _async_get_integration(hass: HomeAssistant, domain: str) -> Integratio
 
     from . import components  # pylint: disable=import-outside-toplevel
 
-    if integration := await hass.async_add_executor_job(
+    stats = async_get_manifest_stats(hass)
+    if (manifest := (await _async_get_manifest_index(hass)).get(domain)) is not None:
+        stats.from_index += 1
+        return Integration(
+            hass,
+            f"{components.__name__}.{domain}",
+            pathlib.Path(components.__path__[0]) / domain,
+            cast(Manifest, dict(manifest)),
+        )
+
+    start = monotonic()
+    integration = await hass.async_add_executor_job(
         Integration.resolve_from_root, hass, components, domain
-    ):
+    )
+    if integration:
+        stats.read += 1
+        stats.read_time += monotonic() - start
         return integration
 
     raise IntegrationNotFound(domain)
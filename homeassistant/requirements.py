@@ -5,10 +5,12 @@ import asyncio
 from collections.abc import Iterable
 import logging
 import os
+import sys
 from typing import Any, cast
 
 from .core import HomeAssistant, callback
 from .exceptions import HomeAssistantError
+from .helpers.storage import Store
 from .helpers.typing import UNDEFINED, UndefinedType
 from .loader import Integration, IntegrationNotFound, async_get_integration
 from .util import package as pkg_util
@@ -19,6 +21,10 @@ DATA_PIP_LOCK = "pip_lock"
 DATA_PKG_CACHE = "pkg_cache"
 DATA_INTEGRATIONS_WITH_REQS = "integrations_with_reqs"
 DATA_INSTALL_FAILURE_HISTORY = "install_failure_history"
+DATA_REQUIREMENTS_CACHE = "requirements_cache"
+REQUIREMENTS_CACHE_STORAGE_KEY = "core.requirements"
+REQUIREMENTS_CACHE_STORAGE_VERSION = 1
+REQUIREMENTS_CACHE_SAVE_DELAY = 10
 CONSTRAINT_FILE = "package_constraints.txt"
 DISCOVERY_INTEGRATIONS: dict[str, Iterable[str]] = {
     "dhcp": ("dhcp",),
@@ -134,6 +140,91 @@ async def _async_process_integration(
             raise result
 
 
+def _environment_fingerprint() -> list[list[Any]]:
+    """Return what changes when packages are installed, upgraded or removed.
+
+    Installing or removing a distribution adds or removes its metadata
+    directory, which changes the modification time of the package directory.
+    """
+    fingerprint: list[list[Any]] = [[sys.executable, sys.version]]
+    for path in sys.path:
+        if not path.endswith(("site-packages", "dist-packages")):
+            continue
+        try:
+            fingerprint.append([path, os.stat(path).st_mtime_ns])
+        except OSError:
+            continue
+    return fingerprint
+
+
+class _RequirementsCache:
+    """Requirements known to be satisfied while the installed packages are unchanged."""
+
+    def __init__(
+        self, data: dict[str, Any] | None, fingerprint: list[list[Any]]
+    ) -> None:
+        """Initialize the cache from stored data."""
+        self.fingerprint = fingerprint
+        self.satisfied: set[str] = set()
+        self.changed = False
+        if data is not None and data.get("fingerprint") == fingerprint:
+            self.satisfied.update(data["satisfied"])
+
+    def add(self, req: str) -> None:
+        """Remember a satisfied requirement."""
+        self.satisfied.add(req)
+        self.changed = True
+
+    def reset(self, fingerprint: list[list[Any]]) -> None:
+        """Forget the satisfied requirements after the packages changed."""
+        self.fingerprint = fingerprint
+        self.satisfied.clear()
+        self.changed = True
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the data to store."""
+        return {"fingerprint": self.fingerprint, "satisfied": sorted(self.satisfied)}
+
+
+async def _async_get_requirements_cache(
+    hass: HomeAssistant,
+) -> tuple[Store, _RequirementsCache]:
+    """Return the requirements cache, loading it the first time.
+
+    Must be called with the pip lock held.
+    """
+    if (store_and_cache := hass.data.get(DATA_REQUIREMENTS_CACHE)) is None:
+        store = Store(
+            hass,
+            REQUIREMENTS_CACHE_STORAGE_VERSION,
+            REQUIREMENTS_CACHE_STORAGE_KEY,
+            private=True,
+        )
+        data, fingerprint = await asyncio.gather(
+            store.async_load(),
+            hass.async_add_executor_job(_environment_fingerprint),
+        )
+        cache = _RequirementsCache(
+            data if isinstance(data, dict) else None, fingerprint
+        )
+        store_and_cache = hass.data[DATA_REQUIREMENTS_CACHE] = (store, cache)
+    return cast(tuple[Store, _RequirementsCache], store_and_cache)
+
+
+def _async_get_pip_lock(hass: HomeAssistant) -> asyncio.Lock:
+    """Return the lock that serializes checking and installing requirements."""
+    if (pip_lock := hass.data.get(DATA_PIP_LOCK)) is None:
+        pip_lock = hass.data[DATA_PIP_LOCK] = asyncio.Lock()
+    return cast(asyncio.Lock, pip_lock)
+
+
+async def async_get_satisfied_requirements(hass: HomeAssistant) -> set[str]:
+    """Return the requirements that were satisfied with the installed packages."""
+    async with _async_get_pip_lock(hass):
+        _, cache = await _async_get_requirements_cache(hass)
+    return cache.satisfied
+
+
 @callback
 def async_clear_install_history(hass: HomeAssistant) -> None:
     """Forget the install history."""
@@ -149,8 +240,7 @@ async def async_process_requirements(
     This method is a coroutine. It will raise RequirementsNotFound
     if an requirement can't be satisfied.
     """
-    if (pip_lock := hass.data.get(DATA_PIP_LOCK)) is None:
-        pip_lock = hass.data[DATA_PIP_LOCK] = asyncio.Lock()
+    pip_lock = _async_get_pip_lock(hass)
     install_failure_history = hass.data.get(DATA_INSTALL_FAILURE_HISTORY)
     if install_failure_history is None:
         install_failure_history = hass.data[DATA_INSTALL_FAILURE_HISTORY] = set()
@@ -158,10 +248,18 @@ async def async_process_requirements(
     kwargs = pip_kwargs(hass.config.config_dir)
 
     async with pip_lock:
-        for req in requirements:
-            await _async_process_requirements(
-                hass, name, req, install_failure_history, kwargs
-            )
+        store, cache = await _async_get_requirements_cache(hass)
+        try:
+            for req in requirements:
+                if req in cache.satisfied:
+                    continue
+                await _async_process_requirements(
+                    hass, name, req, install_failure_history, kwargs, cache
+                )
+        finally:
+            if cache.changed:
+                cache.changed = False
+                store.async_delay_save(cache.as_dict, REQUIREMENTS_CACHE_SAVE_DELAY)
 
 
 async def _async_process_requirements(
@@ -170,6 +268,7 @@ async def _async_process_requirements(
     req: str,
     install_failure_history: set[str],
     kwargs: Any,
+    cache: _RequirementsCache,
 ) -> None:
     """Install a requirement and save failures."""
     if req in install_failure_history:
@@ -180,6 +279,7 @@ async def _async_process_requirements(
         raise RequirementsNotFound(name, [req])
 
     if pkg_util.is_installed(req):
+        cache.add(req)
         return
 
     def _install(req: str, kwargs: dict[str, Any]) -> bool:
@@ -188,6 +288,9 @@ async def _async_process_requirements(
 
     for _ in range(MAX_INSTALL_FAILURES):
         if await hass.async_add_executor_job(_install, req, kwargs):
+            # Installing may have changed what satisfied other requirements.
+            # The installed requirement is checked again on the next start.
+            cache.reset(await hass.async_add_executor_job(_environment_fingerprint))
             return
 
     install_failure_history.add(req)
@@ -6,16 +6,20 @@ import asyncio
 import collections
 from collections.abc import Callable
 from contextlib import suppress
+from datetime import timedelta
+from functools import partial
 import json
 import logging
+from tempfile import TemporaryDirectory
 from timeit import default_timer as timer
 from typing import TypeVar
 
 from homeassistant import core
 from homeassistant.components.websocket_api.const import JSON_DUMP
-from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.const import EVENT_STATE_CHANGED, MATCH_ALL
 from homeassistant.helpers.entityfilter import convert_include_exclude_filter
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import JSONEncoder, json_bytes, json_dumps_compatible
+import homeassistant.util.dt as dt_util
 
 # mypy: allow-untyped-calls, allow-untyped-defs, no-check-untyped-defs
 # mypy: no-warn-return-any
@@ -297,6 +301,117 @@ async def valid_entity_id(hass):
     return timer() - start
 
 
+@benchmark
+async def state_machine_domain_filter(hass):
+    """Look up the states of one of 20 domains with 1k, 10k and 50k entities."""
+    domains = [f"domain{idx}" for idx in range(20)]
+    lookups = 1000
+    runtime = 0.0
+    for entity_count in (1000, 10000, 50000):
+        states = core.StateMachine(hass.bus, hass.loop)
+        for idx in range(entity_count):
+            states.async_set(f"{domains[idx % len(domains)]}.entity_{idx}", "on")
+
+        start = timer()
+        for _ in range(lookups):
+            states.async_all("domain1")
+            states.async_entity_ids("domain1")
+            states.async_entity_ids_count("domain1")
+        elapsed = timer() - start
+        runtime += elapsed
+        print(
+            f"{entity_count} entities: "
+            f"{elapsed / (lookups * 3) * 10**6:.1f}us per filtered lookup"
+        )
+    return runtime
+
+
+@benchmark
+async def state_set_unobserved(hass):
+    """Set 100k states of 1000 entities nobody listens to and print the updates/s."""
+    entity_ids = [f"sensor.entity_{idx}" for idx in range(1000)]
+    attributes = {"unit_of_measurement": "W", "friendly_name": "Power"}
+    updates = 10**5
+    async_set = hass.states.async_set
+
+    start = timer()
+    for idx in range(updates):
+        async_set(entity_ids[idx % len(entity_ids)], idx, attributes)
+    runtime = timer() - start
+
+    print(f"{updates / runtime:.0f} updates/s")
+    return runtime
+
+
+@benchmark
+async def state_set_recorded(hass):
+    """Set 100k states of 1000 entities with a recorder like listener attached.
+
+    Like the recorder, the listener sees every event and reads its context id.
+    """
+    entity_ids = [f"sensor.entity_{idx}" for idx in range(1000)]
+    attributes = {"unit_of_measurement": "W", "friendly_name": "Power"}
+    updates = 10**5
+    async_set = hass.states.async_set
+    context_ids = []
+
+    @core.callback
+    def listener(event):
+        context_ids.append(event.context.id)
+
+    hass.bus.async_listen(MATCH_ALL, listener)
+
+    start = timer()
+    for idx in range(updates):
+        async_set(entity_ids[idx % len(entity_ids)], idx, attributes)
+    runtime = timer() - start
+
+    print(f"{updates / runtime:.0f} updates/s")
+    return runtime
+
+
+@benchmark
+async def sensor_state_writes(hass):
+    """Update 400 power sensors 100k times and print the time per update.
+
+    Like most integrations, each update sets a few _attr_ values of the
+    sensor before writing its state.
+    """
+    # pylint: disable=import-outside-toplevel,protected-access
+    from homeassistant.components.sensor import (
+        SensorDeviceClass,
+        SensorEntity,
+        SensorStateClass,
+    )
+
+    class PowerSensor(SensorEntity):
+        _attr_device_class = SensorDeviceClass.POWER
+        _attr_native_unit_of_measurement = "W"
+        _attr_should_poll = False
+        _attr_state_class = SensorStateClass.MEASUREMENT
+
+    sensors = []
+    for idx in range(400):
+        sensor = PowerSensor()
+        sensor.hass = hass
+        sensor.entity_id = f"sensor.power_{idx}"
+        sensor._attr_name = f"Power {idx}"
+        sensors.append(sensor)
+    updates = 10**5
+
+    start = timer()
+    for idx in range(updates):
+        sensor = sensors[idx % len(sensors)]
+        sensor._attr_available = True
+        sensor._attr_native_value = idx
+        sensor._attr_extra_state_attributes = {"voltage": 230}
+        sensor.async_write_ha_state()
+    runtime = timer() - start
+
+    print(f"{runtime / updates * 1_000_000:.2f} microseconds per update")
+    return runtime
+
+
 @benchmark
 async def json_serialize_states(hass):
     """Serialize million states with websocket default encoder."""
@@ -310,6 +425,320 @@ async def json_serialize_states(hass):
     return timer() - start
 
 
+@benchmark
+async def get_states_cached_json(hass):
+    """Serialize 5k states for 100 get_states calls and print the calls/s."""
+    for idx in range(5000):
+        hass.states.async_set(
+            f"sensor.power_{idx}",
+            idx,
+            {"unit_of_measurement": "W", "friendly_name": f"Power {idx}"},
+        )
+    calls = 100
+    runtime = 0.0
+
+    for name, serialize in (
+        ("encoding the states", lambda states: JSON_DUMP(states)),
+        (
+            "joining the cached JSON",
+            lambda states: b",".join(state.as_dict_json() for state in states),
+        ),
+    ):
+        start = timer()
+        for _ in range(calls):
+            serialize(hass.states.async_all())
+        elapsed = timer() - start
+        runtime += elapsed
+        print(f"{name}: {calls / elapsed:.1f} calls/s")
+
+    return runtime
+
+
+@benchmark
+async def json_backends_states(hass):
+    """Serialize 100k states with the JSON helpers and print the states/s."""
+    states = [
+        core.State(
+            f"sensor.power_{idx}",
+            str(idx),
+            {
+                "unit_of_measurement": "W",
+                "device_class": "power",
+                "state_class": "measurement",
+                "friendly_name": f"Power {idx}",
+                "last_reset": None,
+            },
+        )
+        for idx in range(10**5)
+    ]
+    for state in states:
+        state.as_dict()
+    stdlib_dump = partial(json.dumps, cls=JSONEncoder, separators=(",", ":"))
+    runtime = 0.0
+
+    for name, dump, recorded in (
+        ("json.dumps states", stdlib_dump, False),
+        ("json_bytes states", json_bytes, False),
+        ("json.dumps attributes", stdlib_dump, True),
+        ("json_dumps_compatible attributes", json_dumps_compatible, True),
+    ):
+        start = timer()
+        for state in states:
+            dump(state.attributes if recorded else state)
+        elapsed = timer() - start
+        runtime += elapsed
+        print(f"{name}: {len(states) / elapsed:.0f}/s")
+
+    return runtime
+
+
+@benchmark
+async def recorder_write_states(hass):
+    """Record 10k state changes of 500 entities and print the events/s."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant import config_entries
+    from homeassistant.components import recorder
+    from homeassistant.components.recorder.tasks import CommitTask
+    from homeassistant.setup import async_setup_component
+
+    entities = 500
+    events_to_fire = 10**4
+
+    with TemporaryDirectory() as config_dir:
+        hass.config.config_dir = config_dir
+        hass.config_entries = config_entries.ConfigEntries(hass, {})
+        assert await async_setup_component(hass, recorder.DOMAIN, {})
+        await hass.async_start()
+        instance = recorder.get_instance(hass)
+        await instance.async_recorder_ready.wait()
+
+        start = timer()
+
+        for idx in range(events_to_fire):
+            hass.states.async_set(
+                f"sensor.benchmark_{idx % entities}",
+                idx,
+                {"unit_of_measurement": "W", "friendly_name": "Benchmark"},
+            )
+        instance.queue_task(CommitTask())
+        await hass.async_add_executor_job(instance.block_till_done)
+
+        runtime = timer() - start
+        # Stop while the database still exists
+        await hass.async_stop()
+
+    print(f"Recorded {events_to_fire / runtime:.0f} events/s")
+    return runtime
+
+
+@benchmark
+async def history_columnar(hass):
+    """Convert 100k history rows to json as compressed states and as columns."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.recorder import history
+
+    entities = 200
+    rows_per_entity = 500
+    start_time = dt_util.utcnow() - timedelta(days=7)
+    row = collections.namedtuple(
+        "Row",
+        [
+            "entity_id",
+            "state",
+            "last_changed",
+            "last_updated",
+            "attributes",
+            "shared_attrs",
+        ],
+    )
+    rows = [
+        row(
+            f"sensor.benchmark_{entity_idx}",
+            str(row_idx),
+            None,
+            start_time + timedelta(seconds=row_idx),
+            None,
+            '{"unit_of_measurement":"W","friendly_name":"Benchmark"}',
+        )
+        for entity_idx in range(entities)
+        for row_idx in range(rows_per_entity)
+    ]
+
+    start = timer()
+    JSON_DUMP(
+        history._sorted_states_to_dict(  # pylint: disable=protected-access
+            hass,
+            None,
+            rows,
+            start_time,
+            None,
+            include_start_time_state=False,
+            compressed_state_format=True,
+        )
+    )
+    compressed_runtime = timer() - start
+
+    start = timer()
+    JSON_DUMP(
+        history._sorted_states_to_columnar(  # pylint: disable=protected-access
+            hass, None, rows, start_time, None, include_start_time_state=False
+        )
+    )
+    columnar_runtime = timer() - start
+
+    print(f"Compressed states took {compressed_runtime}s")
+    print(f"Columns took {columnar_runtime}s")
+    return columnar_runtime
+
+
+@benchmark
+async def statistics_during_period_reduced(hass):
+    """Reduce a year of hourly statistics of 50 meters to days, weeks, months and years."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant import config_entries
+    from homeassistant.components import recorder
+    from homeassistant.components.recorder.models import Statistics, StatisticsMeta
+    from homeassistant.components.recorder.statistics import statistics_during_period
+    from homeassistant.components.recorder.util import session_scope
+    from homeassistant.setup import async_setup_component
+
+    meters = 50
+    hours = 365 * 24
+    start_time = dt_util.utcnow().replace(
+        minute=0, second=0, microsecond=0
+    ) - timedelta(hours=hours)
+
+    def _insert_statistics():
+        with session_scope(hass=hass) as session:
+            for meter in range(meters):
+                meta = StatisticsMeta(
+                    statistic_id=f"sensor.benchmark_{meter}",
+                    source=recorder.DOMAIN,
+                    unit_of_measurement="kWh",
+                    has_mean=False,
+                    has_sum=True,
+                )
+                session.add(meta)
+                session.flush()
+                session.execute(
+                    Statistics.__table__.insert(),
+                    [
+                        {
+                            "metadata_id": meta.id,
+                            "created": start_time,
+                            "start": start_time + timedelta(hours=hour),
+                            "state": hour,
+                            "sum": hour,
+                        }
+                        for hour in range(hours)
+                    ],
+                )
+
+    with TemporaryDirectory() as config_dir:
+        hass.config.config_dir = config_dir
+        hass.config_entries = config_entries.ConfigEntries(hass, {})
+        assert await async_setup_component(hass, recorder.DOMAIN, {})
+        await hass.async_start()
+        instance = recorder.get_instance(hass)
+        await instance.async_recorder_ready.wait()
+        await instance.async_add_executor_job(_insert_statistics)
+
+        runtime = 0
+        for period in ("day", "week", "month", "year"):
+            start = timer()
+            await instance.async_add_executor_job(
+                statistics_during_period, hass, start_time, None, None, period
+            )
+            period_runtime = timer() - start
+            print(f"Reducing to {period} took {period_runtime}s")
+            runtime += period_runtime
+
+        # Stop while the database still exists
+        await hass.async_stop()
+
+    return runtime
+
+
+@benchmark
+async def mqtt_sensor_messages(hass):
+    """Deliver 50k MQTT messages to 100 mqtt sensors and print the messages/s."""
+    # pylint: disable=import-outside-toplevel
+    from paho.mqtt.client import MQTTMessage
+
+    from homeassistant import auth, config_entries
+    from homeassistant.components import mqtt
+    from homeassistant.helpers import area_registry, device_registry, entity_registry
+    from homeassistant.setup import async_setup_component
+
+    entities = 100
+    messages_to_deliver = 5 * 10**4
+    value_templates = (
+        "{{ value_json.sensor.temperature }}",
+        "{{ value | float * 10 }}",
+        "{{ value_json['humidity'] | round(1) }}",
+    )
+
+    with TemporaryDirectory() as config_dir:
+        hass.config.config_dir = config_dir
+        hass.config_entries = config_entries.ConfigEntries(hass, {})
+        await asyncio.gather(
+            area_registry.async_load(hass),
+            device_registry.async_load(hass),
+            entity_registry.async_load(hass),
+        )
+        # For http, which mqtt depends on
+        hass.auth = await auth.auth_manager_from_config(hass, [], [])
+        # Messages are handed to the client directly, nothing listens here
+        await hass.config_entries.async_add(
+            config_entries.ConfigEntry(
+                1,
+                mqtt.DOMAIN,
+                "Benchmark",
+                {mqtt.CONF_BROKER: "127.0.0.1", mqtt.CONF_PORT: 9},
+                config_entries.SOURCE_USER,
+            )
+        )
+        assert await async_setup_component(
+            hass,
+            "sensor",
+            {
+                "sensor": [
+                    {
+                        "platform": mqtt.DOMAIN,
+                        "name": f"Benchmark {idx}",
+                        "state_topic": f"benchmark/{idx}",
+                        "value_template": value_templates[idx % len(value_templates)],
+                    }
+                    for idx in range(entities)
+                ]
+            },
+        )
+        await hass.async_block_till_done()
+        client = hass.data[mqtt.DATA_MQTT]
+
+        messages = []
+        for idx in range(messages_to_deliver):
+            value = idx % 1000 / 10
+            message = MQTTMessage(topic=f"benchmark/{idx % entities}".encode())
+            message.payload = (
+                json.dumps({"sensor": {"temperature": value}, "humidity": value})
+                if idx % entities % len(value_templates) != 1
+                else str(value)
+            ).encode()
+            messages.append(message)
+
+        start = timer()
+        for message in messages:
+            # pylint: disable-next=protected-access
+            client._mqtt_handle_message(message)
+        runtime = timer() - start
+
+        await hass.async_stop()
+
+    print(f"Delivered {messages_to_deliver / runtime:.0f} messages/s")
+    return runtime
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
@@ -4,8 +4,10 @@ from __future__ import annotations
 import asyncio
 from collections.abc import Awaitable, Callable, Generator, Iterable
 import contextlib
-from datetime import timedelta
+from datetime import datetime, timedelta
+import importlib
 import logging.handlers
+import threading
 from timeit import default_timer as timer
 from types import ModuleType
 from typing import Any
@@ -20,8 +22,10 @@ from .const import (
 )
 from .core import CALLBACK_TYPE
 from .exceptions import DependencyError, HomeAssistantError
+from .helpers import startup_trace
 from .helpers.typing import ConfigType
-from .util import dt as dt_util, ensure_unique_string
+from .util import dt as dt_util, ensure_unique_string, package as pkg_util
+from .util.async_ import gather_with_concurrency
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,6 +36,9 @@ BASE_PLATFORMS = {platform.value for platform in Platform}
 DATA_SETUP_DONE = "setup_done"
 DATA_SETUP_STARTED = "setup_started"
 DATA_SETUP_TIME = "setup_time"
+DATA_IMPORT_STARTED = "import_started"
+DATA_IMPORT_TIME = "import_time"
+DATA_IMPORTS = "import_tasks"
 
 DATA_SETUP = "setup_tasks"
 DATA_DEPS_REQS = "deps_reqs_processed"
@@ -179,7 +186,10 @@ async def _async_setup_component(
     # Process requirements as soon as possible, so we can import the component
     # without requiring imports to be in functions.
     try:
-        await async_process_deps_reqs(hass, config, integration)
+        with startup_trace.async_trace_span(
+            hass, domain, "requirements", startup_trace.CATEGORY_REQUIREMENTS
+        ):
+            await async_process_deps_reqs(hass, config, integration)
     except HomeAssistantError as err:
         log_error(str(err))
         return False
@@ -187,14 +197,21 @@ async def _async_setup_component(
     # Some integrations fail on import because they call functions incorrectly.
     # So we do it before validating config to catch these errors.
     try:
-        component = integration.get_component()
+        with startup_trace.async_trace_span(
+            hass, domain, "import", startup_trace.CATEGORY_IMPORT
+        ):
+            await _async_wait_for_import(hass, domain)
+            component = integration.get_component()
     except ImportError as err:
         log_error(f"Unable to import component: {err}")
         return False
 
-    processed_config = await conf_util.async_process_component_config(
-        hass, config, integration
-    )
+    with startup_trace.async_trace_span(
+        hass, domain, "config", startup_trace.CATEGORY_CONFIG
+    ):
+        processed_config = await conf_util.async_process_component_config(
+            hass, config, integration
+        )
 
     if processed_config is None:
         log_error("Invalid config.")
@@ -265,12 +282,20 @@ async def _async_setup_component(
         await asyncio.sleep(0)
         await hass.config_entries.flow.async_wait_init_flow_finish(domain)
 
-        await asyncio.gather(
-            *(
-                entry.async_setup(hass, integration=integration)
-                for entry in hass.config_entries.async_entries(domain)
-            )
-        )
+        if entries := hass.config_entries.async_entries(domain):
+            with startup_trace.async_trace_span(
+                hass,
+                domain,
+                "config entries",
+                startup_trace.CATEGORY_CONFIG_ENTRY,
+                {"entries": len(entries)},
+            ):
+                await asyncio.gather(
+                    *(
+                        entry.async_setup(hass, integration=integration)
+                        for entry in entries
+                    )
+                )
 
         hass.config.components.add(domain)
 
@@ -313,7 +338,11 @@ async def async_prepare_setup_platform(
         return None
 
     try:
-        platform = integration.get_platform(domain)
+        with startup_trace.async_trace_span(
+            hass, f"{domain}.{platform_name}", "import", startup_trace.CATEGORY_IMPORT
+        ):
+            await _async_wait_for_import(hass, platform_name)
+            platform = integration.get_platform(domain)
     except ImportError as exc:
         log_error(f"Platform not found ({exc}).")
         return None
@@ -340,6 +369,136 @@ async def async_prepare_setup_platform(
     return platform
 
 
+def _import_integration(
+    integration: loader.Integration,
+    requirements: list[str],
+    with_platforms: bool,
+    trace: startup_trace.StartupTrace | None,
+) -> float | None:
+    """Import an integration and its entity platforms if asked to.
+
+    Returns the time the import took or None if a requirement is not installed.
+    """
+    if not all(pkg_util.is_installed(req) for req in requirements):
+        return None
+
+    start = timer()
+    modules = [integration.pkg_path]
+    if with_platforms:
+        modules.extend(
+            f"{integration.pkg_path}.{path.stem}"
+            for path in sorted(integration.file_path.glob("*.py"))
+            if path.stem in BASE_PLATFORMS
+        )
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except Exception:  # pylint: disable=broad-except
+            # Setup imports it again and reports the error
+            break
+    end = timer()
+    if trace is not None:
+        trace.add(
+            f"executor {threading.current_thread().name}",
+            integration.domain,
+            startup_trace.CATEGORY_IMPORT,
+            start,
+            end,
+            {"modules": modules},
+        )
+    return end - start
+
+
+async def async_import_integrations(
+    hass: core.HomeAssistant,
+    domains: Iterable[str],
+    integrations: dict[str, loader.Integration],
+) -> None:
+    """Import integrations in the executor ahead of their setup.
+
+    The entity platforms of integrations with config entries are imported
+    too. Domains are imported in the given order, integrations are looked up
+    in integrations. Setup waits for a running import instead of importing in
+    the event loop.
+
+    Only built-in integrations whose requirements and the requirements of
+    their dependencies are installed are imported. Others are imported by
+    their setup, after the requirements are processed.
+    """
+    imports: dict[str, asyncio.Future[float | None]] = hass.data.setdefault(
+        DATA_IMPORTS, {}
+    )
+    import_started: dict[str, datetime] = hass.data.setdefault(DATA_IMPORT_STARTED, {})
+    import_time: dict[str, timedelta] = hass.data.setdefault(DATA_IMPORT_TIME, {})
+    components = hass.data.setdefault(loader.DATA_COMPONENTS, {})
+    entry_domains = set(hass.config_entries.async_domains())
+    trace = startup_trace.async_get_startup_trace(hass)
+    satisfied: set[str] = set()
+    if not hass.config.skip_pip:
+        satisfied = await requirements.async_get_satisfied_requirements(hass)
+
+    def get_requirements(integration: loader.Integration) -> list[str]:
+        """Return the unchecked requirements of an integration and its dependencies."""
+        if hass.config.skip_pip:
+            return []
+        reqs = list(integration.requirements)
+        for dep in integration.all_dependencies:
+            if (dep_integration := integrations.get(dep)) is not None:
+                reqs.extend(dep_integration.requirements)
+        return [req for req in reqs if req not in satisfied]
+
+    async def import_integration(integration: loader.Integration) -> None:
+        """Import an integration unless it's imported already."""
+        domain = integration.domain
+        if domain in components or domain in imports:
+            return
+        import_started[domain] = dt_util.utcnow()
+        future = imports[domain] = hass.async_add_executor_job(
+            _import_integration,
+            integration,
+            get_requirements(integration),
+            domain in entry_domains,
+            trace,
+        )
+
+        @core.callback
+        def import_done(future: asyncio.Future[float | None]) -> None:
+            """Record the time of the finished import."""
+            del imports[domain]
+            del import_started[domain]
+            if (
+                not future.cancelled()
+                and future.exception() is None
+                and (seconds := future.result()) is not None
+            ):
+                import_time[domain] = timedelta(seconds=seconds)
+
+        future.add_done_callback(import_done)
+        # An import that times out keeps running in the executor
+        # and setup keeps waiting for it
+        await asyncio.shield(future)
+
+    to_import = []
+    for domain in domains:
+        if (
+            (integration := integrations.get(domain)) is not None
+            and integration.is_built_in
+            and await integration.resolve_dependencies()
+        ):
+            to_import.append(integration)
+
+    await gather_with_concurrency(
+        loader.MAX_LOAD_CONCURRENTLY,
+        *(import_integration(integration) for integration in to_import),
+    )
+
+
+async def _async_wait_for_import(hass: core.HomeAssistant, domain: str) -> None:
+    """Wait for a running import of an integration."""
+    if (future := hass.data.get(DATA_IMPORTS, {}).get(domain)) is not None:
+        await asyncio.shield(future)
+
+
 async def async_process_deps_reqs(
     hass: core.HomeAssistant, config: ConfigType, integration: loader.Integration
 ) -> None:
@@ -445,6 +604,7 @@ def async_start_setup(
     """Keep track of when setup starts and finishes."""
     setup_started = hass.data.setdefault(DATA_SETUP_STARTED, {})
     started = dt_util.utcnow()
+    start = timer()
     unique_components: dict[str, str] = {}
     for domain in components:
         unique = ensure_unique_string(domain, setup_started)
@@ -453,6 +613,11 @@ def async_start_setup(
 
     yield
 
+    if trace := startup_trace.async_get_startup_trace(hass):
+        end = timer()
+        for unique in unique_components:
+            trace.add(unique, "setup", startup_trace.CATEGORY_SETUP, start, end)
+
     setup_time: dict[str, timedelta] = hass.data.setdefault(DATA_SETUP_TIME, {})
     time_taken = dt_util.utcnow() - started
     for unique, domain in unique_components.items():
@@ -10,8 +10,6 @@ from subprocess import PIPE, Popen
 import sys
 from urllib.parse import urlparse
 
-import pkg_resources
-
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -34,6 +32,9 @@ def is_installed(package: str) -> bool:
     Returns True when the requirement is met.
     Returns False when the package is not installed or doesn't meet req.
     """
+    # Imported on first use, importing it scans all installed distributions
+    import pkg_resources  # pylint: disable=import-outside-toplevel
+
     try:
         pkg_resources.get_distribution(package)
         return True
@@ -4,6 +4,9 @@ from __future__ import annotations
 from random import getrandbits
 import time
 
+_CROCKFORD_BASE32 = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_CROCKFORD_BASE32_DECODE = {char: idx for idx, char in enumerate(_CROCKFORD_BASE32)}
+
 
 def ulid_hex() -> str:
     """Generate a ULID in lowercase hex that will work for a UUID.
@@ -35,16 +38,23 @@ def ulid(timestamp: float | None = None) -> str:
     import ulid
     ulid.parse(ulid_util.ulid())
     """
-    ulid_bytes = int((timestamp or time.time()) * 1000).to_bytes(
-        6, byteorder="big"
-    ) + int(getrandbits(80)).to_bytes(10, byteorder="big")
+    return bytes_to_ulid(
+        int((timestamp or time.time()) * 1000).to_bytes(6, byteorder="big")
+        + int(getrandbits(80)).to_bytes(10, byteorder="big")
+    )
+
+
+def bytes_to_ulid(ulid_bytes: bytes) -> str:
+    """Convert the 16 byte binary form of a ULID to its string form."""
+    if len(ulid_bytes) != 16:
+        raise ValueError(f"ULID bytes must be 16 bytes long, got {len(ulid_bytes)}")
 
     # This is base32 crockford encoding with the loop unrolled for performance
     #
     # This code is adapted from:
     # https://github.com/ahawker/ulid/blob/06289583e9de4286b4d80b4ad000d137816502ca/ulid/base32.py#L102
     #
-    enc = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+    enc = _CROCKFORD_BASE32
     return (
         enc[(ulid_bytes[0] & 224) >> 5]
         + enc[ulid_bytes[0] & 31]
@@ -73,3 +83,21 @@ def ulid(timestamp: float | None = None) -> str:
         + enc[((ulid_bytes[14] & 3) << 3) | ((ulid_bytes[15] & 224) >> 5)]
         + enc[ulid_bytes[15] & 31]
     )
+
+
+def ulid_to_bytes(ulid_str: str) -> bytes:
+    """Convert a ULID string to its 16 byte binary form.
+
+    Only the canonical (uppercase) form generated by ulid() is accepted
+    so that bytes_to_ulid(ulid_to_bytes(ulid_str)) == ulid_str always
+    holds. A ValueError is raised for anything else.
+    """
+    if len(ulid_str) != 26 or ulid_str[0] > "7":
+        raise ValueError(f"Not a canonical ULID: {ulid_str}")
+    value = 0
+    try:
+        for char in ulid_str:
+            value = (value << 5) | _CROCKFORD_BASE32_DECODE[char]
+    except KeyError as err:
+        raise ValueError(f"Not a canonical ULID: {ulid_str}") from err
+    return value.to_bytes(16, byteorder="big")
@@ -2,15 +2,29 @@
 from __future__ import annotations
 
 from collections import OrderedDict
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
 import fnmatch
+import hashlib
+from io import StringIO
+import json
 import logging
 import os
 from pathlib import Path
+import threading
+import time
 from typing import Any, TextIO, TypeVar, Union, overload
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as FastestAvailableSafeLoader
+
+    HAS_C_LOADER = True
+except ImportError:
+    HAS_C_LOADER = False
+    from yaml import SafeLoader as FastestAvailableSafeLoader  # type: ignore[misc]
+
+from homeassistant.const import __version__
 from homeassistant.exceptions import HomeAssistantError
 
 from .const import SECRET_YAML
@@ -32,11 +46,9 @@ class Secrets:
         self.config_dir = config_dir
         self._cache: dict[Path, dict[str, str]] = {}
 
-    def get(self, requester_path: str, secret: str) -> str:
-        """Return the value of a secret."""
-        current_path = Path(requester_path)
-
-        secret_dir = current_path
+    def secret_dirs(self, requester_path: str) -> Iterator[Path]:
+        """Return the folders searched for a secrets.yaml, closest first."""
+        secret_dir = Path(requester_path)
         while True:
             secret_dir = secret_dir.parent
 
@@ -44,8 +56,13 @@ class Secrets:
                 secret_dir.relative_to(self.config_dir)
             except ValueError:
                 # We went above the config dir
-                break
+                return
 
+            yield secret_dir
+
+    def get(self, requester_path: str, secret: str) -> str:
+        """Return the value of a secret."""
+        for secret_dir in self.secret_dirs(requester_path):
             secrets = self._load_secret_yaml(secret_dir)
 
             if secret in secrets:
@@ -91,10 +108,16 @@ class Secrets:
 class SafeLineLoader(yaml.SafeLoader):
     """Loader class that keeps track of line numbers."""
 
-    def __init__(self, stream: Any, secrets: Secrets | None = None) -> None:
+    def __init__(
+        self,
+        stream: Any,
+        secrets: Secrets | None = None,
+        cache: YamlCache | None = None,
+    ) -> None:
         """Initialize a safe line loader."""
         super().__init__(stream)
         self.secrets = secrets
+        self.cache = cache
 
     def compose_node(self, parent: yaml.nodes.Node, index: int) -> yaml.nodes.Node:  # type: ignore[override]
         """Annotate a node with the first line it was seen."""
@@ -104,52 +127,397 @@ class SafeLineLoader(yaml.SafeLoader):
         return node
 
 
-def load_yaml(fname: str, secrets: Secrets | None = None) -> JSON_TYPE:
+class FastSafeLoader(FastestAvailableSafeLoader):
+    """The fastest available safe loader, backed by libyaml if available.
+
+    The line of a node is taken from its start mark, which libyaml provides.
+    """
+
+    def __init__(
+        self,
+        stream: Any,
+        secrets: Secrets | None = None,
+        cache: YamlCache | None = None,
+    ) -> None:
+        """Initialize a fast safe loader."""
+        super().__init__(stream)
+        if isinstance(stream, str):
+            self.name = "<unicode string>"
+        elif isinstance(stream, bytes):
+            self.name = "<byte string>"
+        else:
+            self.name = getattr(stream, "name", "<file>")
+        self.stream = stream
+        self.secrets = secrets
+        self.cache = cache
+
+
+LoaderType = Union[SafeLineLoader, FastSafeLoader]
+
+# Filesystems store modification times with limited precision, a file written
+# this close to the time it was fingerprinted is verified with its hash
+_RACY_MTIME_NS = 2_000_000_000
+
+
+class _NotCacheable(Exception):
+    """Raised when a loaded value can't be stored in the YAML cache."""
+
+
+class _Dependencies:
+    """Files and folders a YAML file depends on while it's loaded."""
+
+    __slots__ = ("files", "dirs", "cacheable")
+
+    def __init__(self) -> None:
+        """Initialize the dependencies."""
+        self.files: dict[str, list | None] = {}
+        self.dirs: dict[str, list[str]] = {}
+        self.cacheable = True
+
+    def update(self, files: dict, dirs: dict, cacheable: bool = True) -> None:
+        """Add the dependencies of an included file."""
+        self.files.update(files)
+        self.dirs.update(dirs)
+        self.cacheable = self.cacheable and cacheable
+
+
+def _fingerprint(path: str) -> list | None:
+    """Return the modification time, size and hash of a file.
+
+    Returns None if the file doesn't exist.
+    """
+    try:
+        stat = os.stat(path)
+        with open(path, "rb") as file:
+            digest = hashlib.sha256(file.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+    except OSError as exc:
+        raise _NotCacheable from exc
+    return [stat.st_mtime_ns, stat.st_size, digest]
+
+
+def _is_unchanged(path: str, fingerprint: list | None, created: int) -> bool:
+    """Return if a file still matches its fingerprint."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return fingerprint is None
+    except OSError:
+        return False
+    if fingerprint is None:
+        return False
+    mtime_ns, size, digest = fingerprint
+    if stat.st_size != size:
+        return False
+    if stat.st_mtime_ns == mtime_ns and mtime_ns < created - _RACY_MTIME_NS:
+        return True
+    try:
+        current = _fingerprint(path)
+    except _NotCacheable:
+        return False
+    return current is not None and current[2] == digest
+
+
+# Keys of the JSON objects the cache stores YAML values as. They start with a
+# NUL character, which can't be part of a key in YAML.
+_FILE = "\0f"
+_LINE = "\0l"
+_NODE_LIST = "\0n"
+_NODE_STR = "\0s"
+_PAIRS = "\0o"
+_DICT = "\0d"
+
+
+def _encode(obj: Any, names: dict[str, int]) -> Any:
+    """Encode a loaded YAML value for json, keeping types and line info.
+
+    Mappings with string keys become JSON objects, other values that can't
+    be told apart in JSON become objects with a type key.
+    """
+    obj_type = type(obj)
+    if obj is None or obj_type in (str, int, float, bool):
+        return obj
+    if obj_type is list:
+        return [_encode(value, names) for value in obj]
+    if obj_type is dict:
+        return {
+            _DICT: [
+                [_encode(key, names), _encode(value, names)]
+                for key, value in obj.items()
+            ]
+        }
+    data: dict[str, Any]
+    if obj_type is OrderedDict:
+        if all(type(key) is str and key[:1] != "\0" for key in obj):
+            data = {key: _encode(value, names) for key, value in obj.items()}
+        else:
+            data = {
+                _PAIRS: [
+                    [_encode(key, names), _encode(value, names)]
+                    for key, value in obj.items()
+                ]
+            }
+    elif obj_type is NodeListClass:
+        data = {_NODE_LIST: [_encode(value, names) for value in obj]}
+    elif obj_type is NodeStrClass:
+        data = {_NODE_STR: str(obj)}
+    else:
+        raise _NotCacheable(obj_type)
+    if hasattr(obj, "__config_file__"):
+        data[_FILE] = names.setdefault(obj.__config_file__, len(names))
+        data[_LINE] = obj.__line__
+    return data
+
+
+def _decoder(names: list[str]) -> Callable[[dict[str, Any]], Any]:
+    """Return a json object hook that decodes values encoded with _encode."""
+
+    def decode(data: dict[str, Any]) -> Any:
+        """Decode a JSON object."""
+        line = data.pop(_LINE, None)
+        file = data.pop(_FILE, None)
+        obj: Any
+        if _NODE_LIST in data:
+            obj = NodeListClass(data[_NODE_LIST])
+        elif _NODE_STR in data:
+            obj = NodeStrClass(data[_NODE_STR])
+        elif _PAIRS in data:
+            obj = OrderedDict((key, value) for key, value in data[_PAIRS])
+        elif _DICT in data:
+            return {key: value for key, value in data[_DICT]}
+        else:
+            obj = OrderedDict(data)
+        if line is not None:
+            setattr(obj, "__config_file__", names[file])
+            setattr(obj, "__line__", line)
+        return obj
+
+    return decode
+
+
+class YamlCache:
+    """Cache of loaded YAML files.
+
+    A file is loaded from the cache as long as it, the files it includes and
+    the secrets files it uses match their modification time, size and hash.
+    Files that read environment variables or contain duplicate keys are not
+    cached, so they are always loaded and warned about.
+    """
+
+    def __init__(self, data: dict | None = None) -> None:
+        """Initialize the cache with data returned by as_dict."""
+        self._entries: dict[str, dict[str, Any]] = {}
+        if data and data.get("version") == __version__:
+            self._entries.update(data["files"])
+        self._used: set[str] = set()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.dirty = False
+
+    @property
+    def _stack(self) -> list[_Dependencies]:
+        """Return the dependencies of the files being loaded by this thread."""
+        try:
+            return self._local.stack  # type: ignore[no-any-return]
+        except AttributeError:
+            self._local.stack = []
+            return self._local.stack  # type: ignore[no-any-return]
+
+    def load(
+        self, fname: str, secrets: Secrets | None, load: Callable[[], JSON_TYPE]
+    ) -> JSON_TYPE:
+        """Return a YAML file from the cache or load and cache it."""
+        path = os.path.abspath(fname)
+        secrets_dir = None if secrets is None else str(secrets.config_dir)
+        stack = self._stack
+
+        if (
+            (entry := self._entries.get(path)) is not None
+            and entry["secrets"] == secrets_dir
+            and self._is_valid(entry)
+        ):
+            with self._lock:
+                self._used.add(path)
+            if stack:
+                stack[-1].update(entry["files"], entry["dirs"])
+            return json.loads(  # type: ignore[no-any-return]
+                entry["data"], object_hook=_decoder(entry["names"])
+            )
+
+        created = time.time_ns()
+        deps = _Dependencies()
+        try:
+            # Taken before the file is read, so a file that changes while it
+            # is loaded no longer matches its fingerprint
+            if (fingerprint := _fingerprint(path)) is None:
+                deps.cacheable = False
+            deps.files[path] = fingerprint
+        except _NotCacheable:
+            deps.cacheable = False
+
+        stack.append(deps)
+        try:
+            result = load()
+        finally:
+            stack.pop()
+
+        if stack:
+            stack[-1].update(deps.files, deps.dirs, deps.cacheable)
+        if not deps.cacheable:
+            return result
+        names: dict[str, int] = {}
+        try:
+            data = json.dumps(_encode(result, names), separators=(",", ":"))
+        except _NotCacheable:
+            if stack:
+                stack[-1].cacheable = False
+            return result
+
+        with self._lock:
+            self._entries[path] = {
+                "secrets": secrets_dir,
+                "created": created,
+                "files": deps.files,
+                "dirs": deps.dirs,
+                "names": list(names),
+                "data": data,
+            }
+            self._used.add(path)
+            self.dirty = True
+        return result
+
+    def _is_valid(self, entry: dict[str, Any]) -> bool:
+        """Return if the files and folders of an entry are unchanged."""
+        created: int = entry["created"]
+        return all(
+            _is_unchanged(path, fingerprint, created)
+            for path, fingerprint in entry["files"].items()
+        ) and all(
+            _find_yaml_files(directory) == files
+            for directory, files in entry["dirs"].items()
+        )
+
+    def track_file(self, path: str) -> None:
+        """Make the file being loaded depend on another file."""
+        if not (stack := self._stack):
+            return
+        deps = stack[-1]
+        path = os.path.abspath(path)
+        if path in deps.files:
+            return
+        try:
+            deps.files[path] = _fingerprint(path)
+        except _NotCacheable:
+            deps.cacheable = False
+
+    def track_directory(self, directory: str, files: list[str]) -> None:
+        """Make the file being loaded depend on the YAML files of a folder."""
+        if stack := self._stack:
+            stack[-1].dirs[directory] = files
+
+    def skip(self) -> None:
+        """Don't cache the file being loaded."""
+        if stack := self._stack:
+            stack[-1].cacheable = False
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the files used since the cache was created, for storage."""
+        with self._lock:
+            self.dirty = False
+            return {
+                "version": __version__,
+                "files": {path: self._entries[path] for path in self._used},
+            }
+
+
+def load_yaml(
+    fname: str, secrets: Secrets | None = None, cache: YamlCache | None = None
+) -> JSON_TYPE:
     """Load a YAML file."""
+    if cache is not None:
+        return cache.load(fname, secrets, lambda: _load_yaml(fname, secrets, cache))
+    return _load_yaml(fname, secrets, None)
+
+
+def _load_yaml(
+    fname: str, secrets: Secrets | None, cache: YamlCache | None
+) -> JSON_TYPE:
+    """Read and parse a YAML file."""
     try:
         with open(fname, encoding="utf-8") as conf_file:
-            return parse_yaml(conf_file, secrets)
+            return parse_yaml(conf_file, secrets, cache)
     except UnicodeDecodeError as exc:
         _LOGGER.error("Unable to read file %s: %s", fname, exc)
         raise HomeAssistantError(exc) from exc
 
 
-def parse_yaml(content: str | TextIO, secrets: Secrets | None = None) -> JSON_TYPE:
-    """Load a YAML file."""
+def parse_yaml(
+    content: str | TextIO | StringIO,
+    secrets: Secrets | None = None,
+    cache: YamlCache | None = None,
+) -> JSON_TYPE:
+    """Parse YAML with the fastest available loader."""
+    if not HAS_C_LOADER:
+        return _parse_yaml_python(content, secrets, cache)
     try:
-        # If configuration file is empty YAML returns None
-        # We convert that to an empty dict
-        return (
-            yaml.load(content, Loader=lambda stream: SafeLineLoader(stream, secrets))
-            or OrderedDict()
-        )
+        return _parse_yaml(FastSafeLoader, content, secrets, cache)
+    except yaml.YAMLError:
+        # Parse again with the pure Python loader, its error messages
+        # point at the exact location of the problem
+        if hasattr(content, "seek"):
+            content.seek(0)
+    return _parse_yaml_python(content, secrets, cache)
+
+
+def _parse_yaml_python(
+    content: str | TextIO | StringIO,
+    secrets: Secrets | None = None,
+    cache: YamlCache | None = None,
+) -> JSON_TYPE:
+    """Parse YAML with the pure Python loader."""
+    try:
+        return _parse_yaml(SafeLineLoader, content, secrets, cache)
     except yaml.YAMLError as exc:
         _LOGGER.error(str(exc))
         raise HomeAssistantError(exc) from exc
 
 
+def _parse_yaml(
+    loader: type[FastSafeLoader] | type[SafeLineLoader],
+    content: str | TextIO | StringIO,
+    secrets: Secrets | None,
+    cache: YamlCache | None,
+) -> JSON_TYPE:
+    """Parse YAML with the given loader."""
+    # If configuration file is empty YAML returns None
+    # We convert that to an empty dict
+    return (
+        yaml.load(content, Loader=lambda stream: loader(stream, secrets, cache))
+        or OrderedDict()
+    )
+
+
 @overload
 def _add_reference(
-    obj: list | NodeListClass, loader: SafeLineLoader, node: yaml.nodes.Node
+    obj: list | NodeListClass, loader: LoaderType, node: yaml.nodes.Node
 ) -> NodeListClass:
     ...
 
 
 @overload
 def _add_reference(
-    obj: str | NodeStrClass, loader: SafeLineLoader, node: yaml.nodes.Node
+    obj: str | NodeStrClass, loader: LoaderType, node: yaml.nodes.Node
 ) -> NodeStrClass:
     ...
 
 
 @overload
-def _add_reference(
-    obj: _DictT, loader: SafeLineLoader, node: yaml.nodes.Node
-) -> _DictT:
+def _add_reference(obj: _DictT, loader: LoaderType, node: yaml.nodes.Node) -> _DictT:
     ...
 
 
-def _add_reference(obj, loader: SafeLineLoader, node: yaml.nodes.Node):  # type: ignore[no-untyped-def]
+def _add_reference(obj, loader: LoaderType, node: yaml.nodes.Node):  # type: ignore[no-untyped-def]
     """Add file reference information to an object."""
     if isinstance(obj, list):
         obj = NodeListClass(obj)
@@ -160,7 +528,7 @@ def _add_reference(obj, loader: SafeLineLoader, node: yaml.nodes.Node):  # type:
     return obj
 
 
-def _include_yaml(loader: SafeLineLoader, node: yaml.nodes.Node) -> JSON_TYPE:
+def _include_yaml(loader: LoaderType, node: yaml.nodes.Node) -> JSON_TYPE:
     """Load another YAML file and embeds it using the !include tag.
 
     Example:
@@ -169,7 +537,9 @@ def _include_yaml(loader: SafeLineLoader, node: yaml.nodes.Node) -> JSON_TYPE:
     """
     fname = os.path.join(os.path.dirname(loader.name), node.value)
     try:
-        return _add_reference(load_yaml(fname, loader.secrets), loader, node)
+        return _add_reference(
+            load_yaml(fname, loader.secrets, loader.cache), loader, node
+        )
     except FileNotFoundError as exc:
         raise HomeAssistantError(
             f"{node.start_mark}: Unable to read file {fname}."
@@ -191,63 +561,68 @@ def _find_files(directory: str, pattern: str) -> Iterator[str]:
                 yield filename
 
 
-def _include_dir_named_yaml(
-    loader: SafeLineLoader, node: yaml.nodes.Node
-) -> OrderedDict:
+def _find_yaml_files(directory: str) -> list[str]:
+    """Return the YAML files in a directory, except secrets."""
+    return [
+        fname
+        for fname in _find_files(directory, "*.yaml")
+        if os.path.basename(fname) != SECRET_YAML
+    ]
+
+
+def _find_included_files(loader: LoaderType, node: yaml.nodes.Node) -> list[str]:
+    """Return the YAML files in the directory included by a node."""
+    loc = os.path.join(os.path.dirname(loader.name), node.value)
+    files = _find_yaml_files(loc)
+    if loader.cache is not None:
+        loader.cache.track_directory(loc, files)
+    return files
+
+
+def _include_dir_named_yaml(loader: LoaderType, node: yaml.nodes.Node) -> OrderedDict:
     """Load multiple files from directory as a dictionary."""
     mapping: OrderedDict = OrderedDict()
-    loc = os.path.join(os.path.dirname(loader.name), node.value)
-    for fname in _find_files(loc, "*.yaml"):
+    for fname in _find_included_files(loader, node):
         filename = os.path.splitext(os.path.basename(fname))[0]
-        if os.path.basename(fname) == SECRET_YAML:
-            continue
-        mapping[filename] = load_yaml(fname, loader.secrets)
+        mapping[filename] = load_yaml(fname, loader.secrets, loader.cache)
     return _add_reference(mapping, loader, node)
 
 
 def _include_dir_merge_named_yaml(
-    loader: SafeLineLoader, node: yaml.nodes.Node
+    loader: LoaderType, node: yaml.nodes.Node
 ) -> OrderedDict:
     """Load multiple files from directory as a merged dictionary."""
     mapping: OrderedDict = OrderedDict()
-    loc = os.path.join(os.path.dirname(loader.name), node.value)
-    for fname in _find_files(loc, "*.yaml"):
-        if os.path.basename(fname) == SECRET_YAML:
-            continue
-        loaded_yaml = load_yaml(fname, loader.secrets)
+    for fname in _find_included_files(loader, node):
+        loaded_yaml = load_yaml(fname, loader.secrets, loader.cache)
         if isinstance(loaded_yaml, dict):
             mapping.update(loaded_yaml)
     return _add_reference(mapping, loader, node)
 
 
 def _include_dir_list_yaml(
-    loader: SafeLineLoader, node: yaml.nodes.Node
+    loader: LoaderType, node: yaml.nodes.Node
 ) -> list[JSON_TYPE]:
     """Load multiple files from directory as a list."""
-    loc = os.path.join(os.path.dirname(loader.name), node.value)
     return [
-        load_yaml(f, loader.secrets)
-        for f in _find_files(loc, "*.yaml")
-        if os.path.basename(f) != SECRET_YAML
+        load_yaml(f, loader.secrets, loader.cache)
+        for f in _find_included_files(loader, node)
     ]
 
 
 def _include_dir_merge_list_yaml(
-    loader: SafeLineLoader, node: yaml.nodes.Node
+    loader: LoaderType, node: yaml.nodes.Node
 ) -> JSON_TYPE:
     """Load multiple files from directory as a merged list."""
-    loc: str = os.path.join(os.path.dirname(loader.name), node.value)
     merged_list: list[JSON_TYPE] = []
-    for fname in _find_files(loc, "*.yaml"):
-        if os.path.basename(fname) == SECRET_YAML:
-            continue
-        loaded_yaml = load_yaml(fname, loader.secrets)
+    for fname in _find_included_files(loader, node):
+        loaded_yaml = load_yaml(fname, loader.secrets, loader.cache)
         if isinstance(loaded_yaml, list):
             merged_list.extend(loaded_yaml)
     return _add_reference(merged_list, loader, node)
 
 
-def _ordered_dict(loader: SafeLineLoader, node: yaml.nodes.MappingNode) -> OrderedDict:
+def _ordered_dict(loader: LoaderType, node: yaml.nodes.MappingNode) -> OrderedDict:
     """Load YAML mappings into an ordered dictionary to preserve key order."""
     loader.flatten_mapping(node)
     nodes = loader.construct_pairs(node)
@@ -266,6 +641,9 @@ def _ordered_dict(loader: SafeLineLoader, node: yaml.nodes.MappingNode) -> Order
             ) from exc
 
         if key in seen:
+            if loader.cache is not None:
+                # Keep warning about it on every load
+                loader.cache.skip()
             fname = getattr(loader.stream, "name", "")
             _LOGGER.warning(
                 'YAML file %s contains duplicate key "%s". Check lines %d and %d',
@@ -279,14 +657,17 @@ def _ordered_dict(loader: SafeLineLoader, node: yaml.nodes.MappingNode) -> Order
     return _add_reference(OrderedDict(nodes), loader, node)
 
 
-def _construct_seq(loader: SafeLineLoader, node: yaml.nodes.Node) -> JSON_TYPE:
+def _construct_seq(loader: LoaderType, node: yaml.nodes.Node) -> JSON_TYPE:
     """Add line number and file name to Load YAML sequence."""
     (obj,) = loader.construct_yaml_seq(node)
     return _add_reference(obj, loader, node)
 
 
-def _env_var_yaml(loader: SafeLineLoader, node: yaml.nodes.Node) -> str:
+def _env_var_yaml(loader: LoaderType, node: yaml.nodes.Node) -> str:
     """Load environment variables and embed it into the configuration YAML."""
+    if loader.cache is not None:
+        # The environment is not part of the cache key
+        loader.cache.skip()
     args = node.value.split()
 
     # Check for a default value
@@ -298,27 +679,30 @@ def _env_var_yaml(loader: SafeLineLoader, node: yaml.nodes.Node) -> str:
     raise HomeAssistantError(node.value)
 
 
-def secret_yaml(loader: SafeLineLoader, node: yaml.nodes.Node) -> JSON_TYPE:
+def secret_yaml(loader: LoaderType, node: yaml.nodes.Node) -> JSON_TYPE:
     """Load secrets and embed it into the configuration YAML."""
     if loader.secrets is None:
         raise HomeAssistantError("Secrets not supported in this YAML file")
 
+    if loader.cache is not None:
+        for secret_dir in loader.secrets.secret_dirs(loader.name):
+            loader.cache.track_file(str(secret_dir / SECRET_YAML))
+
     return loader.secrets.get(loader.name, node.value)
 
 
-SafeLineLoader.add_constructor("!include", _include_yaml)
-SafeLineLoader.add_constructor(
-    yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, _ordered_dict
-)
-SafeLineLoader.add_constructor(
-    yaml.resolver.BaseResolver.DEFAULT_SEQUENCE_TAG, _construct_seq
-)
-SafeLineLoader.add_constructor("!env_var", _env_var_yaml)
-SafeLineLoader.add_constructor("!secret", secret_yaml)
-SafeLineLoader.add_constructor("!include_dir_list", _include_dir_list_yaml)
-SafeLineLoader.add_constructor("!include_dir_merge_list", _include_dir_merge_list_yaml)
-SafeLineLoader.add_constructor("!include_dir_named", _include_dir_named_yaml)
-SafeLineLoader.add_constructor(
-    "!include_dir_merge_named", _include_dir_merge_named_yaml
-)
-SafeLineLoader.add_constructor("!input", Input.from_node)
+for _loader in (SafeLineLoader, FastSafeLoader):
+    _loader.add_constructor("!include", _include_yaml)
+    _loader.add_constructor(
+        yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, _ordered_dict
+    )
+    _loader.add_constructor(
+        yaml.resolver.BaseResolver.DEFAULT_SEQUENCE_TAG, _construct_seq
+    )
+    _loader.add_constructor("!env_var", _env_var_yaml)
+    _loader.add_constructor("!secret", secret_yaml)
+    _loader.add_constructor("!include_dir_list", _include_dir_list_yaml)
+    _loader.add_constructor("!include_dir_merge_list", _include_dir_merge_list_yaml)
+    _loader.add_constructor("!include_dir_named", _include_dir_named_yaml)
+    _loader.add_constructor("!include_dir_merge_named", _include_dir_merge_named_yaml)
+    _loader.add_constructor("!input", Input.from_node)
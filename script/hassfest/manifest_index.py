@@ -0,0 +1,46 @@
+"""Generate the manifest index file."""
+from __future__ import annotations
+
+import json
+
+from .model import Config, Integration
+
+
+def generate_and_validate(integrations: dict[str, Integration]) -> str:
+    """Validate and generate the manifest index.
+
+    Every manifest is written on its own line to keep the diffs readable.
+    """
+    lines = [
+        f"{json.dumps(domain)}: "
+        f"{json.dumps(integration.manifest, ensure_ascii=False, separators=(',', ':'))}"
+        for domain, integration in sorted(integrations.items())
+        if integration.manifest
+    ]
+    return "{\n" + ",\n".join(lines) + "\n}"
+
+
+def validate(integrations: dict[str, Integration], config: Config) -> None:
+    """Validate the manifest index file."""
+    index_path = config.root / "homeassistant/generated/manifest_index.json"
+    config.cache["manifest_index"] = content = generate_and_validate(integrations)
+
+    if config.specific_integrations:
+        return
+
+    with open(str(index_path)) as fp:
+        current = fp.read().strip()
+        if current != content:
+            config.add_error(
+                "manifest_index",
+                "File manifest_index.json is not up to date. "
+                "Run python3 -m script.hassfest",
+                fixable=True,
+            )
+
+
+def generate(integrations: dict[str, Integration], config: Config) -> None:
+    """Generate the manifest index file."""
+    index_path = config.root / "homeassistant/generated/manifest_index.json"
+    with open(str(index_path), "w") as fp:
+        fp.write(f"{config.cache['manifest_index']}\n")
@@ -688,6 +688,10 @@ class MockEntityPlatform(entity_platform.EntityPlatform):
         # Otherwise the constructor will blow up.
         if isinstance(platform, Mock) and isinstance(platform.PARALLEL_UPDATES, Mock):
             platform.PARALLEL_UPDATES = 0
+        if isinstance(platform, Mock) and isinstance(
+            platform.STATE_WRITE_COALESCE_WINDOW, Mock
+        ):
+            platform.STATE_WRITE_COALESCE_WINDOW = None
 
         super().__init__(
             hass=hass,
@@ -11,9 +11,11 @@ import pytest
 import homeassistant.components.group as group
 from homeassistant.const import (
     ATTR_ASSUMED_STATE,
+    ATTR_ENTITY_ID,
     ATTR_FRIENDLY_NAME,
     ATTR_ICON,
     EVENT_HOMEASSISTANT_START,
+    EVENT_STATE_CHANGED,
     SERVICE_RELOAD,
     STATE_HOME,
     STATE_NOT_HOME,
@@ -23,7 +25,6 @@ from homeassistant.const import (
 )
 from homeassistant.core import CoreState, HomeAssistant
 from homeassistant.helpers import entity_registry as er
-from homeassistant.helpers.event import TRACK_STATE_CHANGE_CALLBACKS
 from homeassistant.setup import async_setup_component
 
 from tests.common import MockConfigEntry, assert_setup_component
@@ -445,11 +446,27 @@ async def test_reloading_groups(hass):
         "group.second_group",
         "group.test_group",
     ]
-    assert hass.bus.async_listeners()["state_changed"] == 1
-    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["hello.world"]) == 1
-    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["light.bowl"]) == 1
-    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["test.one"]) == 1
-    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["test.two"]) == 1
+    assert hass.bus.async_listeners()["state_changed"] == 3
+    assert (
+        hass.bus.async_keyed_listeners(EVENT_STATE_CHANGED, ATTR_ENTITY_ID)[
+            "hello.world"
+        ]
+        == 1
+    )
+    assert (
+        hass.bus.async_keyed_listeners(EVENT_STATE_CHANGED, ATTR_ENTITY_ID)[
+            "light.bowl"
+        ]
+        == 1
+    )
+    assert (
+        hass.bus.async_keyed_listeners(EVENT_STATE_CHANGED, ATTR_ENTITY_ID)["test.one"]
+        == 1
+    )
+    assert (
+        hass.bus.async_keyed_listeners(EVENT_STATE_CHANGED, ATTR_ENTITY_ID)["test.two"]
+        == 1
+    )
 
     with patch(
         "homeassistant.config.load_yaml_config_file",
@@ -464,10 +481,21 @@ async def test_reloading_groups(hass):
         "group.all_tests",
         "group.hello",
     ]
-    assert hass.bus.async_listeners()["state_changed"] == 1
-    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["light.bowl"]) == 1
-    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["test.one"]) == 1
-    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["test.two"]) == 1
+    assert hass.bus.async_listeners()["state_changed"] == 2
+    assert (
+        hass.bus.async_keyed_listeners(EVENT_STATE_CHANGED, ATTR_ENTITY_ID)[
+            "light.bowl"
+        ]
+        == 1
+    )
+    assert (
+        hass.bus.async_keyed_listeners(EVENT_STATE_CHANGED, ATTR_ENTITY_ID)["test.one"]
+        == 1
+    )
+    assert (
+        hass.bus.async_keyed_listeners(EVENT_STATE_CHANGED, ATTR_ENTITY_ID)["test.two"]
+        == 1
+    )
 
 
 async def test_modify_group(hass):
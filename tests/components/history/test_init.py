@@ -1,20 +1,22 @@
 """The tests the History component."""
 # pylint: disable=protected-access,invalid-name
+import asyncio
 from datetime import timedelta
 from http import HTTPStatus
 import json
-from unittest.mock import patch, sentinel
+from unittest.mock import PropertyMock, patch, sentinel
 
 import pytest
 from pytest import approx
 
-from homeassistant.components import history
+from homeassistant.components import history, recorder
 from homeassistant.components.recorder.history import get_significant_states
 from homeassistant.components.recorder.models import process_timestamp
 from homeassistant.const import CONF_DOMAINS, CONF_ENTITIES, CONF_EXCLUDE, CONF_INCLUDE
 import homeassistant.core as ha
 from homeassistant.helpers.json import JSONEncoder
 from homeassistant.setup import async_setup_component
+from homeassistant.util.async_ import run_callback_threadsafe
 import homeassistant.util.dt as dt_util
 from homeassistant.util.unit_system import IMPERIAL_SYSTEM, METRIC_SYSTEM
 
@@ -1529,3 +1531,462 @@ async def test_history_during_period_with_use_include_order(
         *sort_order,
         "sensor.three",
     ]
+
+
+async def test_columnar_history_during_period(hass, hass_ws_client, recorder_mock):
+    """Test columnar_history_during_period."""
+    now = dt_util.utcnow()
+
+    await async_setup_component(hass, "history", {})
+    await async_setup_component(hass, "sensor", {})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.test", "on", attributes={"any": "attr"})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.test", "off", attributes={"any": "attr"})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.test", "off", attributes={"any": "changed"})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.test", "on", attributes={"any": "changed"})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.other", "1", attributes={"any": "other"})
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/columnar_history_during_period",
+            "start_time": now.isoformat(),
+            "entity_ids": ["sensor.test", "sensor.other"],
+            "significant_changes_only": False,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert list(response["result"]) == ["sensor.test", "sensor.other"]
+
+    sensor_test = response["result"]["sensor.test"]
+    assert sensor_test["s"] == ["on", "off", "off", "on"]
+    assert len(sensor_test["lu"]) == 4
+    assert all(isinstance(last_updated, float) for last_updated in sensor_test["lu"])
+    assert sensor_test["lu"] == sorted(sensor_test["lu"])
+    assert sensor_test["lu"][-1] == approx(
+        hass.states.get("sensor.test").last_updated.timestamp()
+    )
+    # The third state only changed the attributes
+    assert sensor_test["lc"] == [[2, approx(sensor_test["lu"][1])]]
+    assert sensor_test["a"] == [[0, {"any": "attr"}], [2, {"any": "changed"}]]
+    assert response["result"]["sensor.other"] == {
+        "s": ["1"],
+        "lu": [approx(hass.states.get("sensor.other").last_updated.timestamp())],
+        "lc": [],
+        "a": [[0, {"any": "other"}]],
+    }
+
+    await client.send_json(
+        {
+            "id": 2,
+            "type": "history/columnar_history_during_period",
+            "start_time": dt_util.utcnow().isoformat(),
+            "entity_ids": ["sensor.test"],
+            "no_attributes": True,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    sensor_test = response["result"]["sensor.test"]
+    # Only the state at the start time
+    assert sensor_test["s"] == ["on"]
+    assert sensor_test["a"] == []
+
+
+async def test_columnar_history_during_period_matches_history(
+    hass, hass_ws_client, recorder_mock
+):
+    """Test columnar_history_during_period returns the same states as history."""
+    now = dt_util.utcnow()
+
+    await async_setup_component(hass, "history", {})
+    await async_setup_component(hass, "sensor", {})
+    await async_recorder_block_till_done(hass)
+    for idx in range(5):
+        hass.states.async_set("sensor.one", str(idx), attributes={"idx": idx // 2})
+        hass.states.async_set("climate.two", "heat", attributes={"idx": idx})
+        await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    msg = {"start_time": now.isoformat()}
+    await client.send_json({"id": 1, "type": "history/history_during_period", **msg})
+    history_response = await client.receive_json()
+    await client.send_json(
+        {"id": 2, "type": "history/columnar_history_during_period", **msg}
+    )
+    columnar_response = await client.receive_json()
+    assert columnar_response["success"]
+
+    for entity_id, entity_states in history_response["result"].items():
+        columns = columnar_response["result"][entity_id]
+        assert columns["s"] == [state["s"] for state in entity_states]
+        assert columns["lu"] == [approx(state["lu"]) for state in entity_states]
+        attributes = dict(columns["a"])
+        current = None
+        for idx, state in enumerate(entity_states):
+            current = attributes.get(idx, current)
+            assert state["a"] == current
+
+
+async def test_columnar_history_during_period_bad_start_time(
+    hass, hass_ws_client, recorder_mock
+):
+    """Test columnar_history_during_period bad start time."""
+    await async_setup_component(hass, "history", {"history": {}})
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/columnar_history_during_period",
+            "start_time": "cats",
+        }
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_start_time"
+
+
+async def test_history_stream(hass, hass_ws_client, recorder_mock):
+    """Test history/stream sends the history followed by live states."""
+    now = dt_util.utcnow()
+
+    await async_setup_component(hass, "history", {})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.test", "on", attributes={"any": "attr"})
+    hass.states.async_set("sensor.other", "on", attributes={"any": "attr"})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.test", "off", attributes={"any": "attr"})
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    init_count = sum(hass.bus.async_listeners().values())
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/stream",
+            "start_time": now.isoformat(),
+            "entity_ids": ["sensor.test"],
+            "no_attributes": True,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["id"] == 1
+
+    response = await client.receive_json()
+    assert response["type"] == "event"
+    assert response["event"]["start_time"] == approx(now.timestamp())
+    assert response["event"]["end_time"] is None
+    sensor_test_history = response["event"]["states"]["sensor.test"]
+    assert [state["s"] for state in sensor_test_history] == ["on", "off"]
+    assert "sensor.other" not in response["event"]["states"]
+
+    hass.states.async_set("sensor.other", "off", attributes={"any": "attr"})
+    hass.states.async_set("sensor.test", "on", attributes={"any": "attr"})
+    hass.states.async_set("sensor.test", "on", attributes={"any": "changed"})
+    response = await client.receive_json()
+    assert response["type"] == "event"
+    state = hass.states.get("sensor.test")
+    assert response["event"] == {
+        "states": {
+            "sensor.test": [
+                {"s": "on", "a": {}, "lu": approx(state.last_updated.timestamp())}
+            ]
+        }
+    }
+
+    await client.send_json({"id": 2, "type": "unsubscribe_events", "subscription": 1})
+    response = await client.receive_json()
+    assert response["id"] == 2
+    assert response["success"]
+    assert sum(hass.bus.async_listeners().values()) == init_count
+
+
+async def test_history_stream_gap_free_handoff(hass, hass_ws_client, recorder_mock):
+    """Test history/stream sends the states changed while fetching the history once."""
+    now = dt_util.utcnow()
+
+    await async_setup_component(hass, "history", {})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.test", "0")
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/stream",
+            "start_time": now.isoformat(),
+            "entity_ids": ["sensor.test"],
+        }
+    )
+    # Change the state while the history is being fetched
+    for idx in range(1, 5):
+        hass.states.async_set("sensor.test", str(idx))
+    response = await client.receive_json()
+    assert response["success"]
+
+    states = []
+    while len(states) < 5:
+        response = await client.receive_json()
+        assert response["type"] == "event"
+        states.extend(
+            state["s"] for state in response["event"]["states"]["sensor.test"]
+        )
+
+    hass.states.async_set("sensor.test", "5")
+    response = await client.receive_json()
+    states.extend(state["s"] for state in response["event"]["states"]["sensor.test"])
+    assert states == ["0", "1", "2", "3", "4", "5"]
+
+
+async def test_history_stream_states_changed_during_fetch(
+    hass, hass_ws_client, recorder_mock
+):
+    """Test history/stream sends the states recorded during the fetch once."""
+    now = dt_util.utcnow()
+    instance = recorder.get_instance(hass)
+
+    await async_setup_component(hass, "history", {})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.test", "0")
+    await async_wait_recording_done(hass)
+
+    original_get_significant_states = history.history.get_significant_states
+
+    def _get_significant_states(*args, **kwargs):
+        """Change and record states while the history is fetched."""
+        for idx in range(1, 3):
+            run_callback_threadsafe(
+                hass.loop, hass.states.async_set, "sensor.test", str(idx)
+            ).result()
+        instance.block_till_done()
+        return original_get_significant_states(*args, **kwargs)
+
+    client = await hass_ws_client()
+    with patch.object(
+        history.history, "get_significant_states", _get_significant_states
+    ):
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "history/stream",
+                "start_time": now.isoformat(),
+                "entity_ids": ["sensor.test"],
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+
+        states = []
+        while len(states) < 3:
+            response = await client.receive_json()
+            states.extend(
+                state["s"] for state in response["event"]["states"]["sensor.test"]
+            )
+
+    hass.states.async_set("sensor.test", "3")
+    response = await client.receive_json()
+    states.extend(state["s"] for state in response["event"]["states"]["sensor.test"])
+    assert states == ["0", "1", "2", "3"]
+
+
+async def test_history_stream_too_many_pending_events(
+    hass, hass_ws_client, recorder_mock
+):
+    """Test history/stream ends when too many events queue up during the fetch."""
+    await async_setup_component(hass, "history", {})
+    await async_recorder_block_till_done(hass)
+
+    original_get_significant_states = history.history.get_significant_states
+
+    def _get_significant_states(*args, **kwargs):
+        """Change states while the history is fetched."""
+        for idx in range(3):
+            run_callback_threadsafe(
+                hass.loop, hass.states.async_set, "sensor.test", str(idx)
+            ).result()
+        return original_get_significant_states(*args, **kwargs)
+
+    client = await hass_ws_client()
+    init_count = sum(hass.bus.async_listeners().values())
+    with patch.object(history, "MAX_PENDING_STREAM_EVENTS", 2), patch.object(
+        history.history, "get_significant_states", _get_significant_states
+    ):
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "history/stream",
+                "start_time": dt_util.utcnow().isoformat(),
+                "entity_ids": ["sensor.test"],
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "too_many_pending_events"
+    assert sum(hass.bus.async_listeners().values()) == init_count
+
+    hass.states.async_set("sensor.test", "4")
+    await hass.async_block_till_done()
+    await client.send_json({"id": 2, "type": "ping"})
+    response = await client.receive_json()
+    assert response["type"] == "pong"
+
+
+async def test_history_stream_in_chunks(hass, hass_ws_client, recorder_mock):
+    """Test history/stream sends a long history window in chunks."""
+    now = dt_util.utcnow()
+    start_time = now - timedelta(days=2, hours=12)
+
+    await async_setup_component(hass, "history", {})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.test", "on")
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/stream",
+            "start_time": start_time.isoformat(),
+            "entity_ids": ["sensor.test"],
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+
+    chunks = []
+    for _ in range(3):
+        response = await client.receive_json()
+        chunks.append(response["event"])
+    assert [chunk["start_time"] for chunk in chunks] == [
+        approx(start_time.timestamp()),
+        approx((start_time + timedelta(days=1)).timestamp()),
+        approx((start_time + timedelta(days=2)).timestamp()),
+    ]
+    assert chunks[-1]["end_time"] is None
+    assert chunks[0]["states"] == {}
+    assert chunks[1]["states"] == {}
+    assert [state["s"] for state in chunks[2]["states"]["sensor.test"]] == ["on"]
+
+
+async def test_history_stream_bad_start_time(hass, hass_ws_client, recorder_mock):
+    """Test history/stream bad start time."""
+    await async_setup_component(hass, "history", {"history": {}})
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/stream",
+            "start_time": "cats",
+            "entity_ids": ["sensor.test"],
+        }
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_start_time"
+
+
+async def test_history_stream_minimal_response(hass, hass_ws_client, recorder_mock):
+    """Test history/stream filters the live attribute changes with minimal_response."""
+    now = dt_util.utcnow()
+
+    await async_setup_component(hass, "history", {})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.test", "on", attributes={"any": "attr"})
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/stream",
+            "start_time": now.isoformat(),
+            "entity_ids": ["sensor.test"],
+            "minimal_response": True,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    response = await client.receive_json()
+    assert [state["s"] for state in response["event"]["states"]["sensor.test"]] == [
+        "on"
+    ]
+
+    hass.states.async_set("sensor.test", "on", attributes={"any": "changed"})
+    hass.states.async_set("sensor.test", "off", attributes={"any": "changed"})
+    hass.states.async_set("sensor.test", "off", attributes={"any": "again"})
+    hass.states.async_set("sensor.test", "on", attributes={"any": "again"})
+    states = []
+    while len(states) < 2:
+        response = await client.receive_json()
+        states.extend(response["event"]["states"]["sensor.test"])
+    assert [state["s"] for state in states] == ["off", "on"]
+    assert all("a" not in state for state in states)
+
+
+async def test_history_stream_recorder_timeout(hass, hass_ws_client, recorder_mock):
+    """Test history/stream sends an error when the recorder does not catch up."""
+    await async_setup_component(hass, "history", {})
+    await async_recorder_block_till_done(hass)
+
+    async def _block_forever():
+        await asyncio.Event().wait()
+
+    client = await hass_ws_client()
+    init_count = sum(hass.bus.async_listeners().values())
+    instance = recorder.get_instance(hass)
+    with patch.object(history, "STREAM_RECORDER_SYNC_TIMEOUT", 0.01), patch.object(
+        instance, "async_block_till_done", _block_forever
+    ):
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "history/stream",
+                "start_time": dt_util.utcnow().isoformat(),
+                "entity_ids": ["sensor.test"],
+            }
+        )
+        response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "recorder_timeout"
+    assert sum(hass.bus.async_listeners().values()) == init_count
+
+
+async def test_history_stream_recorder_not_recording(
+    hass, hass_ws_client, recorder_mock
+):
+    """Test history/stream does not wait for a recorder that is not recording."""
+    await async_setup_component(hass, "history", {})
+    await async_recorder_block_till_done(hass)
+
+    instance = recorder.get_instance(hass)
+    client = await hass_ws_client()
+    with patch.object(
+        type(instance), "recording", PropertyMock(return_value=False)
+    ), patch.object(instance, "async_block_till_done") as block_till_done:
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "history/stream",
+                "start_time": dt_util.utcnow().isoformat(),
+                "entity_ids": ["sensor.test"],
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        response = await client.receive_json()
+        assert response["type"] == "event"
+    assert not block_till_done.called
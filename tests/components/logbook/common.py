@@ -29,6 +29,9 @@ class MockRow:
         self.context_parent_id = context.parent_id if context else None
         self.context_user_id = context.user_id if context else None
         self.context_id = context.id if context else None
+        self.context_id_bin = None
+        self.context_user_id_bin = None
+        self.context_parent_id_bin = None
         self.state = None
         self.entity_id = None
         self.state_id = None
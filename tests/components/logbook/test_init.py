@@ -5,14 +5,17 @@ import collections
 from datetime import datetime, timedelta
 from http import HTTPStatus
 import json
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, PropertyMock, patch
 
 import pytest
+from sqlalchemy import text
 import voluptuous as vol
 
 from homeassistant.components import logbook
 from homeassistant.components.alexa.smart_home import EVENT_ALEXA_SMART_HOME
 from homeassistant.components.automation import EVENT_AUTOMATION_TRIGGERED
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import EventData
 from homeassistant.components.script import EVENT_SCRIPT_STARTED
 from homeassistant.components.sensor import SensorStateClass
 from homeassistant.const import (
@@ -38,6 +41,7 @@ from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entityfilter import CONF_ENTITY_GLOBS
 from homeassistant.helpers.json import JSONEncoder
 from homeassistant.setup import async_setup_component
+from homeassistant.util.async_ import run_callback_threadsafe
 import homeassistant.util.dt as dt_util
 
 from .common import MockRow, mock_humanify
@@ -342,6 +346,9 @@ def create_state_changed_event_from_old_new(
     row.old_format_icon = None
     row.context_user_id = None
     row.context_parent_id = None
+    row.context_id_bin = None
+    row.context_user_id_bin = None
+    row.context_parent_id_bin = None
     row.old_state_id = old_state and 1
     row.state_id = new_state and 1
     return logbook.LazyEventPartialState(row, {})
@@ -1030,6 +1037,47 @@ async def test_logbook_entity_context_id(hass, recorder_mock, hass_client):
     assert json_dict[7]["context_user_id"] == "9400facee45711eaa9308bfd3d19e474"
 
 
+async def test_logbook_entity_string_context_id(hass, recorder_mock, hass_client):
+    """Test the logbook links contexts that are only stored as strings for entities."""
+    await asyncio.gather(
+        *[
+            async_setup_component(hass, comp, {})
+            for comp in ("homeassistant", "logbook", "automation")
+        ]
+    )
+    await async_recorder_block_till_done(hass)
+
+    # Not a ULID so it is only stored in the string context_id columns
+    context = ha.Context(id="ac5bd62de45711eaaeb351041eec8dd9")
+    entity_id_test = "alarm_control_panel.area_001"
+    hass.states.async_set(entity_id_test, STATE_OFF)
+    await hass.async_block_till_done()
+    hass.bus.async_fire(
+        EVENT_AUTOMATION_TRIGGERED,
+        {ATTR_NAME: "Mock automation", ATTR_ENTITY_ID: "automation.alarm"},
+        context=context,
+    )
+    hass.states.async_set(entity_id_test, STATE_ON, context=context)
+    await async_wait_recording_done(hass)
+
+    client = await hass_client()
+    start = dt_util.utcnow().date()
+    start_date = datetime(start.year, start.month, start.day)
+    end_time = start + timedelta(hours=24)
+
+    for entities in (entity_id_test, f"{entity_id_test},light.switch"):
+        response = await client.get(
+            f"/api/logbook/{start_date.isoformat()}?end_time={end_time}"
+            f"&entity={entities}"
+        )
+        assert response.status == HTTPStatus.OK
+        json_dict = await response.json()
+        assert len(json_dict) == 1
+        assert json_dict[0]["entity_id"] == entity_id_test
+        assert json_dict[0]["context_event_type"] == "automation_triggered"
+        assert json_dict[0]["context_entity_id"] == "automation.alarm"
+
+
 async def test_logbook_context_id_automation_script_started_manually(
     hass, recorder_mock, hass_client
 ):
@@ -1685,6 +1733,63 @@ async def test_logbook_multiple_entities(hass, hass_client, recorder_mock):
     assert json_dict[3]["context_user_id"] == "9400facee45711eaa9308bfd3d19e474"
 
 
+async def test_logbook_during_migration_to_schema_29(hass, hass_client, recorder_mock):
+    """Test the logbook finds states that still store the entity_id before schema 29."""
+    await async_setup_component(hass, "logbook", {})
+    await async_recorder_block_till_done(hass)
+
+    context = ha.Context(
+        id="ac5bd62de45711eaaeb351041eec8dd9",
+        user_id="b400facee45711eaa9308bfd3d19e474",
+    )
+    hass.states.async_set("light.kitchen", STATE_OFF)
+    hass.states.async_set("switch.hall", STATE_OFF)
+    await hass.async_block_till_done()
+    hass.states.async_set("light.kitchen", STATE_ON, context=context)
+    hass.states.async_set("switch.hall", STATE_ON, context=context)
+    await async_wait_recording_done(hass)
+
+    instance = get_instance(hass)
+
+    def _move_entity_ids_to_states() -> None:
+        with instance.engine.connect() as conn:
+            conn.execute(
+                text(
+                    "update states set entity_id=(select entity_id from states_meta "
+                    "where states_meta.metadata_id=states.metadata_id), "
+                    "metadata_id=NULL;"
+                )
+            )
+            conn.commit()
+
+    await instance.async_add_executor_job(_move_entity_ids_to_states)
+
+    client = await hass_client()
+    start = dt_util.utcnow().date()
+    start_date = datetime(start.year, start.month, start.day)
+    end_time = start + timedelta(hours=24)
+
+    with patch.object(instance, "schema_version", 28):
+        for query in (
+            "",
+            "&entity=light.kitchen",
+            "&entity=light.kitchen,switch.hall",
+            f"&context_id={context.id}",
+        ):
+            response = await client.get(
+                f"/api/logbook/{start_date.isoformat()}?end_time={end_time}{query}"
+            )
+            assert response.status == HTTPStatus.OK
+            json_dict = await response.json()
+            entity_ids = {
+                entry["entity_id"] for entry in json_dict if "entity_id" in entry
+            }
+            assert "light.kitchen" in entity_ids, query
+            assert ("switch.hall" in entity_ids) is (
+                query != "&entity=light.kitchen"
+            ), query
+
+
 async def test_logbook_invalid_entity(hass, hass_client, recorder_mock):
     """Test the logbook view with requesting an invalid entity."""
     await async_setup_component(hass, "logbook", {})
@@ -2182,13 +2287,16 @@ async def test_empty_config(hass, hass_client, recorder_mock):
     _assert_entry(entries[1], name="blu", entity_id=entity_id)
 
 
-async def test_context_filter(hass, hass_client, recorder_mock):
+@pytest.mark.parametrize(
+    "context_id", [None, "fc5bd62de45711eaaeb351041eec8dd9"], ids=["ulid", "legacy"]
+)
+async def test_context_filter(hass, hass_client, recorder_mock, context_id):
     """Test we can filter by context."""
     assert await async_setup_component(hass, "logbook", {})
     await async_recorder_block_till_done(hass)
 
     entity_id = "switch.blu"
-    context = ha.Context()
+    context = ha.Context() if context_id is None else ha.Context(id=context_id)
 
     hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
     hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
@@ -2430,3 +2538,376 @@ async def test_get_events_bad_end_time(hass, hass_ws_client, recorder_mock):
     response = await client.receive_json()
     assert not response["success"]
     assert response["error"]["code"] == "invalid_end_time"
+
+
+async def test_event_stream(hass, hass_ws_client, recorder_mock):
+    """Test logbook event_stream sends the backfill and then live events."""
+    now = dt_util.utcnow()
+    await asyncio.gather(
+        *[
+            async_setup_component(hass, comp, {})
+            for comp in ("homeassistant", "logbook")
+        ]
+    )
+    await async_recorder_block_till_done(hass)
+
+    entity_reg = er.async_get(hass)
+    entity_reg.async_get_or_create(
+        "sensor",
+        "test",
+        "unique_0",
+        suggested_object_id="with_state_class",
+        capabilities={"state_class": SensorStateClass.MEASUREMENT},
+    )
+    hass.states.async_set("light.kitchen", STATE_OFF)
+    await hass.async_block_till_done()
+    hass.states.async_set("light.kitchen", STATE_ON, {"brightness": 100})
+    await hass.async_block_till_done()
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    init_count = sum(hass.bus.async_listeners().values())
+    await client.send_json(
+        {"id": 7, "type": "logbook/event_stream", "start_time": now.isoformat()}
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["id"] == 7
+
+    msg = await client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == "event"
+    assert msg["event"]["start_time"] == pytest.approx(now.timestamp())
+    assert msg["event"]["end_time"] is None
+    events = msg["event"]["events"]
+    assert len(events) == 1
+    assert events[0]["entity_id"] == "light.kitchen"
+    assert events[0]["state"] == "on"
+    assert isinstance(events[0]["when"], float)
+
+    context = ha.Context(
+        id="ac5bd62de45711eaaeb351041eec8dd9",
+        user_id="b400facee45711eaa9308bfd3d19e474",
+    )
+    hass.bus.async_fire(
+        EVENT_CALL_SERVICE,
+        {"domain": "light", "service": "turn_off"},
+        context=context,
+    )
+    hass.states.async_set("light.kitchen", STATE_OFF, context=context)
+    await hass.async_block_till_done()
+
+    msg = await client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == "event"
+    assert msg["event"] == {
+        "events": [
+            {
+                "when": pytest.approx(
+                    hass.states.get("light.kitchen").last_updated.timestamp()
+                ),
+                "state": "off",
+                "entity_id": "light.kitchen",
+                "context_user_id": "b400facee45711eaa9308bfd3d19e474",
+                "context_domain": "light",
+                "context_service": "turn_off",
+                "context_event_type": "call_service",
+            }
+        ]
+    }
+
+    # Attribute only changes, sensors with a unit_of_measurement
+    # and sensors with a state_class are filtered in memory
+    hass.states.async_set("light.kitchen", STATE_OFF, {"brightness": 0})
+    hass.states.async_set("sensor.power", "1", {ATTR_UNIT_OF_MEASUREMENT: "W"})
+    hass.states.async_set("sensor.power", "2", {ATTR_UNIT_OF_MEASUREMENT: "W"})
+    hass.states.async_set("sensor.with_state_class", "1")
+    hass.states.async_set("sensor.with_state_class", "2")
+    hass.states.async_set("sensor.door", "closed")
+    hass.states.async_set("sensor.door", "open")
+    hass.bus.async_fire(
+        logbook.EVENT_LOGBOOK_ENTRY,
+        {
+            logbook.ATTR_NAME: "Alarm",
+            logbook.ATTR_MESSAGE: "is triggered",
+            logbook.ATTR_DOMAIN: "switch",
+            logbook.ATTR_ENTITY_ID: "switch.test_switch",
+        },
+    )
+    await hass.async_block_till_done()
+
+    msg = await client.receive_json()
+    assert [
+        (event["entity_id"], event.get("state"), event.get("message"))
+        for event in msg["event"]["events"]
+    ] == [("sensor.door", "open", None)]
+    msg = await client.receive_json()
+    assert [
+        (event["entity_id"], event.get("state"), event.get("message"))
+        for event in msg["event"]["events"]
+    ] == [("switch.test_switch", None, "is triggered")]
+
+    await client.send_json({"id": 8, "type": "unsubscribe_events", "subscription": 7})
+    response = await client.receive_json()
+    assert response["success"]
+    assert sum(hass.bus.async_listeners().values()) == init_count
+
+
+async def test_event_stream_entity_ids(hass, hass_ws_client, recorder_mock):
+    """Test logbook event_stream with entity_ids still links contexts."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "logbook", {})
+    await async_recorder_block_till_done(hass)
+
+    hass.states.async_set("binary_sensor.motion", STATE_OFF)
+    hass.states.async_set("light.kitchen", STATE_OFF)
+    hass.states.async_set("light.other", STATE_OFF)
+    await hass.async_block_till_done()
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "logbook/event_stream",
+            "start_time": now.isoformat(),
+            "entity_ids": ["light.kitchen"],
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    msg = await client.receive_json()
+    assert msg["event"]["events"] == []
+
+    motion_context = ha.Context(id="ac5bd62de45711eaaeb351041eec8dd9")
+    hass.states.async_set("binary_sensor.motion", STATE_ON, context=motion_context)
+    hass.states.async_set("light.other", STATE_ON)
+    hass.states.async_set(
+        "light.kitchen",
+        STATE_ON,
+        context=ha.Context(parent_id=motion_context.id),
+    )
+    await hass.async_block_till_done()
+
+    msg = await client.receive_json()
+    events = msg["event"]["events"]
+    assert len(events) == 1
+    assert events[0]["entity_id"] == "light.kitchen"
+    assert events[0]["state"] == "on"
+    assert events[0]["context_entity_id"] == "binary_sensor.motion"
+    assert events[0]["context_event_type"] is None
+
+
+async def test_event_stream_backfill_in_batches(hass, hass_ws_client, recorder_mock):
+    """Test logbook event_stream sends a bounded backfill in batches."""
+    await async_setup_component(hass, "logbook", {})
+    await async_recorder_block_till_done(hass)
+    now = dt_util.utcnow()
+    three_hours_ago = now - timedelta(hours=3)
+    two_days_ago = now - timedelta(days=2)
+
+    with patch("homeassistant.util.dt.utcnow", return_value=three_hours_ago):
+        hass.states.async_set("light.kitchen", STATE_OFF)
+        hass.states.async_set("light.kitchen", STATE_ON)
+        await hass.async_block_till_done()
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "logbook/event_stream",
+            "start_time": two_days_ago.isoformat(),
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+
+    batches = []
+    while True:
+        msg = await client.receive_json()
+        batches.append(msg["event"])
+        if msg["event"]["end_time"] is None:
+            break
+
+    assert batches[0]["start_time"] == pytest.approx(
+        (now - logbook.STREAM_MAX_BACKFILL).timestamp(), abs=1
+    )
+    assert len(batches) == 24
+    for previous, batch in zip(batches, batches[1:]):
+        assert previous["end_time"] == batch["start_time"]
+    events = [event for batch in batches for event in batch["events"]]
+    assert len(events) == 1
+    assert events[0]["entity_id"] == "light.kitchen"
+    assert events[0]["state"] == "on"
+    assert events[0]["when"] == pytest.approx(three_hours_ago.timestamp())
+
+
+async def test_event_stream_bad_start_time(hass, hass_ws_client, recorder_mock):
+    """Test logbook event_stream bad start time."""
+    await async_setup_component(hass, "logbook", {})
+    await async_recorder_block_till_done(hass)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "logbook/event_stream",
+            "start_time": "cats",
+        }
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_start_time"
+
+
+async def test_event_stream_events_during_backfill(hass, hass_ws_client, recorder_mock):
+    """Test events fired while the backfill is fetched are sent only once."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "logbook", {})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("light.kitchen", STATE_OFF)
+    await hass.async_block_till_done()
+    await async_wait_recording_done(hass)
+
+    original_backfill_batch = logbook._ws_stream_backfill_batch
+
+    def _backfill_batch_with_state_changes(hass, *args):
+        """Change states while the backfill is being fetched."""
+        run_callback_threadsafe(
+            hass.loop, hass.states.async_set, "light.kitchen", STATE_ON
+        ).result()
+        # Wait for the first change to be in the backfill
+        get_instance(hass).block_till_done()
+        result = original_backfill_batch(hass, *args)
+        run_callback_threadsafe(
+            hass.loop, hass.states.async_set, "light.kitchen", STATE_OFF
+        ).result()
+        return result
+
+    client = await hass_ws_client()
+    with patch.object(
+        logbook,
+        "_ws_stream_backfill_batch",
+        _backfill_batch_with_state_changes,
+    ):
+        await client.send_json(
+            {"id": 1, "type": "logbook/event_stream", "start_time": now.isoformat()}
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        msg = await client.receive_json()
+
+    assert [event["state"] for event in msg["event"]["events"]] == [STATE_ON]
+    msg = await client.receive_json()
+    assert [event["state"] for event in msg["event"]["events"]] == [STATE_OFF]
+
+
+async def test_event_stream_events_during_backfill_same_time(
+    hass, hass_ws_client, recorder_mock
+):
+    """Test events fired during the backfill at the time of the last entry are sent."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "logbook", {})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("light.kitchen", STATE_OFF)
+    hass.states.async_set("light.other", STATE_OFF)
+    await hass.async_block_till_done()
+    await async_wait_recording_done(hass)
+
+    original_backfill_batch = logbook._ws_stream_backfill_batch
+    fired_at = dt_util.utcnow()
+
+    def _backfill_batch_with_state_changes(hass, *args):
+        """Change states at the same time while the backfill is being fetched."""
+        with patch("homeassistant.util.dt.utcnow", return_value=fired_at):
+            run_callback_threadsafe(
+                hass.loop, hass.states.async_set, "light.kitchen", STATE_ON
+            ).result()
+        # Wait for the first change to be in the backfill
+        get_instance(hass).block_till_done()
+        result = original_backfill_batch(hass, *args)
+        with patch("homeassistant.util.dt.utcnow", return_value=fired_at):
+            run_callback_threadsafe(
+                hass.loop, hass.states.async_set, "light.other", STATE_ON
+            ).result()
+        return result
+
+    client = await hass_ws_client()
+    with patch.object(
+        logbook,
+        "_ws_stream_backfill_batch",
+        _backfill_batch_with_state_changes,
+    ):
+        await client.send_json(
+            {"id": 1, "type": "logbook/event_stream", "start_time": now.isoformat()}
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        msg = await client.receive_json()
+
+    assert [event["entity_id"] for event in msg["event"]["events"]] == ["light.kitchen"]
+    msg = await client.receive_json()
+    events = msg["event"]["events"]
+    assert [event["entity_id"] for event in events] == ["light.other"]
+    assert events[0]["when"] == pytest.approx(fired_at.timestamp())
+
+
+async def test_event_stream_recorder_timeout(hass, hass_ws_client, recorder_mock):
+    """Test logbook event_stream sends an error when the recorder does not catch up."""
+    await async_setup_component(hass, "logbook", {})
+    await async_recorder_block_till_done(hass)
+
+    async def _block_forever():
+        await asyncio.Event().wait()
+
+    client = await hass_ws_client()
+    init_count = sum(hass.bus.async_listeners().values())
+    instance = get_instance(hass)
+    with patch.object(logbook, "STREAM_RECORDER_SYNC_TIMEOUT", 0.01), patch.object(
+        instance, "async_block_till_done", _block_forever
+    ):
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "logbook/event_stream",
+                "start_time": dt_util.utcnow().isoformat(),
+            }
+        )
+        response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "recorder_timeout"
+    assert sum(hass.bus.async_listeners().values()) == init_count
+
+
+async def test_event_stream_recorder_not_recording(hass, hass_ws_client, recorder_mock):
+    """Test logbook event_stream does not wait for a recorder that is not recording."""
+    await async_setup_component(hass, "logbook", {})
+    await async_recorder_block_till_done(hass)
+
+    instance = get_instance(hass)
+    client = await hass_ws_client()
+    with patch.object(
+        type(instance), "recording", PropertyMock(return_value=False)
+    ), patch.object(instance, "async_block_till_done") as block_till_done:
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "logbook/event_stream",
+                "start_time": dt_util.utcnow().isoformat(),
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        response = await client.receive_json()
+        assert response["type"] == "event"
+    assert not block_till_done.called
+
+
+def test_live_event_row_matches_recorded_data():
+    """Test a live event row has the event data as the recorder stores it."""
+    event = ha.Event(
+        "some_event", {"nan": float("nan"), "big": 1e16, "text": "caf\u00e9"}
+    )
+    row = logbook._async_event_to_row(event, None)
+    assert row.shared_data == EventData.shared_data_from_event(event)
@@ -1,11 +1,17 @@
 """Test the Profiler config flow."""
+import asyncio
 from datetime import timedelta
+from http import HTTPStatus
+import json
 import os
 from unittest.mock import patch
 
 from homeassistant.components.profiler import (
     CONF_SECONDS,
     SERVICE_DUMP_LOG_OBJECTS,
+    SERVICE_DUMP_STARTUP_TRACE,
+    SERVICE_LOG_ENTITY_WRITE_TIMINGS,
+    SERVICE_LOG_EVENT_LISTENER_TIMINGS,
     SERVICE_LOG_EVENT_LOOP_SCHEDULED,
     SERVICE_LOG_THREAD_FRAMES,
     SERVICE_MEMORY,
@@ -15,6 +21,8 @@ from homeassistant.components.profiler import (
 )
 from homeassistant.components.profiler.const import DOMAIN
 from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
+from homeassistant.core import callback
+from homeassistant.helpers import entity, startup_trace
 import homeassistant.util.dt as dt_util
 
 from tests.common import MockConfigEntry, async_fire_time_changed
@@ -194,3 +202,136 @@ async def test_log_scheduled(hass, caplog):
 
     assert await hass.config_entries.async_unload(entry.entry_id)
     await hass.async_block_till_done()
+
+
+async def test_log_event_listener_timings(hass, caplog):
+    """Test we can log the timings of the event listeners."""
+
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.services.has_service(DOMAIN, SERVICE_LOG_EVENT_LISTENER_TIMINGS)
+
+    @callback
+    def _listener(event):
+        """Listen to the test event."""
+
+    hass.bus.async_listen("test_event", _listener)
+
+    real_sleep = asyncio.sleep
+
+    async def _fire_event_while_timing(seconds):
+        hass.bus.async_fire("test_event")
+        await real_sleep(0)
+
+    with patch(
+        "homeassistant.components.profiler.asyncio.sleep", _fire_event_while_timing
+    ):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_LOG_EVENT_LISTENER_TIMINGS, {CONF_SECONDS: 1}, blocking=True
+        )
+
+    assert "test_log_event_listener_timings.<locals>._listener for test_event" in (
+        caplog.text
+    )
+    assert hass.bus.async_listener_timings() == []
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_log_entity_write_timings(hass, caplog):
+    """Test we can log the timings of the entity state writes."""
+
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.services.has_service(DOMAIN, SERVICE_LOG_ENTITY_WRITE_TIMINGS)
+
+    ent = entity.Entity()
+    ent.hass = hass
+    ent.entity_id = "test.timed"
+
+    real_sleep = asyncio.sleep
+
+    async def _write_state_while_timing(seconds):
+        ent.async_write_ha_state()
+        await real_sleep(0)
+
+    with patch(
+        "homeassistant.components.profiler.asyncio.sleep", _write_state_while_timing
+    ):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_LOG_ENTITY_WRITE_TIMINGS, {CONF_SECONDS: 1}, blocking=True
+        )
+
+    assert "Entity test.timed: 1 state writes" in caplog.text
+    assert entity.async_write_timings(hass) == []
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_dump_startup_trace(hass, tmpdir):
+    """Test the startup trace is written to a file."""
+    test_dir = tmpdir.mkdir("profiles")
+    trace = startup_trace.async_start_startup_trace(hass)
+    trace.add("bootstrap", "stage 1", "bootstrap", 1.0, 2.0)
+
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.services.has_service(DOMAIN, SERVICE_DUMP_STARTUP_TRACE)
+
+    last_filename = None
+
+    def _mock_path(filename):
+        nonlocal last_filename
+        last_filename = f"{test_dir}/{filename}"
+        return last_filename
+
+    with patch.object(hass.config, "path", _mock_path):
+        await hass.services.async_call(DOMAIN, SERVICE_DUMP_STARTUP_TRACE, {})
+        await hass.async_block_till_done()
+
+    with open(last_filename) as trace_file:
+        assert json.load(trace_file) == json.loads(json.dumps(trace.as_dict()))
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_download_startup_trace(hass, hass_client, hass_admin_user):
+    """Test the startup trace can be downloaded."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    client = await hass_client()
+    response = await client.get("/api/profiler/startup_trace")
+    assert response.status == HTTPStatus.NOT_FOUND
+
+    trace = startup_trace.async_start_startup_trace(hass)
+    trace.add("bootstrap", "stage 1", "bootstrap", 1.0, 2.0)
+
+    response = await client.get("/api/profiler/startup_trace")
+    assert response.status == HTTPStatus.OK
+    assert response.headers["Content-Disposition"] == (
+        'attachment; filename="startup_trace.json"'
+    )
+    assert await response.json() == json.loads(json.dumps(trace.as_dict()))
+
+    hass_admin_user.groups = []
+    response = await client.get("/api/profiler/startup_trace")
+    assert response.status == HTTPStatus.UNAUTHORIZED
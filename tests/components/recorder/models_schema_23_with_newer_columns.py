@@ -4,8 +4,8 @@ This file contains the model definitions for schema version 23
 used by Home Assistant Core 2021.11.0, which adds the name column
 to statistics_meta.
 
-The v23 schema as been slightly modified to add the EventData table to
-allow the recorder to startup successfully.
+The v23 schema as been slightly modified to add the EventData table and
+the binary context columns to allow the recorder to startup successfully.
 
 It is used to test the schema migration logic.
 """
@@ -26,6 +26,7 @@ from sqlalchemy import (
     Identity,
     Index,
     Integer,
+    LargeBinary,
     SmallInteger,
     String,
     Text,
@@ -58,6 +59,8 @@ _LOGGER = logging.getLogger(__name__)
 
 DB_TIMEZONE = "+00:00"
 
+CONTEXT_ID_BIN_MAX_LENGTH = 16
+
 TABLE_EVENTS = "events"
 TABLE_STATES = "states"
 TABLE_RECORDER_RUNS = "recorder_runs"
@@ -118,6 +121,15 @@ class Events(Base):  # type: ignore
     event_data_rel = relationship(
         "EventData"
     )  # *** Not originally in v23, only added for recorder to startup ok
+    context_id_bin = Column(
+        LargeBinary(CONTEXT_ID_BIN_MAX_LENGTH)
+    )  # *** Not originally in v23, only added for recorder to startup ok
+    context_user_id_bin = Column(
+        LargeBinary(CONTEXT_ID_BIN_MAX_LENGTH)
+    )  # *** Not originally in v23, only added for recorder to startup ok
+    context_parent_id_bin = Column(
+        LargeBinary(CONTEXT_ID_BIN_MAX_LENGTH)
+    )  # *** Not originally in v23, only added for recorder to startup ok
 
     def __repr__(self) -> str:
         """Return string representation of instance for debugging."""
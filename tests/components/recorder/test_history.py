@@ -18,6 +18,7 @@ from homeassistant.components.recorder.models import (
     RecorderRuns,
     StateAttributes,
     States,
+    StatesMeta,
     process_timestamp,
 )
 from homeassistant.components.recorder.util import session_scope
@@ -79,7 +80,7 @@ def _add_db_entries(
             )
             session.add(
                 States(
-                    entity_id=entity_id,
+                    states_meta_rel=StatesMeta(entity_id=entity_id),
                     state="on",
                     attributes='{"name":"the light"}',
                     last_changed=None,
@@ -97,6 +98,12 @@ def _add_db_entries(
             )
 
 
+MOVE_ENTITY_IDS_TO_STATES = (
+    "update states set entity_id=(select entity_id from states_meta "
+    "where states_meta.metadata_id=states.metadata_id), metadata_id=NULL;"
+)
+
+
 def _setup_get_states(hass):
     """Set up for testing get_states."""
     states = []
@@ -677,6 +684,7 @@ async def test_state_changes_during_period_query_during_migration_to_schema_25(
     with instance.engine.connect() as conn:
         conn.execute(text("update states set attributes_id=NULL;"))
         conn.execute(text("drop table state_attributes;"))
+        conn.execute(text(MOVE_ENTITY_IDS_TO_STATES))
         conn.commit()
 
     with patch.object(instance, "schema_version", 24):
@@ -723,6 +731,7 @@ async def test_get_states_query_during_migration_to_schema_25(
     with instance.engine.connect() as conn:
         conn.execute(text("update states set attributes_id=NULL;"))
         conn.execute(text("drop table state_attributes;"))
+        conn.execute(text(MOVE_ENTITY_IDS_TO_STATES))
         conn.commit()
 
     with patch.object(instance, "schema_version", 24):
@@ -772,6 +781,7 @@ async def test_get_states_query_during_migration_to_schema_25_multiple_entities(
     with instance.engine.connect() as conn:
         conn.execute(text("update states set attributes_id=NULL;"))
         conn.execute(text("drop table state_attributes;"))
+        conn.execute(text(MOVE_ENTITY_IDS_TO_STATES))
         conn.commit()
 
     with patch.object(instance, "schema_version", 24):
@@ -790,6 +800,47 @@ async def test_get_states_query_during_migration_to_schema_25_multiple_entities(
         assert hist[1].attributes == {"name": "the light"}
 
 
+async def test_get_significant_states_during_migration_to_schema_29(
+    hass: ha.HomeAssistant,
+    async_setup_recorder_instance: SetupRecorderInstanceT,
+):
+    """Test we can query states that still store the entity_id before schema 29."""
+    instance = await async_setup_recorder_instance(hass, {})
+
+    start = dt_util.utcnow()
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("switch.hall", "off")
+    hass.states.async_set("zone.home", "zoning")
+    await hass.async_block_till_done()
+    hass.states.async_set("light.kitchen", "on")
+    await async_wait_recording_done(hass)
+    end = dt_util.utcnow()
+
+    def _move_entity_ids_to_states() -> None:
+        with instance.engine.connect() as conn:
+            conn.execute(text(MOVE_ENTITY_IDS_TO_STATES))
+            conn.commit()
+
+    await instance.async_add_executor_job(_move_entity_ids_to_states)
+
+    with patch.object(instance, "schema_version", 28):
+        hist = history.get_significant_states(hass, start, end)
+        assert list(hist) == ["light.kitchen", "switch.hall"]
+        assert [state.state for state in hist["light.kitchen"]] == ["off", "on"]
+
+        hist = history.get_significant_states(
+            hass, start, end, ["light.kitchen", "switch.hall"]
+        )
+        assert [state.state for state in hist["light.kitchen"]] == ["off", "on"]
+        assert [state.state for state in hist["switch.hall"]] == ["off"]
+
+        hist = history.get_last_state_changes(hass, 1, "light.kitchen")
+        assert [state.state for state in hist["light.kitchen"]] == ["on"]
+
+        hist = await _async_get_states(hass, end)
+        assert [state.entity_id for state in hist] == ["light.kitchen", "switch.hall"]
+
+
 async def test_get_full_significant_states_handles_empty_last_changed(
     hass: ha.HomeAssistant,
     async_setup_recorder_instance: SetupRecorderInstanceT,
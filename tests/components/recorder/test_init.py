@@ -10,7 +10,9 @@ from typing import cast
 from unittest.mock import Mock, patch
 
 import pytest
+from sqlalchemy.dialects import mysql
 from sqlalchemy.exc import DatabaseError, OperationalError, SQLAlchemyError
+from sqlalchemy.sql.dml import Insert
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder import (
@@ -32,15 +34,18 @@ from homeassistant.components.recorder.models import (
     RecorderRuns,
     StateAttributes,
     States,
+    StatesMeta,
     StatisticsRuns,
     process_timestamp,
 )
+from homeassistant.components.recorder.queries import find_recent_shared_attributes
 from homeassistant.components.recorder.services import (
     SERVICE_DISABLE,
     SERVICE_ENABLE,
     SERVICE_PURGE,
     SERVICE_PURGE_ENTITIES,
 )
+from homeassistant.components.recorder.tasks import CommitTask
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import (
     EVENT_HOMEASSISTANT_FINAL_WRITE,
@@ -66,6 +71,7 @@ from tests.common import (
     async_fire_time_changed,
     fire_time_changed,
     get_test_home_assistant,
+    mock_platform,
 )
 
 
@@ -83,6 +89,7 @@ def _default_recorder(hass):
         entity_filter=CONFIG_SCHEMA({DOMAIN: {}}),
         exclude_t=[],
         exclude_attributes_by_domain={},
+        id_cache_size=2048,
     )
 
 
@@ -189,6 +196,24 @@ async def test_saving_state(hass: HomeAssistant, recorder_mock):
     assert state == _state_with_context(hass, entity_id)
 
 
+async def test_async_block_till_done(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test async_block_till_done commits the pending states."""
+    instance = await async_setup_recorder_instance(
+        hass, {recorder.CONF_COMMIT_INTERVAL: 30}
+    )
+    hass.states.async_set("test.one", "on")
+    hass.states.async_set("test.two", "on")
+    await instance.async_block_till_done()
+
+    def _count_states() -> int:
+        with session_scope(hass=hass) as session:
+            return session.query(States).count()
+
+    assert await instance.async_add_executor_job(_count_states) == 2
+
+
 async def test_saving_many_states(
     hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
 ):
@@ -247,17 +272,18 @@ def test_saving_state_with_exception(hass, hass_recorder, caplog):
     state = "restoring_from_db"
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
-    def _throw_if_state_in_session(*args, **kwargs):
-        for obj in hass.data[DATA_INSTANCE].event_session:
-            if isinstance(obj, States):
-                raise OperationalError(
-                    "insert the state", "fake params", "forced to fail"
-                )
+    event_session = hass.data[DATA_INSTANCE].event_session
+    original_execute = event_session.execute
+
+    def _throw_if_inserting_states(statement, *args, **kwargs):
+        if isinstance(statement, Insert) and statement.table.name == "states":
+            raise OperationalError("insert the state", "fake params", "forced to fail")
+        return original_execute(statement, *args, **kwargs)
 
     with patch("time.sleep"), patch.object(
-        hass.data[DATA_INSTANCE].event_session,
-        "flush",
-        side_effect=_throw_if_state_in_session,
+        event_session,
+        "execute",
+        side_effect=_throw_if_inserting_states,
     ):
         hass.states.set(entity_id, "fail", attributes)
         wait_recording_done(hass)
@@ -277,6 +303,48 @@ def test_saving_state_with_exception(hass, hass_recorder, caplog):
     assert "Error saving events" not in caplog.text
 
 
+def test_saving_state_retry_does_not_duplicate_rows(hass, hass_recorder, caplog):
+    """Test a retried commit does not write the pending rows twice."""
+    hass = hass_recorder()
+
+    event_session = hass.data[DATA_INSTANCE].event_session
+    original_commit = event_session.commit
+    commits = 0
+
+    def _fail_first_commit():
+        nonlocal commits
+        commits += 1
+        if commits == 1:
+            raise OperationalError("commit", "fake params", "forced to fail")
+        return original_commit()
+
+    with patch("time.sleep"), patch.object(
+        event_session, "commit", side_effect=_fail_first_commit
+    ):
+        hass.states.set("test.one", "on", {"attr": 1})
+        hass.states.set("test.one", "off", {"attr": 1})
+        hass.bus.fire("test_event", {"attr": 1})
+        wait_recording_done(hass)
+
+    assert "Error executing query" in caplog.text
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States).order_by(States.state_id))
+        assert len(states) == 2
+        assert states[1].old_state_id == states[0].state_id
+        assert session.query(StatesMeta).count() == 1
+        assert session.query(StateAttributes).count() == 1
+        assert (
+            session.query(Events).filter(Events.event_type == "test_event").count() == 1
+        )
+        assert (
+            session.query(EventData)
+            .filter(EventData.shared_data == '{"attr":1}')
+            .count()
+            == 1
+        )
+
+
 def test_saving_state_with_sqlalchemy_exception(hass, hass_recorder, caplog):
     """Test saving state when there is an SQLAlchemyError."""
     hass = hass_recorder()
@@ -285,17 +353,18 @@ def test_saving_state_with_sqlalchemy_exception(hass, hass_recorder, caplog):
     state = "restoring_from_db"
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
-    def _throw_if_state_in_session(*args, **kwargs):
-        for obj in hass.data[DATA_INSTANCE].event_session:
-            if isinstance(obj, States):
-                raise SQLAlchemyError(
-                    "insert the state", "fake params", "forced to fail"
-                )
+    event_session = hass.data[DATA_INSTANCE].event_session
+    original_execute = event_session.execute
+
+    def _throw_if_inserting_states(statement, *args, **kwargs):
+        if isinstance(statement, Insert) and statement.table.name == "states":
+            raise SQLAlchemyError("insert the state", "fake params", "forced to fail")
+        return original_execute(statement, *args, **kwargs)
 
     with patch("time.sleep"), patch.object(
-        hass.data[DATA_INSTANCE].event_session,
-        "flush",
-        side_effect=_throw_if_state_in_session,
+        event_session,
+        "execute",
+        side_effect=_throw_if_inserting_states,
     ):
         hass.states.set(entity_id, "fail", attributes)
         wait_recording_done(hass)
@@ -328,7 +397,7 @@ async def test_force_shutdown_with_queue_of_writes_that_generate_exceptions(
 
     with patch.object(instance, "db_retry_wait", 0.05), patch.object(
         instance.event_session,
-        "flush",
+        "commit",
         side_effect=OperationalError(
             "insert the state", "fake params", "forced to fail"
         ),
@@ -610,11 +679,11 @@ def test_saving_state_and_removing_entity(hass, hass_recorder):
     with session_scope(hass=hass) as session:
         states = list(session.query(States))
         assert len(states) == 3
-        assert states[0].entity_id == entity_id
+        assert states[0].states_meta_rel.entity_id == entity_id
         assert states[0].state == STATE_LOCKED
-        assert states[1].entity_id == entity_id
+        assert states[1].states_meta_rel.entity_id == entity_id
         assert states[1].state == STATE_UNLOCKED
-        assert states[2].entity_id == entity_id
+        assert states[2].states_meta_rel.entity_id == entity_id
         assert states[2].state is None
 
 
@@ -1014,10 +1083,10 @@ def test_saving_sets_old_state(hass_recorder):
         states = list(session.query(States))
         assert len(states) == 4
 
-        assert states[0].entity_id == "test.one"
-        assert states[1].entity_id == "test.two"
-        assert states[2].entity_id == "test.one"
-        assert states[3].entity_id == "test.two"
+        assert states[0].states_meta_rel.entity_id == "test.one"
+        assert states[1].states_meta_rel.entity_id == "test.two"
+        assert states[2].states_meta_rel.entity_id == "test.one"
+        assert states[3].states_meta_rel.entity_id == "test.two"
 
         assert states[0].old_state_id is None
         assert states[1].old_state_id is None
@@ -1025,6 +1094,104 @@ def test_saving_sets_old_state(hass_recorder):
         assert states[3].old_state_id == states[1].state_id
 
 
+def test_saving_sets_old_state_inside_commit_interval(hass_recorder):
+    """Test saving many states of the same entity in one commit sets old state."""
+    hass = hass_recorder({CONF_COMMIT_INTERVAL: 30})
+    instance = get_instance(hass)
+
+    def _flush() -> None:
+        hass.block_till_done()
+        instance.queue_task(CommitTask())
+        instance.block_till_done()
+
+    hass.states.set("test.one", "on", {"attr": 1})
+    hass.states.set("test.two", "on", {})
+    hass.states.set("test.one", "off", {"attr": 2})
+    hass.states.set("test.one", "on", {"attr": 1})
+    hass.states.remove("test.two")
+    hass.states.set("test.two", "on", {})
+    hass.bus.fire("test_event", {"attr": 1})
+    hass.bus.fire("test_event", {"attr": 1})
+    hass.block_till_done()
+    instance.block_till_done()
+    assert len(instance._pending_states) == 6
+
+    _flush()
+    hass.states.set("test.three", "on", {"attr": 3})
+    hass.states.set("test.one", "off", {"attr": 2})
+    hass.states.set("test.three", "off", {"attr": 3})
+    _flush()
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States).order_by(States.state_id))
+        assert [(state.states_meta_rel.entity_id, state.state) for state in states] == [
+            ("test.one", "on"),
+            ("test.two", "on"),
+            ("test.one", "off"),
+            ("test.one", "on"),
+            ("test.two", None),
+            ("test.two", "on"),
+            ("test.three", "on"),
+            ("test.one", "off"),
+            ("test.three", "off"),
+        ]
+        assert [state.old_state_id for state in states] == [
+            None,
+            None,
+            states[0].state_id,
+            states[2].state_id,
+            states[1].state_id,
+            None,
+            None,
+            states[3].state_id,
+            states[6].state_id,
+        ]
+        shared_attrs = {
+            attributes.attributes_id: attributes.shared_attrs
+            for attributes in session.query(StateAttributes)
+        }
+        assert [shared_attrs[state.attributes_id] for state in states] == [
+            '{"attr":1}',
+            "{}",
+            '{"attr":2}',
+            '{"attr":1}',
+            "{}",
+            "{}",
+            '{"attr":3}',
+            '{"attr":2}',
+            '{"attr":3}',
+        ]
+        assert len(shared_attrs) == 4
+        assert session.query(StatesMeta).count() == 3
+
+        events = list(session.query(Events).filter(Events.event_type == "test_event"))
+        assert len(events) == 2
+        assert events[0].data_id is not None
+        assert events[0].data_id == events[1].data_id
+
+
+def test_state_attributes_ids_cache_pre_populated(hass_recorder):
+    """Test the attributes ids cache is loaded from the most recent states."""
+    hass = hass_recorder()
+
+    hass.states.set("test.one", "on", {"attr": 1})
+    hass.states.set("test.two", "on", {"attr": 2})
+    wait_recording_done(hass)
+
+    instance = recorder.get_instance(hass)
+    instance._state_attributes_ids.clear()
+    instance._pre_populate_state_attributes_ids()
+    assert set(instance._state_attributes_ids.keys()) == {
+        '{"attr":1}',
+        '{"attr":2}',
+    }
+
+    with patch.object(instance, "_find_shared_attr_in_db") as find_shared_attr_in_db:
+        hass.states.set("test.one", "off", {"attr": 2})
+        wait_recording_done(hass)
+    assert not find_shared_attr_in_db.called
+
+
 def test_saving_state_with_serializable_data(hass_recorder, caplog):
     """Test saving data that cannot be serialized does not crash."""
     hass = hass_recorder()
@@ -1041,8 +1208,8 @@ def test_saving_state_with_serializable_data(hass_recorder, caplog):
         states = list(session.query(States))
         assert len(states) == 2
 
-        assert states[0].entity_id == "test.two"
-        assert states[1].entity_id == "test.two"
+        assert states[0].states_meta_rel.entity_id == "test.two"
+        assert states[1].states_meta_rel.entity_id == "test.two"
         assert states[0].old_state_id is None
         assert states[1].old_state_id == states[0].state_id
 
@@ -1210,6 +1377,48 @@ def test_service_disable_run_information_recorded(tmpdir):
     hass.stop()
 
 
+def test_state_attributes_ids_cache_pre_populated_at_start(tmpdir, caplog):
+    """Test the attributes ids cache is loaded from the database at start."""
+    test_db_file = tmpdir.mkdir("sqlite").join("test_run_info.db")
+    dburl = f"{SQLITE_URL_PREFIX}//{test_db_file}"
+
+    hass = get_test_home_assistant()
+    setup_component(hass, DOMAIN, {DOMAIN: {CONF_DB_URL: dburl}})
+    hass.start()
+    hass.states.set("test.one", "on", {"attr": 1})
+    hass.states.set("test.two", "on", {"attr": 2})
+    hass.states.set("test.three", "on", {"attr": 2})
+    hass.states.set("test.four", "on", {"attr": 3})
+    wait_recording_done(hass)
+    hass.stop()
+
+    hass = get_test_home_assistant()
+    setup_component(
+        hass, DOMAIN, {DOMAIN: {CONF_DB_URL: dburl, recorder.CONF_ID_CACHE_SIZE: 2}}
+    )
+    hass.start()
+    wait_recording_done(hass)
+
+    instance = recorder.get_instance(hass)
+    assert set(instance._state_attributes_ids.keys()) == {
+        '{"attr":2}',
+        '{"attr":3}',
+    }
+    assert "Unable to pre-populate" not in caplog.text
+    hass.stop()
+
+
+def test_find_recent_shared_attributes_without_limit_in_subquery():
+    """Test the recent attributes query works on MySQL and MariaDB.
+
+    They don't support LIMIT in an IN subquery.
+    """
+    stmt = find_recent_shared_attributes(10)
+    sql = str(stmt._resolved.compile(dialect=mysql.dialect()))
+    assert " IN " not in sql
+    assert "LIMIT" in sql
+
+
 class CannotSerializeMe:
     """A class that the JSONEncoder cannot serialize."""
 
@@ -1501,12 +1710,11 @@ def test_deduplication_event_data_inside_commit_interval(hass_recorder, caplog):
         assert all(event.data_id == first_data_id for event in events)
 
 
-# Patch STATE_ATTRIBUTES_ID_CACHE_SIZE since otherwise
-# the CI can fail because the test takes too long to run
-@patch("homeassistant.components.recorder.core.STATE_ATTRIBUTES_ID_CACHE_SIZE", 5)
 def test_deduplication_state_attributes_inside_commit_interval(hass_recorder, caplog):
     """Test deduplication of state attributes inside the commit interval."""
-    hass = hass_recorder()
+    # Use a small id cache since otherwise
+    # the CI can fail because the test takes too long to run
+    hass = hass_recorder({recorder.CONF_ID_CACHE_SIZE: 5})
 
     entity_id = "test.recorder"
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
@@ -1528,7 +1736,8 @@ def test_deduplication_state_attributes_inside_commit_interval(hass_recorder, ca
     with session_scope(hass=hass) as session:
         states = list(
             session.query(States)
-            .filter(States.entity_id == entity_id)
+            .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .filter(StatesMeta.entity_id == entity_id)
             .outerjoin(
                 StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
             )
@@ -1537,3 +1746,14 @@ def test_deduplication_state_attributes_inside_commit_interval(hass_recorder, ca
         first_attributes_id = states[0].attributes_id
         last_attributes_id = states[-1].attributes_id
         assert first_attributes_id == last_attributes_id
+
+
+async def test_recorder_platform_async_setup_statistics(hass, recorder_mock):
+    """Test async_setup_statistics of a recorder platform is called when it is added."""
+    recorder_platform = Mock(spec=["async_setup_statistics"])
+    mock_platform(hass, "some_domain.recorder", recorder_platform)
+
+    await async_setup_component(hass, "some_domain", {})
+    await hass.async_block_till_done()
+
+    recorder_platform.async_setup_statistics.assert_called_once_with(hass)
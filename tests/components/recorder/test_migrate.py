@@ -8,6 +8,7 @@ import threading
 from unittest.mock import Mock, PropertyMock, call, patch
 
 import pytest
+import sqlalchemy
 from sqlalchemy import create_engine, text
 from sqlalchemy.exc import (
     DatabaseError,
@@ -24,10 +25,13 @@ from homeassistant.components.recorder import migration, models
 from homeassistant.components.recorder.const import DATA_INSTANCE
 from homeassistant.components.recorder.models import (
     SCHEMA_VERSION,
+    Events,
     RecorderRuns,
     States,
+    StatesMeta,
 )
 from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import Context
 import homeassistant.util.dt as dt_util
 
 from .common import async_wait_recording_done, create_engine_test
@@ -39,7 +43,9 @@ def _get_native_states(hass, entity_id):
     with session_scope(hass=hass) as session:
         return [
             state.to_native()
-            for state in session.query(States).filter(States.entity_id == entity_id)
+            for state in session.query(States)
+            .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .filter(StatesMeta.entity_id == entity_id)
         ]
 
 
@@ -388,6 +394,125 @@ def test_forgiving_add_index():
         migration._create_index(instance.get_session, "states", "ix_states_context_id")
 
 
+def test_migrate_states_entity_ids():
+    """Test entity_ids are moved from the states table to the states_meta table."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    models.Base.metadata.create_all(engine)
+    now = dt_util.utcnow()
+    with Session(engine) as session:
+        session.add(StatesMeta(entity_id="sensor.existing"))
+        for idx in range(3):
+            session.add(
+                States(entity_id="sensor.one", state=str(idx), last_updated=now)
+            )
+        session.add(States(entity_id="sensor.existing", state="1", last_updated=now))
+        session.commit()
+
+    migration._migrate_states_entity_ids(lambda: Session(engine))
+
+    with Session(engine) as session:
+        assert session.query(States).filter(States.entity_id.isnot(None)).count() == 0
+        assert session.query(StatesMeta).count() == 2
+        rows = (
+            session.query(StatesMeta.entity_id, States.state)
+            .join(States, States.metadata_id == StatesMeta.metadata_id)
+            .order_by(States.state_id)
+            .all()
+        )
+        assert [tuple(row) for row in rows] == [
+            ("sensor.one", "0"),
+            ("sensor.one", "1"),
+            ("sensor.one", "2"),
+            ("sensor.existing", "1"),
+        ]
+
+
+def test_add_states_metadata_id_with_foreign_key(hass):
+    """Test the metadata_id column is added with its foreign key."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    models.StatesMeta.__table__.create(engine)
+    with Session(engine) as session:
+        session.execute(
+            text(
+                "CREATE TABLE states (state_id INTEGER PRIMARY KEY, "
+                "entity_id VARCHAR(255), last_updated DATETIME)"
+            )
+        )
+        session.commit()
+
+    migration._apply_update(hass, engine, lambda: Session(engine), 29, 28)
+
+    foreign_keys = sqlalchemy.inspect(engine).get_foreign_keys("states")
+    assert [
+        (
+            foreign_key["constrained_columns"],
+            foreign_key["referred_table"],
+            foreign_key["referred_columns"],
+        )
+        for foreign_key in foreign_keys
+    ] == [(["metadata_id"], "states_meta", ["metadata_id"])]
+
+
+def test_migrate_context_ids():
+    """Test context ids are moved to the binary columns when they round trip."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    models.Base.metadata.create_all(engine)
+    now = dt_util.utcnow()
+    ulid_context_id = "01G0FG9KXFDVGZMQR0FQ86AB4V"
+    user_id = "b400facee45711eaa9308bfd3d19e474"
+    with Session(engine) as session:
+        session.add(
+            Events(
+                event_type="ulid",
+                origin_idx=0,
+                time_fired=now,
+                context_id=ulid_context_id,
+                context_user_id=user_id,
+                context_parent_id=ulid_context_id,
+            )
+        )
+        session.add(
+            Events(event_type="legacy", origin_idx=0, time_fired=now, context_id="1234")
+        )
+        session.add(Events(event_type="empty", origin_idx=0, time_fired=now))
+        session.add(
+            States(
+                entity_id="sensor.one",
+                state="on",
+                last_updated=now,
+                context_id=ulid_context_id,
+                context_user_id="not-a-uuid",
+            )
+        )
+        session.commit()
+
+    migration._migrate_context_ids(lambda: Session(engine))
+
+    with Session(engine) as session:
+        events = {event.event_type: event for event in session.query(Events)}
+        ulid_event = events["ulid"]
+        assert ulid_event.context_id is None
+        assert ulid_event.context_user_id is None
+        assert ulid_event.context_parent_id is None
+        assert len(ulid_event.context_id_bin) == 16
+        assert ulid_event.to_native().context == Context(
+            id=ulid_context_id, user_id=user_id, parent_id=ulid_context_id
+        )
+        legacy_event = events["legacy"]
+        assert legacy_event.context_id == "1234"
+        assert legacy_event.context_id_bin is None
+        assert legacy_event.to_native().context.id == "1234"
+        assert events["empty"].to_native().context == Context(id=None)
+
+        state = session.query(States).one()
+        assert state.context_id is None
+        assert state.context_user_id == "not-a-uuid"
+        assert state.context_user_id_bin is None
+        assert state.to_native().context == Context(
+            id=ulid_context_id, user_id="not-a-uuid"
+        )
+
+
 @pytest.mark.parametrize(
     "exception_type", [OperationalError, ProgrammingError, InternalError]
 )
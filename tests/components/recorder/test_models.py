@@ -15,6 +15,7 @@ from homeassistant.components.recorder.models import (
     RecorderRuns,
     StateAttributes,
     States,
+    StatesMeta,
     process_datetime_to_timestamp,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
@@ -44,6 +45,28 @@ def test_from_event_to_db_state():
     assert state == States.from_event(event).to_native()
 
 
+def test_from_event_to_db_context_round_trip():
+    """Test context ids round trip through the binary and string columns."""
+    ulid_context = ha.Context(
+        user_id="b400facee45711eaa9308bfd3d19e474", parent_id=ha.Context().id
+    )
+    db_event = Events.from_event(ha.Event("test_event", context=ulid_context))
+    assert db_event.context_id is None
+    assert db_event.context_user_id is None
+    assert db_event.context_parent_id is None
+    assert len(db_event.context_id_bin) == 16
+    assert db_event.to_native().context == ulid_context
+
+    legacy_context = ha.Context(
+        id="fc5bd62de45711eaaeb351041eec8dd9", user_id="B400FACE", parent_id="1234"
+    )
+    db_event = Events.from_event(ha.Event("test_event", context=legacy_context))
+    assert db_event.context_id_bin is None
+    assert db_event.context_user_id_bin is None
+    assert db_event.context_parent_id_bin is None
+    assert db_event.to_native().context == legacy_context
+
+
 def test_from_event_to_db_state_attributes():
     """Test converting event to db state attributes."""
     attrs = {"this_attr": True}
@@ -115,7 +138,7 @@ def test_entity_ids():
 
     session.add(
         States(
-            entity_id="sensor.temperature",
+            states_meta_rel=StatesMeta(entity_id="sensor.temperature"),
             state="20",
             last_changed=before_run,
             last_updated=before_run,
@@ -123,7 +146,7 @@ def test_entity_ids():
     )
     session.add(
         States(
-            entity_id="sensor.sound",
+            states_meta_rel=StatesMeta(entity_id="sensor.sound"),
             state="10",
             last_changed=after_run,
             last_updated=after_run,
@@ -132,7 +155,7 @@ def test_entity_ids():
 
     session.add(
         States(
-            entity_id="sensor.humidity",
+            states_meta_rel=StatesMeta(entity_id="sensor.humidity"),
             state="76",
             last_changed=in_run,
             last_updated=in_run,
@@ -140,7 +163,7 @@ def test_entity_ids():
     )
     session.add(
         States(
-            entity_id="sensor.lux",
+            states_meta_rel=StatesMeta(entity_id="sensor.lux"),
             state="5",
             last_changed=in_run3,
             last_updated=in_run3,
@@ -2,31 +2,42 @@
 from datetime import datetime, timedelta
 import json
 import sqlite3
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, PropertyMock, patch
 
 import pytest
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.exc import DatabaseError, OperationalError
 from sqlalchemy.orm.session import Session
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder.const import MAX_ROWS_TO_PURGE, SupportedDialect
+from homeassistant.components.recorder.core import PURGE_PROGRESS_STORAGE_KEY
 from homeassistant.components.recorder.models import (
     EventData,
     Events,
     RecorderRuns,
     StateAttributes,
     States,
+    StatesMeta,
     StatisticsRuns,
     StatisticsShortTerm,
 )
-from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.purge import (
+    MIN_PURGE_ID_RANGE,
+    purge_old_data,
+    split_id_ranges,
+)
 from homeassistant.components.recorder.services import (
     SERVICE_PURGE,
     SERVICE_PURGE_ENTITIES,
 )
 from homeassistant.components.recorder.tasks import PurgeTask
 from homeassistant.components.recorder.util import session_scope
-from homeassistant.const import EVENT_STATE_CHANGED, STATE_ON
+from homeassistant.const import (
+    EVENT_HOMEASSISTANT_FINAL_WRITE,
+    EVENT_STATE_CHANGED,
+    STATE_ON,
+)
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.util import dt as dt_util
@@ -134,6 +145,172 @@ async def test_purge_old_states(
         assert state_attributes.count() == 3
 
 
+async def test_purge_old_states_progress(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: SetupRecorderInstanceT,
+    hass_storage,
+):
+    """Test the progress of a purge is tracked and persisted."""
+    instance = await async_setup_recorder_instance(hass)
+
+    await _add_test_states(hass)
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    finished = purge_old_data(
+        instance,
+        purge_before,
+        states_batch_size=1,
+        events_batch_size=1,
+        repack=False,
+    )
+    assert not finished
+    progress = instance.purge_progress
+    assert progress.purge_before == purge_before
+    assert progress.states_to_purge == 4
+    assert progress.events_to_purge == 0
+    assert progress.states_purged == 4
+    assert progress.state_attributes_purged == 2
+    assert progress.finished is None
+    assert progress.purge_seconds > 0
+    status = progress.as_status_dict()
+    assert status["rows_remaining"] == 0
+    assert status["rows_per_second"] > 0
+    assert status["seconds_remaining"] == 0
+
+    finished = purge_old_data(instance, purge_before, repack=False)
+    assert finished
+    assert instance.purge_progress is progress
+    assert progress.finished is not None
+
+    await hass.async_block_till_done()
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+    await hass.async_block_till_done()
+    assert hass_storage[PURGE_PROGRESS_STORAGE_KEY]["data"] == progress.as_dict()
+
+
+async def test_purge_progress_estimates_rows_from_ids(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: SetupRecorderInstanceT,
+):
+    """Test the rows to purge are estimated from the range of their ids."""
+    instance = await async_setup_recorder_instance(hass)
+
+    await _add_test_states(hass)
+
+    # Nothing is old enough to purge
+    purge_old_data(instance, dt_util.utcnow() - timedelta(days=30), repack=False)
+    assert instance.purge_progress.states_to_purge == 0
+    assert instance.purge_progress.events_to_purge == 0
+
+    # A gap in the ids still counts, the estimate is the range of the ids
+    with session_scope(hass=hass) as session:
+        state_ids = [state.state_id for state in session.query(States)]
+        session.query(States).filter(States.old_state_id == state_ids[1]).update(
+            {"old_state_id": None}
+        )
+        session.query(States).filter(States.state_id == state_ids[1]).delete()
+
+    purge_old_data(
+        instance,
+        dt_util.utcnow() - timedelta(days=4),
+        states_batch_size=1,
+        events_batch_size=1,
+        repack=False,
+    )
+    assert instance.purge_progress.states_to_purge == 4
+
+
+async def test_purge_resumes_after_restart(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: SetupRecorderInstanceT,
+    hass_storage,
+):
+    """Test an unfinished purge is resumed when the recorder starts."""
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    hass_storage[PURGE_PROGRESS_STORAGE_KEY] = {
+        "version": 1,
+        "key": PURGE_PROGRESS_STORAGE_KEY,
+        "data": {
+            "purge_before": purge_before.isoformat(),
+            "repack": False,
+            "apply_filter": False,
+            "started": purge_before.isoformat(),
+            "states_to_purge": 10,
+            "events_to_purge": 0,
+            "states_purged": 6,
+            "events_purged": 0,
+            "state_attributes_purged": 1,
+            "event_data_purged": 0,
+            "purge_seconds": 1.0,
+            "finished": None,
+        },
+    }
+
+    with patch(
+        "homeassistant.components.recorder.purge.purge_old_data",
+        wraps=purge_old_data,
+    ) as purge_mock:
+        instance = await async_setup_recorder_instance(hass)
+        await async_wait_purge_done(hass)
+
+    purge_mock.assert_called_once_with(instance, purge_before, False, False)
+    progress = instance.purge_progress
+    assert progress.states_purged == 6
+    assert progress.finished is not None
+
+
+async def test_purge_yields_to_backlog(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test the purge stops after a batch when the recorder queue grows."""
+    instance = await async_setup_recorder_instance(hass)
+
+    await _add_test_states(hass)
+
+    with session_scope(hass=hass) as session:
+        states = session.query(States)
+        assert states.count() == 6
+
+        purge_before = dt_util.utcnow() - timedelta(days=4)
+        with patch(
+            "homeassistant.components.recorder.purge.find_states_to_purge",
+            side_effect=lambda purge_before: _find_states_to_purge_one(purge_before),
+        ), patch(
+            "homeassistant.components.recorder.core.Recorder.backlog",
+            new_callable=PropertyMock,
+            return_value=100,
+        ):
+            finished = purge_old_data(instance, purge_before, repack=False)
+        assert not finished
+        # Only the first batch of states is purged
+        assert states.count() == 5
+
+        finished = purge_old_data(instance, purge_before, repack=False)
+        assert finished
+        assert states.count() == 2
+
+
+def _find_states_to_purge_one(purge_before: datetime):
+    """Find one state to purge."""
+    return lambda_stmt(
+        lambda: select(States.state_id, States.attributes_id)
+        .filter(States.last_updated < purge_before)
+        .limit(1)
+    )
+
+
+def test_split_id_ranges():
+    """Test ids are split into contiguous ranges to purge by primary key."""
+    assert split_id_ranges([]) == ([], [])
+    assert split_id_ranges([5, 3, 1]) == ([], [1, 3, 5])
+    long_range = list(range(10, 10 + MIN_PURGE_ID_RANGE))
+    assert split_id_ranges([1, 500, *reversed(long_range), 3]) == (
+        [(10, 9 + MIN_PURGE_ID_RANGE)],
+        [1, 3, 500],
+    )
+    assert split_id_ranges(long_range[:-1]) == ([], long_range[:-1])
+
+
 async def test_purge_old_states_encouters_database_corruption(
     hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
 ):
@@ -455,7 +632,7 @@ async def test_purge_edge_case(
             )
             session.add(
                 States(
-                    entity_id="test.recorder2",
+                    states_meta_rel=_states_meta(session, "test.recorder2"),
                     state="purgeme",
                     attributes="{}",
                     last_changed=timestamp,
@@ -524,7 +701,7 @@ async def test_purge_cutoff_date(
             )
             session.add(
                 States(
-                    entity_id="test.cutoff",
+                    states_meta_rel=_states_meta(session, "test.cutoff"),
                     state="keep",
                     attributes="{}",
                     last_changed=timestamp_keep,
@@ -552,7 +729,7 @@ async def test_purge_cutoff_date(
                 )
                 session.add(
                     States(
-                        entity_id="test.cutoff",
+                        states_meta_rel=_states_meta(session, "test.cutoff"),
                         state="purge",
                         attributes="{}",
                         last_changed=timestamp_purge,
@@ -677,7 +854,7 @@ async def test_purge_filtered_states(
             timestamp = dt_util.utcnow() - timedelta(days=1)
             session.add(
                 States(
-                    entity_id="sensor.excluded",
+                    states_meta_rel=_states_meta(session, "sensor.excluded"),
                     state="purgeme",
                     attributes="{}",
                     last_changed=timestamp,
@@ -703,7 +880,7 @@ async def test_purge_filtered_states(
                 ),
             )
             state_1 = States(
-                entity_id="sensor.linked_old_state_id",
+                states_meta_rel=_states_meta(session, "sensor.linked_old_state_id"),
                 state="keep",
                 attributes="{}",
                 last_changed=timestamp,
@@ -713,7 +890,7 @@ async def test_purge_filtered_states(
             )
             timestamp = dt_util.utcnow() - timedelta(days=4)
             state_2 = States(
-                entity_id="sensor.linked_old_state_id",
+                states_meta_rel=_states_meta(session, "sensor.linked_old_state_id"),
                 state="keep",
                 attributes="{}",
                 last_changed=timestamp,
@@ -722,7 +899,7 @@ async def test_purge_filtered_states(
                 state_attributes=state_attrs,
             )
             state_3 = States(
-                entity_id="sensor.linked_old_state_id",
+                states_meta_rel=_states_meta(session, "sensor.linked_old_state_id"),
                 state="keep",
                 attributes="{}",
                 last_changed=timestamp,
@@ -794,8 +971,10 @@ async def test_purge_filtered_states(
         events_keep = session.query(Events).filter(Events.event_type == "EVENT_KEEP")
         assert events_keep.count() == 1
 
-        states_sensor_excluded = session.query(States).filter(
-            States.entity_id == "sensor.excluded"
+        states_sensor_excluded = (
+            session.query(States)
+            .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .filter(StatesMeta.entity_id == "sensor.excluded")
         )
         assert states_sensor_excluded.count() == 0
 
@@ -907,7 +1086,7 @@ async def test_purge_without_state_attributes_filtered_states_to_empty(
             event_id = 1021
             session.add(
                 States(
-                    entity_id="sensor.old_format",
+                    states_meta_rel=_states_meta(session, "sensor.old_format"),
                     state=STATE_ON,
                     attributes=json.dumps({"old": "not_using_state_attributes"}),
                     last_changed=timestamp,
@@ -1080,7 +1259,7 @@ async def test_purge_filtered_events_state_changed(
             # Add states with linked old_state_ids that need to be handled
             timestamp = dt_util.utcnow() - timedelta(days=0)
             state_1 = States(
-                entity_id="sensor.linked_old_state_id",
+                states_meta_rel=_states_meta(session, "sensor.linked_old_state_id"),
                 state="keep",
                 attributes="{}",
                 last_changed=timestamp,
@@ -1089,7 +1268,7 @@ async def test_purge_filtered_events_state_changed(
             )
             timestamp = dt_util.utcnow() - timedelta(days=4)
             state_2 = States(
-                entity_id="sensor.linked_old_state_id",
+                states_meta_rel=_states_meta(session, "sensor.linked_old_state_id"),
                 state="keep",
                 attributes="{}",
                 last_changed=timestamp,
@@ -1097,7 +1276,7 @@ async def test_purge_filtered_events_state_changed(
                 old_state_id=2,
             )
             state_3 = States(
-                entity_id="sensor.linked_old_state_id",
+                states_meta_rel=_states_meta(session, "sensor.linked_old_state_id"),
                 state="keep",
                 attributes="{}",
                 last_changed=timestamp,
@@ -1225,8 +1404,10 @@ async def test_purge_entities(
         states = session.query(States)
         assert states.count() == 10
 
-        states_sensor_kept = session.query(States).filter(
-            States.entity_id == "sensor.keep"
+        states_sensor_kept = (
+            session.query(States)
+            .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .filter(StatesMeta.entity_id == "sensor.keep")
         )
         assert states_sensor_kept.count() == 10
 
@@ -1255,8 +1436,10 @@ async def test_purge_entities(
         states = session.query(States)
         assert states.count() == 10
 
-        states_sensor_kept = session.query(States).filter(
-            States.entity_id == "sensor.keep"
+        states_sensor_kept = (
+            session.query(States)
+            .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .filter(StatesMeta.entity_id == "sensor.keep")
         )
         assert states_sensor_kept.count() == 10
 
@@ -1460,6 +1643,17 @@ async def _add_test_statistics_runs(hass: HomeAssistant):
             )
 
 
+def _states_meta(session: Session, entity_id: str) -> StatesMeta:
+    """Return the states meta for an entity_id, adding it if it does not exist."""
+    if states_meta := (
+        session.query(StatesMeta).filter(StatesMeta.entity_id == entity_id).first()
+    ):
+        return states_meta
+    states_meta = StatesMeta(entity_id=entity_id)
+    session.add(states_meta)
+    return states_meta
+
+
 def _add_state_without_event_linkage(
     session: Session,
     entity_id: str,
@@ -1472,7 +1666,7 @@ def _add_state_without_event_linkage(
     session.add(state_attrs)
     session.add(
         States(
-            entity_id=entity_id,
+            states_meta_rel=_states_meta(session, entity_id),
             state=state,
             attributes=None,
             last_changed=timestamp,
@@ -1497,7 +1691,7 @@ def _add_state_and_state_changed_event(
     session.add(state_attrs)
     session.add(
         States(
-            entity_id=entity_id,
+            states_meta_rel=_states_meta(session, entity_id),
             state=state,
             attributes=None,
             last_changed=timestamp,
@@ -1580,7 +1774,7 @@ async def test_purge_can_mix_legacy_and_new_format(
     with session_scope(hass=hass) as session:
         broken_state_no_time = States(
             event_id=None,
-            entity_id="orphened.state",
+            states_meta_rel=_states_meta(session, "orphened.state"),
             last_updated=None,
             last_changed=None,
         )
@@ -732,6 +732,198 @@ def test_monthly_statistics(hass_recorder, caplog, timezone):
     dt_util.set_default_time_zone(dt_util.get_time_zone("UTC"))
 
 
+@pytest.mark.parametrize("timezone", ["America/Regina", "Europe/Vienna", "UTC"])
+@pytest.mark.freeze_time("2021-08-01 00:00:00+00:00")
+def test_weekly_yearly_statistics(hass_recorder, caplog, timezone):
+    """Test reducing statistics to weeks and years."""
+    dt_util.set_default_time_zone(dt_util.get_time_zone(timezone))
+
+    hass = hass_recorder()
+    wait_recording_done(hass)
+
+    def local(time_str):
+        return dt_util.as_utc(dt_util.parse_datetime(time_str))
+
+    zero = dt_util.utcnow()
+    external_statistics = (
+        # Wednesday
+        {"start": local("2021-09-01 00:00:00"), "mean": 1, "min": 0, "max": 2},
+        # Sunday, the last hour of the same week
+        {"start": local("2021-09-05 23:00:00"), "mean": 3, "min": 1, "max": 4},
+        # Monday
+        {"start": local("2021-09-06 00:00:00"), "mean": 5, "min": 5, "max": 5},
+        # The last hour of the year
+        {"start": local("2021-12-31 23:00:00"), "mean": 7, "min": 6, "max": 8},
+        {"start": local("2022-01-01 00:00:00"), "mean": 9, "min": 9, "max": 10},
+    )
+    for idx, stat in enumerate(external_statistics):
+        stat.update({"last_reset": None, "state": idx, "sum": idx + 2})
+    external_metadata = {
+        "has_mean": True,
+        "has_sum": True,
+        "name": "Total imported energy",
+        "source": "test",
+        "statistic_id": "test:total_energy_import",
+        "unit_of_measurement": "kWh",
+    }
+
+    async_add_external_statistics(hass, external_metadata, external_statistics)
+    wait_recording_done(hass)
+
+    def reduced(start, end, mean, min, max, state):
+        return {
+            "statistic_id": "test:total_energy_import",
+            "start": local(start).isoformat(),
+            "end": local(end).isoformat(),
+            "mean": approx(mean),
+            "min": approx(min),
+            "max": approx(max),
+            "last_reset": None,
+            "state": approx(state),
+            "sum": approx(state + 2),
+        }
+
+    first_week = reduced("2021-08-30 00:00:00", "2021-09-06 00:00:00", 2, 0, 4, 1)
+    stats = statistics_during_period(hass, zero, period="week")
+    assert stats == {
+        "test:total_energy_import": [
+            first_week,
+            reduced("2021-09-06 00:00:00", "2021-09-13 00:00:00", 5, 5, 5, 2),
+            reduced("2021-12-27 00:00:00", "2022-01-03 00:00:00", 8, 6, 10, 4),
+        ]
+    }
+
+    # The last known statistics before start_time are in the first week
+    stats = statistics_during_period(
+        hass,
+        local("2021-09-02 00:00:00"),
+        local("2021-09-06 00:00:00"),
+        period="week",
+    )
+    assert stats == {"test:total_energy_import": [first_week]}
+
+    stats = statistics_during_period(hass, zero, period="year")
+    assert stats == {
+        "test:total_energy_import": [
+            reduced("2021-01-01 00:00:00", "2022-01-01 00:00:00", 4, 0, 8, 3),
+            reduced("2022-01-01 00:00:00", "2023-01-01 00:00:00", 9, 9, 10, 4),
+        ]
+    }
+
+    # The last known statistics before start_time are in the previous year
+    stats = statistics_during_period(hass, local("2021-12-31 23:30:00"), period="year")
+    assert stats == {
+        "test:total_energy_import": [
+            reduced("2021-01-01 00:00:00", "2022-01-01 00:00:00", 7, 6, 8, 3),
+            reduced("2022-01-01 00:00:00", "2023-01-01 00:00:00", 9, 9, 10, 4),
+        ]
+    }
+
+    dt_util.set_default_time_zone(dt_util.get_time_zone("UTC"))
+
+
+@pytest.mark.freeze_time("2021-08-01 00:00:00+00:00")
+def test_daily_statistics_dst(hass_recorder, caplog):
+    """Test reducing statistics to days which are not 24 hours long."""
+    dt_util.set_default_time_zone(dt_util.get_time_zone("Europe/Vienna"))
+
+    hass = hass_recorder()
+    wait_recording_done(hass)
+
+    # DST ends on 2021-10-31, the day is 25 hours long
+    start = dt_util.as_utc(dt_util.parse_datetime("2021-10-31 00:00:00"))
+    external_statistics = [
+        {
+            "start": start + timedelta(hours=idx),
+            "last_reset": None,
+            "state": idx,
+            "sum": idx,
+        }
+        for idx in range(26)
+    ]
+    external_metadata = {
+        "has_mean": False,
+        "has_sum": True,
+        "name": "Total imported energy",
+        "source": "test",
+        "statistic_id": "test:total_energy_import",
+        "unit_of_measurement": "kWh",
+    }
+
+    async_add_external_statistics(hass, external_metadata, external_statistics)
+    wait_recording_done(hass)
+
+    stats = statistics_during_period(hass, start, period="day")
+    assert [
+        (stat["start"], stat["end"], stat["sum"])
+        for stat in stats["test:total_energy_import"]
+    ] == [
+        (
+            "2021-10-30T22:00:00+00:00",
+            "2021-10-31T23:00:00+00:00",
+            approx(24.0),
+        ),
+        (
+            "2021-10-31T23:00:00+00:00",
+            "2021-11-01T23:00:00+00:00",
+            approx(25.0),
+        ),
+    ]
+
+    dt_util.set_default_time_zone(dt_util.get_time_zone("UTC"))
+
+
+@pytest.mark.freeze_time("2021-08-01 00:00:00+00:00")
+def test_daily_statistics_with_and_without_mean(hass_recorder, caplog):
+    """Test reducing statistics with and without a mean in the same request."""
+    hass = hass_recorder()
+    wait_recording_done(hass)
+
+    start = dt_util.as_utc(dt_util.parse_datetime("2021-09-01 00:00:00"))
+    for statistic_id, has_mean in (
+        ("test:temperature", True),
+        ("test:total_energy_import", False),
+    ):
+        external_statistics = [
+            {
+                "start": start + timedelta(hours=idx),
+                "mean": idx if has_mean else None,
+                "min": idx - 1 if has_mean else None,
+                "max": idx + 1 if has_mean else None,
+                "last_reset": None,
+                "state": None if has_mean else idx,
+                "sum": None if has_mean else idx * 2,
+            }
+            for idx in range(48)
+        ]
+        external_metadata = {
+            "has_mean": has_mean,
+            "has_sum": not has_mean,
+            "name": None,
+            "source": "test",
+            "statistic_id": statistic_id,
+            "unit_of_measurement": "kWh",
+        }
+        async_add_external_statistics(hass, external_metadata, external_statistics)
+    wait_recording_done(hass)
+
+    stats = statistics_during_period(hass, start, period="day")
+    assert [
+        (stat["mean"], stat["min"], stat["max"], stat["state"], stat["sum"])
+        for stat in stats["test:temperature"]
+    ] == [
+        (approx(11.5), approx(-1.0), approx(24.0), None, None),
+        (approx(35.5), approx(23.0), approx(48.0), None, None),
+    ]
+    assert [
+        (stat["mean"], stat["min"], stat["max"], stat["state"], stat["sum"])
+        for stat in stats["test:total_energy_import"]
+    ] == [
+        (None, None, None, approx(23.0), approx(46.0)),
+        (None, None, None, approx(47.0), approx(94.0)),
+    ]
+
+
 def test_delete_duplicates_no_duplicates(hass_recorder, caplog):
     """Test removal of duplicated statistics."""
     hass = hass_recorder()
@@ -24,6 +24,8 @@ async def test_recorder_system_health(hass, recorder_mock):
         "current_recorder_run": instance.run_history.current.start,
         "oldest_recorder_run": instance.run_history.first.start,
         "estimated_db_size": ANY,
+        "state_attributes_id_cache": ANY,
+        "event_data_id_cache": ANY,
     }
 
 
@@ -46,6 +48,8 @@ async def test_recorder_system_health_alternate_dbms(hass, recorder_mock, dialec
         "current_recorder_run": instance.run_history.current.start,
         "oldest_recorder_run": instance.run_history.first.start,
         "estimated_db_size": "1.00 MiB",
+        "state_attributes_id_cache": ANY,
+        "event_data_id_cache": ANY,
     }
 
 
@@ -62,4 +66,17 @@ async def test_recorder_system_health_crashed_recorder_runs_table(
         "current_recorder_run": instance.run_history.current.start,
         "oldest_recorder_run": instance.run_history.current.start,
         "estimated_db_size": ANY,
+        "state_attributes_id_cache": ANY,
+        "event_data_id_cache": ANY,
     }
+
+
+async def test_recorder_system_health_id_cache_stats(hass, recorder_mock):
+    """Test recorder system health reports the id cache hits and misses."""
+    assert await async_setup_component(hass, "system_health", {})
+    hass.states.async_set("sensor.test", "on", {"attr": 1})
+    await async_wait_recording_done(hass)
+    hass.states.async_set("sensor.test", "off", {"attr": 1})
+    await async_wait_recording_done(hass)
+    info = await get_system_health_info(hass, "recorder")
+    assert info["state_attributes_id_cache"] == "1 hits, 1 misses"
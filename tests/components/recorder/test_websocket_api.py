@@ -274,6 +274,32 @@ async def test_recorder_info(hass, hass_ws_client, recorder_mock):
     }
 
 
+async def test_recorder_purge_progress(hass, hass_ws_client, recorder_mock):
+    """Test getting the progress of a purge."""
+    client = await hass_ws_client()
+
+    await client.send_json({"id": 1, "type": "recorder/purge_progress"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"] is None
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    await hass.services.async_call(
+        recorder.DOMAIN, "purge", {"keep_days": 4}, blocking=True
+    )
+    await async_wait_recording_done(hass)
+
+    await client.send_json({"id": 2, "type": "recorder/purge_progress"})
+    response = await client.receive_json()
+    assert response["success"]
+    result = response["result"]
+    assert dt_util.parse_datetime(result["purge_before"]) >= purge_before
+    assert result["finished"] is not None
+    assert result["states_purged"] == 0
+    assert result["events_purged"] == 0
+    assert result["rows_remaining"] == 0
+
+
 async def test_recorder_info_no_recorder(hass, hass_ws_client):
     """Test getting recorder status when recorder is not present."""
     client = await hass_ws_client()
@@ -1496,6 +1496,98 @@ def test_compile_hourly_statistics_unchanged(
     assert "Error while processing event StatisticsTask" not in caplog.text
 
 
+def test_compile_statistics_accumulated(hass_recorder, caplog):
+    """Test compiling statistics accumulated while the states changed."""
+    zero = dt_util.as_utc(dt_util.parse_datetime("2021-09-01 00:00:00"))
+    hass = hass_recorder()
+    setup_component(hass, "sensor", {})
+    wait_recording_done(hass)  # Wait for the sensor recorder platform to be added
+    attributes = dict(POWER_SENSOR_ATTRIBUTES)
+
+    def set_state(entity_id, state, time):
+        """Set the state at time."""
+        with patch(
+            "homeassistant.components.recorder.core.dt_util.utcnow", return_value=time
+        ):
+            hass.states.set(entity_id, state, attributes=attributes)
+            wait_recording_done(hass)
+
+    # The state before the period is carried into the period
+    set_state("sensor.test1", "10", zero - timedelta(minutes=6))
+    set_state("sensor.test1", "11", zero - timedelta(minutes=1))
+    set_state("sensor.test1", "20", zero + timedelta(minutes=1))
+    set_state("sensor.test1", STATE_UNAVAILABLE, zero + timedelta(minutes=2))
+    set_state("sensor.test1", "40", zero + timedelta(minutes=3))
+    # A sensor added during the period is compiled from the database
+    set_state("sensor.test2", "10", zero + timedelta(minutes=1))
+
+    get_significant_states = history.get_full_significant_states_with_session
+    queried_entity_ids = []
+
+    def _get_significant_states(hass, session, start, end, entity_ids, **kwargs):
+        queried_entity_ids.extend(entity_ids)
+        return get_significant_states(hass, session, start, end, entity_ids, **kwargs)
+
+    with patch.object(
+        history,
+        "get_full_significant_states_with_session",
+        _get_significant_states,
+    ):
+        do_adhoc_statistics(hass, start=zero)
+        wait_recording_done(hass)
+    assert queried_entity_ids == ["sensor.test2"]
+
+    stats = statistics_during_period(hass, zero, period="5minute")
+    assert stats == {
+        "sensor.test1": [
+            {
+                "statistic_id": "sensor.test1",
+                "start": process_timestamp_to_utc_isoformat(zero),
+                "end": process_timestamp_to_utc_isoformat(zero + timedelta(minutes=5)),
+                "mean": approx((11 * 60 + 20 * 120 + 40 * 120) * 1000 / 300),
+                "min": approx(11000.0),
+                "max": approx(40000.0),
+                "last_reset": None,
+                "state": None,
+                "sum": None,
+            }
+        ],
+        "sensor.test2": [
+            {
+                "statistic_id": "sensor.test2",
+                "start": process_timestamp_to_utc_isoformat(zero),
+                "end": process_timestamp_to_utc_isoformat(zero + timedelta(minutes=5)),
+                "mean": approx(10000.0),
+                "min": approx(10000.0),
+                "max": approx(10000.0),
+                "last_reset": None,
+                "state": None,
+                "sum": None,
+            }
+        ],
+    }
+    assert "Error while processing event StatisticsTask" not in caplog.text
+
+
+async def test_accumulator_checks_recorded_once(hass, recorder_mock):
+    """Test the statistics accumulator checks once if a sensor is recorded."""
+    await async_setup_component(hass, "sensor", {})
+    await async_recorder_block_till_done(hass)
+
+    with patch(
+        "homeassistant.components.sensor.recorder.is_entity_recorded",
+        return_value=True,
+    ) as is_entity_recorded:
+        for state in range(5):
+            hass.states.async_set("sensor.test1", state, POWER_SENSOR_ATTRIBUTES)
+            hass.states.async_set("sensor.test2", state, POWER_SENSOR_ATTRIBUTES)
+        await hass.async_block_till_done()
+    assert [call.args[1] for call in is_entity_recorded.call_args_list] == [
+        "sensor.test1",
+        "sensor.test2",
+    ]
+
+
 def test_compile_hourly_statistics_partially_unavailable(hass_recorder, caplog):
     """Test compiling hourly statistics, with the sensor being partially unavailable."""
     zero = dt_util.utcnow()
@@ -0,0 +1,40 @@
+"""Test template system health."""
+from unittest.mock import ANY
+
+from homeassistant.helpers.event import TrackTemplate, async_track_template_result
+from homeassistant.helpers.template import Template
+from homeassistant.setup import async_setup_component
+
+from tests.common import get_system_health_info
+
+
+async def test_system_health_info(hass):
+    """Test system health info endpoint."""
+    assert await async_setup_component(hass, "system_health", {})
+    assert await async_setup_component(hass, "template", {})
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.test", "1")
+    for _ in range(4):
+        async_track_template_result(
+            hass,
+            [TrackTemplate(Template("{{ states('sensor.test') }}", hass), None)],
+            lambda event, updates: None,
+        )
+    # Tracked templates share their first render, so only one was compiled
+    for _ in range(2):
+        Template("{{ states('sensor.test') }}", hass).async_render()
+
+    info = await get_system_health_info(hass, "template")
+    assert info == {
+        "render_cache_size": 1,
+        "render_cache_hits": 3,
+        "render_cache_misses": 1,
+        "render_cache_hit_rate": "75.0%",
+        "compiled_templates": 1,
+        "reused_templates": 2,
+        "compile_time_saved": ANY,
+        "compile_memory_saved": ANY,
+    }
+    assert info["compile_time_saved"].endswith(" s")
+    assert info["compile_memory_saved"].endswith(" KiB")
@@ -79,7 +79,7 @@ async def test_non_json_message(hass, websocket_client, caplog):
     assert msg["success"]
     assert msg["result"] == []
     assert (
-        f"Unable to serialize to JSON. Bad data found at $.result[0](State: test_domain.entity).attributes.bad={bad_data}(<class 'object'>"
+        f"Unable to serialize to JSON. Bad data found at $(State: test_domain.entity).attributes.bad={bad_data}(<class 'object'>"
         in caplog.text
     )
 
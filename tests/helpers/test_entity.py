@@ -945,3 +945,26 @@ async def test_entity_description_fallback():
             continue
 
         assert getattr(ent, field.name) == getattr(ent_with_description, field.name)
+
+
+async def test_write_timings(hass):
+    """Test timing the state writes of entities."""
+    ent = entity.Entity()
+    ent.hass = hass
+    ent.entity_id = "test.test"
+
+    ent.async_write_ha_state()
+    assert entity.async_write_timings(hass) == []
+
+    entity.async_set_write_timing(hass, True)
+    ent.async_write_ha_state()
+    ent.async_write_ha_state()
+    timings = entity.async_write_timings(hass)
+    assert len(timings) == 1
+    assert timings[0]["entity_id"] == "test.test"
+    assert timings[0]["calls"] == 2
+    assert timings[0]["total"] >= timings[0]["max"] > 0
+
+    entity.async_set_write_timing(hass, False)
+    ent.async_write_ha_state()
+    assert entity.async_write_timings(hass) == []
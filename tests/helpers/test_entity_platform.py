@@ -6,7 +6,7 @@ from unittest.mock import ANY, Mock, patch
 
 import pytest
 
-from homeassistant.const import EVENT_HOMEASSISTANT_STARTED, PERCENTAGE
+from homeassistant.const import EVENT_HOMEASSISTANT_STARTED, PERCENTAGE, STATE_UNKNOWN
 from homeassistant.core import CoreState, HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError, PlatformNotReady
 from homeassistant.helpers import (
@@ -1373,3 +1373,86 @@ class SlowEntity(MockEntity):
         """Make sure control is returned to the event loop on add."""
         await asyncio.sleep(0.1)
         await super().async_added_to_hass()
+
+
+async def test_coalesce_state_writes(hass):
+    """Test state writes within one loop iteration are merged."""
+    platform = MockPlatform()
+    platform.STATE_WRITE_COALESCE_WINDOW = 0
+    entity_platform = MockEntityPlatform(hass, platform=platform)
+    assert entity_platform.state_write_coalesce_window == 0
+
+    state_changes = []
+    hass.bus.async_listen("state_changed", state_changes.append)
+
+    entity = MockEntity(name="coalesced")
+    await entity_platform.async_add_entities([entity])
+    await hass.async_block_till_done()
+    # The first state is written right away
+    assert hass.states.get("test_domain.coalesced").state == STATE_UNKNOWN
+    assert len(state_changes) == 1
+
+    for value in range(3):
+        entity._values["state"] = value
+        entity.async_write_ha_state()
+    await hass.async_block_till_done()
+
+    assert hass.states.get("test_domain.coalesced").state == "2"
+    assert len(state_changes) == 2
+    assert entity_platform.coalesced_state_writes == 2
+
+
+async def test_coalesce_state_writes_window(hass):
+    """Test state writes within the window are merged."""
+    platform = MockPlatform()
+    platform.STATE_WRITE_COALESCE_WINDOW = 10_000_000
+    entity_platform = MockEntityPlatform(hass, platform=platform)
+    assert entity_platform.state_write_coalesce_window == 10
+
+    entity = MockEntity(name="coalesced")
+    await entity_platform.async_add_entities([entity])
+
+    with patch.object(hass.loop, "call_later") as mock_call_later:
+        entity._values["state"] = "on"
+        entity.async_write_ha_state()
+        entity.async_write_ha_state()
+    await hass.async_block_till_done()
+    assert hass.states.get("test_domain.coalesced").state == STATE_UNKNOWN
+
+    assert len(mock_call_later.mock_calls) == 1
+    window, write_pending_state = mock_call_later.mock_calls[0][1]
+    assert window == 10
+    write_pending_state()
+    assert hass.states.get("test_domain.coalesced").state == "on"
+    assert entity_platform.coalesced_state_writes == 1
+
+    # A direct write includes the pending write
+    with patch.object(hass.loop, "call_later") as mock_call_later:
+        entity._values["state"] = "off"
+        entity.async_write_ha_state()
+        await entity.async_update_ha_state()
+    assert hass.states.get("test_domain.coalesced").state == "off"
+    assert entity_platform.coalesced_state_writes == 2
+    assert len(mock_call_later.return_value.cancel.mock_calls) == 1
+
+    # Removing the entity drops the pending write
+    with patch.object(hass.loop, "call_later") as mock_call_later:
+        entity.async_write_ha_state()
+        await entity_platform.async_remove_entity(entity.entity_id)
+    assert hass.states.get("test_domain.coalesced") is None
+    assert entity_platform.coalesced_state_writes == 2
+    assert len(mock_call_later.return_value.cancel.mock_calls) == 1
+
+
+async def test_state_writes_not_coalesced_by_default(hass):
+    """Test state writes are not merged unless the platform opts in."""
+    entity_platform = MockEntityPlatform(hass)
+    assert entity_platform.state_write_coalesce_window is None
+
+    entity = MockEntity(name="direct")
+    await entity_platform.async_add_entities([entity])
+
+    entity._values["state"] = "on"
+    entity.async_write_ha_state()
+    assert hass.states.get("test_domain.direct").state == "on"
+    assert entity_platform.coalesced_state_writes == 0
@@ -38,7 +38,12 @@ from homeassistant.helpers.event import (
     async_track_utc_time_change,
     track_point_in_utc_time,
 )
-from homeassistant.helpers.template import Template, result_as_boolean
+from homeassistant.helpers.template import (
+    Template,
+    _render_with_context,
+    async_get_render_cache,
+    result_as_boolean,
+)
 from homeassistant.setup import async_setup_component
 import homeassistant.util.dt as dt_util
 
@@ -4389,3 +4394,32 @@ async def test_async_track_entity_registry_updated_event_with_empty_list(hass):
 
     unsub_single2()
     unsub_single()
+
+
+async def test_track_template_result_shares_renders(hass):
+    """Test tracked templates with the same source share their renders."""
+    hass.states.async_set("sensor.test", "1")
+    results = []
+
+    @ha.callback
+    def _run_callback(event, updates):
+        results.append(updates.pop().result)
+
+    for _ in range(3):
+        async_track_template_result(
+            hass,
+            [TrackTemplate(Template("{{ states('sensor.test') }}", hass), None)],
+            _run_callback,
+        )
+    await hass.async_block_till_done()
+
+    with patch(
+        "homeassistant.helpers.template._render_with_context",
+        wraps=_render_with_context,
+    ) as mock_render:
+        hass.states.async_set("sensor.test", "2")
+        await hass.async_block_till_done()
+
+    assert results == [2, 2, 2]
+    assert mock_render.call_count == 1
+    assert async_get_render_cache(hass).as_dict()["hits"] == 4
@@ -1,10 +1,19 @@
 """Test Home Assistant remote methods and classes."""
 import datetime
+import json
+import math
 
 import pytest
 
 from homeassistant import core
-from homeassistant.helpers.json import ExtendedJSONEncoder, JSONEncoder
+from homeassistant.helpers.json import (
+    ExtendedJSONEncoder,
+    JSONEncoder,
+    json_bytes,
+    json_bytes_strict,
+    json_dumps,
+    json_dumps_compatible,
+)
 from homeassistant.util import dt as dt_util
 
 
@@ -64,3 +73,61 @@ def test_extended_json_encoder(hass):
     # Default method falls back to repr(o)
     o = object()
     assert ha_json_enc.default(o) == {"__type": str(type(o)), "repr": repr(o)}
+
+
+def test_json_dumps(hass):
+    """Test dumping Home Assistant objects with orjson."""
+    state = core.State("test.test", "hello")
+    now = dt_util.utcnow()
+
+    assert json.loads(json_bytes({"now": now, "state": state, "set": {1}})) == {
+        "now": now.isoformat(),
+        "state": json.loads(json.dumps(state, cls=JSONEncoder)),
+        "set": [1],
+    }
+    assert json_dumps({1: float("nan")}) == '{"1":null}'
+
+    with pytest.raises(TypeError):
+        json_dumps(object())
+
+
+@pytest.mark.parametrize(
+    "data",
+    (
+        {"nan": float("nan")},
+        {"nested": [1, {"inf": math.inf}], "none": None},
+        [None, -math.inf],
+    ),
+)
+def test_json_bytes_strict_not_allows_nan(data):
+    """Test the strict dump raises like json.dumps with allow_nan=False."""
+    with pytest.raises(ValueError):
+        json.dumps(data, allow_nan=False)
+    with pytest.raises(ValueError):
+        json_bytes_strict(data)
+
+
+def test_json_bytes_strict_null_without_nan():
+    """Test null is dumped when there is no NaN, next to values json can't dump."""
+    assert json_bytes_strict({"none": None, "when": datetime.date(2022, 5, 1)}) == (
+        b'{"none":null,"when":"2022-05-01"}'
+    )
+
+
+@pytest.mark.parametrize(
+    "data",
+    (
+        {"float": 0.1, "big": 1e16, "small": 1e-05, "negative": -2.5e-10},
+        {"text": "caf\u00e9 \U0001f600", "delete": "\x7f", "none": None},
+        {"nan": float("nan"), "inf": math.inf, "none": None},
+        {1: "int key", 1e20: "float key", None: "none key"},
+        {"now": datetime.datetime(2022, 5, 1, 12, 30, 1, 500, dt_util.UTC)},
+        {"set": {"a"}, "tuple": (1, 2), "hex": "3e45"},
+        [core.State("test.test", "hello", {"unit": None})],
+    ),
+)
+def test_json_dumps_compatible(hass, data):
+    """Test the compatible dump matches json.dumps with the JSONEncoder."""
+    assert json_dumps_compatible(data) == json.dumps(
+        data, cls=JSONEncoder, separators=(",", ":")
+    )
@@ -0,0 +1,54 @@
+"""Test the startup trace helper."""
+import threading
+
+from homeassistant.helpers import startup_trace
+
+
+async def test_trace_span(hass):
+    """Test spans are recorded on their tracks in the Chrome trace format."""
+    trace = startup_trace.async_start_startup_trace(hass)
+    assert startup_trace.async_get_startup_trace(hass) is trace
+
+    with startup_trace.async_trace_span(hass, "bootstrap", "stage 1", "bootstrap"):
+        with startup_trace.async_trace_span(
+            hass, "light", "setup", "setup", {"entries": 1}
+        ):
+            pass
+
+    def add_from_thread():
+        with trace.span("executor", "sun", "import"):
+            pass
+
+    thread = threading.Thread(target=add_from_thread)
+    thread.start()
+    thread.join()
+
+    startup_trace.async_finish_startup_trace(hass)
+    with startup_trace.async_trace_span(hass, "bootstrap", "late", "bootstrap"):
+        pass
+    trace.add("bootstrap", "late", "bootstrap", 1.0, 2.0)
+
+    data = trace.as_dict()
+    assert data["otherData"]["finished"] is True
+    events = data["traceEvents"]
+    assert [
+        (event["ph"], event["name"], event["tid"], event["args"]) for event in events
+    ] == [
+        ("M", "thread_name", 1, {"name": "bootstrap"}),
+        ("X", "stage 1", 1, {}),
+        ("M", "thread_name", 2, {"name": "light"}),
+        ("X", "setup", 2, {"entries": 1}),
+        ("M", "thread_name", 3, {"name": "executor"}),
+        ("X", "sun", 3, {}),
+    ]
+    stage_1, light_setup = events[1], events[3]
+    assert stage_1["ts"] <= light_setup["ts"]
+    assert light_setup["ts"] + light_setup["dur"] <= stage_1["ts"] + stage_1["dur"] + 1
+
+
+async def test_trace_span_without_trace(hass):
+    """Test spans are not recorded when startup is not traced."""
+    with startup_trace.async_trace_span(hass, "bootstrap", "stage 1", "bootstrap"):
+        pass
+
+    assert startup_trace.async_get_startup_trace(hass) is None
@@ -1,5 +1,6 @@
 """Test Home Assistant template helper methods."""
 from datetime import datetime, timedelta
+import gc
 import logging
 import math
 import random
@@ -1272,6 +1273,84 @@ def test_render_with_possible_json_value_non_string_value(hass):
     assert tpl.async_render_with_possible_json_value(value) == expected
 
 
+@pytest.mark.parametrize(
+    "template_str,value",
+    [
+        ("{{ value }}", " 23.5 "),
+        ("{{ value | float }}", "23.5"),
+        ("{{ value | float * 10 }}", "23.5"),
+        ("{{ value | int(base=16) }}", "ff"),
+        ("{{ -(value | float) + 1 }}", "2"),
+        ("{{ (value | float - 32) / 1.8 }}", "75.2"),
+        ("{{ value | float // 3 % 2 }}", "10"),
+        ("{{ value_json.sensor.temperature }}", '{"sensor": {"temperature": 21}}'),
+        ("{{ value_json['humidity'] | round(1) }}", '{"humidity": 45.678}'),
+        ("{{ value_json.readings[1] | abs }}", '{"readings": [1, -2.5]}'),
+        ("{{ value_json.state }}", '{"state": null}'),
+        ("{{ value_json.on }}", '{"on": true}'),
+    ],
+)
+def test_render_with_possible_json_value_fast_render(hass, template_str, value):
+    """Test trivial value templates render the same without jinja."""
+    tpl = template.Template(template_str, hass)
+    with patch("homeassistant.helpers.template._render_with_context") as mock_render:
+        result = tpl.async_render_with_possible_json_value(value)
+    assert not mock_render.called
+
+    with patch(
+        "homeassistant.helpers.template._compile_fast_render", return_value=None
+    ):
+        tpl2 = template.Template(template_str, hass)
+        assert tpl2.async_render_with_possible_json_value(value) == result
+
+
+@pytest.mark.parametrize(
+    "template_str,value,expected",
+    [
+        ("{{ value_json.hello }}", '{"hello": "world"}', "world"),
+        ("{{ value_json.bye }}", '{"hello": "world"}', ""),
+        ("{{ value_json.hello }}", "{ I AM NOT JSON }", "{ I AM NOT JSON }"),
+        ("{{ value_json[0] }}", '{"hello": "world"}', ""),
+        ("{{ value_json }}", '{"hello": "world"}', "{'hello': 'world'}"),
+        ("{{ value * 2 }}", "ab", "abab"),
+        ("{{ value | float(default=-1) }}", "ab", "-1"),
+    ],
+)
+def test_render_with_possible_json_value_fast_render_fallback(
+    hass, template_str, value, expected
+):
+    """Test value templates fall back to jinja when the fast render misses."""
+    tpl = template.Template(template_str, hass)
+    assert tpl.async_render_with_possible_json_value(value) == expected
+
+
+def test_render_with_possible_json_value_fast_render_errors(hass):
+    """Test errors of the fast rendered templates come from jinja."""
+    tpl = template.Template("{{ value | float }}", hass)
+    with pytest.raises(ValueError):
+        tpl.async_render_with_possible_json_value("ab")
+    assert tpl.async_render_with_possible_json_value("1") == "1.0"
+
+
+@pytest.mark.parametrize(
+    "template_str",
+    [
+        "{{ value }} °C",
+        "{{ states('sensor.test') }}",
+        "{{ value | upper }}",
+        "{{ value_json[key] }}",
+        "{{ value_json.items }}",
+        "{% if value %}on{% endif %}",
+        "{{ value | float ** 2 }}",
+    ],
+)
+def test_render_with_possible_json_value_no_fast_render(hass, template_str):
+    """Test templates doing more than reading the value render with jinja."""
+    tpl = template.Template(template_str, hass)
+    tpl.async_render_with_possible_json_value("1")
+    assert tpl._fast_render is False
+
+
 def test_if_state_exists(hass):
     """Test if state exists works."""
     hass.states.async_set("test.object", "available")
@@ -3817,3 +3896,118 @@ async def test_undefined_variable(hass, caplog):
         "Template variable warning: 'no_such_variable' is undefined when rendering '{{ no_such_variable }}'"
         in caplog.text
     )
+
+
+async def test_render_to_info_cache(hass):
+    """Test renders are shared until their entities are updated."""
+    hass.states.async_set("sensor.test", "1")
+    tmpl = template.Template("{{ states('sensor.test') | int + value }}", hass)
+    other_tmpl = template.Template("{{ states('sensor.test') | int + value }}", hass)
+    cache = template.async_get_render_cache(hass)
+
+    info = tmpl.async_render_to_info({"value": 1}, use_cache=True)
+    assert_result_info(info, 2, ["sensor.test"])
+    assert cache.as_dict() == {"size": 1, "hits": 0, "misses": 1, "hit_rate": 0.0}
+
+    with patch("homeassistant.helpers.template._render_with_context") as mock_render:
+        info = other_tmpl.async_render_to_info({"value": 1}, use_cache=True)
+    assert not mock_render.called
+    assert_result_info(info, 2, ["sensor.test"])
+    assert info.template is other_tmpl
+    assert cache.hits == 1
+
+    # Other variables are rendered on their own
+    info = other_tmpl.async_render_to_info({"value": 2}, use_cache=True)
+    assert_result_info(info, 3, ["sensor.test"])
+    assert cache.misses == 2
+
+    # An updated entity renders again
+    hass.states.async_set("sensor.test", "5")
+    info = tmpl.async_render_to_info({"value": 1}, use_cache=True)
+    assert_result_info(info, 6, ["sensor.test"])
+    assert cache.as_dict() == {"size": 2, "hits": 1, "misses": 3, "hit_rate": 0.25}
+
+    # Not cached unless asked for
+    info = tmpl.async_render_to_info({"value": 1})
+    assert_result_info(info, 6, ["sensor.test"])
+    assert cache.as_dict()["hits"] == 1
+
+
+@pytest.mark.parametrize(
+    "template_str,variables",
+    (
+        ("{{ states('sensor.test') }} {{ now() }}", None),
+        ("{{ states('sensor.test') }} {{ [1, 2] | random }}", None),
+        ("{{ area_id('sensor.test') }} {{ states('sensor.test') }}", None),
+        ("{{ states.sensor | count }}", None),
+        ("{{ 1 + 1 }}", None),
+        ("{{ states('sensor.test') }} {{ trigger.id }}", {"trigger": {"id": 1}}),
+    ),
+)
+async def test_render_to_info_not_cached(hass, template_str, variables):
+    """Test renders that don't only depend on their entities are not cached."""
+    hass.states.async_set("sensor.test", "1")
+    template.Template(template_str, hass).async_render_to_info(
+        variables, use_cache=True
+    )
+    assert len(template.async_get_render_cache(hass)) == 0
+
+
+async def test_render_cache_this_variable(hass):
+    """Test the state of the entity of a template entity is part of the key."""
+    hass.states.async_set("sensor.one", "1")
+    hass.states.async_set("sensor.two", "2")
+    tmpl = template.Template("{{ this.state }}", hass)
+
+    for entity_id, result in (("sensor.one", 1), ("sensor.two", 2)):
+        info = tmpl.async_render_to_info(
+            {"this": template.TemplateStateFromEntityId(hass, entity_id)},
+            use_cache=True,
+        )
+        assert_result_info(info, result, [entity_id])
+
+    assert template.async_get_render_cache(hass).as_dict()["misses"] == 2
+
+
+async def test_compiled_template_shared(hass):
+    """Test templates with the same source share the compiled template."""
+    template_string = "{{ value_json.temperature | float * 2 }}"
+    tpl = template.Template(template_string, hass)
+    tpl2 = template.Template(template_string, hass)
+    assert tpl.async_render_with_possible_json_value('{"temperature": 1}') == "2.0"
+    assert tpl2.async_render_with_possible_json_value('{"temperature": 2}') == "4.0"
+
+    # pylint: disable=protected-access
+    assert tpl._compiled is tpl2._compiled
+    stats = template.async_get_compile_stats(hass)
+    assert stats["compiled"] == 1
+    assert stats["compile_time"] > 0
+    assert stats["reused"] == 1
+    assert stats["time_saved"] > 0
+    assert stats["memory_saved"] > 0
+
+    # Other environments have their own templates
+    tpl3 = template.Template(template_string, hass)
+    assert tpl3.async_render({"value_json": {"temperature": 3}}, limited=True) == 6.0
+    assert tpl3._compiled is not tpl._compiled
+
+
+async def test_compiled_template_garbage_collection(hass):
+    """Test compiled templates are dropped with the last template using them."""
+    template_string = "{{ value | int + 1 }}"
+    tpl = template.Template(template_string, hass)
+    tpl2 = template.Template(template_string, hass)
+    assert tpl.async_render_with_possible_json_value("1") == "2"
+    assert tpl2.async_render_with_possible_json_value("2") == "3"
+
+    # pylint: disable=protected-access
+    env = tpl._env
+    assert env.compiled_cache.get(template_string) is not None
+    del tpl
+    gc.collect()
+    assert env.compiled_cache.get(template_string) is not None
+    del tpl2
+    # Compiled templates reference themselves from their namespace
+    gc.collect()
+    assert env.compiled_cache.get(template_string) is None
+    assert env.template_cache.get(template_string) is None
@@ -27,6 +27,11 @@ async def apply_stop_hass(stop_hass):
     """Make sure all hass are stopped."""
 
 
+@pytest.fixture(autouse=True)
+def mock_storage(hass_storage):
+    """Keep the checks from writing to the storage of the test config dir."""
+
+
 @pytest.fixture
 def mock_is_file():
     """Mock is_file."""
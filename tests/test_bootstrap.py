@@ -7,11 +7,12 @@ from unittest.mock import Mock, patch
 
 import pytest
 
-from homeassistant import bootstrap, core, runner
+from homeassistant import bootstrap, core, runner, setup
 import homeassistant.config as config_util
 from homeassistant.const import SIGNAL_BOOTSTRAP_INTEGRATONS
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.startup_trace import async_get_startup_trace
 
 from tests.common import (
     MockModule,
@@ -425,6 +426,26 @@ async def test_setup_hass(
     assert len(mock_ensure_config_exists.mock_calls) == 1
     assert len(mock_process_ha_config_upgrade.mock_calls) == 1
 
+    trace = async_get_startup_trace(hass)
+    assert trace.finished
+    events = trace.as_dict()["traceEvents"]
+    tracks = {
+        event["args"]["name"]: event["tid"] for event in events if event["ph"] == "M"
+    }
+    spans = {(event["tid"], event["name"]) for event in events if event["ph"] == "X"}
+    for name in (
+        "load configuration",
+        "core integrations",
+        "resolve integrations",
+        "registries and imports",
+        "stage 2 imports",
+        "stage 2",
+        "wrap up",
+    ):
+        assert (tracks["bootstrap"], name) in spans
+    assert (tracks["browser"], "import") in spans
+    assert (tracks["browser"], "setup") in spans
+
 
 async def test_setup_hass_takes_longer_than_log_slow_startup(
     mock_enable_logging,
@@ -717,3 +738,25 @@ async def test_warning_logged_on_wrap_up_timeout(hass, caplog):
         await hass.async_block_till_done()
 
     assert "Setup timed out for bootstrap - moving forward" in caplog.text
+
+
+@pytest.mark.parametrize("load_registries", [False])
+async def test_stage_1_import_timeout_moves_forward(hass, caplog):
+    """Test setup moves on when the stage 1 imports time out."""
+    mock_integration(hass, MockModule(domain="normal_integration"))
+    import_integrations = setup.async_import_integrations
+    stalled = asyncio.Event()
+
+    async def _stalled_import(hass, domains, integration_cache):
+        if "normal_integration" not in domains:
+            await stalled.wait()
+        await import_integrations(hass, domains, integration_cache)
+
+    with patch.object(bootstrap, "STAGE_1_TIMEOUT", 0.1), patch.object(
+        bootstrap, "async_import_integrations", _stalled_import
+    ):
+        await bootstrap._async_set_up_integrations(hass, {"normal_integration": {}})
+        await hass.async_block_till_done()
+
+    assert "Import timed out for stage 1 - moving forward" in caplog.text
+    assert "normal_integration" in hass.config.components
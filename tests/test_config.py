@@ -2,6 +2,7 @@
 # pylint: disable=protected-access
 from collections import OrderedDict
 import copy
+from datetime import timedelta
 import os
 from unittest import mock
 from unittest.mock import AsyncMock, Mock, patch
@@ -32,9 +33,10 @@ from homeassistant.helpers import config_validation as cv
 import homeassistant.helpers.check_config as check_config
 from homeassistant.helpers.entity import Entity
 from homeassistant.loader import async_get_integration
-from homeassistant.util.yaml import SECRET_YAML
+import homeassistant.util.dt as dt_util
+from homeassistant.util.yaml import SECRET_YAML, loader as yaml_loader
 
-from tests.common import get_test_config_dir, patch_yaml_files
+from tests.common import async_fire_time_changed, get_test_config_dir, patch_yaml_files
 
 CONFIG_DIR = get_test_config_dir()
 YAML_PATH = os.path.join(CONFIG_DIR, config_util.YAML_CONFIG_FILE)
@@ -648,6 +650,34 @@ async def test_async_hass_config_yaml_merge(merge_log_err, hass):
     assert len(conf["light"]) == 1
 
 
+async def test_async_hass_config_yaml_cache(hass, hass_storage, tmp_path):
+    """Test unchanged configuration files are loaded from the cache."""
+    hass.config.config_dir = str(tmp_path)
+    (tmp_path / config_util.YAML_CONFIG_FILE).write_text(
+        "homeassistant:\n  name: !secret name\n"
+    )
+    (tmp_path / SECRET_YAML).write_text("name: Home\n")
+
+    with patch(
+        "homeassistant.util.yaml.loader._parse_yaml",
+        wraps=yaml_loader._parse_yaml,
+    ) as mock_parse:
+        conf = await config_util.async_hass_config_yaml(hass)
+        assert conf == {"homeassistant": {"name": "Home"}}
+        assert mock_parse.call_count == 2
+
+        mock_parse.reset_mock()
+        conf = await config_util.async_hass_config_yaml(hass)
+        assert conf == {"homeassistant": {"name": "Home"}}
+        assert mock_parse.call_count == 0
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=config_util.YAML_CACHE_SAVE_DELAY)
+    )
+    await hass.async_block_till_done()
+    assert config_util.YAML_CACHE_STORAGE_KEY in hass_storage
+
+
 # pylint: disable=redefined-outer-name
 @pytest.fixture
 def merge_log_err(hass):
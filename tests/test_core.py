@@ -6,9 +6,12 @@ import array
 import asyncio
 from datetime import datetime, timedelta
 import functools
+import json
 import logging
 import os
 from tempfile import TemporaryDirectory
+import threading
+import time
 from unittest.mock import MagicMock, Mock, PropertyMock, patch
 
 import pytest
@@ -398,6 +401,57 @@ def test_state_as_dict():
     assert state.as_dict() is as_dict_1
 
 
+def test_state_as_json():
+    """Test the JSON of a State is cached."""
+    last_time = datetime(1984, 12, 8, 12, 0, 0)
+    state = ha.State(
+        "happy.happy",
+        "on",
+        {"pig": "dog"},
+        last_updated=last_time,
+        last_changed=last_time,
+    )
+    as_dict_json = state.as_dict_json()
+    assert json.loads(as_dict_json) == state.as_dict()
+    assert state.as_dict_json() is as_dict_json
+
+    compressed_state = state.as_compressed_state()
+    assert compressed_state == {
+        "s": "on",
+        "a": {"pig": "dog"},
+        "c": state.context.id,
+        "lc": last_time.timestamp(),
+    }
+    assert state.as_compressed_state() is compressed_state
+    assert isinstance(compressed_state, ReadOnlyDict)
+    as_compressed_state_json = state.as_compressed_state_json()
+    assert json.loads(as_compressed_state_json) == compressed_state
+    assert state.as_compressed_state_json() is as_compressed_state_json
+
+
+def test_state_as_compressed_state_with_context_and_last_updated():
+    """Test the compressed State with a full context and last updated."""
+    last_changed = datetime(1984, 12, 8, 12, 0, 0)
+    last_updated = datetime(1984, 12, 8, 13, 0, 0)
+    context = ha.Context(user_id="abc", parent_id="def")
+    state = ha.State(
+        "happy.happy",
+        "on",
+        last_changed=last_changed,
+        last_updated=last_updated,
+        context=context,
+    )
+    compressed_state = state.as_compressed_state()
+    assert compressed_state == {
+        "s": "on",
+        "a": {},
+        "c": context.as_dict(),
+        "lc": last_changed.timestamp(),
+        "lu": last_updated.timestamp(),
+    }
+    assert isinstance(compressed_state["c"], ReadOnlyDict)
+
+
 async def test_eventbus_add_remove_listener(hass):
     """Test remove_listener method."""
     old_count = len(hass.bus.async_listeners())
@@ -464,6 +518,108 @@ async def test_eventbus_run_immediately(hass):
     unsub()
 
 
+async def test_eventbus_keyed_listener(hass):
+    """Test listening to the events with a key in the event data."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    listeners_before = hass.bus.async_listeners().get("test", 0)
+    unsub = hass.bus.async_listen_keyed(
+        "test", "entity_id", ["light.kitchen", "light.bowl"], listener
+    )
+    unsub_other = hass.bus.async_listen_keyed(
+        "test", "entity_id", ["light.bowl"], listener
+    )
+    assert hass.bus.async_listeners()["test"] == listeners_before + 2
+    assert hass.bus.async_keyed_listeners("test", "entity_id") == {
+        "light.kitchen": 1,
+        "light.bowl": 2,
+    }
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    hass.bus.async_fire("test", {"entity_id": "light.other"})
+    hass.bus.async_fire("test", {"entity_id": ["light.kitchen"]})
+    hass.bus.async_fire("test")
+    hass.bus.async_fire("other", {"entity_id": "light.kitchen"})
+    await hass.async_block_till_done()
+    assert [event.data["entity_id"] for event in calls] == ["light.kitchen"]
+
+    calls.clear()
+    hass.bus.async_fire("test", {"entity_id": "light.bowl"})
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+
+    # Listeners removed before the event is dispatched are not called
+    calls.clear()
+    hass.bus.async_fire("test", {"entity_id": "light.bowl"})
+    unsub_other()
+    unsub_other()
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+    assert hass.bus.async_keyed_listeners("test", "entity_id") == {
+        "light.kitchen": 1,
+        "light.bowl": 1,
+    }
+
+    unsub()
+    assert hass.bus.async_listeners().get("test", 0) == listeners_before
+    assert hass.bus.async_keyed_listeners("test", "entity_id") == {}
+
+    calls.clear()
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    await hass.async_block_till_done()
+    assert calls == []
+
+
+async def test_eventbus_listener_timing(hass):
+    """Test timing the event listeners."""
+
+    @ha.callback
+    def callback_listener(event):
+        """Mock callback listener."""
+
+    async def coroutine_listener(event):
+        """Mock coroutine listener."""
+
+    @ha.callback
+    def keyed_listener(event):
+        """Mock keyed listener."""
+
+    hass.bus.async_listen("test", callback_listener)
+    hass.bus.async_listen("test", coroutine_listener)
+    hass.bus.async_listen("test", callback_listener, run_immediately=True)
+    hass.bus.async_listen_keyed("test", "key", ["value"], keyed_listener)
+
+    hass.bus.async_fire("test", {"key": "value"})
+    await hass.async_block_till_done()
+    assert hass.bus.async_listener_timings() == []
+
+    hass.bus.async_set_listener_timing(True)
+    hass.bus.async_fire("test", {"key": "value"})
+    hass.bus.async_fire("test", {"key": "other"})
+    await hass.async_block_till_done()
+
+    timings = {
+        timing["listener"].rsplit(".", 1)[-1]: timing
+        for timing in hass.bus.async_listener_timings()
+    }
+    assert len(hass.bus.async_listener_timings()) == 4
+    assert timings["coroutine_listener"]["calls"] == 2
+    assert timings["keyed_listener"]["calls"] == 1
+    assert timings["keyed_listener"]["event_type"] == "test"
+    assert timings["keyed_listener"]["total"] >= timings["keyed_listener"]["max"]
+    assert timings["keyed_listener"]["listener"] == (
+        "tests.test_core.test_eventbus_listener_timing.<locals>.keyed_listener"
+    )
+
+    hass.bus.async_set_listener_timing(False)
+    assert hass.bus.async_listener_timings() == []
+
+
 async def test_eventbus_unsubscribe_listener(hass):
     """Test unsubscribe listener from returned function."""
     calls = []
@@ -761,6 +917,20 @@ async def test_statemachine_force_update(hass):
     assert len(events) == 1
 
 
+async def test_statemachine_shares_unchanged_attributes(hass):
+    """Test a state change with the same attributes reuses them."""
+    hass.states.async_set("light.bowl", "on", {"brightness": 100})
+    state = hass.states.get("light.bowl")
+
+    hass.states.async_set("light.bowl", "off", {"brightness": 100})
+    state2 = hass.states.get("light.bowl")
+    assert state2.state == "off"
+    assert state2.attributes is state.attributes
+
+    hass.states.async_set("light.bowl", "off", {"brightness": 50})
+    assert hass.states.get("light.bowl").attributes == {"brightness": 50}
+
+
 def test_service_call_repr():
     """Test ServiceCall repr."""
     call = ha.ServiceCall("homeassistant", "start")
@@ -1179,6 +1349,48 @@ def test_context():
     assert c.id is not None
 
 
+def test_context_id_is_stable():
+    """Test the lazily generated context id does not change once used."""
+    context = ha.Context()
+    context_id = context.id
+    assert len(context_id) == 26
+    assert context.id == context_id
+    assert context == ha.Context(id=context_id)
+    assert hash(context) == hash(ha.Context(id=context_id))
+    assert context != ha.Context()
+    assert repr(context) == f"Context(user_id=None, parent_id=None, id='{context_id}')"
+
+    with pytest.raises(AttributeError):
+        context.id = "changed"
+
+    assert ha.Context(id=None).id is None
+
+
+def test_context_id_generated_once_across_threads():
+    """Test threads reading a new context id at the same time get the same id."""
+    context = ha.Context()
+    generated = []
+
+    def slow_ulid(timestamp):
+        generated.append(timestamp)
+        time.sleep(0.05)
+        return f"ulid-{len(generated)}"
+
+    ids = []
+    with patch("homeassistant.core.ulid_util.ulid", side_effect=slow_ulid):
+        threads = [
+            threading.Thread(target=lambda: ids.append(context.id)) for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        ids.append(context.id)
+        for thread in threads:
+            thread.join()
+
+    assert len(generated) == 1
+    assert ids == ["ulid-1"] * 4
+
+
 async def test_async_functions_with_callback(hass):
     """Test we deal with async functions accidentally marked as callback."""
     runs = []
@@ -1455,6 +1667,36 @@ async def test_async_entity_ids_count(hass):
     assert hass.states.async_entity_ids_count("light") == 3
 
 
+async def test_domain_filter_follows_set_and_remove(hass):
+    """Test the domain filtered lookups follow states being set and removed."""
+    hass.states.async_set("light.bowl", "on")
+    hass.states.async_set("switch.link", "on")
+    hass.states.async_set("light.frog", "on")
+
+    assert hass.states.async_entity_ids("LIGHT") == ["light.bowl", "light.frog"]
+    assert hass.states.async_entity_ids(["switch", "light", "switch"]) == [
+        "switch.link",
+        "light.bowl",
+        "light.frog",
+    ]
+
+    hass.states.async_set("light.bowl", "off")
+    assert hass.states.async_all("light") == [
+        hass.states.get("light.bowl"),
+        hass.states.get("light.frog"),
+    ]
+    assert hass.states.async_all("light")[0].state == "off"
+
+    assert hass.states.async_remove("light.bowl")
+    assert hass.states.async_entity_ids("light") == ["light.frog"]
+    assert hass.states.async_entity_ids_count("light") == 1
+
+    assert hass.states.async_remove("light.frog")
+    assert hass.states.async_entity_ids("light") == []
+    assert hass.states.async_entity_ids_count(["light", "vacuum"]) == 0
+    assert hass.states.async_all("vacuum") == []
+
+
 async def test_hassjob_forbid_coroutine():
     """Test hassjob forbids coroutines."""
 
@@ -1,4 +1,7 @@
 """Test to verify that we can load components."""
+from datetime import timedelta
+import json
+import pathlib
 from unittest.mock import patch
 
 import pytest
@@ -6,8 +9,9 @@ import pytest
 from homeassistant import core, loader
 from homeassistant.components import http, hue
 from homeassistant.components.hue import light as hue_light
+import homeassistant.util.dt as dt_util
 
-from tests.common import MockModule, mock_integration
+from tests.common import MockModule, async_fire_time_changed, mock_integration
 
 
 async def test_component_dependencies(hass):
@@ -465,6 +469,75 @@ async def test_get_custom_components(hass, enable_custom_integrations):
         mock_get.assert_called_once_with(hass)
 
 
+async def test_get_integration_from_manifest_index(hass):
+    """Test built-in integrations are resolved without reading their manifest."""
+    with patch.object(
+        loader.Integration, "resolve_from_root", side_effect=AssertionError
+    ):
+        integration = await loader.async_get_integration(hass, "http")
+
+    manifest = json.loads(
+        (pathlib.Path(http.__file__).parent / "manifest.json").read_text()
+    )
+    assert integration.manifest == {**manifest, "is_built_in": True}
+    assert integration.pkg_path == "homeassistant.components.http"
+    assert integration.file_path == pathlib.Path(http.__file__).parent
+    assert integration.get_component() is http
+
+    stats = loader.async_get_manifest_stats(hass)
+    assert stats.from_index == 1
+    assert stats.read == 0
+
+
+async def test_get_integration_without_manifest_index(hass, caplog):
+    """Test manifests are read when the manifest index can't be loaded."""
+    with patch.object(loader, "MANIFEST_INDEX_PATH", pathlib.Path("/non/existing")):
+        integration = await loader.async_get_integration(hass, "http")
+
+    assert integration.get_component() is http
+    assert "Unable to load the manifest index" in caplog.text
+    assert loader.async_get_manifest_stats(hass).read == 1
+
+
+async def test_custom_component_manifest_cache(
+    hass, hass_storage, enable_custom_integrations
+):
+    """Test manifests of custom integrations are read only when they changed."""
+    integrations = await loader._async_get_custom_components(hass)
+    stats = loader.async_get_manifest_stats(hass)
+    # Including integrations that are blocked for not having a valid version
+    assert stats.read > len(integrations) > 0
+    assert stats.from_cache == 0
+    read = stats.read
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=loader.CUSTOM_MANIFESTS_SAVE_DELAY)
+    )
+    await hass.async_block_till_done()
+    data = hass_storage[loader.CUSTOM_MANIFESTS_STORAGE_KEY]["data"]
+
+    assert len(data) == read
+
+    hass.data.pop(loader.DATA_MANIFEST_STATS)
+    cached = await loader._async_get_custom_components(hass)
+    assert {domain: integration.manifest for domain, integration in cached.items()} == {
+        domain: integration.manifest for domain, integration in integrations.items()
+    }
+    stats = loader.async_get_manifest_stats(hass)
+    assert stats.read == 0
+    assert stats.from_cache == read
+    assert stats.time_saved is None
+
+    # A changed manifest is read again
+    test_package = next(path for path in data if "/test_package/" in path)
+    data[test_package]["mtime"] -= 1
+    hass.data.pop(loader.DATA_MANIFEST_STATS)
+    await loader._async_get_custom_components(hass)
+    stats = loader.async_get_manifest_stats(hass)
+    assert stats.read == 1
+    assert stats.from_cache == read - 1
+
+
 async def test_get_config_flows(hass):
     """Verify that custom components with config_flow are available."""
     test_1_integration = _get_test_integration(hass, "test_1", False)
@@ -1,4 +1,5 @@
 """Test requirements module."""
+from datetime import timedelta
 import os
 from unittest.mock import call, patch
 
@@ -7,13 +8,18 @@ import pytest
 from homeassistant import loader, setup
 from homeassistant.requirements import (
     CONSTRAINT_FILE,
+    DATA_REQUIREMENTS_CACHE,
+    REQUIREMENTS_CACHE_SAVE_DELAY,
+    REQUIREMENTS_CACHE_STORAGE_KEY,
     RequirementsNotFound,
     async_clear_install_history,
     async_get_integration_with_requirements,
+    async_get_satisfied_requirements,
     async_process_requirements,
 )
+import homeassistant.util.dt as dt_util
 
-from tests.common import MockModule, mock_integration
+from tests.common import MockModule, async_fire_time_changed, mock_integration
 
 
 def env_without_wheel_links():
@@ -83,6 +89,60 @@ async def test_install_existing_package(hass):
     assert len(mock_inst.mock_calls) == 0
 
 
+async def test_satisfied_requirements_are_cached(hass, hass_storage):
+    """Test satisfied requirements are not checked again after a restart."""
+    with patch(
+        "homeassistant.util.package.is_installed", return_value=True
+    ) as mock_is_installed:
+        await async_process_requirements(hass, "test_component", ["hello==1.0.0"])
+        await async_process_requirements(hass, "test_component", ["hello==1.0.0"])
+
+    assert len(mock_is_installed.mock_calls) == 1
+    assert await async_get_satisfied_requirements(hass) == {"hello==1.0.0"}
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=REQUIREMENTS_CACHE_SAVE_DELAY)
+    )
+    await hass.async_block_till_done()
+    assert hass_storage[REQUIREMENTS_CACHE_STORAGE_KEY]["data"]["satisfied"] == [
+        "hello==1.0.0"
+    ]
+
+    # Restart with the same installed packages
+    hass.data.pop(DATA_REQUIREMENTS_CACHE)
+    with patch(
+        "homeassistant.util.package.is_installed", return_value=True
+    ) as mock_is_installed:
+        await async_process_requirements(hass, "test_component", ["hello==1.0.0"])
+
+    assert len(mock_is_installed.mock_calls) == 0
+
+    # Restart after the installed packages changed
+    hass.data.pop(DATA_REQUIREMENTS_CACHE)
+    with patch(
+        "homeassistant.requirements._environment_fingerprint",
+        return_value=[["/site-packages", 1]],
+    ), patch(
+        "homeassistant.util.package.is_installed", return_value=True
+    ) as mock_is_installed:
+        await async_process_requirements(hass, "test_component", ["hello==1.0.0"])
+
+    assert len(mock_is_installed.mock_calls) == 1
+
+
+async def test_install_clears_satisfied_requirements(hass):
+    """Test installing a package forgets the satisfied requirements."""
+    with patch("homeassistant.util.package.is_installed", return_value=True):
+        await async_process_requirements(hass, "test_component", ["hello==1.0.0"])
+
+    with patch("homeassistant.util.package.is_installed", return_value=False), patch(
+        "homeassistant.util.package.install_package", return_value=True
+    ):
+        await async_process_requirements(hass, "test_component", ["world==1.0.0"])
+
+    assert await async_get_satisfied_requirements(hass) == set()
+
+
 async def test_install_missing_package(hass):
     """Test an install attempt on an existing package."""
     with patch(
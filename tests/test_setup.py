@@ -8,7 +8,7 @@ from unittest.mock import AsyncMock, Mock, patch
 import pytest
 import voluptuous as vol
 
-from homeassistant import config_entries, setup
+from homeassistant import config_entries, loader, setup
 from homeassistant.const import EVENT_COMPONENT_LOADED, EVENT_HOMEASSISTANT_START
 from homeassistant.core import callback
 from homeassistant.exceptions import HomeAssistantError
@@ -708,3 +708,59 @@ async def test_async_start_setup_platforms(hass):
     assert "august" not in hass.data[setup.DATA_SETUP_STARTED]
     assert isinstance(hass.data[setup.DATA_SETUP_TIME]["august"], datetime.timedelta)
     assert "sensor" not in hass.data[setup.DATA_SETUP_TIME]
+
+
+async def test_async_import_integrations(hass):
+    """Test integrations are imported in the executor ahead of setup."""
+    MockConfigEntry(domain="uptime").add_to_hass(hass)
+    integrations = {
+        domain: await loader.async_get_integration(hass, domain)
+        for domain in ("sun", "uptime")
+    }
+
+    with patch("homeassistant.setup.importlib.import_module") as mock_import:
+        await setup.async_import_integrations(
+            hass, ["sun", "uptime", "not_resolved"], integrations
+        )
+
+    assert [call[0][0] for call in mock_import.call_args_list] == [
+        "homeassistant.components.sun",
+        "homeassistant.components.uptime",
+        "homeassistant.components.uptime.sensor",
+    ]
+    assert set(hass.data[setup.DATA_IMPORT_TIME]) == {"sun", "uptime"}
+    assert hass.data[setup.DATA_IMPORT_STARTED] == {}
+    assert hass.data[setup.DATA_IMPORTS] == {}
+
+
+async def test_async_import_integrations_requirements_missing(hass):
+    """Test integrations with missing requirements are left to their setup."""
+    hass.config.skip_pip = False
+    sun = await loader.async_get_integration(hass, "sun")
+    integration = loader.Integration(
+        hass,
+        sun.pkg_path,
+        sun.file_path,
+        {**sun.manifest, "requirements": ["not-installed==1.0"]},
+    )
+
+    with patch("homeassistant.setup.importlib.import_module") as mock_import:
+        await setup.async_import_integrations(hass, ["sun"], {"sun": integration})
+
+    assert not mock_import.called
+    assert hass.data[setup.DATA_IMPORT_TIME] == {}
+
+
+async def test_setup_waits_for_import(hass):
+    """Test setup waits for a running import of the integration."""
+    mock_integration(hass, MockModule("comp"))
+    future = hass.loop.create_future()
+    hass.data[setup.DATA_IMPORTS] = {"comp": future}
+
+    task = hass.async_create_task(setup.async_setup_component(hass, "comp", {}))
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert not task.done()
+
+    future.set_result(0.1)
+    assert await task
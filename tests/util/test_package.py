@@ -263,7 +263,7 @@ def test_get_distribution_falls_back_to_version():
     installed_version = first_package.version
 
     with patch(
-        "homeassistant.util.package.pkg_resources.get_distribution",
+        "pkg_resources.get_distribution",
         side_effect=pkg_resources.ExtractionError,
     ):
         assert package.is_installed(installed_package)
@@ -280,7 +280,7 @@ def test_check_package_previous_failed_install():
     installed_version = first_package.version
 
     with patch(
-        "homeassistant.util.package.pkg_resources.get_distribution",
+        "pkg_resources.get_distribution",
         side_effect=pkg_resources.ExtractionError,
     ), patch("homeassistant.util.package.version", return_value=None):
         assert not package.is_installed(installed_package)
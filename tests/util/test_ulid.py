@@ -2,6 +2,8 @@
 
 import uuid
 
+import pytest
+
 import homeassistant.util.ulid as ulid_util
 
 
@@ -14,3 +16,35 @@ async def test_ulid_util_uuid_hex():
 async def test_ulid_util_uuid():
     """Verify we can generate a ulid."""
     assert len(ulid_util.ulid()) == 26
+
+
+async def test_ulid_bytes_round_trip():
+    """Verify a ulid survives conversion to bytes and back."""
+    ulid = ulid_util.ulid()
+    ulid_bytes = ulid_util.ulid_to_bytes(ulid)
+    assert len(ulid_bytes) == 16
+    assert ulid_util.bytes_to_ulid(ulid_bytes) == ulid
+    assert ulid_util.ulid_to_bytes("7ZZZZZZZZZZZZZZZZZZZZZZZZZ") == b"\xff" * 16
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "",
+        "1234",
+        "fc5bd62de45711eaaeb351041eec8dd9",
+        "01g0fg9kxfdvgzmqr0fq86ab4v",
+        "8ZZZZZZZZZZZZZZZZZZZZZZZZZ",
+        "01G0FG9KXFDVGZMQR0FQ86AB4U",
+    ],
+)
+async def test_ulid_to_bytes_rejects_non_canonical(value):
+    """Verify only canonical ulids are converted to bytes."""
+    with pytest.raises(ValueError):
+        ulid_util.ulid_to_bytes(value)
+
+
+async def test_bytes_to_ulid_wrong_length():
+    """Verify bytes_to_ulid requires 16 bytes."""
+    with pytest.raises(ValueError):
+        ulid_util.bytes_to_ulid(b"\x00" * 15)
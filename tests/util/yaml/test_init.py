@@ -1,5 +1,6 @@
 """Test Home Assistant yaml loader."""
 import io
+import json
 import os
 import unittest
 from unittest.mock import patch
@@ -445,3 +446,163 @@ def test_input():
     """Test loading inputs."""
     data = {"hello": yaml.Input("test_name")}
     assert yaml.parse_yaml(yaml.dump(data)) == data
+
+
+@pytest.mark.parametrize(
+    "loader", [yaml_loader.SafeLineLoader, yaml_loader.FastSafeLoader]
+)
+def test_loaders_add_line_info(loader):
+    """Test both loaders store the file and line of mappings and lists."""
+    stream = io.StringIO("key:\n  - 1\nother:\n  nested: value\n")
+    stream.name = "configuration.yaml"
+    data = yaml_loader._parse_yaml(loader, stream, None, None)
+
+    assert data == {"key": [1], "other": {"nested": "value"}}
+    assert data["key"].__config_file__ == "configuration.yaml"
+    assert data["key"].__line__ == 1
+    assert data["other"].__line__ == 3
+
+
+def test_parse_error_uses_python_loader_message(caplog):
+    """Test errors of the fast loader are reported by the Python loader."""
+    with pytest.raises(HomeAssistantError):
+        yaml.parse_yaml(io.StringIO("key: [1"))
+
+    assert "expected ',' or ']', but got '<stream end>'" in caplog.text
+
+
+def _write(path, content):
+    """Write a file, with a modification time different from the last write."""
+    path.write_text(content)
+    mtime_ns = path.stat().st_mtime_ns + 1_000_000_000
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def _cached_load(cache, path, secrets=None):
+    """Load a YAML file with a cache and return the result and if it was parsed."""
+    with patch.object(
+        yaml_loader, "_parse_yaml", wraps=yaml_loader._parse_yaml
+    ) as mock_parse:
+        result = yaml.load_yaml(str(path), secrets, cache)
+    return result, mock_parse.call_count
+
+
+def test_yaml_cache(tmp_path):
+    """Test unchanged files are loaded from the cache."""
+    config = tmp_path / YAML_CONFIG_FILE
+    _write(config, "packages: !include_dir_merge_named packages\nkey: !secret pw\n")
+    _write(tmp_path / yaml.SECRET_YAML, "pw: hello\n")
+    (tmp_path / "packages").mkdir()
+    _write(tmp_path / "packages" / "one.yaml", "one:\n  - a\n  - b\n")
+    cache = yaml.YamlCache()
+
+    data, parsed = _cached_load(cache, config, yaml.Secrets(tmp_path))
+    # The configuration, the package and the secrets
+    assert parsed == 3
+    assert data == {"packages": {"one": ["a", "b"]}, "key": "hello"}
+    assert cache.dirty
+
+    # The cache survives storage
+    cache = yaml.YamlCache(json.loads(json.dumps(cache.as_dict())))
+    assert not cache.dirty
+
+    cached, parsed = _cached_load(cache, config, yaml.Secrets(tmp_path))
+    assert parsed == 0
+    assert cached == data
+    assert cached["packages"]["one"].__config_file__ == str(
+        tmp_path / "packages" / "one.yaml"
+    )
+    assert cached["packages"]["one"].__line__ == 1
+    assert cached["packages"].__config_file__ == str(config)
+    assert cached["packages"].__line__ == 0
+
+    # Only the changed file and the files including it are parsed
+    _write(tmp_path / "packages" / "one.yaml", "one:\n  - c\n  - d\n")
+    data, parsed = _cached_load(cache, config, yaml.Secrets(tmp_path))
+    assert parsed == 3
+    assert data["packages"] == {"one": ["c", "d"]}
+
+    _write(tmp_path / "packages" / "two.yaml", "two: 2\n")
+    data, parsed = _cached_load(cache, config, yaml.Secrets(tmp_path))
+    assert parsed == 3
+    assert data["packages"] == {"one": ["c", "d"], "two": 2}
+
+    _write(tmp_path / yaml.SECRET_YAML, "pw: world\n")
+    data, parsed = _cached_load(cache, config, yaml.Secrets(tmp_path))
+    assert parsed == 2
+    assert data["key"] == "world"
+
+    # Loading without secrets doesn't use results loaded with secrets
+    with pytest.raises(HomeAssistantError):
+        _cached_load(cache, config)
+
+
+def test_yaml_cache_skips_env_vars_and_duplicate_keys(tmp_path, caplog):
+    """Test files with environment variables or duplicate keys are not cached."""
+    env_var = tmp_path / "env_var.yaml"
+    _write(env_var, "key: !env_var YAML_CACHE_TEST default\n")
+    duplicate_key = tmp_path / "duplicate.yaml"
+    _write(duplicate_key, "key: 1\nkey: 2\n")
+    cache = yaml.YamlCache()
+
+    for _ in range(2):
+        assert _cached_load(cache, env_var) == ({"key": "default"}, 1)
+        caplog.clear()
+        assert _cached_load(cache, duplicate_key) == ({"key": 2}, 1)
+        assert "contains duplicate key" in caplog.text
+
+    assert not cache.dirty
+
+
+def test_yaml_cache_version_change(tmp_path):
+    """Test the cache is discarded when Home Assistant is updated."""
+    config = tmp_path / YAML_CONFIG_FILE
+    _write(config, "key: value\n")
+    cache = yaml.YamlCache()
+    _cached_load(cache, config)
+
+    data = cache.as_dict()
+    data["version"] = "0.1"
+    assert _cached_load(yaml.YamlCache(data), config) == ({"key": "value"}, 1)
+
+
+def test_yaml_cache_keeps_types(tmp_path):
+    """Test values loaded from the cache have the types and lines of parsed ones."""
+    config = tmp_path / YAML_CONFIG_FILE
+    _write(
+        config,
+        "1: int key\n"
+        "null: [a, {b: c}]\n"
+        '"\\0l": nul key\n'
+        "float: .nan\n"
+        "text: !include text.yaml\n"
+        "listed: !include_dir_list listed\n",
+    )
+    _write(tmp_path / "text.yaml", "some text\n")
+    (tmp_path / "listed").mkdir()
+    _write(tmp_path / "listed" / "one.yaml", "one: 1\n")
+    cache = yaml.YamlCache()
+
+    parsed, _ = _cached_load(cache, config)
+    cached, parse_count = _cached_load(cache, config)
+    assert parse_count == 0
+
+    def _assert_same(first, second):
+        assert type(first) is type(second)
+        assert getattr(first, "__config_file__", None) == getattr(
+            second, "__config_file__", None
+        )
+        assert getattr(first, "__line__", None) == getattr(second, "__line__", None)
+        if isinstance(first, dict):
+            assert list(first) == list(second)
+            for key in first:
+                _assert_same(first[key], second[key])
+        elif isinstance(first, list):
+            assert len(first) == len(second)
+            for item, other in zip(first, second):
+                _assert_same(item, other)
+        elif first == first:  # NaN is not equal to itself
+            assert first == second
+
+    _assert_same(parsed, cached)
+    assert isinstance(cached["text"], yaml_loader.NodeStrClass)